@@ -0,0 +1,676 @@
+# -*- coding: utf-8 -*-
+"""
+벤치마크 케이스 정의 - DatabaseManager 공개 메서드, 목록 필터/정렬, CSV, 백업/복원, 시작
+
+케이스는 @case로 등록한다. setup(ctx)의 반환값이 측정 함수의 인자로 전달되며
+setup 시간은 측정에 포함되지 않는다.
+"""
+
+import sys
+import copy
+import random
+import subprocess
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, List, Optional
+
+# src 경로 추가
+SRC_DIR = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from database import DatabaseManager
+from models import Customer, Policy
+
+
+@dataclass
+class BenchCase:
+    """벤치마크 케이스 1개"""
+
+    name: str
+    func: Callable
+    setup: Optional[Callable] = None
+    covers: Optional[str] = None  # 측정 대상 DatabaseManager 메서드 이름 (커버리지 확인용)
+
+
+@dataclass
+class BenchContext:
+    """케이스 실행 환경 (작업용 DB 복사본 + 표본 ID)"""
+
+    db_path: Path
+    work_dir: Path
+    db: DatabaseManager
+    seed: int
+    customer_ids: List[int] = field(default_factory=list)
+    policy_ids: List[int] = field(default_factory=list)
+    counter: int = 0
+
+    def __post_init__(self):
+        self.rng = random.Random(self.seed)
+        cursor = self.db.connection.cursor()
+        cursor.execute("SELECT MAX(id) FROM customers")
+        max_customer = cursor.fetchone()[0] or 0
+        cursor.execute("SELECT MAX(id) FROM policies")
+        max_policy = cursor.fetchone()[0] or 0
+        self.customer_ids = [self.rng.randint(1, max_customer) for _ in range(200)] if max_customer else []
+        self.policy_ids = [self.rng.randint(1, max_policy) for _ in range(200)] if max_policy else []
+
+    def pick_customer(self) -> int:
+        return self.rng.choice(self.customer_ids)
+
+    def pick_policy(self) -> int:
+        return self.rng.choice(self.policy_ids)
+
+    def next_serial(self) -> int:
+        """케이스 간 겹치지 않는 일련번호 (전화번호/키 생성용)"""
+        self.counter += 1
+        return self.counter
+
+
+CASES: List[BenchCase] = []
+
+# 측정하지 않는 공개 메서드 (사유)
+NOT_TIMED = {
+    "close": "연결 종료 (측정 대상 아님)",
+    "cache_generation": "속성",
+}
+
+
+def case(name: str, setup: Optional[Callable] = None, covers: Optional[str] = None):
+    """케이스 등록 데코레이터 (covers 기본값: 이름의 '[' 앞부분)"""
+    def decorator(func):
+        CASES.append(BenchCase(name, func, setup, covers or name.split("[")[0]))
+        return func
+    return decorator
+
+
+def _new_customer(ctx: BenchContext) -> Customer:
+    serial = ctx.next_serial()
+    return Customer(
+        name=f"벤치고객{serial}",
+        phone=f"019-{serial // 10000:04d}-{serial % 10000:04d}",
+        resident_id="900101-1234567",
+        address="서울시 강남구",
+        med_medication="고혈압" if serial % 3 == 0 else None,
+    )
+
+
+def _new_policy(ctx: BenchContext, customer_id: int) -> Policy:
+    return Policy(
+        customer_id=customer_id,
+        insurer="삼성생명",
+        product_name="벤치보험",
+        premium=50000,
+        payment_method="card",
+        billing_cycle="monthly",
+        billing_day=15,
+        card_issuer="신한카드",
+        card_number="1234-5678-9012-3456",
+        card_expiry="12/30",
+        contract_start_date="2024-01-15",
+        next_payment_date=datetime.now().strftime("%Y-%m-%d"),
+    )
+
+
+def _cold_customer(ctx: BenchContext) -> int:
+    ctx.db.clear_cache()
+    return ctx.pick_customer()
+
+
+def _cold_policy(ctx: BenchContext) -> int:
+    ctx.db.clear_cache()
+    return ctx.pick_policy()
+
+
+def _cold_customer_ids(ctx: BenchContext) -> List[int]:
+    ctx.db.clear_cache()
+    return ctx.rng.sample(ctx.customer_ids, min(11, len(ctx.customer_ids)))
+
+
+# =============================================================================
+# Customer
+# =============================================================================
+
+@case("add_customer", setup=_new_customer)
+def _add_customer(ctx, customer):
+    ctx.db.add_customer(customer)
+
+
+@case("get_customer", setup=_cold_customer)
+def _get_customer(ctx, customer_id):
+    ctx.db.get_customer(customer_id)
+
+
+@case("get_customer[cached]", setup=lambda ctx: ctx.customer_ids[0])
+def _get_customer_cached(ctx, customer_id):
+    ctx.db.get_customer(customer_id)
+
+
+@case("get_all_customers")
+def _get_all_customers(ctx, _):
+    ctx.db.get_all_customers()
+
+
+@case("get_customers_by_ids", setup=_cold_customer_ids)
+def _get_customers_by_ids(ctx, customer_ids):
+    ctx.db.get_customers_by_ids(customer_ids)
+
+
+@case("fetch_customers_by_ids", setup=_cold_customer_ids)
+def _fetch_customers_by_ids(ctx, customer_ids):
+    DatabaseManager.fetch_customers_by_ids(ctx.db.connection, customer_ids)
+
+
+def _page_cursor(ctx: BenchContext):
+    """임의 고객 위치의 키셋 커서 (name, id) - 깊은 페이지 조회용"""
+    row = ctx.db.connection.execute(
+        "SELECT name, id FROM customers WHERE id >= ? ORDER BY id LIMIT 1", (ctx.pick_customer(),)
+    ).fetchone()
+    return tuple(row) if row else (None, None)
+
+
+@case("page_customers[deep]", setup=_page_cursor)
+def _page_customers(ctx, cursor):
+    ctx.db.page_customers(*cursor, limit=100)
+
+
+@case("iter_customers")
+def _iter_customers(ctx, _):
+    for _customer in ctx.db.iter_customers():
+        pass
+
+
+@case("search_customers[name]")
+def _search_by_name(ctx, _):
+    ctx.db.search_customers("김민")
+
+
+@case("search_customers[phone]")
+def _search_by_phone(ctx, _):
+    ctx.db.search_customers("0001-12")
+
+
+@case("update_customer", setup=lambda ctx: ctx.db.get_customer(ctx.pick_customer()))
+def _update_customer(ctx, customer):
+    customer.memo = f"수정 {ctx.next_serial()}"
+    ctx.db.update_customer(customer)
+
+
+@case("update_customer[changed_only]", setup=lambda ctx: ctx.db.get_customer(ctx.pick_customer()))
+def _update_customer_changed_only(ctx, customer):
+    original = copy.copy(customer)  # 폼을 연 시점 스냅샷 → 바뀐 컬럼(memo)만 UPDATE
+    customer.memo = f"수정 {ctx.next_serial()}"
+    ctx.db.update_customer(customer, original)
+
+
+@case("update_customer[unchanged]", setup=lambda ctx: ctx.db.get_customer(ctx.pick_customer()))
+def _update_customer_unchanged(ctx, customer):
+    ctx.db.update_customer(customer, copy.copy(customer))  # 바뀐 값 없음 → 쓰기/커밋 생략
+
+
+@case("delete_customer", setup=lambda ctx: ctx.db.add_customer(_new_customer(ctx)))
+def _delete_customer(ctx, customer_id):
+    ctx.db.delete_customer(customer_id)
+
+
+@case("get_customer_summaries[all]")
+def _summaries_all(ctx, _):
+    ctx.db.get_customer_summaries()
+
+
+@case("get_customer_summaries[ids]", setup=lambda ctx: ctx.customer_ids)
+def _summaries_ids(ctx, customer_ids):
+    ctx.db.get_customer_summaries(customer_ids)
+
+
+@case("get_customer_summaries[page]", setup=lambda ctx: ctx.db.get_sorted_customer_ids("phone")[-200:])
+def _get_customer_summaries_page(ctx, customer_ids):
+    ctx.db.get_customer_summaries(customer_ids, keep_order=True)
+
+
+for _sort in ("name", "phone", "payment_method", "next_payment", "overdue"):
+    case(f"get_sorted_customer_ids[{_sort}]")(lambda ctx, _, sort=_sort: ctx.db.get_sorted_customer_ids(sort))
+case("get_sorted_customer_ids[overdue,desc]")(lambda ctx, _: ctx.db.get_sorted_customer_ids("overdue", True))
+
+
+@case("page_customer_summaries[deep]", setup=_page_cursor)
+def _page_summaries(ctx, cursor):
+    ctx.db.page_customer_summaries(*cursor, limit=100)
+
+
+@case("rebuild_customer_summary")
+def _rebuild_summary(ctx, _):
+    ctx.db.rebuild_customer_summary()
+
+
+@case("get_customer_ids_by_conditions")
+def _ids_by_conditions(ctx, _):
+    ctx.db.get_customer_ids_by_conditions(["고혈압", "당뇨병"], match_all=False)
+
+
+@case("get_customer_ids_by_vehicle_types")
+def _ids_by_vehicle(ctx, _):
+    ctx.db.get_customer_ids_by_vehicle_types(["taxi"])
+
+
+@case("find_customers_by_conditions")
+def _find_by_conditions(ctx, _):
+    ctx.db.find_customers_by_conditions(["암"], card_policy_only=True)
+
+
+# =============================================================================
+# 세그먼트 / 캐시
+# =============================================================================
+
+@case("get_segment_index[build]", setup=lambda ctx: ctx.db.get_segment_index().invalidate())
+def _segment_build(ctx, _):
+    ctx.db.get_segment_index().bits("all")
+
+
+@case("clear_cache")
+def _clear_cache(ctx, _):
+    ctx.db.clear_cache()
+
+
+@case("invalidate_caches")
+def _invalidate_caches(ctx, _):
+    ctx.db.invalidate_caches()
+
+
+def _built_index_customers(ctx: BenchContext) -> List[int]:
+    ctx.db.get_segment_index()  # 세그먼트 비트 갱신까지 포함해 측정
+    return ctx.rng.sample(ctx.customer_ids, min(5, len(ctx.customer_ids)))
+
+
+@case("refresh_customers", setup=_built_index_customers)
+def _refresh_customers(ctx, customer_ids):
+    ctx.db.refresh_customers(customer_ids)
+
+
+@case("get_cache_stats")
+def _cache_stats(ctx, _):
+    ctx.db.get_cache_stats()
+
+
+@case("missing_from_cache", setup=lambda ctx: ctx.customer_ids)
+def _missing_from_cache(ctx, customer_ids):
+    ctx.db.missing_from_cache(customer_ids)
+
+
+def _prime_cache_args(ctx):
+    ctx.db.clear_cache()
+    ids = ctx.customer_ids[:11]
+    return (
+        DatabaseManager.fetch_customers_by_ids(ctx.db.connection, ids),
+        DatabaseManager.fetch_policies_by_customers(ctx.db.connection, ids),
+        ctx.db.cache_generation,
+    )
+
+
+@case("prime_cache", setup=_prime_cache_args)
+def _prime_cache(ctx, args):
+    ctx.db.prime_cache(*args)
+
+
+# =============================================================================
+# 생일 / 상령일
+# =============================================================================
+
+@case("get_birthday_customer_ids")
+def _birthday_ids(ctx, _):
+    ctx.db.get_birthday_customer_ids()
+
+
+@case("count_birthdays")
+def _count_birthdays(ctx, _):
+    ctx.db.count_birthdays()
+
+
+@case("get_upcoming_birthdays")
+def _upcoming_birthdays(ctx, _):
+    ctx.db.get_upcoming_birthdays(days_ahead=7)
+
+
+@case("refresh_insurance_age_changes")
+def _refresh_age_changes(ctx, _):
+    ctx.db.refresh_insurance_age_changes()
+
+
+@case("get_upcoming_age_changes")
+def _upcoming_age_changes(ctx, _):
+    ctx.db.get_upcoming_age_changes(days_ahead=30)
+
+
+# =============================================================================
+# Policy / 납부
+# =============================================================================
+
+@case("add_policy", setup=lambda ctx: _new_policy(ctx, ctx.pick_customer()))
+def _add_policy(ctx, policy):
+    ctx.db.add_policy(policy)
+
+
+@case("get_policy", setup=_cold_policy)
+def _get_policy(ctx, policy_id):
+    ctx.db.get_policy(policy_id)
+
+
+@case("get_policies_by_customer", setup=_cold_customer)
+def _policies_by_customer(ctx, customer_id):
+    ctx.db.get_policies_by_customer(customer_id)
+
+
+@case("get_policies_by_customers", setup=_cold_customer_ids)
+def _policies_by_customers(ctx, customer_ids):
+    ctx.db.get_policies_by_customers(customer_ids)
+
+
+@case("fetch_policies_by_customers", setup=_cold_customer_ids)
+def _fetch_policies_by_customers(ctx, customer_ids):
+    DatabaseManager.fetch_policies_by_customers(ctx.db.connection, customer_ids)
+
+
+@case("page_policies[deep]", setup=lambda ctx: ctx.pick_policy())
+def _page_policies(ctx, policy_id):
+    ctx.db.page_policies(policy_id, limit=100)
+
+
+@case("iter_policies")
+def _iter_policies(ctx, _):
+    for _policy in ctx.db.iter_policies():
+        pass
+
+
+@case("update_policy", setup=lambda ctx: ctx.db.get_policy(ctx.pick_policy()))
+def _update_policy(ctx, policy):
+    policy.memo = f"수정 {ctx.next_serial()}"
+    ctx.db.update_policy(policy)
+
+
+@case("delete_policy", setup=lambda ctx: ctx.db.add_policy(_new_policy(ctx, ctx.pick_customer())))
+def _delete_policy(ctx, policy_id):
+    ctx.db.delete_policy(policy_id)
+
+
+@case("get_upcoming_payments")
+def _upcoming_payments(ctx, _):
+    ctx.db.get_upcoming_payments(days_ahead=7)
+
+
+@case("get_overdue_policies")
+def _overdue_policies(ctx, _):
+    ctx.db.get_overdue_policies()
+
+
+@case("get_payment_alert_counts")
+def _payment_alert_counts(ctx, _):
+    ctx.db.get_payment_alert_counts()
+
+
+@case("mark_payment_completed", setup=lambda ctx: ctx.pick_policy())
+def _mark_payment_completed(ctx, policy_id):
+    ctx.db.mark_payment_completed(policy_id, datetime.now().strftime("%Y-%m-%d"))
+
+
+@case("mark_payments_completed", setup=lambda ctx: ctx.rng.sample(ctx.policy_ids, min(50, len(ctx.policy_ids))))
+def _mark_payments_completed(ctx, policy_ids):
+    ctx.db.mark_payments_completed(policy_ids, datetime.now().strftime("%Y-%m-%d"))
+
+
+@case("calculate_next_payment_date")
+def _calculate_next_payment_date(ctx, _):
+    ctx.db.calculate_next_payment_date("2026-01-31", "monthly", 31)
+
+
+@case("auto_update_payment_status")
+def _auto_update_payment_status(ctx, _):
+    ctx.db.auto_update_payment_status()
+
+
+# =============================================================================
+# SMS 발송 대기열
+# =============================================================================
+
+def _sms_entry(ctx):
+    serial = ctx.next_serial()
+    return {
+        "idempotency_key": f"bench:{serial}",
+        "customer_id": ctx.pick_customer(),
+        "phone": "010-0000-0000",
+        "message": "벤치마크 메시지",
+        "template": "general",
+    }
+
+
+def _enqueued_sms(ctx) -> int:
+    entry = _sms_entry(ctx)
+    return ctx.db.enqueue_sms(entry["phone"], entry["message"], idempotency_key=entry["idempotency_key"])[0]
+
+
+@case("enqueue_sms", setup=_sms_entry)
+def _enqueue_sms(ctx, entry):
+    ctx.db.enqueue_sms(entry["phone"], entry["message"], entry["customer_id"], idempotency_key=entry["idempotency_key"])
+
+
+@case("enqueue_sms_batch", setup=lambda ctx: [_sms_entry(ctx) for _ in range(200)])
+def _enqueue_sms_batch(ctx, entries):
+    ctx.db.enqueue_sms_batch(entries)
+
+
+@case("get_sms", setup=_enqueued_sms)
+def _get_sms(ctx, outbox_id):
+    ctx.db.get_sms(outbox_id)
+
+
+@case("get_sms_outbox")
+def _get_sms_outbox(ctx, _):
+    ctx.db.get_sms_outbox(status="pending", limit=100)
+
+
+@case("claim_due_sms", setup=_enqueued_sms)
+def _claim_due_sms(ctx, _):
+    ctx.db.claim_due_sms(limit=10)
+
+
+@case("complete_sms", setup=_enqueued_sms)
+def _complete_sms(ctx, outbox_id):
+    ctx.db.complete_sms(outbox_id)
+
+
+@case("retry_sms", setup=_enqueued_sms)
+def _retry_sms(ctx, outbox_id):
+    next_attempt = (datetime.now() + timedelta(seconds=30)).strftime("%Y-%m-%d %H:%M:%S.%f")
+    ctx.db.retry_sms(outbox_id, "HTTP 503", next_attempt)
+
+
+@case("fail_sms", setup=_enqueued_sms)
+def _fail_sms(ctx, outbox_id):
+    ctx.db.fail_sms(outbox_id, "HTTP 400")
+
+
+@case("recover_sending_sms")
+def _recover_sending_sms(ctx, _):
+    ctx.db.recover_sending_sms()
+
+
+# =============================================================================
+# 변경 로그 (change_log)
+# =============================================================================
+
+def _touched_rows(ctx) -> int:
+    """고객 100명 + 계약 100건 수정 후 그 직전 위치 반환 (증분 처리 대상 만들기)"""
+    seq = ctx.db.get_change_seq()
+    for table, ids in (("customers", ctx.customer_ids), ("policies", ctx.policy_ids)):
+        placeholders = ", ".join("?" for _ in ids[:100])
+        ctx.db.connection.execute(
+            f"UPDATE {table} SET memo = COALESCE(memo, '') WHERE id IN ({placeholders})", ids[:100]
+        )
+    ctx.db.connection.commit()
+    return seq
+
+
+@case("get_change_seq")
+def _get_change_seq(ctx, _):
+    ctx.db.get_change_seq()
+
+
+@case("changes_since", setup=_touched_rows)
+def _changes_since(ctx, seq):
+    ctx.db.changes_since(seq)
+
+
+@case("changed_rows_since", setup=_touched_rows)
+def _changed_rows_since(ctx, seq):
+    ctx.db.changed_rows_since("customers", seq)
+
+
+@case("compact_change_log", setup=_touched_rows)
+def _compact_change_log(ctx, _):
+    ctx.db.compact_change_log()
+
+
+@case("get_change_log_mark")
+def _get_change_log_mark(ctx, _):
+    ctx.db.get_change_log_mark("backup")
+
+
+@case("set_change_log_mark", setup=lambda ctx: ctx.db.get_change_seq())
+def _set_change_log_mark(ctx, seq):
+    ctx.db.set_change_log_mark("backup", seq)
+
+
+def _consumed_rows(ctx) -> None:
+    """_touched_rows + 소비자 위치를 수정 직전으로 (압축 대상 만들기)"""
+    ctx.db.set_change_log_mark("csv_export", _touched_rows(ctx))
+
+
+@case("compact_change_log_for_consumers", setup=_consumed_rows)
+def _compact_change_log_for_consumers(ctx, _):
+    ctx.db.compact_change_log_for_consumers()
+
+
+# =============================================================================
+# 메인 목록 필터/정렬 (load_customers의 화면 외 부분: ID 정렬 + 첫 페이지)
+# =============================================================================
+
+def _filter_case(mode: str, combination: Optional[dict] = None, sort: Optional[str] = None):
+    def run(ctx, _):
+        from customer_list import fetch_summary_page, select_customer_ids
+
+        ordered_ids, _ = select_customer_ids(ctx.db, mode, combination, sort=sort)
+        fetch_summary_page(ctx.db, ordered_ids, 0)
+    return run
+
+
+for _mode in ("all", "birthday", "credit_card", "today_card", "medical", "upcoming_payment", "overdue", "age_change"):
+    case(f"load_customers[{_mode}]", covers="-")(_filter_case(_mode))
+case("load_customers[medical+credit_card-overdue]", covers="-")(
+    _filter_case("medical", {"credit_card": "and", "overdue": "not"})
+)
+for _sort in ("phone", "next_payment"):
+    case(f"load_customers[all,sort={_sort}]", covers="-")(_filter_case("all", sort=_sort))
+case("load_customers[credit_card,sort=overdue]", covers="-")(_filter_case("credit_card", sort="overdue"))
+
+
+# =============================================================================
+# CSV / 백업 / 복원
+# =============================================================================
+
+@case("export_to_csv", covers="-")
+def _export_to_csv(ctx, _):
+    from utils.export_helpers import export_to_csv
+
+    success, error = export_to_csv(ctx.db.iter_customers(), str(ctx.work_dir / "export.csv"))
+    if not success:
+        raise RuntimeError(error)
+
+
+@case("export_changes_to_csv", covers="-", setup=_touched_rows)
+def _export_changes_to_csv(ctx, seq):
+    from utils.export_helpers import export_changes_to_csv
+
+    success, error, _ = export_changes_to_csv(ctx.db, seq, str(ctx.work_dir / "changes.csv"))
+    if not success:
+        raise RuntimeError(error)
+
+
+@case("backup_database", covers="-")
+def _backup_database(ctx, _):
+    from utils.file_helpers import backup_database
+
+    success, _, error = backup_database(ctx.db_path, ctx.work_dir / "backups")
+    if not success:
+        raise RuntimeError(error)
+
+
+def _restore_setup(ctx):
+    from utils.file_helpers import backup_database
+
+    _, backup_path, _ = backup_database(ctx.db_path, ctx.work_dir / "restore_source")
+    return Path(backup_path)
+
+
+@case("backup_changes", covers="-", setup=_touched_rows)
+def _backup_changes(ctx, seq):
+    from utils.file_helpers import backup_changes
+
+    success, _, error = backup_changes(ctx.db, ctx.work_dir / "changes", seq)
+    if not success:
+        raise RuntimeError(error)
+
+
+def _restore_changes_setup(ctx):
+    from utils.file_helpers import backup_changes
+
+    _, backup_path, _ = backup_changes(ctx.db, ctx.work_dir / "restore_changes", _touched_rows(ctx))
+    return Path(backup_path)
+
+
+@case("restore_changes", covers="-", setup=_restore_changes_setup)
+def _restore_changes(ctx, backup_path):
+    from utils.file_helpers import restore_changes
+
+    # 같은 값으로 다시 적용 (upsert라 결과 동일)
+    success, error = restore_changes(backup_path, ctx.db_path)
+    if not success:
+        raise RuntimeError(error)
+
+
+@case("restore_database", covers="-", setup=_restore_setup)
+def _restore_database(ctx, backup_path):
+    from utils.file_helpers import restore_database
+
+    success, error = restore_database(backup_path, ctx.work_dir / "restored.db")
+    if not success:
+        raise RuntimeError(error)
+
+
+# =============================================================================
+# 시작
+# =============================================================================
+
+@case("startup[open_database]", covers="-")
+def _startup_open_database(ctx, _):
+    DatabaseManager(str(ctx.db_path)).close()
+
+
+@case("startup[first_list]", covers="-")
+def _startup_first_list(ctx, _):
+    from customer_list import fetch_summary_page, select_customer_ids
+
+    db = DatabaseManager(str(ctx.db_path))
+    ordered_ids, _ = select_customer_ids(db, "all")
+    fetch_summary_page(db, ordered_ids, 0)
+    db.close()
+
+
+@case("startup[import_main_window]", covers="-")
+def _startup_import(ctx, _):
+    subprocess.run([sys.executable, "-c", "import gui.main_window"], cwd=str(SRC_DIR), check=True)
+
+
+def uncovered_methods() -> List[str]:
+    """케이스가 없는 DatabaseManager 공개 메서드 (새 메서드 추가 시 케이스 누락 확인)"""
+    public = [name for name in dir(DatabaseManager) if not name.startswith("_") and not name.isupper()]
+    covered = {bench_case.covers for bench_case in CASES}
+    return sorted(name for name in public if name not in covered and name not in NOT_TIMED)
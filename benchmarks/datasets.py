@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+벤치마크용 합성 데이터베이스 (시드 고정 → 같은 규모/시드/기준일이면 항상 같은 데이터)
+
+생성은 scripts/create_dummy_data.py의 대량 생성 모드를 사용하고,
+만든 DB는 캐시 디렉토리에 보관해 재사용한다.
+"""
+
+import os
+import sys
+import hashlib
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+# src, scripts 경로 추가
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR / "src"))
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+from create_dummy_data import create_bulk_data
+from database import DatabaseManager
+
+
+# 규모 이름 → 고객 수 (계약은 고객당 평균 3건)
+SCALES = {
+    "1k": 1_000,
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+DEFAULT_SEED = 20240101
+DEFAULT_CACHE_DIR = Path(__file__).parent / ".data"
+
+
+@lru_cache(maxsize=1)
+def schema_fingerprint() -> str:
+    """현재 스키마(테이블/인덱스/뷰/트리거 정의) 해시 8자리
+
+    스키마가 바뀌면 캐시 DB 이름도 바뀌어 새로 생성된다
+    (예전 캐시를 쓰면 작업용 복사본마다 마이그레이션 비용이 측정에 섞임).
+    """
+    db = DatabaseManager(":memory:")
+    try:
+        rows = db.connection.execute(
+            "SELECT type, name, sql FROM sqlite_master WHERE sql IS NOT NULL ORDER BY type, name"
+        ).fetchall()
+    finally:
+        db.close()
+    text = "\n".join(f"{kind} {name} {sql}" for kind, name, sql in rows)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:8]
+
+
+def dataset_path(scale: str, seed: int = DEFAULT_SEED, base_date: Optional[str] = None, cache_dir: Path = None) -> Path:
+    """캐시 DB 경로 (규모/시드/기준일/스키마별)"""
+    base_date = base_date or datetime.now().strftime("%Y-%m-%d")
+    cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+    return cache_dir / f"bench_{scale}_{seed}_{base_date.replace('-', '')}_{schema_fingerprint()}.db"
+
+
+def ensure_dataset(scale: str, seed: int = DEFAULT_SEED, base_date: Optional[str] = None,
+                   cache_dir: Path = None, rebuild: bool = False) -> Path:
+    """캐시 DB가 없으면 생성 후 경로 반환
+
+    Args:
+        scale: SCALES 키 ("1k", "10k", "100k", "1m")
+        seed: 난수 시드
+        base_date: 기준일 "YYYY-MM-DD" (생일/납부일을 기준일 주변에 분포, 기본: 오늘)
+        cache_dir: 캐시 디렉토리
+        rebuild: True면 기존 캐시 무시하고 재생성
+
+    Returns:
+        DB 파일 경로
+    """
+    base_date = base_date or datetime.now().strftime("%Y-%m-%d")
+    path = dataset_path(scale, seed, base_date, cache_dir)
+    if path.exists() and not rebuild:
+        return path
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".building")
+    if temp_path.exists():
+        temp_path.unlink()
+    build_dataset(temp_path, SCALES[scale], seed, base_date)
+    temp_path.replace(path)
+    return path
+
+
+def build_dataset(path: Path, customer_count: int, seed: int = DEFAULT_SEED, base_date: Optional[str] = None) -> None:
+    """합성 DB 생성 (create_dummy_data.py 대량 생성 모드 사용)
+
+    Args:
+        path: 생성할 DB 파일 경로
+        customer_count: 고객 수
+        seed: 난수 시드
+        base_date: 기준일 "YYYY-MM-DD" (기본: 오늘)
+    """
+    create_bulk_data(Path(path), customer_count, seed, base_date, workers=os.cpu_count() or 1, verbose=False)
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+성능 벤치마크 실행 / 비교
+
+run: 규모별 합성 DB(benchmarks/datasets.py)의 작업용 복사본에서 모든 케이스를 측정해 JSON으로 저장
+compare: 두 결과 JSON의 중앙값을 비교해 임계값 이상 느려진 케이스가 있으면 종료 코드 1
+
+사용법:
+    python benchmarks/run.py run --scales 1k 10k
+    python benchmarks/run.py run --scales 100k --filter load_customers --output after.json
+    python benchmarks/run.py compare before.json after.json --threshold 0.2
+"""
+
+import sys
+import json
+import math
+import shutil
+import sqlite3
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).parent
+sys.path.insert(0, str(BENCH_DIR))
+
+from datasets import DEFAULT_SEED, SCALES, ensure_dataset
+from cases import CASES, BenchContext, uncovered_methods
+from database import DatabaseManager
+
+
+def nearest_rank(sorted_samples: list, ratio: float) -> float:
+    """백분위수 (nearest-rank: 정렬된 n개 중 ceil(ratio * n)번째 값)"""
+    return sorted_samples[max(0, math.ceil(len(sorted_samples) * ratio) - 1)]
+
+
+def time_case(ctx: BenchContext, bench_case, min_runs: int, max_runs: int, max_seconds: float) -> dict:
+    """케이스 1개 측정 (워밍업 1회 + min_runs ~ max_runs회, max_seconds 넘으면 중단)
+
+    Returns:
+        {"median_ms", "p95_ms", "min_ms", "mean_ms", "runs"}
+    """
+    samples = []
+    started = time.perf_counter()
+    for run_index in range(max_runs + 1):
+        arg = bench_case.setup(ctx) if bench_case.setup else None
+        start = time.perf_counter()
+        bench_case.func(ctx, arg)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if run_index > 0:  # 첫 실행은 워밍업
+            samples.append(elapsed_ms)
+        if len(samples) >= min_runs and time.perf_counter() - started > max_seconds:
+            break
+
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(nearest_rank(samples, 0.95), 4),
+        "min_ms": round(samples[0], 4),
+        "mean_ms": round(statistics.mean(samples), 4),
+        "runs": len(samples),
+    }
+
+
+def run_scale(scale: str, args) -> dict:
+    """규모 1개의 모든 케이스 측정 (캐시 DB는 건드리지 않고 복사본 사용)"""
+    print(f"[{scale}] 데이터 준비 ({SCALES[scale]:,}명)...", flush=True)
+    source = ensure_dataset(scale, args.seed, args.base_date, args.cache_dir, args.rebuild)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        work_dir = Path(temp_dir)
+        db_path = work_dir / "bench.db"
+        shutil.copyfile(source, db_path)
+
+        db = DatabaseManager(str(db_path))
+        ctx = BenchContext(db_path=db_path, work_dir=work_dir, db=db, seed=args.seed)
+        try:
+            for bench_case in CASES:
+                if args.filter and not any(f in bench_case.name for f in args.filter):
+                    continue
+                result = time_case(ctx, bench_case, args.min_runs, args.max_runs, args.max_seconds)
+                results[bench_case.name] = result
+                print(
+                    f"  {bench_case.name:<45} {result['median_ms']:>10.3f} ms"
+                    f"  (p95 {result['p95_ms']:.3f}, n={result['runs']})",
+                    flush=True,
+                )
+        finally:
+            db.close()
+    return results
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=str(BENCH_DIR), capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def command_run(args) -> int:
+    missing = uncovered_methods()
+    if missing:
+        print(f"[WARNING] 케이스 없는 DatabaseManager 메서드: {', '.join(missing)}")
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "base_date": args.base_date,
+        },
+        "results": {},
+    }
+    for scale in args.scales:
+        report["results"][scale] = run_scale(scale, args)
+
+    output = Path(args.output or BENCH_DIR / "results" / f"bench_{datetime.now():%Y%m%d_%H%M%S}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"결과 저장: {output}")
+    return 0
+
+
+def compare_reports(before: dict, after: dict, threshold: float, min_delta_ms: float):
+    """두 결과의 중앙값 비교
+
+    Returns:
+        [(규모, 케이스, 이전 ms, 이후 ms, 변화율, 회귀 여부), ...]
+    """
+    rows = []
+    for scale, cases in after["results"].items():
+        for name, result in cases.items():
+            previous = before["results"].get(scale, {}).get(name)
+            if previous is None:
+                continue
+            old_ms, new_ms = previous["median_ms"], result["median_ms"]
+            change = (new_ms - old_ms) / old_ms if old_ms > 0 else 0.0
+            regressed = change > threshold and new_ms - old_ms > min_delta_ms
+            rows.append((scale, name, old_ms, new_ms, change, regressed))
+    return rows
+
+
+def command_compare(args) -> int:
+    before = json.loads(Path(args.before).read_text(encoding="utf-8"))
+    after = json.loads(Path(args.after).read_text(encoding="utf-8"))
+    rows = compare_reports(before, after, args.threshold, args.min_delta_ms)
+
+    print(f"{before['meta']['revision']} → {after['meta']['revision']} (threshold {args.threshold:.0%})")
+    for scale, name, old_ms, new_ms, change, regressed in rows:
+        mark = "REGRESSION" if regressed else ""
+        print(f"  [{scale}] {name:<45} {old_ms:>10.3f} → {new_ms:>10.3f} ms  {change:+7.1%}  {mark}")
+
+    regressions = [row for row in rows if row[5]]
+    if regressions:
+        print(f"[FAIL] {len(regressions)}개 케이스가 {args.threshold:.0%} 이상 느려짐")
+        return 1
+    print("[OK] 회귀 없음")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CRM performance benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run benchmarks and write JSON")
+    run_parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["1k", "10k"])
+    run_parser.add_argument("--filter", nargs="*", help="only cases whose name contains any of these")
+    run_parser.add_argument("--output", type=str, default=None, help="result JSON path")
+    run_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    run_parser.add_argument("--base-date", type=str, default=datetime.now().strftime("%Y-%m-%d"))
+    run_parser.add_argument("--cache-dir", type=str, default=None, help="synthetic DB cache directory")
+    run_parser.add_argument("--rebuild", action="store_true", help="regenerate cached synthetic DBs")
+    run_parser.add_argument("--min-runs", type=int, default=5)
+    run_parser.add_argument("--max-runs", type=int, default=50)
+    run_parser.add_argument("--max-seconds", type=float, default=2.0, help="time budget per case")
+
+    compare_parser = subparsers.add_parser("compare", help="compare two result JSON files")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown ratio")
+    compare_parser.add_argument("--min-delta-ms", type=float, default=0.05, help="ignore smaller absolute changes")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        sys.exit(command_run(args))
+    sys.exit(command_compare(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+서비스 모드 부하 테스트 - 합성 DB로 서비스(src/service.py)를 별도 프로세스로 띄우고
+클라이언트 N개가 동시에 요청해 작업별 p50/p99 지연과 전체 처리량을 측정
+
+작업 비율 (클라이언트마다 무작위):
+    list 40%      POST /list (필터 + 정렬 + 페이지)
+    detail 30%    POST /batch (get_customer + get_policies_by_customer, 왕복 1회)
+    search 15%    POST /search (이름 부분 일치 한 페이지)
+    update 10%    get_customer → update_customer (쓰기 큐)
+    mark_paid 5%  POST /payments/mark-paid (계약 5건, 쓰기 큐)
+
+사용법:
+    python benchmarks/service_load.py --scale 10k --clients 8 --duration 10
+    python benchmarks/service_load.py --scale 100k --clients 16 --readers 4 --output load.json
+"""
+
+import sys
+import json
+import random
+import shutil
+import sqlite3
+import argparse
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).parent
+sys.path.insert(0, str(BENCH_DIR))
+
+from datasets import DEFAULT_SEED, SCALES, ensure_dataset
+from service import RemoteDatabase
+
+SRC_DIR = BENCH_DIR.parent / "src"
+
+OPERATIONS = (
+    ("list", 40),
+    ("detail", 30),
+    ("search", 15),
+    ("update", 10),
+    ("mark_paid", 5),
+)
+LIST_FILTERS = ("all", "credit_card", "medical", "overdue", "upcoming_payment", "birthday")
+LIST_SORTS = (None, "name", "phone", "next_payment", "overdue")
+SEARCH_KEYWORDS = ("김", "이", "박", "민", "010-1")
+
+
+def start_service(db_path: Path, readers: int):
+    """서비스 프로세스 시작
+
+    Returns:
+        (프로세스, 서비스 주소)
+    """
+    process = subprocess.Popen(
+        [sys.executable, str(SRC_DIR / "service.py"), "--db", str(db_path), "--port", "0",
+         "--readers", str(readers)],
+        stdout=subprocess.PIPE, text=True, encoding="utf-8",
+    )
+    line = process.stdout.readline()  # "서비스 시작: http://127.0.0.1:<port> ..."
+    if "http://" not in line:
+        process.kill()
+        raise RuntimeError(f"서비스 시작 실패: {line!r}")
+    return process, line.split()[2]
+
+
+def run_client(url: str, rng: random.Random, max_customer_id: int, max_policy_id: int,
+               deadline: float, samples: list) -> None:
+    """클라이언트 1개 (deadline까지 요청 반복, (작업, 지연 ms) 기록)"""
+    db = RemoteDatabase(url)
+    names = [name for name, _ in OPERATIONS]
+    weights = [weight for _, weight in OPERATIONS]
+    try:
+        while time.perf_counter() < deadline:
+            operation = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            if operation == "list":
+                db.list_page(rng.choice(LIST_FILTERS), sort=rng.choice(LIST_SORTS), start=200 * rng.randrange(3))
+            elif operation == "detail":
+                customer_id = rng.randint(1, max_customer_id)
+                db.batch([("get_customer", (customer_id,), {}), ("get_policies_by_customer", (customer_id,), {})])
+            elif operation == "search":
+                db.search_page(rng.choice(SEARCH_KEYWORDS))
+            elif operation == "update":
+                customer = db.get_customer(rng.randint(1, max_customer_id))
+                if customer is not None:
+                    customer.memo = f"부하 테스트 {rng.random():.6f}"
+                    db.update_customer(customer)
+            else:
+                db.mark_payments_completed([rng.randint(1, max_policy_id) for _ in range(5)])
+            samples.append((operation, (time.perf_counter() - start) * 1000))
+    finally:
+        db.close()
+
+
+def percentile(sorted_values, ratio: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * ratio))]
+
+
+def summarize(samples, elapsed: float) -> dict:
+    """작업별 + 전체 {count, p50_ms, p99_ms, throughput_rps}"""
+    groups = {}
+    for operation, latency in samples:
+        groups.setdefault(operation, []).append(latency)
+    groups["all"] = [latency for _, latency in samples]
+
+    report = {}
+    for operation, latencies in groups.items():
+        latencies.sort()
+        report[operation] = {
+            "count": len(latencies),
+            "p50_ms": round(statistics.median(latencies), 3),
+            "p99_ms": round(percentile(latencies, 0.99), 3),
+            "throughput_rps": round(len(latencies) / elapsed, 1),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서비스 모드 부하 테스트")
+    parser.add_argument("--scale", choices=list(SCALES), default="10k")
+    parser.add_argument("--clients", type=int, default=8, help="동시 클라이언트 수")
+    parser.add_argument("--duration", type=float, default=10.0, help="측정 시간 (초)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="측정 전 워밍업 (초)")
+    parser.add_argument("--readers", type=int, default=4, help="서비스 읽기 스레드 수")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--cache-dir", type=str, default=None, help="synthetic DB cache directory")
+    parser.add_argument("--output", type=str, default=None, help="result JSON path")
+    args = parser.parse_args()
+
+    print(f"[{args.scale}] 데이터 준비 ({SCALES[args.scale]:,}명)...", flush=True)
+    source = ensure_dataset(args.scale, args.seed, cache_dir=args.cache_dir)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = Path(temp_dir) / "service.db"
+        shutil.copyfile(source, db_path)
+        with sqlite3.connect(db_path) as connection:
+            max_customer_id = connection.execute("SELECT MAX(id) FROM customers").fetchone()[0]
+            max_policy_id = connection.execute("SELECT MAX(id) FROM policies").fetchone()[0]
+        connection.close()
+
+        process, url = start_service(db_path, args.readers)
+        try:
+            for phase, duration in (("warmup", args.warmup), ("measure", args.duration)):
+                samples = []
+                deadline = time.perf_counter() + duration
+                started = time.perf_counter()
+                threads = [
+                    threading.Thread(
+                        target=run_client,
+                        args=(url, random.Random(args.seed + index), max_customer_id, max_policy_id,
+                              deadline, samples),
+                    )
+                    for index in range(args.clients)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                elapsed = time.perf_counter() - started
+        finally:
+            process.terminate()
+            process.wait(10)
+
+    report = summarize(samples, elapsed)
+    print(f"클라이언트 {args.clients}개, 읽기 스레드 {args.readers}개, {elapsed:.1f}초")
+    print(f"  {'작업':<12}{'건수':>8}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>10}")
+    for operation in [name for name, _ in OPERATIONS] + ["all"]:
+        if operation in report:
+            row = report[operation]
+            print(f"  {operation:<12}{row['count']:>8}{row['p50_ms']:>10.2f}{row['p99_ms']:>10.2f}"
+                  f"{row['throughput_rps']:>10.1f}")
+
+    if args.output:
+        output = {"scale": args.scale, "clients": args.clients, "readers": args.readers,
+                  "duration_s": round(elapsed, 2), "results": report}
+        Path(args.output).write_text(json.dumps(output, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -52,6 +52,21 @@ python -m PyInstaller ^
     --hidden-import=utils ^
     --hidden-import=utils.validators ^
     --hidden-import=utils.file_helpers ^
+    --hidden-import=utils.export_helpers ^
+    --hidden-import=utils.message_simulator ^
+    --hidden-import=utils.date_helpers ^
+    --hidden-import=gui.policy_form ^
+    --hidden-import=segments ^
+    --hidden-import=prefetch ^
+    --hidden-import=campaigns ^
+    --hidden-import=customer_list ^
+    --hidden-import=events ^
+    --hidden-import=service ^
+    --hidden-import=utils.background ^
+    --hidden-import=utils.query_profiler ^
+    --hidden-import=utils.single_instance ^
+    --hidden-import=utils.sms_outbox ^
+    --hidden-import=dateutil.relativedelta ^
     --add-data "src/gui;gui" ^
     --add-data "src/utils;utils" ^
     --add-data "src/database.py;." ^
@@ -79,4 +94,7 @@ echo.
 echo NOTE: Copy dist\InsuranceCRM.exe and
 echo       dist\data\ folder together.
 echo.
+echo Startup budget check:
+echo   python scripts\startup_benchmark.py launch --exe dist\InsuranceCRM.exe
+echo.
 pause
@@ -2,14 +2,20 @@
 """
 더미 데이터 생성 스크립트 (v2)
 30명 고객 + 다양한 보험 계약 + 모든 필드 완벽 채움
+
+--bulk: 대량 생성 모드 (예: 100만 고객 + 300만 계약)
+    python scripts/create_dummy_data.py --bulk --customers 1000000 --db crm_1m.db
 """
 
 import sys
 import os
+import time
 import random
 import argparse
+from dataclasses import dataclass, replace
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
 
 # src 경로 추가
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -481,8 +487,8 @@ def create_dummy_data(customers_target: int = 30, db_filename: str = "crm_dummy.
     print(f"\n[Verification]")
     print("=" * 60)
 
-    all_customers = db.get_all_customers()
-    print(f"  Total customers: {len(all_customers)}")
+    customer_total = db.connection.execute("SELECT COUNT(*) FROM customers").fetchone()[0]
+    print(f"  Total customers: {customer_total}")
 
     upcoming = db.get_upcoming_payments(days_ahead=7)
     print(f"  Upcoming payments (D-7): {len(upcoming)}")
@@ -504,7 +510,7 @@ def create_dummy_data(customers_target: int = 30, db_filename: str = "crm_dummy.
     overdue_cids = {p['customer'].id for p in overdue}
     today_pay_cids = {p['customer'].id for p in upcoming if p['policy'].next_payment_date == today_str}
 
-    for c in all_customers:
+    for c in db.iter_customers():
         bday = ""
         if c.resident_id:
             try:
@@ -523,19 +529,392 @@ def create_dummy_data(customers_target: int = 30, db_filename: str = "crm_dummy.
     db.close()
 
     print(f"\n{'=' * 60}")
-    print(f"[SUCCESS] {len(all_customers)} customers + {policy_count} policies created!")
+    print(f"[SUCCESS] {customer_total} customers + {policy_count} policies created!")
     print(f"Database: {db_path}")
     print(f"\nRun app with dummy data:")
     print(f"  python scripts/run_with_dummy.py --db {db_filename}")
     print(f"{'=' * 60}")
 
 
+
+# =============================================================================
+# 대량 생성 모드 (--bulk): 청크 단위 열 생성 + executemany 일괄 적재
+# =============================================================================
+
+@dataclass
+class BulkDistribution:
+    """대량 생성 분포 설정 (--set key=value로 변경)"""
+
+    policy_count_weights: Tuple[int, ...] = (5, 10, 20, 30, 20, 10, 5)  # 고객당 계약 0~6건 가중치 (평균 3건)
+    customer_payment_weights: Tuple[int, ...] = (50, 30, 20)  # 계좌이체 / 신용카드 / 자동이체
+    driving_weights: Tuple[int, ...] = (40, 45, 15)  # none / personal / commercial
+    card_ratio: float = 0.7  # 카드 납부 계약 비율
+    yearly_ratio: float = 0.1  # 연납 계약 비율
+    billing_days: Tuple[int, ...] = tuple(range(1, 29))  # 결제일 후보 (균등)
+    overdue_ratio: float = 0.05  # 연체 계약 비율
+    terminated_ratio: float = 0.03  # 해지 계약 비율
+    upcoming_window_days: int = 30  # 정상 계약 다음 납부일: 기준일 ~ +N일
+    overdue_max_days: int = 60  # 연체 계약 납부일: 기준일 -1 ~ -N일
+    birthday_near_ratio: float = 0.05  # 생일이 기준일 ±birthday_window_days 안인 고객 비율
+    birthday_window_days: int = 3
+    medication_ratio: float = 0.2
+    diagnosis_ratio: float = 0.08
+    recent_exam_ratio: float = 0.1
+
+    def override(self, assignments: List[str]) -> "BulkDistribution":
+        """"key=value" 목록으로 일부 값 변경 (튜플은 콤마 구분)"""
+        values = {}
+        for assignment in assignments:
+            key, _, raw = assignment.partition("=")
+            if key not in self.__dataclass_fields__:
+                raise ValueError(f"알 수 없는 분포 설정: {key}")
+            current = getattr(self, key)
+            if isinstance(current, tuple):
+                values[key] = tuple(int(item) for item in raw.split(","))
+            else:
+                values[key] = type(current)(raw)
+        return replace(self, **values)
+
+
+BULK_CHUNK_SIZE = 50_000
+
+BULK_LAST_NAMES = ["김", "이", "박", "최", "정", "강", "조", "윤", "장", "임"]
+BULK_FIRST_NAMES = [
+    "민준", "서연", "지훈", "수빈", "예린", "도윤", "하은", "지안", "현우", "유진",
+    "태윤", "지수", "서준", "가은", "시우", "나은", "주원", "채원", "윤서", "다은",
+]
+BULK_OCCUPATIONS = ["회사원", "자영업", "공무원", "교사", "간호사", "프리랜서", "기술직", "영업직"]
+BULK_ADDRESSES = [
+    "서울시 강남구", "서울시 마포구", "서울시 송파구", "경기도 성남시",
+    "경기도 수원시", "인천시 남동구", "대전시 유성구", "부산시 해운대구",
+]
+BULK_MEDICATIONS = ["고혈압", "당뇨병", "고지혈증"]
+BULK_DIAGNOSES = ["암", "뇌졸중", "심근경색"]
+BULK_VEHICLE_TYPES = ["taxi", "construction"]
+BULK_INSURERS = ["삼성생명", "한화생명", "교보생명", "DB손해보험", "현대해상", "KB손해보험", "메리츠화재"]
+BULK_PRODUCTS = ["종신보험", "실손보험", "암보험", "운전자보험", "자동차보험", "연금보험", "치아보험"]
+BULK_CARD_ISSUERS = ["신한카드", "삼성카드", "현대카드", "KB국민카드", "롯데카드"]
+
+
+def chunk_seed(seed: int, chunk_index: int) -> int:
+    """청크별 시드 (작업자 수와 무관하게 같은 결과)"""
+    return seed * 1_000_003 + chunk_index
+
+
+def bulk_choices(rng: random.Random, population, weights=None, k: int = 1) -> list:
+    """rng.choices 대체: 16비트 난수 하나당 조회표 한 번 (가중치 오차 < 1/65536)
+
+    k개 난수를 randbytes로 한 번에 만들어 열 전체를 리스트 컴프리헨션 한 번으로 뽑는다.
+    """
+    population = list(population)
+    weights = list(weights) if weights is not None else [1] * len(population)
+    weight_total = sum(weights)
+    table = []
+    accumulated = 0
+    for item, weight in zip(population, weights):
+        accumulated += weight
+        table.extend([item] * (round(accumulated * 65536 / weight_total) - len(table)))
+    return [table[value] for value in memoryview(rng.randbytes(2 * k)).cast("H")]
+
+
+def generate_bulk_chunk(seed: int, chunk_index: int, start_id: int, count: int, base_date: str,
+                        distribution: BulkDistribution) -> Tuple[List, List, List, List]:
+    """고객 count명(ID start_id부터) + 질환/차종 + 계약 행 생성
+
+    행 단위 난수 호출 대신 열마다 bulk_choices()로 한 번에 뽑아 zip으로 묶는다.
+
+    Returns:
+        (customers, conditions, vehicle_types, policies) 튜플 리스트
+    """
+    from utils.date_helpers import next_insurance_age_change
+
+    rng = random.Random(chunk_seed(seed, chunk_index))
+    dist = distribution
+    base = datetime.strptime(base_date, "%Y-%m-%d").date()
+    timestamp = f"{base - timedelta(days=365):%Y-%m-%d} 09:00:00"
+    ids = range(start_id, start_id + count)
+
+    # --- 고객 ---
+    all_days = [(month, day) for month in range(1, 13) for day in range(1, 29)]
+    near_days = [
+        ((base + timedelta(days=offset)).month, min((base + timedelta(days=offset)).day, 28))
+        for offset in range(-dist.birthday_window_days, dist.birthday_window_days + 1)
+    ]
+    is_near = bulk_choices(rng, (True, False), (dist.birthday_near_ratio, 1 - dist.birthday_near_ratio), k=count)
+    month_days = [
+        near if flag else anyday
+        for flag, near, anyday in zip(is_near, bulk_choices(rng, near_days, k=count), bulk_choices(rng, all_days, k=count))
+    ]
+    years = bulk_choices(rng, range(1950, 2005), k=count)
+
+    # 상령일은 (월, 일)만으로 결정됨 (일 ≤ 28, 출생연도 < 기준연도 - 1)
+    age_change_by_day = {
+        (month, day): next_insurance_age_change(date(1950, month, day), base).strftime("%Y-%m-%d")
+        for month, day in all_days
+    }
+
+    names = [
+        last + first
+        for last, first in zip(bulk_choices(rng, BULK_LAST_NAMES, k=count), bulk_choices(rng, BULK_FIRST_NAMES, k=count))
+    ]
+    addresses = bulk_choices(rng, BULK_ADDRESSES, k=count)
+    occupations = bulk_choices(rng, BULK_OCCUPATIONS, k=count)
+    driving_types = bulk_choices(rng, ["none", "personal", "commercial"], dist.driving_weights, k=count)
+    vehicle_types = bulk_choices(rng, BULK_VEHICLE_TYPES, k=count)
+    payment_methods = bulk_choices(rng, ["계좌이체", "신용카드", "자동이체"], dist.customer_payment_weights, k=count)
+    medications = bulk_choices(
+        rng, BULK_MEDICATIONS + [None], [dist.medication_ratio / 3] * 3 + [1 - dist.medication_ratio], k=count
+    )
+    diagnoses = bulk_choices(
+        rng, BULK_DIAGNOSES + [None], [dist.diagnosis_ratio / 3] * 3 + [1 - dist.diagnosis_ratio], k=count
+    )
+    recent_exams = bulk_choices(rng, (1, 0), (dist.recent_exam_ratio, 1 - dist.recent_exam_ratio), k=count)
+    serials = [value % 1_000_000 for value in memoryview(rng.randbytes(4 * count)).cast("I")]
+
+    customers, conditions, vehicles = [], [], []
+    for i, customer_id in enumerate(ids):
+        month, day = month_days[i]
+        year = years[i]
+        gender = (1 + (customer_id & 1)) + (2 if year >= 2000 else 0)
+        commercial_detail = vehicle_types[i] if driving_types[i] == "commercial" else None
+        customers.append((
+            customer_id,
+            names[i],
+            f"010-{customer_id // 10000:04d}-{customer_id % 10000:04d}",
+            f"{year % 100:02d}{month:02d}{day:02d}-{gender}{serials[i]:06d}",
+            f"{year}-{month:02d}-{day:02d}",
+            addresses[i],
+            f"LOAD TEST #{customer_id}",
+            occupations[i],
+            driving_types[i],
+            commercial_detail,
+            payment_methods[i],
+            medications[i],
+            recent_exams[i],
+            diagnoses[i],
+            timestamp,
+            timestamp,
+            f"{month:02d}-{day:02d}",
+            age_change_by_day[(month, day)],
+        ))
+        if medications[i]:
+            conditions.append((customer_id, "medication", medications[i]))
+        if diagnoses[i]:
+            conditions.append((customer_id, "diagnosis", diagnoses[i]))
+        if commercial_detail:
+            vehicles.append((customer_id, commercial_detail))
+
+    # --- 계약 ---
+    counts = bulk_choices(rng, range(len(dist.policy_count_weights)), dist.policy_count_weights, k=count)
+    owners = [customer_id for customer_id, n in zip(ids, counts) for _ in range(n)]
+    total = len(owners)
+
+    active_ratio = 1 - dist.overdue_ratio - dist.terminated_ratio
+    statuses = bulk_choices(
+        rng, ("active", "overdue", "terminated"), (active_ratio, dist.overdue_ratio, dist.terminated_ratio), k=total
+    )
+    upcoming_dates = [(base + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(dist.upcoming_window_days + 1)]
+    overdue_dates = [(base - timedelta(days=d)).strftime("%Y-%m-%d") for d in range(1, dist.overdue_max_days + 1)]
+    next_payment_dates = [
+        overdue if status == "overdue" else upcoming
+        for status, overdue, upcoming in zip(
+            statuses, bulk_choices(rng, overdue_dates, k=total), bulk_choices(rng, upcoming_dates, k=total)
+        )
+    ]
+    is_card = bulk_choices(rng, (True, False), (dist.card_ratio, 1 - dist.card_ratio), k=total)
+    billing_days = bulk_choices(rng, dist.billing_days, k=total)
+    start_months = bulk_choices(rng, [f"{base.year - y}-{m:02d}" for y in range(0, 10) for m in range(1, 13)], k=total)
+
+    # 카드 정보는 미리 만든 후보에서 뽑음 (행마다 16자리 난수 포맷팅 생략)
+    card_pool = []
+    for _ in range(4096):
+        digits = f"{rng.randrange(10 ** 16):016d}"
+        card_pool.append(f"{digits[:4]}-{digits[4:8]}-{digits[8:12]}-{digits[12:]}")
+    expiry_pool = [f"{m:02d}/{y}" for m in range(1, 13) for y in range(27, 32)]
+
+    policies = list(zip(
+        owners,
+        bulk_choices(rng, BULK_INSURERS, k=total),
+        bulk_choices(rng, BULK_PRODUCTS, k=total),
+        bulk_choices(rng, range(10_000, 300_001, 1_000), k=total),
+        ["card" if card else "transfer" for card in is_card],
+        bulk_choices(rng, ("yearly", "monthly"), (dist.yearly_ratio, 1 - dist.yearly_ratio), k=total),
+        billing_days,
+        [issuer if card else None for issuer, card in zip(bulk_choices(rng, BULK_CARD_ISSUERS, k=total), is_card)],
+        [number if card else None for number, card in zip(bulk_choices(rng, card_pool, k=total), is_card)],
+        [expiry if card else None for expiry, card in zip(bulk_choices(rng, expiry_pool, k=total), is_card)],
+        [f"{month}-{day:02d}" for month, day in zip(start_months, billing_days)],
+        statuses,
+        next_payment_dates,
+        [timestamp] * total,
+        [timestamp] * total,
+    ))
+
+    return customers, conditions, vehicles, policies
+
+
+def _generate_bulk_chunk_args(args):
+    return generate_bulk_chunk(*args)
+
+
+def create_bulk_data(db_path: Path, customers_target: int, seed: int = 42, base_date: Optional[str] = None,
+                     distribution: Optional[BulkDistribution] = None, workers: int = 1, verbose: bool = True,
+                     chunk_size: int = BULK_CHUNK_SIZE) -> dict:
+    """대량 더미 DB 생성 (기존 파일은 덮어씀)
+
+    1) DatabaseManager로 스키마 생성
+    2) 보조 인덱스/요약 트리거 제거, 저널/동기화 끄고 executemany로 적재
+    3) customer_summary 일괄 계산 → 인덱스 재생성 → DatabaseManager 재오픈(트리거 복구) → ANALYZE
+
+    Args:
+        db_path: 생성할 DB 경로
+        customers_target: 고객 수
+        seed: 기본 시드 (청크별 시드 = chunk_seed(seed, 청크 번호))
+        base_date: 기준일 "YYYY-MM-DD" (기본: 오늘)
+        distribution: 분포 설정 (기본: BulkDistribution())
+        workers: 청크 생성 프로세스 수 (1이면 현재 프로세스에서 생성, 생성과 적재가 겹쳐 실행됨)
+        verbose: 진행 상황 출력
+        chunk_size: 청크당 고객 수
+
+    Returns:
+        {"customers", "policies", "seconds"}
+    """
+    import sqlite3
+    from concurrent.futures import ProcessPoolExecutor
+
+    started = time.perf_counter()
+    db_path = Path(db_path)
+    base_date = base_date or datetime.now().strftime("%Y-%m-%d")
+    distribution = distribution or BulkDistribution()
+    if db_path.exists():
+        db_path.unlink()
+
+    DatabaseManager(str(db_path)).close()
+
+    connection = sqlite3.connect(str(db_path), isolation_level=None)
+    connection.execute("PRAGMA journal_mode = OFF")
+    connection.execute("PRAGMA synchronous = OFF")
+    connection.execute("PRAGMA locking_mode = EXCLUSIVE")
+    connection.execute("PRAGMA cache_size = -262144")  # 256MB
+    connection.execute("PRAGMA temp_store = MEMORY")
+    connection.execute(f"PRAGMA threads = {os.cpu_count() or 1}")  # 인덱스 생성 정렬 병렬화
+
+    # 적재 중에는 보조 인덱스와 요약 트리거, 변경 로그 트리거를 빼 둔다 (재생성이 행마다 갱신보다 빠름,
+    # 생성 데이터는 변경 이력이 아님 → 변경 로그는 빈 상태로 시작)
+    index_sql = [
+        row[0] for row in connection.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+            "AND tbl_name IN ('customers', 'policies', 'customer_conditions', 'customer_vehicle_types', "
+            "'customer_summary')"
+        )
+    ]
+    for (name,) in connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+        "AND tbl_name IN ('customers', 'policies', 'customer_conditions', 'customer_vehicle_types', "
+            "'customer_summary')"
+    ).fetchall():
+        connection.execute(f"DROP INDEX {name}")
+    for (name,) in connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+        "AND (name LIKE 'trg_summary_%' OR name LIKE 'trg_change_%')"
+    ).fetchall():
+        connection.execute(f"DROP TRIGGER {name}")
+
+    chunks = [
+        (seed, index, start + 1, min(chunk_size, customers_target - start), base_date, distribution)
+        for index, start in enumerate(range(0, customers_target, chunk_size))
+    ]
+    workers = max(1, min(workers, len(chunks)))
+
+    policy_total = 0
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        results = executor.map(_generate_bulk_chunk_args, chunks) if executor else map(_generate_bulk_chunk_args, chunks)
+        connection.execute("BEGIN")
+        for customers, conditions, vehicles, policies in results:
+            connection.executemany(
+                """
+                INSERT INTO customers (
+                    id, name, phone, resident_id, birth_date, address, memo, occupation,
+                    driving_type, commercial_detail, payment_method, med_medication,
+                    med_recent_exam, med_5yr_diagnosis, created_at, updated_at,
+                    birth_mmdd, insurance_age_change_date
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                customers,
+            )
+            connection.executemany(
+                "INSERT INTO customer_conditions (customer_id, kind, name) VALUES (?, ?, ?)", conditions
+            )
+            connection.executemany(
+                "INSERT INTO customer_vehicle_types (customer_id, vehicle_type) VALUES (?, ?)", vehicles
+            )
+            connection.executemany(
+                """
+                INSERT INTO policies (
+                    customer_id, insurer, product_name, premium, payment_method, billing_cycle,
+                    billing_day, card_issuer, card_number, card_expiry, contract_start_date,
+                    status, next_payment_date, created_at, updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                policies,
+            )
+            policy_total += len(policies)
+            if verbose:
+                print(f"  loaded {customers[-1][0]:,} customers / {policy_total:,} policies "
+                      f"({time.perf_counter() - started:.1f}s)", flush=True)
+        connection.execute("COMMIT")
+    finally:
+        if executor:
+            executor.shutdown()
+
+    # 요약은 인덱스 없는 상태에서 GROUP BY 한 번으로 채우고 인덱스와 함께 정렬 생성
+    connection.execute(DatabaseManager.SUMMARY_REBUILD_SQL)
+    if verbose:
+        print(f"  customer_summary rebuilt ({time.perf_counter() - started:.1f}s)", flush=True)
+    for sql in index_sql:
+        connection.execute(sql)
+    connection.close()
+    if verbose:
+        print(f"  indexes rebuilt ({time.perf_counter() - started:.1f}s)", flush=True)
+
+    # 요약/변경 로그 트리거는 DatabaseManager가 다시 만든다 (요약 테이블이 있으므로 재계산 없음)
+    db = DatabaseManager(str(db_path))
+    db.connection.execute("ANALYZE")
+    db.connection.commit()
+    db.close()
+    if verbose:
+        print(f"  ANALYZE ({time.perf_counter() - started:.1f}s)", flush=True)
+
+    return {
+        "customers": customers_target,
+        "policies": policy_total,
+        "seconds": round(time.perf_counter() - started, 1),
+    }
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Create dummy CRM data")
     parser.add_argument("--customers", type=int, default=30, help="Number of customers to create (default: 30)")
     parser.add_argument("--db", type=str, default="crm_dummy.db", help="Output DB filename under data/")
     parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducibility")
+    parser.add_argument("--bulk", action="store_true", help="High-speed bulk generator (large datasets)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Bulk: generator processes")
+    parser.add_argument("--base-date", type=str, default=None, help="Bulk: base date YYYY-MM-DD (default: today)")
+    parser.add_argument(
+        "--set", action="append", default=[], metavar="KEY=VALUE",
+        help="Bulk: override distribution (e.g. --set overdue_ratio=0.1 --set billing_days=1,15,25)",
+    )
     args = parser.parse_args()
 
-    random.seed(args.seed)
-    create_dummy_data(customers_target=args.customers, db_filename=args.db)
+    if args.bulk:
+        db_path = Path(__file__).parent.parent / "data" / args.db
+        distribution = BulkDistribution().override(args.set)
+        print(f"[Bulk] {args.customers:,} customers → {db_path} (workers={args.workers}, seed={args.seed})")
+        stats = create_bulk_data(db_path, args.customers, args.seed, args.base_date, distribution, args.workers)
+        print(f"[SUCCESS] {stats['customers']:,} customers + {stats['policies']:,} policies in {stats['seconds']}s")
+    else:
+        random.seed(args.seed)
+        create_dummy_data(customers_target=args.customers, db_filename=args.db)
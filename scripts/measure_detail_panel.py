@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+상세 패널 갱신 지연 측정 스크립트
+고객 목록을 위에서부터 한 행씩 선택하며 행 선택 → 화면 반영까지 걸린 시간을 측정한다.
+(화면(DISPLAY)이 있는 환경에서 실행)
+
+사용법 (변경 전/후 비교: 이전 커밋을 worktree로 꺼내 --src로 지정):
+    python scripts/measure_detail_panel.py
+    git worktree add ../crm-before <커밋>
+    python scripts/measure_detail_panel.py --src ../crm-before/src
+"""
+
+import sys
+import os
+import math
+import time
+import argparse
+import statistics
+import tempfile
+import tkinter as tk
+from pathlib import Path
+
+DEFAULT_SRC = Path(__file__).parent.parent / "src"
+
+
+def _prepare_db(db_path: str, count: int) -> None:
+    """측정용 고객 데이터 생성 (--src의 DatabaseManager로 생성 → 그 버전의 스키마)"""
+    from database import DatabaseManager
+    from models import Customer
+
+    db = DatabaseManager(db_path)
+    for i in range(count):
+        db.add_customer(
+            Customer(
+                name=f"측정고객{i:04d}",
+                phone=f"010-5000-{i:04d}",
+                resident_id=f"{70 + i % 30:02d}{1 + i % 12:02d}{1 + i % 28:02d}-1234567",
+                address="서울시 강남구",
+                occupation="회사원",
+                driving_type="commercial" if i % 5 == 0 else "personal",
+                commercial_detail="taxi" if i % 5 == 0 else None,
+                med_medication="고혈압" if i % 4 == 0 else None,
+                memo="메모 " * (i % 20),
+            )
+        )
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure customer detail panel update latency")
+    parser.add_argument("--customers", type=int, default=300, help="number of customers")
+    parser.add_argument("--rows", type=int, default=200, help="number of rows to select")
+    parser.add_argument("--src", type=Path, default=DEFAULT_SRC, help="src directory to measure (default: this tree)")
+    args = parser.parse_args()
+    sys.path.insert(0, str(args.src.resolve()))
+
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, "measure.db")
+    _prepare_db(db_path, args.customers)
+    os.environ["CRM_DB_PATH"] = db_path
+
+    from gui.main_window import MainWindow
+
+    root = tk.Tk()
+    app = MainWindow(root)
+    root.update()
+
+    items = app.tree.get_children()[: args.rows]
+    samples = []
+    for item in items:
+        start = time.perf_counter()
+        app.tree.selection_set(item)  # <<TreeviewSelect>> → _on_row_select
+        root.update()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    root.destroy()
+
+    samples.sort()
+    print(f"src : {args.src.resolve()}")
+    print(f"rows: {len(samples)}")
+    print(f"mean: {statistics.mean(samples):.2f} ms")
+    print(f"p50 : {samples[len(samples) // 2]:.2f} ms")
+    print(f"p95 : {samples[math.ceil(len(samples) * 0.95) - 1]:.2f} ms")
+    print(f"max : {samples[-1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+시작 시간 벤치마크 (예산 초과 시 종료 코드 1)
+
+1) import: python -X importtime으로 gui.main_window import 비용 측정 + 지연 import 대상 모듈 로드 여부 확인
+2) launch: 앱을 CRM_STARTUP_PROBE=1로 실행해 첫 목록 로드 후 종료까지의 시간 측정
+   (개발 실행: python src/main.py / 빌드 exe: --exe dist/InsuranceCRM.exe, 화면 필요)
+
+사용법:
+    python scripts/startup_benchmark.py import
+    python scripts/startup_benchmark.py launch --runs 5
+    python scripts/startup_benchmark.py launch --exe dist/InsuranceCRM.exe
+"""
+
+import sys
+import os
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+SRC_DIR = ROOT_DIR / "src"
+
+# 첫 화면에 필요 없으므로 gui.main_window import 시 로드되면 안 되는 모듈
+LAZY_MODULES = (
+    "dateutil",
+    "gui.customer_form",
+    "gui.policy_form",
+    "utils.export_helpers",
+    "utils.file_helpers",
+    "utils.message_simulator",
+    "prefetch",
+    "concurrent.futures",
+)
+
+# 예산 (밀리초)
+IMPORT_BUDGET_MS = 150
+LAUNCH_BUDGET_MS = {"dev": 1500, "exe": 3000}  # onefile exe는 압축 해제 시간 포함
+
+
+def parse_importtime(stderr: str):
+    """-X importtime 출력 → [(모듈, self_us, cumulative_us), ...]"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def measure_imports(runs: int):
+    """gui.main_window import 비용 측정
+
+    Returns:
+        (중앙값 ms, 가장 느린 모듈 목록, 로드된 지연 대상 모듈 목록)
+    """
+    code = (
+        "import sys, gui.main_window; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    totals = []
+    entries = []
+    loaded = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=str(SRC_DIR),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        entries = parse_importtime(result.stderr)
+        totals.append(sum(self_us for _, self_us, _ in entries) / 1000)
+        loaded = [m for m in result.stdout.strip().split(",") if m]
+
+    slowest = sorted(entries, key=lambda e: e[1], reverse=True)[:10]
+    return statistics.median(totals), slowest, loaded
+
+
+def measure_launch(runs: int, exe: str = None):
+    """앱 실행 → 첫 목록 로드 → 종료까지 시간 측정 (중앙값 ms)"""
+    command = [exe] if exe else [sys.executable, str(SRC_DIR / "main.py")]
+    samples = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        env = dict(os.environ)
+        env["CRM_STARTUP_PROBE"] = "1"
+        env["CRM_DB_PATH"] = str(Path(temp_dir) / "startup.db")
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(command, env=env, check=True, timeout=60)
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup time benchmark with budgets")
+    parser.add_argument("mode", choices=["import", "launch"])
+    parser.add_argument("--runs", type=int, default=5, help="number of runs (median is reported)")
+    parser.add_argument("--exe", type=str, default=None, help="built exe path (launch mode)")
+    parser.add_argument("--budget-ms", type=float, default=None, help="override time budget")
+    args = parser.parse_args()
+
+    if args.mode == "import":
+        budget = args.budget_ms or IMPORT_BUDGET_MS
+        total_ms, slowest, loaded = measure_imports(args.runs)
+        print(f"gui.main_window import: {total_ms:.1f} ms (budget {budget:.0f} ms)")
+        for name, self_us, cumulative_us in slowest:
+            print(f"  {self_us / 1000:7.2f} ms  {name.strip()}")
+        if loaded:
+            print(f"[FAIL] lazy modules imported at startup: {', '.join(loaded)}")
+        ok = total_ms <= budget and not loaded
+    else:
+        target = "exe" if args.exe else "dev"
+        budget = args.budget_ms or LAUNCH_BUDGET_MS[target]
+        launch_ms = measure_launch(args.runs, args.exe)
+        print(f"launch ({target}) to first list: {launch_ms:.0f} ms (budget {budget:.0f} ms)")
+        ok = launch_ms <= budget
+
+    print("[OK]" if ok else "[FAIL] startup budget exceeded")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
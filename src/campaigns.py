@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+SMS 캠페인 - 세그먼트 SQL 1회로 수신자 조회 → 미리 파싱한 템플릿으로 일괄 렌더링 → 발송 대기열 등록
+"""
+
+import string
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from utils.date_helpers import birthday_mmdds, next_insurance_age_change
+
+
+# 템플릿에서 사용할 수 있는 필드 (모든 캠페인 SQL이 같은 컬럼을 반환)
+TEMPLATE_FIELDS = (
+    "name",
+    "phone",
+    "payment_date",
+    "premium_total",
+    "policy_count",
+    "product_names",
+    "age_change_date",
+)
+
+# 기본 템플릿 (키는 단건 발송 템플릿 키와 동일)
+DEFAULT_TEMPLATES = {
+    "birthday": "{name}님, 생일을 진심으로 축하드립니다! 건강하고 행복한 한 해 보내세요.",
+    "overdue": (
+        "{name}님, {product_names} 보험료 {premium_total}원의 납부일({payment_date})이 지났습니다. "
+        "카드 결제 상태를 확인 부탁드립니다."
+    ),
+    "upcoming": "{name}님, {payment_date}에 {product_names} 보험료 {premium_total}원이 카드로 결제될 예정입니다.",
+    "age_change": (
+        "{name}님, {age_change_date}부터 보험 나이가 바뀌어 보험료가 오를 수 있습니다. "
+        "가입/변경 상담이 필요하시면 연락 주세요."
+    ),
+}
+
+_CAMPAIGN_COLUMNS = """
+    c.id AS customer_id, c.name, c.phone,
+    {payment_date} AS payment_date,
+    {premium_total} AS premium_total,
+    {policy_count} AS policy_count,
+    {product_names} AS product_names,
+    NULL AS age_change_date,
+    c.birth_date
+"""
+
+_CUSTOMER_ONLY = _CAMPAIGN_COLUMNS.format(
+    payment_date="NULL", premium_total="0", policy_count="0", product_names="''"
+)
+_POLICY_AGGREGATE = _CAMPAIGN_COLUMNS.format(
+    payment_date="MIN(p.next_payment_date)",
+    premium_total="SUM(p.premium)",
+    policy_count="COUNT(p.id)",
+    product_names="GROUP_CONCAT(p.product_name, ', ')",
+)
+
+# 캠페인 세그먼트: 이름 → (기본 템플릿 키, 수신자 SQL). 세그먼트당 쿼리 1회.
+# SQL이 None이면 DatabaseManager 조회로 수신자를 만든다 (_age_change_rows).
+CAMPAIGN_SEGMENTS: Dict[str, Tuple[str, Optional[str]]] = {
+    "birthday_today": (
+        "birthday",
+        f"""
+        SELECT {_CUSTOMER_ONLY} FROM customers c
+        WHERE c.birth_mmdd IN (:today_mmdd, :leap_day_mmdd)
+        ORDER BY c.name, c.id
+        """,
+    ),
+    "overdue": (
+        "overdue",
+        f"""
+        SELECT {_POLICY_AGGREGATE} FROM customers c
+        JOIN policies p ON p.customer_id = c.id
+        WHERE p.status = 'overdue' AND p.payment_method = 'card'
+        GROUP BY c.id
+        ORDER BY c.name, c.id
+        """,
+    ),
+    "upcoming_payment": (
+        "upcoming",
+        f"""
+        SELECT {_POLICY_AGGREGATE} FROM customers c
+        JOIN policies p ON p.customer_id = c.id
+        WHERE p.next_payment_date BETWEEN :today AND :upcoming_end
+          AND p.status = 'active' AND p.payment_method = 'card'
+        GROUP BY c.id
+        ORDER BY c.name, c.id
+        """,
+    ),
+    # 저장된 상령일은 오늘 기준 값이라 다른 기준일에는 맞지 않음 → get_upcoming_age_changes로 기준일마다 계산
+    "age_change": ("age_change", None),
+}
+
+
+class CompiledTemplate:
+    """미리 파싱한 SMS 템플릿
+
+    생성 시 한 번만 파싱하고 (알 수 없는 필드는 즉시 오류),
+    render()는 (문자열, 필드) 조각을 이어 붙이기만 한다.
+    """
+
+    def __init__(self, text: str):
+        """CompiledTemplate 초기화
+
+        Args:
+            text: "{name}님, ..." 형식 템플릿
+
+        Raises:
+            ValueError: 알 수 없는 필드 또는 서식 지정자 사용
+        """
+        self.text = text
+        self.parts: List[Tuple[str, Optional[str]]] = []
+        for literal, field_name, format_spec, conversion in string.Formatter().parse(text):
+            if field_name is not None:
+                if field_name not in TEMPLATE_FIELDS:
+                    raise ValueError(f"알 수 없는 템플릿 필드: {field_name}")
+                if format_spec or conversion:
+                    raise ValueError(f"템플릿 필드에는 서식을 지정할 수 없습니다: {field_name}")
+            self.parts.append((literal, field_name))
+
+    def render(self, values: Dict[str, str]) -> str:
+        """필드 값으로 메시지 생성 (값이 없으면 빈 문자열)"""
+        chunks = []
+        for literal, field_name in self.parts:
+            chunks.append(literal)
+            if field_name is not None:
+                chunks.append(values.get(field_name) or "")
+        return "".join(chunks)
+
+
+@dataclass
+class CampaignMessage:
+    """캠페인 메시지 1건"""
+
+    customer_id: int
+    name: str
+    phone: str
+    message: str
+
+
+@dataclass
+class CampaignPlan:
+    """캠페인 발송 계획 (dry-run 결과, DB 변경 없음)"""
+
+    segment: str
+    template: str
+    base_date: str
+    messages: List[CampaignMessage] = field(default_factory=list)
+    skipped: List[Tuple[int, str, str]] = field(default_factory=list)  # (고객 ID, 이름, 사유)
+
+    def preview(self, limit: int = 3) -> str:
+        """미리보기 문자열 (수신자 수 + 앞쪽 메시지 limit건)"""
+        lines = [f"세그먼트: {self.segment} / 템플릿: {self.template}", f"수신자: {len(self.messages)}명"]
+        if self.skipped:
+            lines.append(f"제외: {len(self.skipped)}명 (전화번호 없음)")
+        for item in self.messages[:limit]:
+            lines.append(f"\n[{item.name} {item.phone}]\n{item.message}")
+        if len(self.messages) > limit:
+            lines.append(f"\n... 외 {len(self.messages) - limit}건")
+        return "\n".join(lines)
+
+
+def _campaign_params(base_date: str, upcoming_days: int) -> dict:
+    """캠페인 SQL 날짜 파라미터"""
+    today = datetime.strptime(base_date, "%Y-%m-%d").date()
+    today_mmdd, leap_day_mmdd = birthday_mmdds(today)  # 평년 3월 1일은 2월 29일생 포함
+    return {
+        "today": base_date,
+        "today_mmdd": today_mmdd,
+        "leap_day_mmdd": leap_day_mmdd,
+        "upcoming_end": (today + timedelta(days=upcoming_days)).strftime("%Y-%m-%d"),
+    }
+
+
+def _age_change_rows(db, base_date: str, age_change_days: int) -> List[Dict]:
+    """상령일 임박 수신자 (기준일 다음 상령일로 계산, 캠페인 SQL과 같은 컬럼/이름순)"""
+    rows = [
+        {
+            "customer_id": item["customer"].id,
+            "name": item["customer"].name,
+            "phone": item["customer"].phone,
+            "payment_date": None,
+            "premium_total": 0,
+            "policy_count": 0,
+            "product_names": "",
+            "age_change_date": item["change_date"],
+            "birth_date": item["customer"].birth_date,
+        }
+        for item in db.get_upcoming_age_changes(age_change_days, base_date)
+    ]
+    rows.sort(key=lambda row: (row["name"], row["customer_id"]))
+    return rows
+
+
+def plan_campaign(
+    db,
+    segment: str,
+    template_text: Optional[str] = None,
+    base_date: Optional[str] = None,
+    upcoming_days: int = 7,
+    age_change_days: int = 30,
+) -> CampaignPlan:
+    """캠페인 수신자 조회 + 메시지 일괄 렌더링 (dry-run, DB 변경 없음)
+
+    Args:
+        db: DatabaseManager 인스턴스
+        segment: CAMPAIGN_SEGMENTS 키
+        template_text: 템플릿 문자열 (None이면 세그먼트 기본 템플릿)
+        base_date: 기준일 "YYYY-MM-DD" (기본: 오늘)
+        upcoming_days: 납부 임박 기준 일수
+        age_change_days: 상령일 임박 기준 일수
+
+    Returns:
+        CampaignPlan
+
+    Raises:
+        ValueError: 알 수 없는 세그먼트 또는 템플릿 필드
+    """
+    if segment not in CAMPAIGN_SEGMENTS:
+        raise ValueError(f"알 수 없는 캠페인 세그먼트: {segment}")
+
+    template_key, sql = CAMPAIGN_SEGMENTS[segment]
+    compiled = CompiledTemplate(template_text or DEFAULT_TEMPLATES[template_key])
+    base_date = base_date or datetime.now().strftime("%Y-%m-%d")
+
+    if sql is None:
+        rows = _age_change_rows(db, base_date, age_change_days)
+    else:
+        cursor = db.connection.cursor()
+        cursor.execute(sql, _campaign_params(base_date, upcoming_days))
+        columns = [column[0] for column in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    # 다른 세그먼트 템플릿의 {age_change_date}도 기준일 다음 상령일 (저장된 상령일은 오늘 기준)
+    uses_age_change = any(field_name == "age_change_date" for _, field_name in compiled.parts)
+    base = datetime.strptime(base_date, "%Y-%m-%d").date()
+
+    plan = CampaignPlan(segment=segment, template=template_key, base_date=base_date)
+    for values in rows:
+        if uses_age_change and values["age_change_date"] is None and values["birth_date"]:
+            birth = datetime.strptime(values["birth_date"], "%Y-%m-%d").date()
+            values["age_change_date"] = next_insurance_age_change(birth, base).strftime("%Y-%m-%d")
+        if not (values["phone"] or "").strip():
+            plan.skipped.append((values["customer_id"], values["name"], "전화번호 없음"))
+            continue
+        values["premium_total"] = f"{values['premium_total'] or 0:,}"
+        values["policy_count"] = str(values["policy_count"] or 0)
+        plan.messages.append(
+            CampaignMessage(
+                customer_id=values["customer_id"],
+                name=values["name"],
+                phone=values["phone"],
+                message=compiled.render(values),
+            )
+        )
+    return plan
+
+
+def enqueue_campaign(db, plan: CampaignPlan) -> int:
+    """캠페인 메시지를 발송 대기열에 일괄 등록 (같은 날 같은 캠페인 재실행 시 중복 등록 없음)
+
+    Args:
+        db: DatabaseManager 인스턴스
+        plan: plan_campaign() 결과
+
+    Returns:
+        새로 등록된 건수
+    """
+    entries = [
+        {
+            "idempotency_key": f"campaign:{plan.segment}:{item.customer_id}:{plan.base_date}",
+            "customer_id": item.customer_id,
+            "phone": item.phone,
+            "message": item.message,
+            "template": plan.template,
+        }
+        for item in plan.messages
+    ]
+    return db.enqueue_sms_batch(entries)
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+고객 목록 선택 - 필터 조합/정렬 → 표시 순서의 고객 ID + 페이지 요약
+
+Tk 없이 호출 가능 (메인 윈도우, 서비스 모드 /list, 벤치마크/테스트 공용).
+"""
+
+from segments import bitmap_from_ids, ids_from_bitmap
+
+
+# 필터 모드 → 세그먼트 조합식 (segments.SegmentIndex)
+FILTER_SEGMENTS = {
+    "all": "all",
+    "birthday": "birthday_today",
+    "credit_card": "credit_card",
+    "today_card": "today_card",
+    "medical": "patient",
+    "upcoming_payment": ("and", "upcoming_payment", ("not", "today_card")),
+    "overdue": "overdue",
+    "age_change": "age_change",
+}
+
+
+# 목록은 정렬된 ID 목록만 메모리에 두고 행은 페이지 단위로 채운다 (스크롤 끝 근처에서 다음 페이지)
+LIST_PAGE_SIZE = 200
+
+
+def select_customer_ids(db, filter_mode="all", filter_combination=None, customers=None,
+                        sort=None, descending=False):
+    """메인 목록 필터/정렬 → 표시 순서의 고객 ID 목록
+
+    Args:
+        db: DatabaseManager 인스턴스
+        filter_mode: 기본 필터 (FILTER_SEGMENTS 키)
+        filter_combination: {필터: "and"|"not"} 추가 조합 (Ctrl+클릭 / 우클릭)
+        customers: 검색 결과 고객 리스트 (None이면 전체)
+        sort: 정렬 키 (DatabaseManager.SUMMARY_SORT_COLUMNS 키, None이면 필터별 기본 정렬)
+        descending: 헤더 정렬 내림차순 여부
+
+    Returns:
+        (정렬된 고객 ID 리스트, 범위 비트맵)
+    """
+    segments = db.get_segment_index()
+    all_bits = segments.bits("all")
+
+    # 검색 결과면 해당 고객으로 범위 제한
+    scope_bits = all_bits if customers is None else bitmap_from_ids(c.id for c in customers)
+
+    # 필터 조합: 기본 모드 AND (Ctrl+클릭 필터) AND NOT (우클릭 필터)
+    terms = [FILTER_SEGMENTS.get(filter_mode, "all")]
+    for mode, op in (filter_combination or {}).items():
+        expr = FILTER_SEGMENTS.get(mode, "all")
+        terms.append(expr if op == "and" else ("not", expr))
+    selected_bits = segments.bits(("and", *terms)) & scope_bits
+
+    # 정렬은 SQL (정렬 인덱스 순서의 전체 ID) → 선택 범위만 남김
+    if sort is None and filter_mode == "overdue":
+        # 연체 필터에서는 연체일수 큰 고객(가장 오래된 연체 납부일)을 먼저 배치
+        sort = "overdue"
+    ordered_ids = db.get_sorted_customer_ids(sort or "name", descending)
+    if selected_bits != all_bits:
+        selected = set(ids_from_bitmap(selected_bits))
+        ordered_ids = [customer_id for customer_id in ordered_ids if customer_id in selected]
+    if sort is not None:
+        return ordered_ids, scope_bits
+
+    if filter_mode == "age_change":
+        # 상령일 필터에서는 상령일이 가까운 고객을 먼저 배치 (이름순 유지 안정 정렬)
+        days_left = {
+            item["customer"].id: item["days_left"] for item in db.get_upcoming_age_changes(days_ahead=30)
+        }
+        ordered_ids.sort(key=lambda customer_id: days_left.get(customer_id, 0))
+        return ordered_ids, scope_bits
+
+    # 생일자 우선 (그 외는 이름순 유지)
+    birthday_bits = segments.bits("birthday_today") & selected_bits
+    if birthday_bits:
+        birthday = set(ids_from_bitmap(birthday_bits))
+        ordered_ids = (
+            [customer_id for customer_id in ordered_ids if customer_id in birthday]
+            + [customer_id for customer_id in ordered_ids if customer_id not in birthday]
+        )
+    return ordered_ids, scope_bits
+
+
+def fetch_summary_page(db, ordered_ids, start, size=LIST_PAGE_SIZE):
+    """정렬된 ID 목록의 한 페이지 요약 (표시 순서 유지)
+
+    Args:
+        db: DatabaseManager 인스턴스
+        ordered_ids: select_customer_ids() 결과
+        start: 시작 위치
+        size: 페이지 크기
+
+    Returns:
+        요약 dict 리스트 (get_customer_summaries() 형식)
+    """
+    page_ids = ordered_ids[start:start + size]
+    if not page_ids:
+        return []
+    return db.get_customer_summaries(page_ids, keep_order=True)
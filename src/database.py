@@ -3,13 +3,36 @@
 데이터베이스 계층 - SQLite CRUD 작업
 """
 
+import copy
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Optional, Dict
-from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from datetime import date, datetime, timedelta
 
+import events
 from models import Customer, Policy
+from utils import query_profiler
+from utils.date_helpers import (
+    birthday_mmdds,
+    derive_birth_fields,
+    next_birthday,
+    next_insurance_age_change,
+)
+
+
+class ChangeLogExpiredError(Exception):
+    """요청한 시점 이후 변경 로그 일부(톰스톤)가 압축으로 삭제됨 → 전체 내보내기/백업 필요"""
+
+
+class ConflictError(Exception):
+    """수정하려는 행을 그사이 다른 창/설계사가 먼저 수정함 (행 버전 불일치) → 다시 불러와 수정 필요"""
+
+
+class RecordDeletedError(ConflictError):
+    """수정하려는 행을 그사이 다른 창/설계사가 삭제함 → 수정 내용을 저장할 수 없음"""
 
 
 class DatabaseManager:
@@ -23,7 +46,7 @@ class DatabaseManager:
         "occupation, driving_type, commercial_detail, payment_method, "
         "med_medication, med_hospitalized, med_hospital_detail, "
         "med_recent_exam, med_recent_exam_detail, med_5yr_diagnosis, med_5yr_custom, "
-        "notification_content, created_at, updated_at"
+        "notification_content, created_at, updated_at, version"
     )
 
     POLICY_COLUMNS = (
@@ -32,24 +55,146 @@ class DatabaseManager:
         "card_issuer, card_number, card_expiry, "
         "contract_start_date, contract_end_date, "
         "status, next_payment_date, last_payment_date, "
-        "memo, created_at, updated_at"
+        "memo, created_at, updated_at, version"
+    )
+
+    # update_customer / update_policy가 쓰는 컬럼 (모델 필드 이름 = 컬럼 이름)
+    # 편집 시작 시점 스냅샷(original, 없으면 DB의 현재 행)과 비교해 값이 바뀐 컬럼만 UPDATE 한다.
+    CUSTOMER_UPDATE_FIELDS = (
+        "name", "phone", "resident_id", "birth_date", "address", "email", "memo", "occupation",
+        "driving_type", "commercial_detail", "payment_method",
+        "med_medication", "med_hospitalized", "med_hospital_detail",
+        "med_recent_exam", "med_recent_exam_detail", "med_5yr_diagnosis", "med_5yr_custom",
+        "notification_content",
+    )
+    POLICY_UPDATE_FIELDS = (
+        "customer_id", "insurer", "product_name", "premium",
+        "payment_method", "billing_cycle", "billing_day",
+        "card_issuer", "card_number", "card_expiry",
+        "contract_start_date", "contract_end_date",
+        "status", "next_payment_date", "last_payment_date", "memo",
+    )
+    # 바뀌면 파생 컬럼(birth_date/birth_mmdd/insurance_age_change_date)을 다시 계산하는 필드
+    CUSTOMER_BIRTH_FIELDS = ("resident_id", "birth_date")
+    # 바뀌면 정규화 테이블(customer_conditions/customer_vehicle_types)을 다시 쓰는 필드
+    CUSTOMER_ATTRIBUTE_FIELDS = ("med_medication", "med_5yr_diagnosis", "commercial_detail")
+
+    # 고객 목록 읽기 모델 (customer_summary) 컬럼
+    # 계약 파생 값은 트리거가 customer_summary_source 뷰로 재계산해 유지한다.
+    SUMMARY_COLUMNS = (
+        "customer_id, name, phone, resident_id, driving_type, payment_method, "
+        "birth_mmdd, is_patient, policy_count, monthly_premium_total, "
+        "next_payment_date, oldest_overdue_date, has_card"
+    )
+    # idx_summary_list 컬럼 순서 (정렬 키 name, customer_id 먼저)
+    SUMMARY_COLUMNS_BY_NAME = (
+        "name, customer_id, phone, resident_id, driving_type, payment_method, "
+        "birth_mmdd, is_patient, policy_count, monthly_premium_total, "
+        "next_payment_date, oldest_overdue_date, has_card"
+    )
+    # 전체 재계산 SQL: customer_summary_source 뷰와 같은 값을 계약 한 번 훑기(GROUP BY)로 계산
+    # (뷰는 고객마다 하위 조회 5번 → 트리거의 한 고객 갱신용, 전체 재계산은 이쪽이 빠름)
+    SUMMARY_REBUILD_SQL = (
+        f"INSERT INTO customer_summary ({SUMMARY_COLUMNS}) "
+        """
+        SELECT
+            c.id, c.name, c.phone, c.resident_id, c.driving_type, c.payment_method, c.birth_mmdd,
+            (COALESCE(c.med_medication, '') != ''
+             OR COALESCE(c.med_recent_exam, 0) != 0
+             OR COALESCE(c.med_5yr_diagnosis, '') != ''
+             OR COALESCE(c.med_5yr_custom, '') != ''),
+            COALESCE(p.policy_count, 0), COALESCE(p.monthly_premium_total, 0),
+            p.next_payment_date, p.oldest_overdue_date, COALESCE(p.has_card, 0)
+        FROM customers c
+        LEFT JOIN (
+            SELECT
+                customer_id,
+                SUM(status != 'terminated') AS policy_count,
+                SUM(CASE WHEN status = 'terminated' THEN 0
+                         WHEN billing_cycle = 'yearly' THEN premium / 12
+                         ELSE premium END) AS monthly_premium_total,
+                MIN(CASE WHEN status = 'active' AND payment_method = 'card'
+                         THEN next_payment_date END) AS next_payment_date,
+                MIN(CASE WHEN status = 'overdue' AND payment_method = 'card'
+                         THEN next_payment_date END) AS oldest_overdue_date,
+                MAX(status != 'terminated' AND payment_method = 'card') AS has_card
+            FROM policies
+            GROUP BY customer_id
+        ) p ON p.customer_id = c.id
+        """
+    )
+
+    SMS_OUTBOX_COLUMNS = (
+        "id, idempotency_key, customer_id, phone, message, template, status, "
+        "attempts, next_attempt_at, last_error, created_at, updated_at, sent_at"
+    )
+
+    # 계약 인덱스 (조회 패턴 기준, 테이블 재생성 마이그레이션에서도 재사용)
+    # - 납부 조회는 모두 카드결제 + status + next_payment_date → 카드 계약만 담은 부분 인덱스
+    # - 고객별 계약은 created_at DESC 정렬 → (customer_id, created_at DESC)로 정렬 없이 읽음
+    POLICY_INDEX_SQL = (
+        "CREATE INDEX IF NOT EXISTS idx_policy_customer_created ON policies(customer_id, created_at DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_policy_card_due ON policies(status, next_payment_date) "
+        "WHERE payment_method = 'card'",
     )
 
-    def __init__(self, db_path: str = "data/crm.db"):
+    # 위 인덱스로 대체되어 마이그레이션 시 삭제하는 인덱스
+    SUPERSEDED_INDEXES = (
+        "idx_policy_customer",      # → idx_policy_customer_created (customer_id 접두어)
+        "idx_policy_next_payment",  # → idx_policy_card_due (납부일 조회는 카드결제만)
+        "idx_policy_status",        # → idx_policy_card_due (status 단독은 선택도 낮음)
+        "idx_summary_name",         # → idx_summary_list (같은 접두어 + 목록 컬럼 포함)
+        "idx_summary_next_payment",  # → idx_summary_sort_next_payment (정렬 보조 키 name 포함)
+        "idx_summary_overdue",       # → idx_summary_sort_overdue (정렬 보조 키 name 포함)
+    )
+
+    # 목록 정렬 키 → customer_summary 컬럼 (get_sorted_customer_ids)
+    # 같은 값은 name, customer_id 순. 컬럼마다 (컬럼, name) 인덱스가 있어 정렬 없이 인덱스 순서로 읽는다.
+    SUMMARY_SORT_COLUMNS = {
+        "name": "name",
+        "phone": "phone",
+        "payment_method": "payment_method",
+        "next_payment": "next_payment_date",   # 가장 이른 카드 납부일
+        "overdue": "oldest_overdue_date",      # 가장 오래된 연체 납부일 (오름차순 = 연체일수 큰 고객 먼저)
+    }
+    # NOT NULL 컬럼 (그 외 정렬 키는 값 없는 고객을 방향과 무관하게 맨 뒤에 둔다)
+    SUMMARY_SORT_NOT_NULL = ("name", "phone")
+
+    # 변경 로그(change_log)를 남기는 테이블 (트리거로 INSERT/UPDATE/DELETE 기록)
+    CHANGE_LOG_TABLES = ("customers", "policies")
+    # 변경 로그 증분 소비자 (마지막 처리 위치를 change_log_state에 "mark:<이름>"으로 저장)
+    CHANGE_LOG_CONSUMERS = ("csv_export", "backup")
+
+    # 읽기 캐시 (Customer/Policy LRU)
+    CACHE_SIZE = 2048
+    DATA_VERSION_CHECK_INTERVAL = 1.0  # 다른 프로세스 변경 감지 주기 (초)
+
+    def __init__(self, db_path: str = "data/crm.db", profiler=None):
         """DatabaseManager 초기화
 
         Args:
             db_path: 데이터베이스 파일 경로
+            profiler: 쿼리 계측기 (utils.query_profiler.QueryProfiler,
+                      기본: CRM_QUERY_PROFILE 환경 변수가 켜진 경우만 공용 계측기)
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.connection = None
+        self.profiler = profiler or query_profiler.get_profiler()
+        self._segment_index = None  # get_segment_index() 최초 호출 시 빌드
+        self._cache = OrderedDict()  # ("customer", id) / ("policy", id) / ("policies_of", customer_id)
+        self._cache_lock = threading.Lock()
+        self._cache_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+        self._cache_generation = 0  # 무효화마다 증가 (백그라운드 프리페치 결과 검증용)
+        self._data_version = None
+        self._data_version_checked_at = 0.0
+        self.events = events.EventBus()  # 커밋 후 변경 이벤트 발행 (화면 부분 갱신용)
         self._connect()
         self._create_tables()
 
     def _connect(self) -> None:
         """데이터베이스 연결 및 UTF-8 인코딩 설정 (AP-004 대응)"""
-        self.connection = sqlite3.connect(str(self.db_path))
+        self.connection = query_profiler.connect(str(self.db_path), self.profiler)
         self.connection.execute("PRAGMA encoding = 'UTF-8'")
         self.connection.execute("PRAGMA foreign_keys = ON")
         self.connection.row_factory = sqlite3.Row
@@ -79,7 +224,10 @@ class DatabaseManager:
             med_5yr_custom TEXT,
             notification_content TEXT,
             created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL
+            updated_at TEXT NOT NULL,
+            birth_mmdd TEXT,
+            insurance_age_change_date TEXT,
+            version INTEGER NOT NULL DEFAULT 1  -- 행 버전 (수정마다 +1)
         );
         """
 
@@ -115,6 +263,7 @@ class DatabaseManager:
             memo TEXT,
             created_at TEXT NOT NULL,
             updated_at TEXT NOT NULL,
+            version INTEGER NOT NULL DEFAULT 1,  -- 행 버전 (수정마다 +1)
 
             FOREIGN KEY (customer_id) REFERENCES customers(id) ON DELETE CASCADE
         );
@@ -125,14 +274,65 @@ class DatabaseManager:
             "CREATE INDEX IF NOT EXISTS idx_customer_name ON customers(name);",
             "CREATE INDEX IF NOT EXISTS idx_customer_phone ON customers(phone);",
             # Policy 인덱스
-            "CREATE INDEX IF NOT EXISTS idx_policy_customer ON policies(customer_id);",
-            "CREATE INDEX IF NOT EXISTS idx_policy_next_payment ON policies(next_payment_date);",
-            "CREATE INDEX IF NOT EXISTS idx_policy_status ON policies(status);",
+            *self.POLICY_INDEX_SQL,
+            # 정규화 테이블 인덱스 (질환명/차종 → 고객)
+            "CREATE INDEX IF NOT EXISTS idx_condition_name ON customer_conditions(name, kind, customer_id);",
+            "CREATE INDEX IF NOT EXISTS idx_vehicle_type ON customer_vehicle_types(vehicle_type, customer_id);",
+            # SMS 대기열 인덱스 (발송 대상 조회)
+            "CREATE INDEX IF NOT EXISTS idx_sms_outbox_due ON sms_outbox(status, next_attempt_at);",
         ]
 
+        # 콤마 구분 필드 정규화 테이블 (med_medication, med_5yr_diagnosis, commercial_detail 미러)
+        create_conditions_table_sql = """
+        CREATE TABLE IF NOT EXISTS customer_conditions (
+            customer_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,            -- "medication" / "diagnosis"
+            name TEXT NOT NULL,            -- 예: "고혈압", "당뇨병"
+            PRIMARY KEY (customer_id, kind, name),
+            FOREIGN KEY (customer_id) REFERENCES customers(id) ON DELETE CASCADE
+        ) WITHOUT ROWID;
+        """
+
+        create_vehicle_types_table_sql = """
+        CREATE TABLE IF NOT EXISTS customer_vehicle_types (
+            customer_id INTEGER NOT NULL,
+            vehicle_type TEXT NOT NULL,    -- "taxi" / "construction"
+            PRIMARY KEY (customer_id, vehicle_type),
+            FOREIGN KEY (customer_id) REFERENCES customers(id) ON DELETE CASCADE
+        ) WITHOUT ROWID;
+        """
+
+        # SMS 발송 대기열 (백그라운드 발송기 utils/sms_outbox.py가 처리)
+        create_sms_outbox_table_sql = """
+        CREATE TABLE IF NOT EXISTS sms_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            idempotency_key TEXT NOT NULL UNIQUE,  -- 같은 키는 한 번만 대기열에 등록
+            customer_id INTEGER,
+            phone TEXT NOT NULL,
+            message TEXT NOT NULL,
+            template TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',  -- "pending" / "sending" / "sent" / "failed"
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at TEXT NOT NULL,
+            last_error TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            sent_at TEXT,
+            FOREIGN KEY (customer_id) REFERENCES customers(id) ON DELETE SET NULL
+        );
+        """
+
         cursor = self.connection.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        existing_tables = {row[0] for row in cursor.fetchall()}
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        existing_indexes = {row[0] for row in cursor.fetchall()}
+
         cursor.execute(create_customers_table_sql)
         cursor.execute(create_policies_table_sql)
+        cursor.execute(create_conditions_table_sql)
+        cursor.execute(create_vehicle_types_table_sql)
+        cursor.execute(create_sms_outbox_table_sql)
 
         for index_sql in create_indexes_sql:
             cursor.execute(index_sql)
@@ -140,8 +340,172 @@ class DatabaseManager:
         # 기존 테이블 마이그레이션 (새 컬럼 추가)
         self._migrate_existing_tables(cursor)
 
+        # 정규화 테이블이 새로 생긴 경우 기존 고객 데이터로 채움
+        if "customer_conditions" not in existing_tables or "customer_vehicle_types" not in existing_tables:
+            self._rebuild_customer_attributes(cursor)
+
+        # 고객 목록 읽기 모델 (마이그레이션 이후 생성: birth_mmdd 등 파생 컬럼 필요)
+        self._create_summary_objects(cursor)
+        if "customer_summary" not in existing_tables:
+            self._rebuild_customer_summary(cursor)
+
+        # 변경 로그 (마이그레이션 이후 생성: policies 재생성 마이그레이션이 트리거를 지우므로)
+        self._create_change_log_objects(cursor)
+
+        # 인덱스 교체 (기존 DB만 통계 갱신)
+        if "customers" in existing_tables:
+            self._migrate_indexes(cursor, existing_indexes)
+
         self.connection.commit()
 
+    def _create_summary_objects(self, cursor) -> None:
+        """customer_summary 테이블 + 재계산 뷰 + 유지 트리거 생성 (있으면 무시)"""
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS customer_summary (
+                customer_id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                phone TEXT NOT NULL,
+                resident_id TEXT,
+                driving_type TEXT,
+                payment_method TEXT,
+                birth_mmdd TEXT,
+                is_patient INTEGER NOT NULL DEFAULT 0,
+                policy_count INTEGER NOT NULL DEFAULT 0,       -- 해지 제외
+                monthly_premium_total INTEGER NOT NULL DEFAULT 0,  -- 연납은 /12 환산
+                next_payment_date TEXT,                        -- 정상 카드 계약 중 가장 이른 납부일
+                oldest_overdue_date TEXT,                      -- 연체 카드 계약 중 가장 오래된 납부일
+                has_card INTEGER NOT NULL DEFAULT 0            -- 카드 납부 계약 보유
+            )
+            """
+        )
+        # 목록 화면 커버링 인덱스: 이름순 전체/페이지 조회를 테이블 조회 없이 인덱스만으로 처리
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_summary_list ON customer_summary({self.SUMMARY_COLUMNS_BY_NAME})"
+        )
+        # 목록 정렬 인덱스 (SUMMARY_SORT_COLUMNS): customer_id는 rowid라 모든 인덱스에 포함됨
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_summary_sort_phone ON customer_summary(phone)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_summary_sort_payment_method ON customer_summary(payment_method, name)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_summary_sort_next_payment ON customer_summary(next_payment_date, name)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_summary_sort_overdue ON customer_summary(oldest_overdue_date, name)"
+        )
+
+        # 요약 재계산 뷰 (트리거/재빌드/정합성 검증 공용)
+        # 고객별 하위 조회는 customer_id 인덱스를 타야 한다. status 조건 앞의 단항 +는
+        # 통계가 없을 때 플래너가 카드 부분 인덱스(status)를 고르는 것을 막는다 (고객마다 전체 훑기 방지).
+        view_sql = """CREATE VIEW customer_summary_source AS
+            SELECT
+                c.id AS customer_id, c.name, c.phone, c.resident_id, c.driving_type, c.payment_method,
+                c.birth_mmdd,
+                (COALESCE(c.med_medication, '') != ''
+                 OR COALESCE(c.med_recent_exam, 0) != 0
+                 OR COALESCE(c.med_5yr_diagnosis, '') != ''
+                 OR COALESCE(c.med_5yr_custom, '') != '') AS is_patient,
+                (SELECT COUNT(*) FROM policies p
+                 WHERE p.customer_id = c.id AND p.status != 'terminated') AS policy_count,
+                (SELECT COALESCE(SUM(CASE WHEN p.billing_cycle = 'yearly'
+                                          THEN p.premium / 12 ELSE p.premium END), 0)
+                 FROM policies p
+                 WHERE p.customer_id = c.id AND p.status != 'terminated') AS monthly_premium_total,
+                (SELECT MIN(p.next_payment_date) FROM policies p
+                 WHERE p.customer_id = c.id AND +p.status = 'active'
+                   AND p.payment_method = 'card') AS next_payment_date,
+                (SELECT MIN(p.next_payment_date) FROM policies p
+                 WHERE p.customer_id = c.id AND +p.status = 'overdue'
+                   AND p.payment_method = 'card') AS oldest_overdue_date,
+                EXISTS (SELECT 1 FROM policies p
+                        WHERE p.customer_id = c.id AND p.status != 'terminated'
+                          AND p.payment_method = 'card') AS has_card
+            FROM customers c"""
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'view' AND name = 'customer_summary_source'")
+        row = cursor.fetchone()
+        if row is None or row[0] != view_sql:
+            cursor.execute("DROP VIEW IF EXISTS customer_summary_source")  # 정의가 바뀐 기존 DB
+            cursor.execute(view_sql)
+
+        refresh_sql = (
+            f"INSERT OR REPLACE INTO customer_summary ({self.SUMMARY_COLUMNS}) "
+            f"SELECT {self.SUMMARY_COLUMNS} FROM customer_summary_source WHERE customer_id = {{target}};"
+        )
+        triggers = {
+            "trg_summary_customer_insert": (
+                "AFTER INSERT ON customers", refresh_sql.format(target="NEW.id")
+            ),
+            "trg_summary_customer_update": (
+                "AFTER UPDATE ON customers", refresh_sql.format(target="NEW.id")
+            ),
+            "trg_summary_customer_delete": (
+                "AFTER DELETE ON customers", "DELETE FROM customer_summary WHERE customer_id = OLD.id;"
+            ),
+            "trg_summary_policy_insert": (
+                "AFTER INSERT ON policies", refresh_sql.format(target="NEW.customer_id")
+            ),
+            "trg_summary_policy_update": (
+                "AFTER UPDATE ON policies",
+                refresh_sql.format(target="OLD.customer_id") + refresh_sql.format(target="NEW.customer_id"),
+            ),
+            "trg_summary_policy_delete": (
+                "AFTER DELETE ON policies", refresh_sql.format(target="OLD.customer_id")
+            ),
+        }
+        for trigger_name, (event, body) in triggers.items():
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {trigger_name} {event} BEGIN {body} END")
+
+    def _create_change_log_objects(self, cursor) -> None:
+        """change_log 테이블 + 기록 트리거 생성 (있으면 무시)
+
+        기존 DB는 빈 로그로 시작한다 (소비자는 전체 내보내기 후 get_change_seq()부터 증분).
+        """
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS change_log (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,  -- 단조 증가 (삭제/압축 후에도 재사용 안 함)
+                table_name TEXT NOT NULL,
+                row_id INTEGER NOT NULL,
+                op TEXT NOT NULL,                       -- "insert" / "update" / "delete" (삭제 = 톰스톤)
+                version INTEGER NOT NULL,               -- 변경 후 행 버전 (customers/policies.version, 삭제는 마지막 버전)
+                changed_at TEXT NOT NULL
+            )
+            """
+        )
+        # 행별 최신 항목 (압축)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_change_log_row ON change_log(table_name, row_id, seq)")
+        # 압축 상태: purged_through 이하 톰스톤은 삭제됨 → 그보다 이전 위치에서는 증분 불가
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS change_log_state (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+
+        existing_triggers = dict(cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_change_%'"
+        ).fetchall())
+        for table in self.CHANGE_LOG_TABLES:
+            for op, event, ref in (("insert", "INSERT", "NEW"), ("update", "UPDATE", "NEW"), ("delete", "DELETE", "OLD")):
+                name = f"trg_change_{table}_{op}"
+                if name in existing_triggers and f"{ref}.version" not in existing_triggers[name]:
+                    # 예전 트리거 (로그 안에서 따로 센 번호) → 행 version 기록으로 교체
+                    cursor.execute(f"DROP TRIGGER {name}")
+                cursor.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {table} BEGIN
+                        INSERT INTO change_log (table_name, row_id, op, version, changed_at)
+                        VALUES (
+                            '{table}', {ref}.id, '{op}', {ref}.version,
+                            strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')
+                        );
+                    END
+                    """
+                )
+
+    def _rebuild_customer_summary(self, cursor) -> None:
+        """customer_summary 전체 재계산 (최초 생성 / 복구용)"""
+        cursor.execute("DELETE FROM customer_summary")
+        cursor.execute(self.SUMMARY_REBUILD_SQL)
+
     def _migrate_existing_tables(self, cursor) -> None:
         """기존 테이블에 새 컬럼 추가 (있으면 무시)"""
         # 현재 테이블 컬럼 목록 조회
@@ -163,6 +527,9 @@ class DatabaseManager:
             ("med_5yr_diagnosis", "TEXT"),
             ("med_5yr_custom", "TEXT"),
             ("notification_content", "TEXT"),
+            ("birth_mmdd", "TEXT"),  # 주민번호에서 파생 (생일 인덱스 조회용)
+            ("insurance_age_change_date", "TEXT"),  # 다음 상령일 (생일 + 6개월)
+            ("version", "INTEGER NOT NULL DEFAULT 1"),  # 행 버전 (기존 행은 1부터)
         ]
 
         # 누락된 컬럼 추가
@@ -171,9 +538,154 @@ class DatabaseManager:
                 alter_sql = f"ALTER TABLE customers ADD COLUMN {col_name} {col_type}"
                 cursor.execute(alter_sql)
 
+        # 파생 컬럼 인덱스 (컬럼 추가 이후 생성)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_customer_birth_mmdd ON customers(birth_mmdd)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_customer_age_change ON customers(insurance_age_change_date)"
+        )
+
+        # 기존 고객의 생일/상령일 파생 컬럼 채우기
+        self._backfill_birth_fields(cursor)
+        self._backfill_age_change_dates(cursor)
+
         # card_last4 → card_number 마이그레이션
         self._migrate_card_field(cursor)
 
+        # 계약 행 버전 (테이블 재생성 마이그레이션 이후 추가)
+        cursor.execute("PRAGMA table_info(policies)")
+        if "version" not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE policies ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+
+    def _migrate_indexes(self, cursor, existing_indexes: Set[str]) -> None:
+        """대체된 인덱스 삭제 + 새 인덱스가 생겼으면 ANALYZE (플래너 통계 갱신)
+
+        Args:
+            cursor: 커서
+            existing_indexes: 이번 실행 전에 있던 인덱스 이름
+        """
+        dropped = False
+        for index_name in self.SUPERSEDED_INDEXES:
+            if index_name in existing_indexes:
+                cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+                dropped = True
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL")
+        created = {row[0] for row in cursor.fetchall()} - existing_indexes
+        if created or dropped:
+            cursor.execute("ANALYZE")
+
+    def _backfill_birth_fields(self, cursor) -> None:
+        """birth_mmdd가 비어 있는 기존 고객의 생년월일/생일 컬럼 계산"""
+        cursor.execute(
+            """
+            SELECT id, resident_id, birth_date FROM customers
+            WHERE birth_mmdd IS NULL
+              AND (COALESCE(resident_id, '') != '' OR COALESCE(birth_date, '') != '')
+            """
+        )
+        updates = []
+        for customer_id, resident_id, birth_date in cursor.fetchall():
+            derived_date, birth_mmdd = derive_birth_fields(resident_id, birth_date)
+            if birth_mmdd:
+                updates.append((derived_date, birth_mmdd, customer_id))
+
+        if updates:
+            cursor.executemany(
+                "UPDATE customers SET birth_date = ?, birth_mmdd = ?, version = version + 1 WHERE id = ?",
+                updates,
+            )
+
+    def _backfill_age_change_dates(self, cursor) -> None:
+        """상령일이 비어 있는 기존 고객의 insurance_age_change_date 계산"""
+        cursor.execute(
+            """
+            SELECT id, birth_date FROM customers
+            WHERE insurance_age_change_date IS NULL AND birth_mmdd IS NOT NULL
+            """
+        )
+        updates = [
+            (self._calculate_age_change_date(birth_date), customer_id)
+            for customer_id, birth_date in cursor.fetchall()
+        ]
+
+        if updates:
+            cursor.executemany(
+                "UPDATE customers SET insurance_age_change_date = ?, version = version + 1 WHERE id = ?",
+                updates,
+            )
+
+    @staticmethod
+    def _calculate_age_change_date(birth_date: Optional[str], base_date=None) -> Optional[str]:
+        """생년월일(YYYY-MM-DD) → 기준일 이후 다음 상령일 (YYYY-MM-DD)"""
+        if not birth_date:
+            return None
+        try:
+            birth = datetime.strptime(birth_date, "%Y-%m-%d").date()
+        except ValueError:
+            return None
+        base = base_date or datetime.now().date()
+        return next_insurance_age_change(birth, base).strftime("%Y-%m-%d")
+
+    @staticmethod
+    def _split_values(value: Optional[str]) -> List[str]:
+        """콤마 구분 문자열 → 공백 제거된 값 리스트 (중복/빈 값 제외)"""
+        if not value:
+            return []
+        values = []
+        for item in value.split(","):
+            item = item.strip()
+            if item and item not in values:
+                values.append(item)
+        return values
+
+    def _sync_customer_attributes(self, cursor, customer_id: int, customer: Customer) -> None:
+        """고객의 질환/차종 정규화 테이블 동기화 (커밋은 호출자가 수행)"""
+        cursor.execute("DELETE FROM customer_conditions WHERE customer_id = ?", (customer_id,))
+        cursor.execute("DELETE FROM customer_vehicle_types WHERE customer_id = ?", (customer_id,))
+
+        conditions = [
+            (customer_id, "medication", name) for name in self._split_values(customer.med_medication)
+        ] + [
+            (customer_id, "diagnosis", name) for name in self._split_values(customer.med_5yr_diagnosis)
+        ]
+        if conditions:
+            cursor.executemany(
+                "INSERT INTO customer_conditions (customer_id, kind, name) VALUES (?, ?, ?)",
+                conditions,
+            )
+
+        vehicle_types = [
+            (customer_id, vehicle_type) for vehicle_type in self._split_values(customer.commercial_detail)
+        ]
+        if vehicle_types:
+            cursor.executemany(
+                "INSERT INTO customer_vehicle_types (customer_id, vehicle_type) VALUES (?, ?)",
+                vehicle_types,
+            )
+
+    def _rebuild_customer_attributes(self, cursor) -> None:
+        """전체 고객의 질환/차종 정규화 테이블 재구성 (마이그레이션용)"""
+        cursor.execute(
+            """
+            SELECT id, med_medication, med_5yr_diagnosis, commercial_detail FROM customers
+            WHERE COALESCE(med_medication, '') != ''
+               OR COALESCE(med_5yr_diagnosis, '') != ''
+               OR COALESCE(commercial_detail, '') != ''
+            """
+        )
+        for customer_id, medication, diagnosis, commercial_detail in cursor.fetchall():
+            self._sync_customer_attributes(
+                cursor,
+                customer_id,
+                Customer(
+                    name="",
+                    phone="",
+                    med_medication=medication,
+                    med_5yr_diagnosis=diagnosis,
+                    commercial_detail=commercial_detail,
+                ),
+            )
+
     def add_customer(self, customer: Customer) -> int:
         """새 고객 추가
 
@@ -187,6 +699,8 @@ class DatabaseManager:
             sqlite3.IntegrityError: 전화번호 중복 시
         """
         timestamp = Customer.get_current_timestamp()
+        birth_date, birth_mmdd = derive_birth_fields(customer.resident_id, customer.birth_date)
+        age_change_date = self._calculate_age_change_date(birth_date) if birth_mmdd else None
 
         cursor = self.connection.cursor()
         cursor.execute(
@@ -196,15 +710,15 @@ class DatabaseManager:
                 driving_type, commercial_detail, payment_method,
                 med_medication, med_hospitalized, med_hospital_detail,
                 med_recent_exam, med_recent_exam_detail, med_5yr_diagnosis, med_5yr_custom,
-                notification_content, created_at, updated_at
+                notification_content, created_at, updated_at, birth_mmdd, insurance_age_change_date
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 customer.name,
                 customer.phone,
                 customer.resident_id,
-                customer.birth_date,
+                birth_date,
                 customer.address,
                 customer.email,
                 customer.memo,
@@ -222,10 +736,15 @@ class DatabaseManager:
                 customer.notification_content,
                 timestamp,
                 timestamp,
+                birth_mmdd,
+                age_change_date,
             ),
         )
+        customer_id = cursor.lastrowid
+        self._sync_customer_attributes(cursor, customer_id, customer)
         self.connection.commit()
-        return cursor.lastrowid
+        self._on_write([customer_id], [events.customer_event(events.INSERT, customer_id)])
+        return customer_id
 
     def get_customer(self, customer_id: int) -> Optional[Customer]:
         """ID로 고객 조회
@@ -236,12 +755,18 @@ class DatabaseManager:
         Returns:
             Customer 객체 또는 None (없는 경우)
         """
+        cached = self._cache_get(("customer", customer_id))
+        if cached is not None:
+            return copy.copy(cached)
+
         cursor = self.connection.cursor()
         cursor.execute(f"SELECT {self.CUSTOMER_COLUMNS} FROM customers WHERE id = ?", (customer_id,))
         row = cursor.fetchone()
 
         if row:
-            return Customer.from_db_row(tuple(row))
+            customer = Customer.from_db_row(tuple(row))
+            self._cache_put(("customer", customer_id), customer)
+            return copy.copy(customer)
         return None
 
     def get_all_customers(self) -> List[Customer]:
@@ -256,6 +781,32 @@ class DatabaseManager:
 
         return [Customer.from_db_row(tuple(row)) for row in rows]
 
+    def get_customers_by_ids(self, customer_ids: List[int]) -> List[Customer]:
+        """여러 고객을 IN 쿼리로 한 번에 조회 (캐시 미경유)
+
+        Args:
+            customer_ids: 고객 ID 목록
+
+        Returns:
+            Customer 객체 리스트 (없는 ID는 제외)
+        """
+        return self.fetch_customers_by_ids(self.connection, customer_ids)
+
+    @classmethod
+    def fetch_customers_by_ids(cls, connection, customer_ids: List[int]) -> List[Customer]:
+        """지정한 연결로 고객 IN 조회 (백그라운드 연결 공용)"""
+        customers = []
+        ids = list(customer_ids)
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = connection.execute(
+                f"SELECT {cls.CUSTOMER_COLUMNS} FROM customers WHERE id IN ({placeholders})",
+                chunk,
+            ).fetchall()
+            customers.extend(Customer.from_db_row(tuple(row)) for row in rows)
+        return customers
+
     def search_customers(self, keyword: str) -> List[Customer]:
         """이름 또는 전화번호로 고객 검색
 
@@ -280,57 +831,174 @@ class DatabaseManager:
 
         return [Customer.from_db_row(tuple(row)) for row in rows]
 
-    def update_customer(self, customer: Customer) -> bool:
-        """고객 정보 수정
+    def page_customers(
+        self,
+        after_name: Optional[str] = None,
+        after_id: Optional[int] = None,
+        limit: int = 100,
+        keyword: Optional[str] = None,
+    ) -> List[Customer]:
+        """이름순 고객 한 페이지 (키셋 페이지네이션)
+
+        OFFSET 대신 직전 페이지 마지막 행의 (name, id) 다음부터 (name, id) 인덱스로 바로 읽으므로
+        몇 번째 페이지든 비용이 페이지 크기에 비례한다.
 
         Args:
-            customer: 수정할 고객 정보 (id 필수)
+            after_name: 직전 페이지 마지막 고객 이름 (None이면 처음부터)
+            after_id: 직전 페이지 마지막 고객 ID (after_name과 함께 지정)
+            limit: 페이지 크기
+            keyword: 이름/전화번호 부분 일치 검색어 (search_customers와 같은 조건)
 
         Returns:
-            성공 여부
+            Customer 객체 리스트 (limit개보다 적으면 마지막 페이지)
+        """
+        if (after_name is None) != (after_id is None):
+            raise ValueError("after_name과 after_id는 함께 지정해야 합니다")
+
+        conditions, params = [], []
+        if after_name is not None:
+            conditions.append("(name, id) > (?, ?)")
+            params.extend((after_name, after_id))
+        if keyword:
+            search_pattern = f"%{keyword}%"
+            conditions.append("(name LIKE ? OR phone LIKE ?)")
+            params.extend((search_pattern, search_pattern))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        rows = self.connection.execute(
+            f"SELECT {self.CUSTOMER_COLUMNS} FROM customers {where} ORDER BY name ASC, id ASC LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        return [Customer.from_db_row(tuple(row)) for row in rows]
+
+    def iter_customers(self, batch_size: int = 500, keyword: Optional[str] = None) -> Iterator[Customer]:
+        """이름순 전체 고객 스트리밍 (batch_size개씩 키셋 페이지로 읽음)
+
+        메모리 사용이 DB 크기와 무관하다 (CSV 내보내기 등 순차 소비자용).
+
+        Args:
+            batch_size: 한 번에 읽을 고객 수
+            keyword: 이름/전화번호 부분 일치 검색어
+
+        Yields:
+            Customer 객체
+        """
+        after_name = after_id = None
+        while True:
+            page = self.page_customers(after_name, after_id, batch_size, keyword)
+            yield from page
+            if len(page) < batch_size:
+                return
+            after_name, after_id = page[-1].name, page[-1].id
+
+    def update_customer(self, customer: Customer, original: Optional[Customer] = None) -> bool:
+        """고객 정보 수정 (바뀐 컬럼만, 행 버전 비교 후 교체)
+
+        original(편집 시작 시점 스냅샷, 없으면 DB의 현재 행)과 값이 다른 컬럼만 UPDATE 한다.
+        바뀐 값이 없으면 쓰기/커밋을 모두 생략한다 (updated_at, version 그대로).
+        customer.version(original이 있으면 original.version)이 DB의 version과 같을 때만 수정하고
+        version을 1 올린다. 그사이 다른 창/설계사가 먼저 수정했으면 ConflictError.
+        version이 없는 객체(직접 만든 Customer)는 비교 없이 수정한다.
+
+        Args:
+            customer: 수정할 고객 정보 (id 필수, 수정 시 version 갱신)
+            original: 편집 시작 시점 스냅샷
+
+        Returns:
+            실제로 수정했는지 (id가 없거나 바뀐 값이 없으면 False → 화면 갱신 생략 가능)
+
+        Raises:
+            ConflictError: 행 버전 불일치 (다른 곳에서 먼저 수정됨)
+            RecordDeletedError: 고객이 그사이 삭제됨
         """
         if customer.id is None:
             return False
+        expected_version = customer.version
+        if original is None:
+            original = self._fetch_current_row(Customer, "customers", self.CUSTOMER_COLUMNS, customer.id)
+            if original is None:
+                raise RecordDeletedError(f"다른 곳에서 삭제되었습니다 (customers #{customer.id})")
+        else:
+            expected_version = original.version
 
-        timestamp = Customer.get_current_timestamp()
+        fields = self._changed_fields(customer, original, self.CUSTOMER_UPDATE_FIELDS)
+        if not fields:
+            return False
+        values = {
+            field: (1 if getattr(customer, field) else 0)
+            if field in ("med_hospitalized", "med_recent_exam") else getattr(customer, field)
+            for field in fields
+        }
+        if any(field in values for field in self.CUSTOMER_BIRTH_FIELDS):
+            birth_date, birth_mmdd = derive_birth_fields(customer.resident_id, customer.birth_date)
+            values["birth_date"] = birth_date
+            values["birth_mmdd"] = birth_mmdd
+            values["insurance_age_change_date"] = (
+                self._calculate_age_change_date(birth_date) if birth_mmdd else None
+            )
+        values["updated_at"] = Customer.get_current_timestamp()
 
         cursor = self.connection.cursor()
-        cursor.execute(
-            """
-            UPDATE customers
-            SET name = ?, phone = ?, resident_id = ?, birth_date = ?, address = ?, email = ?, memo = ?, occupation = ?,
-                driving_type = ?, commercial_detail = ?, payment_method = ?,
-                med_medication = ?, med_hospitalized = ?, med_hospital_detail = ?,
-                med_recent_exam = ?, med_recent_exam_detail = ?, med_5yr_diagnosis = ?, med_5yr_custom = ?,
-                notification_content = ?, updated_at = ?
-            WHERE id = ?
-            """,
-            (
-                customer.name,
-                customer.phone,
-                customer.resident_id,
-                customer.birth_date,
-                customer.address,
-                customer.email,
-                customer.memo,
-                customer.occupation,
-                customer.driving_type,
-                customer.commercial_detail,
-                customer.payment_method,
-                customer.med_medication,
-                1 if customer.med_hospitalized else 0,
-                customer.med_hospital_detail,
-                1 if customer.med_recent_exam else 0,
-                customer.med_recent_exam_detail,
-                customer.med_5yr_diagnosis,
-                customer.med_5yr_custom,
-                customer.notification_content,
-                timestamp,
-                customer.id,
-            ),
-        )
+        version = self._update_versioned_row(cursor, "customers", customer.id, values, expected_version)
+        if any(field in values for field in self.CUSTOMER_ATTRIBUTE_FIELDS):
+            self._sync_customer_attributes(cursor, customer.id, customer)
         self.connection.commit()
-        return cursor.rowcount > 0
+        customer.version = version
+        self._on_write([customer.id])
+        return True
+
+    @staticmethod
+    def _changed_fields(record, original, fields) -> List[str]:
+        """스냅샷과 값이 다른 필드"""
+        return [field for field in fields if getattr(record, field) != getattr(original, field)]
+
+    def _fetch_current_row(self, model, table: str, columns: str, row_id: int):
+        """수정 전 비교용 현재 행 (캐시를 거치지 않음: 다른 프로세스 변경이 아직 캐시에 없을 수 있음)"""
+        row = self.connection.execute(f"SELECT {columns} FROM {table} WHERE id = ?", (row_id,)).fetchone()
+        return model.from_db_row(tuple(row)) if row else None
+
+    def _update_versioned_row(
+        self, cursor, table: str, row_id: int, values: Dict, expected_version: Optional[int]
+    ) -> int:
+        """행 1개 UPDATE + version 1 증가 (expected_version이 있으면 같을 때만: compare-and-swap)
+
+        커밋은 호출자가 수행한다 (충돌 시에는 여기서 롤백).
+
+        Args:
+            cursor: 커서
+            table: "customers" / "policies"
+            row_id: 행 ID
+            values: {컬럼: 값}
+            expected_version: 편집 시작 시점 version (None이면 비교 없이 수정)
+
+        Returns:
+            수정 후 version
+
+        Raises:
+            ConflictError: 행은 있지만 version이 expected_version과 다름
+            RecordDeletedError: 행이 없음 (그사이 삭제됨)
+        """
+        assignments = ", ".join(f"{column} = ?" for column in values)
+        sql = f"UPDATE {table} SET {assignments}, version = version + 1 WHERE id = ?"
+        params = [*values.values(), row_id]
+        if expected_version is not None:
+            sql += " AND version = ?"
+            params.append(expected_version)
+        cursor.execute(sql, params)
+        updated = cursor.rowcount > 0
+        if updated and expected_version is not None:
+            return expected_version + 1
+
+        row = cursor.execute(f"SELECT version FROM {table} WHERE id = ?", (row_id,)).fetchone()
+        if row is not None and updated:
+            return row[0]
+        self.connection.rollback()
+        if row is None:
+            raise RecordDeletedError(f"다른 곳에서 삭제되었습니다 ({table} #{row_id})")
+        raise ConflictError(
+            f"다른 곳에서 먼저 수정되었습니다 ({table} #{row_id}: 편집 시작 버전 {expected_version}, "
+            f"현재 버전 {row[0]})"
+        )
 
     def delete_customer(self, customer_id: int) -> bool:
         """고객 삭제
@@ -344,7 +1012,679 @@ class DatabaseManager:
         cursor = self.connection.cursor()
         cursor.execute("DELETE FROM customers WHERE id = ?", (customer_id,))
         self.connection.commit()
-        return cursor.rowcount > 0
+        deleted = cursor.rowcount > 0
+        if deleted:
+            self._on_write([customer_id], [events.customer_event(events.DELETE, customer_id)])
+        return deleted
+
+    # =============================================================================
+    # 고객 목록 읽기 모델 (customer_summary)
+    # =============================================================================
+
+    def get_customer_summaries(self, customer_ids: Optional[List[int]] = None, keep_order: bool = False) -> List[Dict]:
+        """고객 목록 표시용 요약 조회 (단일 테이블, 이름순)
+
+        Args:
+            customer_ids: 조회할 고객 ID 목록 (None이면 전체)
+            keep_order: True면 이름순 대신 customer_ids 순서 유지 (정렬된 ID 목록의 한 페이지 조회용)
+
+        Returns:
+            [{customer_id, name, phone, ..., has_card, overdue_days, has_payment_today}, ...]
+            overdue_days/has_payment_today는 조회 시점 기준으로 계산 (_summary_dicts)
+        """
+        cursor = self.connection.cursor()
+        if customer_ids is None:
+            cursor.execute(f"SELECT {self.SUMMARY_COLUMNS} FROM customer_summary ORDER BY name ASC, customer_id ASC")
+            rows = cursor.fetchall()
+        else:
+            rows = []
+            ids = list(customer_ids)
+            # SQLite 바인딩 변수 한도 이내로 나눠 조회
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                cursor.execute(
+                    f"SELECT {self.SUMMARY_COLUMNS} FROM customer_summary WHERE customer_id IN ({placeholders})",
+                    chunk,
+                )
+                rows.extend(cursor.fetchall())
+            if keep_order:
+                position = {customer_id: index for index, customer_id in enumerate(ids)}
+                rows.sort(key=lambda row: position[row["customer_id"]])
+            else:
+                rows.sort(key=lambda row: (row["name"], row["customer_id"]))
+
+        return self._summary_dicts(rows)
+
+    def page_customer_summaries(
+        self, after_name: Optional[str] = None, after_id: Optional[int] = None, limit: int = 100
+    ) -> List[Dict]:
+        """고객 목록 요약 한 페이지 (이름순 키셋, idx_summary_list 커버링 인덱스만 읽음)
+
+        Args:
+            after_name: 직전 페이지 마지막 고객 이름 (None이면 처음부터)
+            after_id: 직전 페이지 마지막 고객 ID (after_name과 함께 지정)
+            limit: 페이지 크기
+
+        Returns:
+            get_customer_summaries()와 같은 형식
+        """
+        if (after_name is None) != (after_id is None):
+            raise ValueError("after_name과 after_id는 함께 지정해야 합니다")
+
+        where, params = "", ()
+        if after_name is not None:
+            where, params = "WHERE (name, customer_id) > (?, ?)", (after_name, after_id)
+        rows = self.connection.execute(
+            f"SELECT {self.SUMMARY_COLUMNS} FROM customer_summary {where} "
+            f"ORDER BY name ASC, customer_id ASC LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        return self._summary_dicts(rows)
+
+    def get_sorted_customer_ids(self, sort: str = "name", descending: bool = False) -> List[int]:
+        """전체 고객 ID를 목록 정렬 키 순서로 조회 (정렬은 SQL ORDER BY + 정렬 인덱스)
+
+        화면은 이 ID 목록에서 보이는 구간만 get_customer_summaries(..., keep_order=True)로 채운다.
+
+        Args:
+            sort: 정렬 키 (SUMMARY_SORT_COLUMNS 키)
+            descending: True면 내림차순 (같은 값의 name, customer_id 순서도 반대)
+
+        Returns:
+            고객 ID 리스트 (값 없는 고객은 방향과 무관하게 맨 뒤, 이름순)
+        """
+        if sort not in self.SUMMARY_SORT_COLUMNS:
+            raise ValueError(f"알 수 없는 정렬 키: {sort}")
+        column = self.SUMMARY_SORT_COLUMNS[sort]
+        direction = "DESC" if descending else "ASC"
+        # 정렬 인덱스 키 순서와 같게: (phone)은 rowid만, 나머지는 (컬럼, name) 뒤에 rowid
+        keys = [column] if column in ("name", "phone") else [column, "name"]
+        order_by = "ORDER BY " + ", ".join(f"{key} {direction}" for key in (*keys, "customer_id"))
+
+        # ID만 읽으므로 sqlite3.Row 대신 튜플 (행 객체 생성 비용이 조회 시간의 절반)
+        cursor = self.connection.cursor()
+        cursor.row_factory = None
+        if sort in self.SUMMARY_SORT_NOT_NULL:
+            cursor.execute(f"SELECT customer_id FROM customer_summary {order_by}")
+            return [row[0] for row in cursor.fetchall()]
+
+        # NULL은 인덱스 앞쪽에 모이므로 값 있는 구간/없는 구간을 나눠 각각 인덱스 순서로 읽음
+        cursor.execute(f"SELECT customer_id FROM customer_summary WHERE {column} IS NOT NULL {order_by}")
+        ids = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            f"SELECT customer_id FROM customer_summary WHERE {column} IS NULL ORDER BY name ASC, customer_id ASC"
+        )
+        ids.extend(row[0] for row in cursor.fetchall())
+        return ids
+
+    def _summary_dicts(self, rows) -> List[Dict]:
+        """요약 행 → dict (overdue_days, has_payment_today는 조회 시점 기준 계산)
+
+        overdue_days: oldest_overdue_date부터 오늘까지 일수 (연체 없으면 0)
+        has_payment_today: 정상 카드 계약 중 오늘 납부 예정이 있는지. next_payment_date(가장 이른 납부일)가
+        오늘이면 참, 없거나 오늘 이후면 거짓, 오늘보다 이르면(연체 갱신 전 지난 납부일) 계약을 직접 확인한다.
+        """
+        today = datetime.now().date()
+        today_str = today.isoformat()
+        results = []
+        past_due = []  # 가장 이른 납부일이 지난 고객 → 오늘 납부 계약이 따로 있는지 확인
+        for row in rows:
+            summary = dict(row)
+            overdue_date = summary["oldest_overdue_date"]
+            summary["overdue_days"] = (
+                (today - date.fromisoformat(overdue_date)).days if overdue_date else 0
+            )
+            next_payment_date = summary["next_payment_date"]
+            summary["has_payment_today"] = next_payment_date == today_str
+            if next_payment_date is not None and next_payment_date < today_str:
+                past_due.append(summary)
+            results.append(summary)
+
+        if past_due:
+            paying_today = self._get_card_payment_customer_ids([s["customer_id"] for s in past_due], today_str)
+            for summary in past_due:
+                summary["has_payment_today"] = summary["customer_id"] in paying_today
+        return results
+
+    def _get_card_payment_customer_ids(self, customer_ids: List[int], payment_date: str) -> Set[int]:
+        """고객 중 payment_date에 납부 예정인 정상 카드 계약이 있는 고객 ID (고객별 계약 인덱스)"""
+        cursor = self.connection.cursor()
+        found = set()
+        for start in range(0, len(customer_ids), 500):
+            chunk = customer_ids[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor.execute(
+                f"""
+                SELECT DISTINCT customer_id FROM policies
+                WHERE customer_id IN ({placeholders}) AND +status = 'active'
+                  AND payment_method = 'card' AND +next_payment_date = ?
+                """,
+                (*chunk, payment_date),
+            )
+            found.update(row[0] for row in cursor.fetchall())
+        return found
+
+    def rebuild_customer_summary(self) -> None:
+        """customer_summary 전체 재계산 (정합성 복구용)"""
+        cursor = self.connection.cursor()
+        self._rebuild_customer_summary(cursor)
+        self.connection.commit()
+
+    # =============================================================================
+    # 질환/차종 조회 (정규화 테이블)
+    # =============================================================================
+
+    def get_customer_ids_by_conditions(
+        self, conditions: List[str], match_all: bool = True, kind: Optional[str] = None
+    ) -> Set[int]:
+        """질환명으로 고객 ID 조회
+
+        Args:
+            conditions: 질환명 리스트 (예: ["고혈압", "당뇨병"])
+            match_all: True면 모두 해당(AND), False면 하나 이상 해당(OR)
+            kind: "medication" / "diagnosis" (None이면 둘 다)
+
+        Returns:
+            고객 ID 집합
+        """
+        names = self._split_values(",".join(conditions))
+        if not names:
+            return set()
+
+        placeholders = ", ".join("?" for _ in names)
+        params: list = list(names)
+        kind_sql = ""
+        if kind:
+            kind_sql = "AND kind = ?"
+            params.append(kind)
+
+        cursor = self.connection.cursor()
+        if match_all:
+            cursor.execute(
+                f"""
+                SELECT customer_id FROM customer_conditions
+                WHERE name IN ({placeholders}) {kind_sql}
+                GROUP BY customer_id
+                HAVING COUNT(DISTINCT name) = ?
+                """,
+                params + [len(names)],
+            )
+        else:
+            cursor.execute(
+                f"""
+                SELECT DISTINCT customer_id FROM customer_conditions
+                WHERE name IN ({placeholders}) {kind_sql}
+                """,
+                params,
+            )
+        return {row[0] for row in cursor.fetchall()}
+
+    def get_customer_ids_by_vehicle_types(self, vehicle_types: List[str], match_all: bool = False) -> Set[int]:
+        """영업용 차종으로 고객 ID 조회
+
+        Args:
+            vehicle_types: 차종 리스트 (예: ["taxi", "construction"])
+            match_all: True면 모두 해당(AND), False면 하나 이상 해당(OR)
+
+        Returns:
+            고객 ID 집합
+        """
+        types = self._split_values(",".join(vehicle_types))
+        if not types:
+            return set()
+
+        placeholders = ", ".join("?" for _ in types)
+        cursor = self.connection.cursor()
+        cursor.execute(
+            f"""
+            SELECT customer_id FROM customer_vehicle_types
+            WHERE vehicle_type IN ({placeholders})
+            GROUP BY customer_id
+            HAVING COUNT(*) >= ?
+            """,
+            types + [len(types) if match_all else 1],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+    def find_customers_by_conditions(
+        self,
+        conditions: List[str],
+        match_all: bool = True,
+        kind: Optional[str] = None,
+        card_policy_only: bool = False,
+    ) -> List[Customer]:
+        """질환명으로 고객 조회 (예: 당뇨병 + 카드결제 계약 보유 고객)
+
+        Args:
+            conditions: 질환명 리스트
+            match_all: True면 모두 해당(AND), False면 하나 이상 해당(OR)
+            kind: "medication" / "diagnosis" (None이면 둘 다)
+            card_policy_only: True면 해지되지 않은 카드결제 계약이 있는 고객만
+
+        Returns:
+            Customer 객체 리스트 (이름순)
+        """
+        names = self._split_values(",".join(conditions))
+        if not names:
+            return []
+
+        placeholders = ", ".join("?" for _ in names)
+        params: list = list(names)
+        kind_sql = ""
+        if kind:
+            kind_sql = "AND cc.kind = ?"
+            params.append(kind)
+        having_sql = "HAVING COUNT(DISTINCT cc.name) = ?" if match_all else ""
+        if match_all:
+            params.append(len(names))
+
+        card_sql = ""
+        if card_policy_only:
+            card_sql = """
+              AND EXISTS (
+                  SELECT 1 FROM policies p
+                  WHERE p.customer_id = customers.id
+                    AND p.payment_method = 'card'
+                    AND p.status != 'terminated'
+              )
+            """
+
+        cursor = self.connection.cursor()
+        cursor.execute(
+            f"""
+            SELECT {self.CUSTOMER_COLUMNS} FROM customers
+            WHERE id IN (
+                SELECT cc.customer_id FROM customer_conditions cc
+                WHERE cc.name IN ({placeholders}) {kind_sql}
+                GROUP BY cc.customer_id
+                {having_sql}
+            )
+            {card_sql}
+            ORDER BY name ASC
+            """,
+            params,
+        )
+        rows = cursor.fetchall()
+
+        return [Customer.from_db_row(tuple(row)) for row in rows]
+
+    # =============================================================================
+    # 세그먼트 비트맵 (필터 조합)
+    # =============================================================================
+
+    def get_segment_index(self):
+        """고객 세그먼트 비트맵 인덱스 반환 (최초 호출 시 빌드)
+
+        Returns:
+            SegmentIndex 객체 (쓰기 메서드에서 고객 단위로 자동 갱신)
+        """
+        if self._segment_index is None:
+            from segments import SegmentIndex
+
+            self._segment_index = SegmentIndex(self.connection)
+            self._segment_index.build()
+        return self._segment_index
+
+    def _on_write(self, customer_ids, changes: Optional[List[events.ChangeEvent]] = None) -> None:
+        """쓰기(커밋) 이후 읽기 캐시 무효화 + 파생 인덱스 갱신 + 변경 이벤트 발행
+
+        Args:
+            customer_ids: 변경된 고객 ID 목록 (None 포함 가능)
+            changes: 발행할 이벤트 (기본: 고객별 UPDATE)
+        """
+        self._cache_invalidate_customers(customer_ids)
+        if self._segment_index is not None:
+            for customer_id in customer_ids:
+                if customer_id is not None:
+                    self._segment_index.refresh_customer(customer_id)
+        if changes is None:
+            changes = [
+                events.customer_event(events.UPDATE, customer_id)
+                for customer_id in customer_ids if customer_id is not None
+            ]
+        self.events.publish(changes)
+
+    # =============================================================================
+    # 읽기 캐시 (Customer/Policy LRU)
+    # =============================================================================
+
+    def _cache_get(self, key):
+        """캐시 조회 (없으면 None, 다른 프로세스가 DB를 바꿨으면 전체 무효화)"""
+        self._check_data_version()
+        with self._cache_lock:
+            value = self._cache.get(key)
+            if value is None:
+                self._cache_stats["misses"] += 1
+                return None
+            self._cache.move_to_end(key)
+            self._cache_stats["hits"] += 1
+            return value
+
+    def _cache_put(self, key, value) -> None:
+        """캐시 저장 (CACHE_SIZE 초과 시 가장 오래된 항목 제거)"""
+        with self._cache_lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def _cache_invalidate_customers(self, customer_ids) -> None:
+        """고객 단위 캐시 무효화 (고객 + 계약 목록 + 해당 고객의 개별 계약)"""
+        targets = {customer_id for customer_id in customer_ids if customer_id is not None}
+        if not targets:
+            return
+        with self._cache_lock:
+            stale = [
+                key for key, value in self._cache.items()
+                if (key[0] in ("customer", "policies_of") and key[1] in targets)
+                or (key[0] == "policy" and value.customer_id in targets)
+            ]
+            for key in stale:
+                del self._cache[key]
+            self._cache_stats["invalidations"] += len(stale)
+            self._cache_generation += 1
+
+    def clear_cache(self) -> None:
+        """읽기 캐시 전체 비우기 (대량 변경 이후)"""
+        with self._cache_lock:
+            self._cache_stats["invalidations"] += len(self._cache)
+            self._cache.clear()
+            self._cache_generation += 1
+
+    @property
+    def cache_generation(self) -> int:
+        """현재 캐시 세대 (프리페치 요청 시점 기록용)"""
+        return self._cache_generation
+
+    def missing_from_cache(self, customer_ids: List[int]) -> List[int]:
+        """고객 또는 계약 목록이 캐시에 없는 고객 ID (통계에 집계하지 않음)"""
+        with self._cache_lock:
+            return [
+                customer_id for customer_id in customer_ids
+                if ("customer", customer_id) not in self._cache
+                or ("policies_of", customer_id) not in self._cache
+            ]
+
+    def prime_cache(
+        self, customers: List[Customer], policies_by_customer: Dict[int, List[Policy]], generation: int
+    ) -> bool:
+        """백그라운드에서 읽은 고객/계약을 캐시에 채움
+
+        Args:
+            customers: 고객 목록
+            policies_by_customer: {고객 ID: 계약 목록}
+            generation: 읽기 시작 전 cache_generation 값
+
+        Returns:
+            반영 여부 (그 사이 쓰기/무효화가 있었으면 버림)
+        """
+        with self._cache_lock:
+            if generation != self._cache_generation:
+                return False
+            for customer in customers:
+                self._cache[("customer", customer.id)] = customer
+                policies = tuple(policies_by_customer.get(customer.id, []))
+                self._cache[("policies_of", customer.id)] = policies
+                for policy in policies:
+                    self._cache[("policy", policy.id)] = policy
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+            return True
+
+    def _check_data_version(self) -> None:
+        """PRAGMA data_version으로 다른 연결의 커밋 감지 (DATA_VERSION_CHECK_INTERVAL 주기)"""
+        now = time.monotonic()
+        if now - self._data_version_checked_at < self.DATA_VERSION_CHECK_INTERVAL:
+            return
+        self._data_version_checked_at = now
+
+        version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        if self._data_version is not None and version != self._data_version:
+            self.invalidate_caches()
+        self._data_version = version
+
+    def refresh_customers(self, customer_ids) -> None:
+        """다른 연결이 바꾼 고객만 캐시 무효화 + 세그먼트 비트 갱신 (변경 고객을 아는 경우)
+
+        Args:
+            customer_ids: 변경된 고객 ID 목록
+        """
+        self._on_write(customer_ids)
+
+    def invalidate_caches(self) -> None:
+        """읽기 캐시 + 세그먼트 인덱스 무효화 + 전체 갱신 이벤트 (다른 연결이 DB를 바꾼 경우)"""
+        self.clear_cache()
+        if self._segment_index is not None:
+            self._segment_index.invalidate()
+        self.events.publish([events.REFRESH_EVENT])
+
+    def get_cache_stats(self) -> Dict:
+        """읽기 캐시 통계
+
+        Returns:
+            {"hits", "misses", "invalidations", "size", "hit_rate"}
+        """
+        with self._cache_lock:
+            stats = dict(self._cache_stats)
+            stats["size"] = len(self._cache)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    # =============================================================================
+    # 생일 조회 (birth_mmdd 인덱스)
+    # =============================================================================
+
+    def get_birthday_customer_ids(self, base_date: Optional[str] = None) -> Set[int]:
+        """해당 날짜가 생일인 고객 ID 조회 (평년 3월 1일은 2월 29일생 포함)
+
+        Args:
+            base_date: 기준 날짜 (YYYY-MM-DD, 기본: 오늘)
+
+        Returns:
+            고객 ID 집합
+        """
+        target = self._parse_base_date(base_date)
+
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "SELECT id FROM customers WHERE birth_mmdd IN (?, ?)",
+            birthday_mmdds(target),
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+    def count_birthdays(self, base_date: Optional[str] = None) -> int:
+        """해당 날짜가 생일인 고객 수 (평년 3월 1일은 2월 29일생 포함)
+
+        Args:
+            base_date: 기준 날짜 (YYYY-MM-DD, 기본: 오늘)
+
+        Returns:
+            생일자 수
+        """
+        target = self._parse_base_date(base_date)
+
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "SELECT COUNT(*) FROM customers WHERE birth_mmdd IN (?, ?)",
+            birthday_mmdds(target),
+        )
+        return cursor.fetchone()[0]
+
+    def get_upcoming_birthdays(self, days_ahead: int = 7, base_date: Optional[str] = None) -> List[Dict]:
+        """다가오는 생일 고객 조회 (12월→1월 연말 구간 처리 포함)
+
+        Args:
+            days_ahead: 며칠 이내 생일 (기본: 7일, 0이면 당일만)
+            base_date: 기준 날짜 (YYYY-MM-DD, 기본: 오늘)
+
+        Returns:
+            [{customer: Customer, birthday: "YYYY-MM-DD", days_left: int}, ...] (가까운 순)
+        """
+        today = self._parse_base_date(base_date)
+        # 평년 3월 1일에 시작하면 2월 29일생도 포함 ("02-29" 바로 다음이 "03-01"이라 범위만 넓히면 됨)
+        start_mmdd = min(birthday_mmdds(today))
+
+        cursor = self.connection.cursor()
+        if days_ahead >= 365:
+            cursor.execute(
+                f"""
+                SELECT {self.CUSTOMER_COLUMNS}, birth_mmdd FROM customers
+                WHERE birth_mmdd IS NOT NULL
+                ORDER BY CASE WHEN birth_mmdd >= ? THEN 0 ELSE 1 END, birth_mmdd, name
+                """,
+                (start_mmdd,),
+            )
+        else:
+            end_mmdd = (today + timedelta(days=days_ahead)).strftime("%m-%d")
+            if start_mmdd <= end_mmdd:
+                # 같은 해 구간: 단일 범위 스캔
+                cursor.execute(
+                    f"""
+                    SELECT {self.CUSTOMER_COLUMNS}, birth_mmdd FROM customers
+                    WHERE birth_mmdd BETWEEN ? AND ?
+                    ORDER BY birth_mmdd, name
+                    """,
+                    (start_mmdd, end_mmdd),
+                )
+            else:
+                # 연말 구간 (예: 12-28 ~ 01-04): 두 범위로 분할
+                cursor.execute(
+                    f"""
+                    SELECT {self.CUSTOMER_COLUMNS}, birth_mmdd FROM customers
+                    WHERE birth_mmdd >= ? OR birth_mmdd <= ?
+                    ORDER BY CASE WHEN birth_mmdd >= ? THEN 0 ELSE 1 END, birth_mmdd, name
+                    """,
+                    (start_mmdd, end_mmdd, start_mmdd),
+                )
+        rows = cursor.fetchall()
+
+        results = []
+        for row in rows:
+            customer = Customer.from_db_row(tuple(row[:23]))
+            birthday = next_birthday(row[23], today)
+            results.append({
+                'customer': customer,
+                'birthday': birthday.strftime("%Y-%m-%d"),
+                'days_left': (birthday - today).days,
+            })
+
+        return results
+
+    # =============================================================================
+    # 상령일 조회 (insurance_age_change_date 인덱스)
+    # =============================================================================
+
+    def refresh_insurance_age_changes(self, base_date: Optional[str] = None) -> int:
+        """지난 상령일을 다음 상령일로 갱신 (기준일 이전 값만 재계산)
+
+        저장 값은 실제 오늘 기준의 다음 상령일이므로 미래 기준일은 오늘로 제한한다
+        (미래 날짜로 미리 넘기면 오늘 기준 조회에서 이번 달 상령일이 빠짐).
+
+        Args:
+            base_date: 기준 날짜 (YYYY-MM-DD, 기본: 오늘)
+
+        Returns:
+            갱신된 고객 수
+        """
+        today = min(self._parse_base_date(base_date), datetime.now().date())
+
+        cursor = self.connection.cursor()
+        cursor.execute(
+            """
+            SELECT id, birth_date FROM customers
+            WHERE insurance_age_change_date < ?
+            """,
+            (today.strftime("%Y-%m-%d"),),
+        )
+        updates = [
+            (self._calculate_age_change_date(birth_date, today), customer_id)
+            for customer_id, birth_date in cursor.fetchall()
+        ]
+
+        if updates:
+            cursor.executemany(
+                "UPDATE customers SET insurance_age_change_date = ?, version = version + 1 WHERE id = ?",
+                updates,
+            )
+            self.connection.commit()
+            if self._segment_index is not None:
+                self._segment_index.invalidate()
+            self.events.publish([events.REFRESH_EVENT])
+
+        return len(updates)
+
+    def get_upcoming_age_changes(self, days_ahead: int = 30, base_date: Optional[str] = None) -> List[Dict]:
+        """상령일 임박 고객 조회 (보험나이 변경 → 보험료 변동)
+
+        Args:
+            days_ahead: 며칠 이내 상령일 (기본: 30일)
+            base_date: 기준 날짜 (YYYY-MM-DD, 기본: 오늘)
+
+        Returns:
+            [{customer: Customer, change_date: "YYYY-MM-DD", days_left: int, insurance_age: int}, ...]
+            (상령일 가까운 순, insurance_age는 상령일 이후 보험나이)
+        """
+        today = self._parse_base_date(base_date)
+        end_date = today + timedelta(days=days_ahead)
+        cursor = self.connection.cursor()
+
+        if today == datetime.now().date():
+            # 오늘 기준: 지난 상령일을 다음 해로 옮긴 뒤 저장된 상령일 인덱스 범위 조회
+            self.refresh_insurance_age_changes()
+            cursor.execute(
+                f"""
+                SELECT {self.CUSTOMER_COLUMNS} FROM customers
+                WHERE insurance_age_change_date BETWEEN ? AND ?
+                """,
+                (today.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")),
+            )
+        else:
+            # 다른 기준일: 저장 값은 그대로 두고 상령일 월-일(해마다 같음, 2월 말만 ±1일)로 후보를 고름
+            start_mmdd = (today - timedelta(days=3)).strftime("%m-%d")
+            end_mmdd = (end_date + timedelta(days=3)).strftime("%m-%d")
+            if days_ahead + 6 >= 365:
+                mmdd_filter, params = "", ()
+            elif start_mmdd <= end_mmdd:
+                mmdd_filter, params = "AND substr(insurance_age_change_date, 6) BETWEEN ? AND ?", (start_mmdd, end_mmdd)
+            else:  # 연말을 넘는 구간
+                mmdd_filter = "AND (substr(insurance_age_change_date, 6) >= ? OR substr(insurance_age_change_date, 6) <= ?)"
+                params = (start_mmdd, end_mmdd)
+            cursor.execute(
+                f"""
+                SELECT {self.CUSTOMER_COLUMNS} FROM customers
+                WHERE insurance_age_change_date IS NOT NULL {mmdd_filter}
+                """,
+                params,
+            )
+
+        results = []
+        for row in cursor.fetchall():
+            customer = Customer.from_db_row(tuple(row))
+            birth = date.fromisoformat(customer.birth_date)
+            change_date = next_insurance_age_change(birth, today)  # 기준일 다음 상령일 (저장 안 함)
+            if change_date > end_date:
+                continue
+
+            # 상령일 = 생일 + N년 6개월 → 상령일 이후 보험나이 N+1
+            months = (change_date.year - birth.year) * 12 + (change_date.month - birth.month)
+            results.append({
+                'customer': customer,
+                'change_date': change_date.strftime("%Y-%m-%d"),
+                'days_left': (change_date - today).days,
+                'insurance_age': (months - 6) // 12 + 1,
+            })
+
+        results.sort(key=lambda item: (item['change_date'], item['customer'].name))
+        return results
+
+    @staticmethod
+    def _parse_base_date(base_date: Optional[str]):
+        """기준 날짜 문자열 → date (None이면 오늘)"""
+        if base_date:
+            return datetime.strptime(base_date, "%Y-%m-%d").date()
+        return datetime.now().date()
 
     # =============================================================================
     # Policy 관련 메서드
@@ -404,7 +1744,9 @@ class DatabaseManager:
             ),
         )
         self.connection.commit()
-        return cursor.lastrowid
+        policy_id = cursor.lastrowid
+        self._on_write([policy.customer_id], [events.policy_event(events.INSERT, policy_id, policy.customer_id)])
+        return policy_id
 
     def get_policy(self, policy_id: int) -> Optional[Policy]:
         """ID로 계약 조회
@@ -415,12 +1757,18 @@ class DatabaseManager:
         Returns:
             Policy 객체 또는 None (없는 경우)
         """
+        cached = self._cache_get(("policy", policy_id))
+        if cached is not None:
+            return copy.copy(cached)
+
         cursor = self.connection.cursor()
         cursor.execute(f"SELECT {self.POLICY_COLUMNS} FROM policies WHERE id = ?", (policy_id,))
         row = cursor.fetchone()
 
         if row:
-            return Policy.from_db_row(tuple(row))
+            policy = Policy.from_db_row(tuple(row))
+            self._cache_put(("policy", policy_id), policy)
+            return copy.copy(policy)
         return None
 
     def get_policies_by_customer(self, customer_id: int) -> List[Policy]:
@@ -432,6 +1780,10 @@ class DatabaseManager:
         Returns:
             Policy 객체 리스트 (생성일 역순)
         """
+        cached = self._cache_get(("policies_of", customer_id))
+        if cached is not None:
+            return [copy.copy(policy) for policy in cached]
+
         cursor = self.connection.cursor()
         cursor.execute(
             f"SELECT {self.POLICY_COLUMNS} FROM policies WHERE customer_id = ? ORDER BY created_at DESC",
@@ -439,57 +1791,126 @@ class DatabaseManager:
         )
         rows = cursor.fetchall()
 
+        policies = [Policy.from_db_row(tuple(row)) for row in rows]
+        self._cache_put(("policies_of", customer_id), tuple(policies))
+        return [copy.copy(policy) for policy in policies]
+
+    def get_policies_by_customers(self, customer_ids: List[int]) -> Dict[int, List[Policy]]:
+        """여러 고객의 계약을 IN 쿼리로 한 번에 조회 (캐시 미경유)
+
+        Args:
+            customer_ids: 고객 ID 목록
+
+        Returns:
+            {고객 ID: [Policy, ...]} (고객별 생성일 역순, 계약 없는 고객은 빈 리스트)
+        """
+        return self.fetch_policies_by_customers(self.connection, customer_ids)
+
+    @classmethod
+    def fetch_policies_by_customers(cls, connection, customer_ids: List[int]) -> Dict[int, List[Policy]]:
+        """지정한 연결로 계약 IN 조회 (백그라운드 연결 공용)"""
+        ids = list(customer_ids)
+        result = {customer_id: [] for customer_id in ids}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = connection.execute(
+                f"""
+                SELECT {cls.POLICY_COLUMNS} FROM policies
+                WHERE customer_id IN ({placeholders})
+                ORDER BY customer_id, created_at DESC
+                """,
+                chunk,
+            ).fetchall()
+            for row in rows:
+                policy = Policy.from_db_row(tuple(row))
+                result[policy.customer_id].append(policy)
+        return result
+
+    def page_policies(self, after_id: Optional[int] = None, limit: int = 100) -> List[Policy]:
+        """ID순 계약 한 페이지 (키셋 페이지네이션, 기본 키 범위 조회)
+
+        Args:
+            after_id: 직전 페이지 마지막 계약 ID (None이면 처음부터)
+            limit: 페이지 크기
+
+        Returns:
+            Policy 객체 리스트 (limit개보다 적으면 마지막 페이지)
+        """
+        rows = self.connection.execute(
+            f"SELECT {self.POLICY_COLUMNS} FROM policies WHERE id > ? ORDER BY id ASC LIMIT ?",
+            (after_id if after_id is not None else 0, limit),
+        ).fetchall()
         return [Policy.from_db_row(tuple(row)) for row in rows]
 
-    def update_policy(self, policy: Policy) -> bool:
-        """계약 정보 수정
+    def iter_policies(self, batch_size: int = 500) -> Iterator[Policy]:
+        """ID순 전체 계약 스트리밍 (batch_size개씩 키셋 페이지로 읽음)
 
         Args:
-            policy: 수정할 계약 정보 (id 필수)
+            batch_size: 한 번에 읽을 계약 수
+
+        Yields:
+            Policy 객체
+        """
+        after_id = None
+        while True:
+            page = self.page_policies(after_id, batch_size)
+            yield from page
+            if len(page) < batch_size:
+                return
+            after_id = page[-1].id
+
+    def update_policy(self, policy: Policy, original: Optional[Policy] = None) -> bool:
+        """계약 정보 수정 (바뀐 컬럼만, 행 버전 비교 후 교체 - update_customer와 같은 규칙)
+
+        Args:
+            policy: 수정할 계약 정보 (id 필수, 수정 시 version 갱신)
+            original: 편집 시작 시점 스냅샷 (없으면 DB의 현재 행과 비교)
 
         Returns:
-            성공 여부
+            실제로 수정했는지 (id가 없거나 바뀐 값이 없으면 False)
+
+        Raises:
+            ConflictError: 행 버전 불일치 (다른 곳에서 먼저 수정됨)
+            RecordDeletedError: 계약이 그사이 삭제됨
         """
         if policy.id is None:
             return False
-
-        timestamp = Policy.get_current_timestamp()
+        expected_version = policy.version
+        if original is None:
+            original = self._fetch_current_row(Policy, "policies", self.POLICY_COLUMNS, policy.id)
+            if original is None:
+                raise RecordDeletedError(f"다른 곳에서 삭제되었습니다 (policies #{policy.id})")
+            previous_customer_id = original.customer_id
+        else:
+            expected_version = original.version
+            # 버전 비교에 성공하면 스냅샷의 고객 ID가 곧 DB의 이전 값
+            if original.version is not None:
+                previous_customer_id = original.customer_id
+            else:
+                previous_customer_id = self._get_policy_customer_id(policy.id)
+
+        values = {
+            field: getattr(policy, field)
+            for field in self._changed_fields(policy, original, self.POLICY_UPDATE_FIELDS)
+        }
+        if not values:
+            return False
+        values["updated_at"] = Policy.get_current_timestamp()
 
         cursor = self.connection.cursor()
-        cursor.execute(
-            """
-            UPDATE policies
-            SET customer_id = ?, insurer = ?, product_name = ?, premium = ?,
-                payment_method = ?, billing_cycle = ?, billing_day = ?,
-                card_issuer = ?, card_number = ?, card_expiry = ?,
-                contract_start_date = ?, contract_end_date = ?,
-                status = ?, next_payment_date = ?, last_payment_date = ?,
-                memo = ?, updated_at = ?
-            WHERE id = ?
-            """,
-            (
-                policy.customer_id,
-                policy.insurer,
-                policy.product_name,
-                policy.premium,
-                policy.payment_method,
-                policy.billing_cycle,
-                policy.billing_day,
-                policy.card_issuer,
-                policy.card_number,
-                policy.card_expiry,
-                policy.contract_start_date,
-                policy.contract_end_date,
-                policy.status,
-                policy.next_payment_date,
-                policy.last_payment_date,
-                policy.memo,
-                timestamp,
-                policy.id,
-            ),
-        )
+        version = self._update_versioned_row(cursor, "policies", policy.id, values, expected_version)
         self.connection.commit()
-        return cursor.rowcount > 0
+        policy.version = version
+        if previous_customer_id == policy.customer_id:
+            changes = [events.policy_event(events.UPDATE, policy.id, policy.customer_id)]
+        else:  # 다른 고객으로 옮김 → 이전 고객 화면에서는 삭제, 새 고객 화면에서는 추가
+            changes = [
+                events.policy_event(events.DELETE, policy.id, previous_customer_id),
+                events.policy_event(events.INSERT, policy.id, policy.customer_id),
+            ]
+        self._on_write({previous_customer_id, policy.customer_id}, changes)
+        return True
 
     def delete_policy(self, policy_id: int) -> bool:
         """계약 삭제
@@ -500,10 +1921,22 @@ class DatabaseManager:
         Returns:
             성공 여부
         """
+        customer_id = self._get_policy_customer_id(policy_id)
+
         cursor = self.connection.cursor()
         cursor.execute("DELETE FROM policies WHERE id = ?", (policy_id,))
         self.connection.commit()
-        return cursor.rowcount > 0
+        deleted = cursor.rowcount > 0
+        if deleted:
+            self._on_write([customer_id], [events.policy_event(events.DELETE, policy_id, customer_id)])
+        return deleted
+
+    def _get_policy_customer_id(self, policy_id: int) -> Optional[int]:
+        """계약의 고객 ID 조회 (쓰기 전 파생 인덱스 갱신 대상 확인용)"""
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT customer_id FROM policies WHERE id = ?", (policy_id,))
+        row = cursor.fetchone()
+        return row[0] if row else None
 
     def get_upcoming_payments(self, days_ahead: int = 7) -> List[Dict]:
         """납부 임박 계약 조회 (D-7)
@@ -538,8 +1971,8 @@ class DatabaseManager:
 
         results = []
         for row in rows:
-            policy = Policy.from_db_row(tuple(row[:19]))
-            customer = Customer.from_db_row(tuple(row[19:]))
+            policy = Policy.from_db_row(tuple(row[:20]))
+            customer = Customer.from_db_row(tuple(row[20:]))
 
             # 남은 일수 계산
             payment_date = datetime.strptime(policy.next_payment_date, "%Y-%m-%d").date()
@@ -580,8 +2013,8 @@ class DatabaseManager:
 
         results = []
         for row in rows:
-            policy = Policy.from_db_row(tuple(row[:19]))
-            customer = Customer.from_db_row(tuple(row[19:]))
+            policy = Policy.from_db_row(tuple(row[:20]))
+            customer = Customer.from_db_row(tuple(row[20:]))
 
             # 연체 일수 계산
             payment_date = datetime.strptime(policy.next_payment_date, "%Y-%m-%d").date()
@@ -595,6 +2028,34 @@ class DatabaseManager:
 
         return results
 
+    def get_payment_alert_counts(self, days_ahead: int = 7) -> Dict:
+        """납부 알림용 계약 건수 (카드결제만, 목록 없이 건수만)
+
+        Args:
+            days_ahead: 며칠 이내 납부 예정 (기본: 7일)
+
+        Returns:
+            {"upcoming_count": 납부 임박 건수, "overdue_count": 연체 건수}
+        """
+        today = datetime.now().date()
+        end_date = today + timedelta(days=days_ahead)
+
+        # 상태별 범위 COUNT 두 번 (idx_policy_card_due 인덱스만으로 계산, 계약 전체를 훑지 않음)
+        cursor = self.connection.cursor()
+        cursor.execute(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM policies
+                 WHERE payment_method = 'card' AND status = 'active'
+                   AND next_payment_date BETWEEN ? AND ?),
+                (SELECT COUNT(*) FROM policies
+                 WHERE payment_method = 'card' AND status = 'overdue')
+            """,
+            (today.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")),
+        )
+        upcoming_count, overdue_count = cursor.fetchone()
+        return {"upcoming_count": upcoming_count, "overdue_count": overdue_count}
+
     def mark_payment_completed(self, policy_id: int, payment_date: str) -> bool:
         """납부 완료 처리 및 다음 납부일 자동 계산
 
@@ -623,13 +2084,67 @@ class DatabaseManager:
             SET last_payment_date = ?,
                 next_payment_date = ?,
                 status = 'active',
-                updated_at = ?
+                updated_at = ?,
+                version = version + 1
             WHERE id = ?
             """,
             (payment_date, next_date, Policy.get_current_timestamp(), policy_id)
         )
         self.connection.commit()
-        return cursor.rowcount > 0
+        updated = cursor.rowcount > 0
+        if updated:
+            self._on_write([policy.customer_id], [events.policy_event(events.UPDATE, policy_id, policy.customer_id)])
+        return updated
+
+    def mark_payments_completed(self, policy_ids: List[int], payment_date: str) -> int:
+        """여러 계약 납부 완료 처리 (한 트랜잭션, 다음 납부일은 계약별로 계산)
+
+        Args:
+            policy_ids: 계약 ID 목록 (중복/없는 ID는 무시)
+            payment_date: 납부 완료 날짜 (YYYY-MM-DD)
+
+        Returns:
+            처리된 계약 수
+        """
+        ids = list(dict.fromkeys(policy_ids))
+        rows = []
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows.extend(self.connection.execute(
+                f"SELECT id, customer_id, billing_cycle, billing_day FROM policies WHERE id IN ({placeholders})",
+                chunk,
+            ).fetchall())
+        if not rows:
+            return 0
+
+        timestamp = Policy.get_current_timestamp()
+        self.connection.executemany(
+            """
+            UPDATE policies
+            SET last_payment_date = ?,
+                next_payment_date = ?,
+                status = 'active',
+                updated_at = ?,
+                version = version + 1
+            WHERE id = ?
+            """,
+            [
+                (
+                    payment_date,
+                    self.calculate_next_payment_date(payment_date, billing_cycle, billing_day),
+                    timestamp,
+                    policy_id,
+                )
+                for policy_id, _, billing_cycle, billing_day in rows
+            ],
+        )
+        self.connection.commit()
+        self._on_write(
+            {row[1] for row in rows},
+            [events.policy_event(events.UPDATE, policy_id, customer_id) for policy_id, customer_id, _, _ in rows],
+        )
+        return len(rows)
 
     def calculate_next_payment_date(
         self, current_date: str, billing_cycle: str, billing_day: int
@@ -650,6 +2165,8 @@ class DatabaseManager:
             >>> calculate_next_payment_date("2026-01-31", "monthly", 31)
             "2026-02-28"  # 2월은 28일까지
         """
+        from dateutil.relativedelta import relativedelta  # 시작 시간 단축: 사용 시점 import
+
         base_date = datetime.strptime(current_date, "%Y-%m-%d").date()
 
         if billing_cycle == "monthly":
@@ -704,9 +2221,8 @@ class DatabaseManager:
                 cursor.execute("ALTER TABLE policies_new RENAME TO policies")
 
                 # 인덱스 재생성
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_policy_customer ON policies(customer_id)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_policy_next_payment ON policies(next_payment_date)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_policy_status ON policies(status)")
+                for index_sql in self.POLICY_INDEX_SQL:
+                    cursor.execute(index_sql)
 
                 self.connection.commit()
                 print("[OK] Card field migration completed (card_last4 -> card_number)")
@@ -728,7 +2244,7 @@ class DatabaseManager:
         cursor = self.connection.execute(
             """
             UPDATE policies
-            SET status = 'overdue', updated_at = ?
+            SET status = 'overdue', updated_at = ?, version = version + 1
             WHERE next_payment_date < ? AND status = 'active'
               AND payment_method = 'card'
             """,
@@ -738,16 +2254,427 @@ class DatabaseManager:
         overdue_count = cursor.rowcount
         self.connection.commit()
 
+        if overdue_count > 0:
+            self.invalidate_caches()
+
         return {
             "updated": overdue_count,
             "overdue": overdue_count
         }
 
+    # =============================================================================
+    # SMS 발송 대기열 (sms_outbox)
+    # =============================================================================
+
+    def enqueue_sms(
+        self,
+        phone: str,
+        message: str,
+        customer_id: Optional[int] = None,
+        template: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Tuple[int, bool]:
+        """SMS 발송 대기열에 등록 (같은 idempotency_key는 기존 항목 반환, "failed" 항목이면 다시 대기)
+
+        Args:
+            phone: 수신 전화번호
+            message: 본문
+            customer_id: 고객 ID (선택)
+            template: 템플릿 키 (선택, 기록용)
+            idempotency_key: 중복 방지 키 (None이면 새 키 생성)
+
+        Returns:
+            (대기열 항목 ID, 이번에 대기열에 넣었는지) - 이미 대기/발송 중이거나 발송된 키면 False
+
+        Raises:
+            sqlite3.IntegrityError: 전화번호/본문 누락 등 제약 위반 (중복 키만 무시)
+        """
+        import uuid
+
+        key = idempotency_key or uuid.uuid4().hex
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        cursor = self.connection.cursor()
+        cursor.execute(
+            """
+            INSERT INTO sms_outbox (
+                idempotency_key, customer_id, phone, message, template,
+                status, attempts, next_attempt_at, created_at, updated_at
+            )
+            VALUES (?, ?, ?, ?, ?, 'pending', 0, ?, ?, ?)
+            ON CONFLICT(idempotency_key) DO NOTHING
+            """,
+            (key, customer_id, phone, message, template, timestamp, timestamp, timestamp),
+        )
+        queued = cursor.rowcount > 0
+        if queued:
+            outbox_id = cursor.lastrowid
+        else:
+            # 최종 실패한 같은 키는 처음부터 다시 시도 (재발송)
+            cursor.execute(
+                """
+                UPDATE sms_outbox SET status = 'pending', attempts = 0, last_error = NULL,
+                    phone = ?, message = ?, next_attempt_at = ?, updated_at = ?
+                WHERE idempotency_key = ? AND status = 'failed'
+                """,
+                (phone, message, timestamp, timestamp, key),
+            )
+            queued = cursor.rowcount > 0
+            cursor.execute("SELECT id FROM sms_outbox WHERE idempotency_key = ?", (key,))
+            outbox_id = cursor.fetchone()[0]
+        self.connection.commit()
+        return outbox_id, queued
+
+    def enqueue_sms_batch(self, entries: List[Dict]) -> int:
+        """SMS 여러 건을 한 트랜잭션으로 대기열에 등록 (이미 있는 idempotency_key는 무시)
+
+        Args:
+            entries: {"idempotency_key", "customer_id", "phone", "message", "template"} dict 리스트
+
+        Returns:
+            새로 등록된 건수
+
+        Raises:
+            sqlite3.IntegrityError: 제약 위반 항목이 있음 (중복 키만 무시, 전체 롤백)
+        """
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = [
+            (
+                entry["idempotency_key"],
+                entry.get("customer_id"),
+                entry["phone"],
+                entry["message"],
+                entry.get("template"),
+                timestamp,
+                timestamp,
+                timestamp,
+            )
+            for entry in entries
+        ]
+        before = self.connection.total_changes
+        try:
+            self.connection.executemany(
+                """
+                INSERT INTO sms_outbox (
+                    idempotency_key, customer_id, phone, message, template,
+                    status, attempts, next_attempt_at, created_at, updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, 'pending', 0, ?, ?, ?)
+                ON CONFLICT(idempotency_key) DO NOTHING
+                """,
+                rows,
+            )
+        except sqlite3.Error:
+            self.connection.rollback()  # 일부만 등록된 상태로 남기지 않음
+            raise
+        self.connection.commit()
+        return self.connection.total_changes - before
+
+    def get_sms(self, outbox_id: int) -> Optional[Dict]:
+        """대기열 항목 조회
+
+        Args:
+            outbox_id: 대기열 항목 ID
+
+        Returns:
+            항목 dict 또는 None
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(f"SELECT {self.SMS_OUTBOX_COLUMNS} FROM sms_outbox WHERE id = ?", (outbox_id,))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+
+    def get_sms_outbox(self, status: Optional[str] = None, limit: int = 100) -> List[Dict]:
+        """대기열 목록 조회 (최근 등록순)
+
+        Args:
+            status: 상태 필터 (None이면 전체)
+            limit: 최대 건수
+
+        Returns:
+            항목 dict 리스트
+        """
+        cursor = self.connection.cursor()
+        if status:
+            cursor.execute(
+                f"SELECT {self.SMS_OUTBOX_COLUMNS} FROM sms_outbox WHERE status = ? ORDER BY id DESC LIMIT ?",
+                (status, limit),
+            )
+        else:
+            cursor.execute(
+                f"SELECT {self.SMS_OUTBOX_COLUMNS} FROM sms_outbox ORDER BY id DESC LIMIT ?", (limit,)
+            )
+        return [dict(row) for row in cursor.fetchall()]
+
+    def claim_due_sms(self, limit: int = 10) -> List[Dict]:
+        """발송 시각이 된 대기 항목을 "sending"으로 바꾸고 반환 (시도 횟수 +1)
+
+        Args:
+            limit: 최대 건수
+
+        Returns:
+            항목 dict 리스트 (발송 예정 시각순)
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        due = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")  # 재시도 시각은 소수 초까지 기록
+        cursor = self.connection.cursor()
+        cursor.execute(
+            """
+            SELECT id FROM sms_outbox
+            WHERE status = 'pending' AND next_attempt_at <= ?
+            ORDER BY next_attempt_at ASC, id ASC
+            LIMIT ?
+            """,
+            (due, limit),
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+        if not ids:
+            return []
+
+        placeholders = ", ".join("?" for _ in ids)
+        cursor.execute(
+            f"""
+            UPDATE sms_outbox SET status = 'sending', attempts = attempts + 1, updated_at = ?
+            WHERE id IN ({placeholders})
+            """,
+            [now, *ids],
+        )
+        cursor.execute(
+            f"SELECT {self.SMS_OUTBOX_COLUMNS} FROM sms_outbox WHERE id IN ({placeholders}) "
+            "ORDER BY next_attempt_at ASC, id ASC",
+            ids,
+        )
+        claimed = [dict(row) for row in cursor.fetchall()]
+        self.connection.commit()
+        return claimed
+
+    def complete_sms(self, outbox_id: int) -> bool:
+        """발송 성공 처리"""
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self._update_sms(
+            "UPDATE sms_outbox SET status = 'sent', sent_at = ?, last_error = NULL, updated_at = ? WHERE id = ?",
+            (timestamp, timestamp, outbox_id),
+        )
+
+    def retry_sms(self, outbox_id: int, error: str, next_attempt_at: str) -> bool:
+        """재시도 예약 (상태를 "pending"으로 되돌림)
+
+        Args:
+            outbox_id: 대기열 항목 ID
+            error: 실패 사유
+            next_attempt_at: 다음 시도 시각 (YYYY-MM-DD HH:MM:SS[.ffffff])
+        """
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self._update_sms(
+            """
+            UPDATE sms_outbox SET status = 'pending', last_error = ?, next_attempt_at = ?, updated_at = ?
+            WHERE id = ?
+            """,
+            (error, next_attempt_at, timestamp, outbox_id),
+        )
+
+    def fail_sms(self, outbox_id: int, error: str) -> bool:
+        """최종 실패 처리 (재시도 불가 오류 / 최대 시도 초과)"""
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self._update_sms(
+            "UPDATE sms_outbox SET status = 'failed', last_error = ?, updated_at = ? WHERE id = ?",
+            (error, timestamp, outbox_id),
+        )
+
+    def recover_sending_sms(self) -> int:
+        """비정상 종료로 "sending"에 남은 항목을 대기 상태로 복구 (발송기 시작 시)
+
+        Returns:
+            복구된 항목 수
+        """
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "UPDATE sms_outbox SET status = 'pending', updated_at = ? WHERE status = 'sending'",
+            (timestamp,),
+        )
+        self.connection.commit()
+        return cursor.rowcount
+
+    def _update_sms(self, sql: str, params: tuple) -> bool:
+        """대기열 항목 갱신 공통"""
+        cursor = self.connection.cursor()
+        cursor.execute(sql, params)
+        self.connection.commit()
+        return cursor.rowcount > 0
+
+    # =============================================================================
+    # 변경 로그 (change_log) - 증분 내보내기/백업/동기화
+    # =============================================================================
+
+    def get_change_seq(self) -> int:
+        """현재 변경 로그 위치 (마지막으로 발급된 seq, 없으면 0)
+
+        증분 소비자는 전체 내보내기 직전에 이 값을 저장하고 다음부터 changes_since()에 넘긴다.
+        """
+        row = self.connection.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'change_log'"
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _check_change_log_horizon(self, since_seq: int) -> None:
+        """since_seq 이후 톰스톤이 압축으로 삭제됐으면 ChangeLogExpiredError"""
+        row = self.connection.execute(
+            "SELECT value FROM change_log_state WHERE name = 'purged_through'"
+        ).fetchone()
+        if row and since_seq < row[0]:
+            raise ChangeLogExpiredError(
+                f"seq {since_seq} 이후 변경 로그가 압축되었습니다 (증분 가능 위치: {row[0]} 이상)"
+            )
+
+    def changes_since(self, seq: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """seq 이후 변경 로그 (seq 오름차순)
+
+        Args:
+            seq: 마지막으로 처리한 seq (0이면 처음부터)
+            limit: 최대 건수 (None이면 전부)
+
+        Returns:
+            [{seq, table_name, row_id, op, version, changed_at}, ...]
+
+        Raises:
+            ChangeLogExpiredError: seq 이후 톰스톤이 압축으로 삭제됨 (전체 내보내기 필요)
+        """
+        self._check_change_log_horizon(seq)
+        rows = self.connection.execute(
+            "SELECT seq, table_name, row_id, op, version, changed_at FROM change_log "
+            "WHERE seq > ? ORDER BY seq LIMIT ?",
+            (seq, -1 if limit is None else limit),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def changed_rows_since(
+        self, table: str, seq: int = 0, until_seq: Optional[int] = None
+    ) -> Dict[str, List[int]]:
+        """seq 이후 바뀐 행 (행별 마지막 변경만: 삭제면 톰스톤, 그 외는 현재 값으로 다시 내보낼 행)
+
+        Args:
+            table: CHANGE_LOG_TABLES 중 하나
+            seq: 마지막으로 처리한 seq
+            until_seq: 이 seq까지만 (기본: 현재 위치) - 내보내기 결과에 기록할 위치와 맞추기 위함
+
+        Returns:
+            {"upserted": [row_id, ...], "deleted": [row_id, ...]} (row_id 오름차순)
+
+        Raises:
+            ChangeLogExpiredError: seq 이후 톰스톤이 압축으로 삭제됨 (전체 내보내기 필요)
+        """
+        if table not in self.CHANGE_LOG_TABLES:
+            raise ValueError(f"변경 로그 대상이 아닌 테이블: {table}")
+        self._check_change_log_horizon(seq)
+        if until_seq is None:
+            until_seq = self.get_change_seq()
+
+        # MAX(seq)와 함께 고른 op는 그 행(마지막 변경)의 값 (SQLite 집계 규칙)
+        # +table_name: 테이블 전체 이력(idx_change_log_row) 대신 seq 구간(PK)만 읽도록
+        rows = self.connection.execute(
+            "SELECT row_id, op, MAX(seq) FROM change_log "
+            "WHERE seq > ? AND seq <= ? AND +table_name = ? GROUP BY row_id ORDER BY row_id",
+            (seq, until_seq, table),
+        ).fetchall()
+        result = {"upserted": [], "deleted": []}
+        for row_id, op, _ in rows:
+            result["deleted" if op == "delete" else "upserted"].append(row_id)
+        return result
+
+    def compact_change_log(self, purge_tombstones_through: Optional[int] = None) -> int:
+        """변경 로그 압축
+
+        - 행별 마지막 항목만 남김 (증분 소비자는 행별 최신 상태만 필요하므로 항상 안전)
+        - purge_tombstones_through를 주면 그 seq 이하의 톰스톤도 삭제하고, 그보다 이전 위치에서의
+          증분 요청은 ChangeLogExpiredError로 거절 (전체 내보내기 필요)
+
+        Args:
+            purge_tombstones_through: 톰스톤 삭제 기준 seq (모든 소비자가 처리한 위치, None이면 톰스톤 유지)
+
+        Returns:
+            삭제된 로그 건수
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "DELETE FROM change_log WHERE seq NOT IN "
+            "(SELECT MAX(seq) FROM change_log GROUP BY table_name, row_id)"
+        )
+        removed = cursor.rowcount
+        if purge_tombstones_through is not None:
+            cursor.execute(
+                "DELETE FROM change_log WHERE op = 'delete' AND seq <= ?", (purge_tombstones_through,)
+            )
+            removed += cursor.rowcount
+            cursor.execute(
+                "INSERT INTO change_log_state (name, value) VALUES ('purged_through', ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = MAX(value, excluded.value)",
+                (purge_tombstones_through,),
+            )
+        self.connection.commit()
+        return removed
+
+    def get_change_log_mark(self, consumer: str) -> Optional[int]:
+        """증분 소비자의 마지막 처리 위치
+
+        Args:
+            consumer: CHANGE_LOG_CONSUMERS 중 하나 ("csv_export" / "backup")
+
+        Returns:
+            마지막으로 내보낸/백업한 seq (한 번도 없으면 None → 전체 내보내기/백업 필요)
+        """
+        if consumer not in self.CHANGE_LOG_CONSUMERS:
+            raise ValueError(f"알 수 없는 변경 로그 소비자: {consumer}")
+        row = self.connection.execute(
+            "SELECT value FROM change_log_state WHERE name = ?", (f"mark:{consumer}",)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_change_log_mark(self, consumer: str, seq: int) -> None:
+        """증분 소비자의 처리 위치 저장 (내보내기/백업 성공 후, 다음 증분의 since_seq)
+
+        Args:
+            consumer: CHANGE_LOG_CONSUMERS 중 하나
+            seq: 이번에 처리한 위치
+        """
+        if consumer not in self.CHANGE_LOG_CONSUMERS:
+            raise ValueError(f"알 수 없는 변경 로그 소비자: {consumer}")
+        self.connection.execute(
+            "INSERT INTO change_log_state (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+            (f"mark:{consumer}", seq),
+        )
+        self.connection.commit()
+
+    def compact_change_log_for_consumers(self) -> int:
+        """소비자 위치 기준 압축 (모든 소비자가 처리한 위치까지 톰스톤 삭제)
+
+        한 번도 실행되지 않은 소비자는 처음에 전체 내보내기/백업을 하므로 기준에서 제외한다.
+
+        Returns:
+            삭제된 로그 건수
+        """
+        marks = [
+            mark for mark in (self.get_change_log_mark(consumer) for consumer in self.CHANGE_LOG_CONSUMERS)
+            if mark is not None
+        ]
+        return self.compact_change_log(purge_tombstones_through=min(marks) if marks else None)
+
     def close(self) -> None:
-        """데이터베이스 연결 종료 (AP-007 대응)"""
+        """데이터베이스 연결 종료 (AP-007 대응)
+
+        닫기 전에 PRAGMA optimize로 통계가 오래된 테이블만 다시 분석한다 (분석 행 수 제한).
+        """
         if self.connection:
+            try:
+                self.connection.execute("PRAGMA analysis_limit = 400")
+                self.connection.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass  # 읽기 전용/잠김 등 - 통계 갱신은 다음 기회에
             self.connection.close()
             self.connection = None
+            if self.profiler is not None:
+                self.profiler.flush()
 
     def __del__(self):
         """소멸자 - 연결 자동 종료"""
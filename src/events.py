@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+변경 이벤트 버스 - DatabaseManager 쓰기 → 화면 부분 갱신
+
+DatabaseManager는 커밋 후 바뀐 행을 ChangeEvent로 발행하고(events 속성), 화면은 구독해
+목록 전체를 다시 읽는 대신 해당 행/배지/카운터만 고친다.
+Tk 화면은 IdleDispatcher로 구독한다: 연속 쓰기(대량 가져오기 등)의 이벤트를 모아 유휴 시점에 한 번만 갱신.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+# 테이블 (DatabaseManager.CHANGE_LOG_TABLES와 같은 이름)
+CUSTOMERS = "customers"
+POLICIES = "policies"
+ALL = "*"  # 전체 (REFRESH 전용)
+
+# 작업
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+REFRESH = "refresh"  # 바뀐 행을 모름 (대량 갱신, 다른 연결의 변경) → 전체 다시 읽기
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """행 1개 변경 (REFRESH는 행 없음)"""
+
+    table: str
+    op: str
+    row_id: Optional[int] = None
+    customer_id: Optional[int] = None  # 고객 이벤트는 row_id와 같음, 계약 이벤트는 소유 고객
+
+
+def customer_event(op: str, customer_id: int) -> ChangeEvent:
+    return ChangeEvent(CUSTOMERS, op, customer_id, customer_id)
+
+
+def policy_event(op: str, policy_id: int, customer_id: Optional[int]) -> ChangeEvent:
+    return ChangeEvent(POLICIES, op, policy_id, customer_id)
+
+
+REFRESH_EVENT = ChangeEvent(ALL, REFRESH)
+
+
+@dataclass
+class ChangeBatch:
+    """이벤트 묶음 요약 (같은 행은 마지막 작업 기준, 추가 후 삭제는 삭제)"""
+
+    refresh: bool = False
+    customer_ids: Set[int] = field(default_factory=set)          # 다시 그릴 고객 (계약 변경 포함)
+    deleted_customer_ids: Set[int] = field(default_factory=set)
+    # 고객 ID → {계약 ID: 마지막 작업} (다른 고객으로 옮긴 계약은 이전 고객 삭제 + 새 고객 추가로 따로 남음)
+    customer_policy_ops: Dict[int, Dict[int, str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_events(cls, events: Iterable[ChangeEvent]) -> "ChangeBatch":
+        batch = cls()
+        for event in events:
+            if event.op == REFRESH:
+                batch.refresh = True
+            elif event.table == CUSTOMERS:
+                if event.op == DELETE:
+                    batch.deleted_customer_ids.add(event.row_id)
+                    batch.customer_ids.discard(event.row_id)
+                else:
+                    batch.deleted_customer_ids.discard(event.row_id)
+                    batch.customer_ids.add(event.row_id)
+            elif event.table == POLICIES and event.customer_id is not None:
+                batch.customer_policy_ops.setdefault(event.customer_id, {})[event.row_id] = event.op
+                if event.customer_id not in batch.deleted_customer_ids:
+                    batch.customer_ids.add(event.customer_id)
+        return batch
+
+    def policies_of(self, customer_id: int) -> Dict[int, str]:
+        """고객의 계약 변경 {계약 ID: 마지막 작업}"""
+        return dict(self.customer_policy_ops.get(customer_id, {}))
+
+
+class EventBus:
+    """동기 발행/구독 (발행한 스레드에서 구독자 호출, 구독자 예외는 쓰기에 영향 없음)"""
+
+    def __init__(self):
+        self._subscribers: List[Callable[[List[ChangeEvent]], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[List[ChangeEvent]], None]) -> Callable[[], None]:
+        """구독
+
+        Args:
+            callback: 쓰기 1건의 이벤트 리스트를 받는 함수
+
+        Returns:
+            구독 해제 함수
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def publish(self, events: List[ChangeEvent]) -> None:
+        if not events:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(events)
+            except Exception as e:
+                print(f"⚠️ 변경 이벤트 처리 실패: {e}")
+
+
+class IdleDispatcher:
+    """이벤트를 모아 Tk 유휴 시점에 한 번만 콜백 (EventBus 구독자로 사용)
+
+    쓰기가 Tk 스레드에서 연달아 일어나면 그 사이 유휴 콜백이 돌지 않으므로
+    몇 건이든 화면 갱신은 쓰기가 끝난 뒤 1회다.
+    """
+
+    def __init__(self, root, callback: Callable[[ChangeBatch], None]):
+        """
+        Args:
+            root: tkinter 위젯 (after_idle 호출용)
+            callback: 모은 이벤트 요약(ChangeBatch)을 받는 함수 (Tk 스레드)
+        """
+        self.root = root
+        self.callback = callback
+        self._pending: List[ChangeEvent] = []
+        self._after_id = None
+        self._lock = threading.Lock()
+
+    def __call__(self, events: List[ChangeEvent]) -> None:
+        with self._lock:
+            self._pending.extend(events)
+            if self._after_id is not None:
+                return
+            self._after_id = self.root.after_idle(self._flush)
+
+    def _flush(self) -> None:
+        with self._lock:
+            events, self._pending = self._pending, []
+            self._after_id = None
+        if events:
+            self.callback(ChangeBatch.from_events(events))
+
+    def cancel(self) -> None:
+        """대기 중인 갱신 취소 (창 닫을 때)"""
+        with self._lock:
+            self._pending = []
+            if self._after_id is not None:
+                self.root.after_cancel(self._after_id)
+                self._after_id = None
@@ -4,10 +4,12 @@
 보험 정보 + 건강 정보 + 고지 내용 포함
 """
 
+import copy
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Optional, Callable, List
 
+from database import ConflictError, RecordDeletedError
 from models import Customer, Policy
 from gui.theme import COLORS, FONTS, SPACING, SIZES
 from utils.validators import (
@@ -34,11 +36,14 @@ class CustomerForm:
         Args:
             parent: 부모 윈도우
             customer: 수정할 고객 (None이면 추가 모드)
-            on_save: 저장 후 호출될 콜백 함수
+            on_save: 저장 시 호출될 콜백 함수
+                     (추가: on_save(customer), 수정: on_save(customer, original) - original은 폼을 연 시점 스냅샷,
+                     update_customer에 넘겨 바뀐 컬럼만 저장 / ConflictError면 폼을 닫지 않음)
             database: DatabaseManager 인스턴스 (계약 관리용)
         """
         self.parent = parent
         self.customer = customer
+        self.original = copy.copy(customer)  # 편집 시작 시점 스냅샷 (바뀐 컬럼 계산 + 버전 비교 기준)
         self.on_save = on_save
         self.database = database
         self.is_edit_mode = customer is not None
@@ -1020,7 +1025,7 @@ class CustomerForm:
             resident_id=resident_id,
             birth_date=None,  # 주민번호로 대체됨
             address=self.address_var.get().strip() or None,
-            email=None,
+            email=self.customer.email if self.is_edit_mode else None,  # 폼에 없는 필드는 기존 값 유지
             memo=self.memo_text.get("1.0", tk.END).strip() or None,
             occupation=self.occupation_var.get().strip() or None,
             driving_type=self.driving_type_var.get(),
@@ -1036,16 +1041,34 @@ class CustomerForm:
             notification_content=self.notification_text.get("1.0", tk.END).strip() or None,
         )
 
-        # 수정 모드인 경우 ID 유지
+        # 수정 모드인 경우 ID/버전 유지 (주민번호가 그대로면 저장된 생년월일도 유지)
         if self.is_edit_mode:
             customer.id = self.customer.id
             customer.created_at = self.customer.created_at
+            customer.version = self.customer.version
+            if customer.resident_id == self.customer.resident_id:
+                customer.birth_date = self.customer.birth_date
 
         # 콜백 호출
         if self.on_save:
             try:
-                self.on_save(customer)
+                if self.is_edit_mode:
+                    self.on_save(customer, self.original)
+                else:
+                    self.on_save(customer)
                 self.window.destroy()
+            except RecordDeletedError:
+                messagebox.showwarning(
+                    "삭제된 고객",
+                    "이 고객은 그사이 다른 곳에서 삭제되어 수정 내용을 저장할 수 없습니다.\n"
+                    "필요한 내용을 옮겨 적은 뒤 창을 닫고 새 고객으로 다시 등록해주세요.",
+                )
+            except ConflictError:
+                messagebox.showwarning(
+                    "저장 충돌",
+                    "이 고객 정보를 그사이 다른 곳에서 먼저 수정했습니다.\n"
+                    "입력한 내용을 확인한 뒤 창을 닫고 다시 열어 최신 정보에서 수정해주세요.",
+                )
             except Exception as e:
                 messagebox.showerror("저장 실패", f"오류가 발생했습니다:\n{e}")
         else:
@@ -1166,6 +1189,72 @@ class CustomerForm:
         # 계약 목록 로드
         self._load_policies()
 
+        # 다른 화면/연결에서 바뀐 계약도 반영 (변경 이벤트 구독, 창 닫으면 해제)
+        if self.database is not None:
+            from events import IdleDispatcher
+
+            dispatcher = IdleDispatcher(self.window, self._on_db_changes)
+            unsubscribe = self.database.events.subscribe(dispatcher)
+
+            def _on_destroy(event):
+                if event.widget is self.window:
+                    unsubscribe()
+                    dispatcher.cancel()
+
+            self.window.bind("<Destroy>", _on_destroy, add="+")
+
+    def _on_db_changes(self, batch):
+        """계약 변경 반영 (이 고객의 계약 행만 추가/수정/삭제, 바뀐 행을 모르면 다시 로드)
+
+        Args:
+            batch: events.ChangeBatch
+        """
+        from events import INSERT, DELETE
+
+        customer_id = self.customer.id
+        if customer_id in batch.deleted_customer_ids:
+            return
+        if batch.refresh:
+            self._load_policies()
+            return
+
+        for policy_id, op in batch.policies_of(customer_id).items():
+            iid = str(policy_id)
+            if op == DELETE:
+                if self.policy_tree.exists(iid):
+                    self.policy_tree.delete(iid)
+                continue
+            policy = self.database.get_policy(policy_id)
+            if policy is None or policy.customer_id != customer_id:
+                if self.policy_tree.exists(iid):
+                    self.policy_tree.delete(iid)
+            elif self.policy_tree.exists(iid):
+                self.policy_tree.item(iid, values=self._policy_values(policy))
+            elif op == INSERT:
+                # 최신 등록순 (get_policies_by_customer: created_at DESC)
+                self.policy_tree.insert("", 0, iid=iid, values=self._policy_values(policy), tags=(iid,))
+
+    @staticmethod
+    def _policy_values(policy: Policy) -> tuple:
+        """계약 → Treeview 행 값"""
+        # 상태 한글 변환
+        status_map = {"active": "활성", "overdue": "연체", "terminated": "해지"}
+        status_text = status_map.get(policy.status, policy.status)
+
+        # 보험료 천 단위 쉼표
+        premium_text = f"{policy.premium:,}원"
+
+        # 납부일
+        billing_day_text = f"{policy.billing_day}일"
+
+        return (
+            policy.insurer,
+            policy.product_name,
+            premium_text,
+            billing_day_text,
+            status_text,
+        )
+
     def _load_policies(self):
         """고객의 계약 목록을 Treeview에 로드"""
         if not self.database or not self.customer or not self.customer.id:
@@ -1178,28 +1267,13 @@ class CustomerForm:
         # 계약 목록 조회
         policies = self.database.get_policies_by_customer(self.customer.id)
 
-        # Treeview에 추가
+        # Treeview에 추가 (iid = 계약 ID: 변경 이벤트로 해당 행만 고침)
         for policy in policies:
-            # 상태 한글 변환
-            status_map = {"active": "활성", "overdue": "연체", "terminated": "해지"}
-            status_text = status_map.get(policy.status, policy.status)
-
-            # 보험료 천 단위 쉼표
-            premium_text = f"{policy.premium:,}원"
-
-            # 납부일
-            billing_day_text = f"{policy.billing_day}일"
-
             self.policy_tree.insert(
                 "",
                 "end",
-                values=(
-                    policy.insurer,
-                    policy.product_name,
-                    premium_text,
-                    billing_day_text,
-                    status_text,
-                ),
+                iid=str(policy.id),
+                values=self._policy_values(policy),
                 tags=(str(policy.id),),
             )
 
@@ -1214,10 +1288,8 @@ class CustomerForm:
 
         def on_policy_save(policy: Policy):
             """PolicyForm 저장 콜백"""
-            # DB에 저장
+            # DB에 저장 (목록은 변경 이벤트로 갱신)
             self.database.add_policy(policy)
-            # 목록 새로고침
-            self._load_policies()
             messagebox.showinfo("성공", "계약이 추가되었습니다")
 
         # PolicyForm 모달 열기
@@ -1246,12 +1318,11 @@ class CustomerForm:
         # PolicyForm import (lazy import)
         from gui.policy_form import PolicyForm
 
-        def on_policy_update(updated_policy: Policy):
-            """PolicyForm 저장 콜백"""
-            # DB 업데이트
-            self.database.update_policy(updated_policy)
-            # 목록 새로고침
-            self._load_policies()
+        def on_policy_update(updated_policy: Policy, original: Policy):
+            """PolicyForm 저장 콜백 (original: 폼을 연 시점 스냅샷 → 바뀐 컬럼만 저장)"""
+            # DB 업데이트 (바뀐 내용이 없으면 쓰기 생략, 목록은 변경 이벤트로 갱신)
+            if not self.database.update_policy(updated_policy, original):
+                return
             messagebox.showinfo("성공", "계약이 수정되었습니다")
 
         # PolicyForm 모달 열기 (수정 모드)
@@ -1284,8 +1355,6 @@ class CustomerForm:
         if response:
             # DB에서 삭제
             if self.database.delete_policy(policy_id):
-                # 목록 새로고침
-                self._load_policies()
                 messagebox.showinfo("성공", "계약이 삭제되었습니다")
             else:
                 messagebox.showerror("오류", "계약 삭제에 실패했습니다")
@@ -1321,7 +1390,6 @@ class CustomerForm:
 
         if response:
             if self.database.mark_payment_completed(policy_id, today):
-                self._load_policies()
                 messagebox.showinfo("성공", "납부 완료 처리되었습니다.\n다음 납부일이 갱신되었습니다.")
             else:
                 messagebox.showerror("오류", "납부 완료 처리에 실패했습니다")
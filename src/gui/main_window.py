@@ -10,23 +10,38 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
 from pathlib import Path
 from datetime import datetime
+from typing import Tuple
 
-from database import DatabaseManager
+from database import ConflictError, DatabaseManager
 from models import Customer
-from gui.customer_form import CustomerForm
 from gui.theme import COLORS, FONTS, SPACING, SIZES, APP_INFO
-from utils.file_helpers import backup_database, restore_database
-from utils.export_helpers import export_to_csv
-from utils.message_simulator import simulate_sms_send, send_sms, build_sms_template_message, build_review_text
+from segments import count_bits
+from customer_list import fetch_summary_page, select_customer_ids
+from events import ChangeBatch, IdleDispatcher
+from utils.date_helpers import birthday_mmdds
 
+# 첫 화면에 필요 없는 모듈(폼, 백업/복원, CSV, SMS, 프리페치)은 사용 시점에 import 한다.
+# (시작 시간 예산: scripts/startup_benchmark.py)
 
-def show_toast(parent, message, duration=1500):
-    """자동 사라지는 토스트 메시지
+
+# 정렬 가능한 컬럼 → DatabaseManager.SUMMARY_SORT_COLUMNS 키 (헤더 클릭)
+SORTABLE_COLUMNS = {
+    "납부": "next_payment",
+    "연체": "overdue",
+    "고객명": "name",
+    "전화번호": "phone",
+    "입금": "payment_method",
+}
+
+
+def show_toast(parent, message, duration=1500, bg=None):
+    """자동 사라지는 토스트 메시지 (비모달, 클릭하면 바로 닫힘)
 
     Args:
         parent: 부모 윈도우
         message: 표시할 메시지
         duration: 표시 시간 (밀리초, 기본: 1500ms)
+        bg: 배경색 (기본: COLORS["success"])
     """
     toast = tk.Toplevel(parent)
     toast.overrideredirect(True)  # 테두리 제거
@@ -37,12 +52,14 @@ def show_toast(parent, message, duration=1500):
         toast,
         text=message,
         font=FONTS["body"],
-        bg=COLORS["success"],
+        bg=bg or COLORS["success"],
         fg=COLORS["text_on_primary"],
+        justify=tk.LEFT,
         padx=20,
         pady=10,
     )
     label.pack()
+    label.bind("<Button-1>", lambda e: toast.destroy())
 
     # 화면 중앙 하단에 배치
     parent.update_idletasks()
@@ -59,30 +76,85 @@ def show_toast(parent, message, duration=1500):
     toast.after(duration, toast.destroy)
 
 
+def _run_startup_payment_check(db_path: str, server_url: str = None) -> dict:
+    """(작업 스레드) 납부 상태 자동 갱신 + 알림 건수 조회
+
+    sqlite3 연결은 생성한 스레드 전용이므로 작업 스레드에서 별도 DatabaseManager를 연다.
+
+    Args:
+        db_path: 데이터베이스 파일 경로
+        server_url: 서비스 모드 주소 (지정하면 db_path 대신 서비스에서 실행)
+
+    Returns:
+        {"updated", "overdue", "upcoming_count", "overdue_count"}
+    """
+    if server_url:
+        from service import RemoteDatabase
+
+        db = RemoteDatabase(server_url)
+    else:
+        db = DatabaseManager(db_path)
+    try:
+        result = db.auto_update_payment_status()
+        result.update(db.get_payment_alert_counts(days_ahead=7))
+        return result
+    finally:
+        db.close()
+
+
 class MainWindow:
     """메인 윈도우 클래스 - 확장 버전"""
 
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: tk.Tk, instance_server=None, open_customer_id=None, server_url=None):
         """메인 윈도우 초기화
 
         Args:
             root: tkinter 루트 윈도우
+            instance_server: 두 번째 실행/다른 프로세스 명령 수신기 (utils.single_instance.InstanceServer)
+            open_customer_id: 시작 시 열 고객 ID (--open-customer)
+            server_url: 서비스 모드 주소 (--server, 지정하면 로컬 DB 대신 service.RemoteDatabase)
         """
         self.root = root
+        self.instance_server = instance_server
+        self._open_customer_id = open_customer_id
+        self.server_url = server_url
         self.root.title(APP_INFO["title"])
         self.root.geometry("1400x800")  # 크기 확대
         self.root.configure(bg=COLORS["bg_main"])
         self.root.minsize(1200, 700)
 
-        # 데이터베이스 초기화 (환경변수 지원)
-        db_path = os.environ.get("CRM_DB_PATH", "data/crm.db")
-        self.db = DatabaseManager(db_path)
+        # 데이터베이스는 첫 화면을 그린 뒤 _init_database()에서 연결
+        self.db = None
+
+        # 선택 행 주변 고객/계약 백그라운드 프리페치
+        self.prefetcher = None
+        self._prefetch_after_id = None
+
+        # SMS 백그라운드 발송기 (_get_sms_worker()에서 생성)
+        self._sms_worker = None
+        self._sms_status_queue = None
 
         # 선택된 고객 ID
         self.selected_customer_id = None
 
         # 필터 상태
-        self.filter_mode = "all"  # "all" / "credit_card" / "today_card" / "overdue" / "upcoming_payment" / "birthday" / "medical"
+        self.filter_mode = "all"  # "all" / "credit_card" / "today_card" / "overdue" / "upcoming_payment" / "birthday" / "medical" / "age_change"
+        self.filter_combination = {}  # 추가 조합 필터: 모드 → "and" (Ctrl+클릭) / "not" (우클릭)
+        self.filter_labels = {}  # 필터 모드 → 버튼 텍스트 (조합 상태 표시용)
+
+        # 헤더 정렬 상태 (None이면 필터별 기본 정렬)
+        self.sort_key = None  # SORTABLE_COLUMNS 값
+        self.sort_descending = False
+
+        # 목록 페이지 상태: 정렬된 ID 전체 + 테이블에 채운 행 수 (select_customer_ids / _append_list_page)
+        self._list_ids = []
+        self._list_loaded = 0
+        self._list_customers = None  # 현재 검색 범위 (정렬 변경 시 유지)
+        self._list_page_pending = False
+
+        # DB 변경 이벤트 구독 (_subscribe_changes: 유휴 시점에 모아서 바뀐 행만 갱신)
+        self._change_dispatcher = None
+        self._unsubscribe_changes = None
 
         # 스타일 설정
         self._setup_styles()
@@ -93,14 +165,78 @@ class MainWindow:
         self._create_main_content()  # 좌측 테이블 + 우측 상세 패널
         self._create_footer()
 
-        # 초기 데이터 로드
-        self.load_customers()
-
         # 윈도우 중앙 배치
         self._center_window()
 
-        # 앱 시작 시 납부 알림 체크 (UI 렌더링 후 실행)
-        self.root.after(500, self._check_payments_on_startup)
+        # 초기 데이터 로드 (첫 화면 렌더링 이후 유휴 시간에 실행)
+        self.count_label.config(text="불러오는 중...")
+        self.root.after_idle(self._init_database)
+
+    def _init_database(self):
+        """데이터베이스 연결(스키마 준비) + 초기 목록 로드 + 납부 알림 예약"""
+        # 데이터베이스 초기화 (환경변수 지원, 서비스 모드면 서비스 접속)
+        if self.server_url:
+            self._connect_service(self.server_url)
+        else:
+            self._open_database(os.environ.get("CRM_DB_PATH", "data/crm.db"))
+        self.load_customers()
+        if self._open_customer_id is not None:
+            self._open_customer(self._open_customer_id)
+
+        # 두 번째 실행/다른 프로세스 명령 처리 (DB 연결 이후: 쓰기 위임은 이 연결에서 실행)
+        if self.instance_server is not None:
+            self.root.after_idle(self._poll_instance_requests)
+
+        # 시작 시간 측정 모드: 데이터 로드까지 마치면 종료 (scripts/startup_benchmark.py)
+        if os.environ.get("CRM_STARTUP_PROBE"):
+            self.root.after_idle(self.root.destroy)
+            return
+
+        # 앱 시작 시 납부 상태 갱신 + 알림 (작업 스레드)
+        self._check_payments_on_startup()
+
+    def _open_database(self, db_path: str):
+        """DatabaseManager + 프리페처 생성
+
+        Args:
+            db_path: 데이터베이스 파일 경로
+        """
+        from prefetch import Prefetcher
+
+        self.db = DatabaseManager(db_path)
+        self.prefetcher = Prefetcher(self.db)
+        self._subscribe_changes()
+
+    def _connect_service(self, server_url: str):
+        """서비스 클라이언트 연결 (프리페치 없음: 캐시는 서비스 읽기 스레드가 유지)
+
+        Args:
+            server_url: 서비스 주소
+        """
+        from service import RemoteDatabase
+
+        self.db = RemoteDatabase(server_url)
+        self.root.title(f"{APP_INFO['title']} - {server_url}")
+        self._subscribe_changes()
+
+    def _subscribe_changes(self):
+        """현재 DB의 변경 이벤트 구독 (복원으로 DB를 다시 열면 이전 구독은 해제)"""
+        if self._unsubscribe_changes is not None:
+            self._unsubscribe_changes()
+            self._change_dispatcher.cancel()
+        self._change_dispatcher = IdleDispatcher(self.root, self._on_db_changes)
+        self._unsubscribe_changes = self.db.events.subscribe(self._change_dispatcher)
+
+    def _require_local_database(self, feature: str) -> bool:
+        """로컬 DB 파일이 필요한 기능인지 확인 (서비스 모드면 안내 후 False)
+
+        Args:
+            feature: 기능 이름 (안내 메시지용)
+        """
+        if not self.server_url:
+            return True
+        messagebox.showinfo(feature, f"서비스 모드에서는 {feature}을(를) 서비스 PC에서 실행하세요.")
+        return False
 
     def _center_window(self):
         """윈도우를 화면 중앙에 배치"""
@@ -112,31 +248,43 @@ class MainWindow:
         self.root.geometry(f"{w}x{h}+{x}+{y}")
 
     def _check_payments_on_startup(self):
-        """앱 시작 시 납부 상태 자동 갱신 + 알림"""
-        try:
-            # 1. 납부 상태 자동 갱신 (NEW!)
-            result = self.db.auto_update_payment_status()
-
-            # 2. 납부 임박/연체 조회
-            upcoming = self.db.get_upcoming_payments(days_ahead=7)
-            overdue = self.db.get_overdue_policies()
-
-            messages = []
-            if result["updated"] > 0:
-                messages.append(f"🔄 {result['updated']}건 연체 상태로 갱신됨")
-            if upcoming:
-                messages.append(f"📅 납부 임박 (7일 이내): {len(upcoming)}건")
-            if overdue:
-                messages.append(f"⚠️ 연체 계약: {len(overdue)}건")
-
-            if messages:
-                messagebox.showinfo(
-                    "납부 상태 알림",
-                    "\n".join(messages) + "\n\n필터 버튼으로 해당 고객을 확인하세요."
-                )
-        except Exception as e:
-            # 시작 시 알림 실패해도 앱 실행에 영향 없음
-            print(f"⚠️ 납부 상태 체크 실패: {e}")
+        """앱 시작 시 납부 상태 자동 갱신 + 알림 (작업 스레드에서 실행, 결과는 root.after로 전달)"""
+        from utils.background import run_in_background
+
+        db_path = None if self.server_url else str(self.db.db_path)
+        run_in_background(
+            self.root,
+            lambda: _run_startup_payment_check(db_path, self.server_url),
+            on_done=self._on_payment_check_done,
+            on_error=self._on_payment_check_failed,
+        )
+
+    def _on_payment_check_done(self, result: dict):
+        """납부 상태 체크 결과 반영 (Tk 스레드)"""
+        # 다른 연결에서 상태가 바뀌었으므로 캐시/세그먼트를 비움 (REFRESH 이벤트 → 목록 다시 그림)
+        if result["updated"] > 0:
+            self.db.invalidate_caches()
+
+        messages = []
+        if result["updated"] > 0:
+            messages.append(f"🔄 {result['updated']}건 연체 상태로 갱신됨")
+        if result["upcoming_count"]:
+            messages.append(f"📅 납부 임박 (7일 이내): {result['upcoming_count']}건")
+        if result["overdue_count"]:
+            messages.append(f"⚠️ 연체 계약: {result['overdue_count']}건")
+
+        if messages:
+            show_toast(
+                self.root,
+                "\n".join(messages) + "\n필터 버튼으로 해당 고객을 확인하세요.",
+                duration=6000,
+                bg=COLORS["warning"],
+            )
+
+    def _on_payment_check_failed(self, error: BaseException):
+        """납부 상태 체크 실패 (Tk 스레드)"""
+        # 시작 시 알림 실패해도 앱 실행에 영향 없음
+        print(f"⚠️ 납부 상태 체크 실패: {error}")
 
     def _setup_styles(self):
         """ttk 스타일 설정"""
@@ -376,6 +524,7 @@ class MainWindow:
         self._create_filter_button(filter_frame, "이번주 준비", "upcoming_payment")
         self._create_filter_button(filter_frame, "생일자만 보기", "birthday")
         self._create_filter_button(filter_frame, "유병자만 보기", "medical")
+        self._create_filter_button(filter_frame, "상령일 임박", "age_change")
         self._create_filter_button(filter_frame, "전체 보기", "all")
 
         # 필터 상태 표시
@@ -436,6 +585,7 @@ class MainWindow:
             style="Custom.Vertical.TScrollbar",
         )
         scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree_scrollbar = scrollbar_y
 
         # Treeview 테이블 (컬럼 변경)
         columns = ("생일", "유병", "납부", "연체", "고객명", "전화번호", "주민번호", "운전", "입금")
@@ -443,7 +593,7 @@ class MainWindow:
             parent,
             columns=columns,
             show="headings",
-            yscrollcommand=scrollbar_y.set,
+            yscrollcommand=self._on_tree_scroll,  # 스크롤바 갱신 + 끝 근처면 다음 페이지
             style="Custom.Treeview",
             selectmode="browse",
         )
@@ -460,6 +610,11 @@ class MainWindow:
         self.tree.heading("운전", text="운전", anchor=tk.CENTER)
         self.tree.heading("입금", text="입금방식", anchor=tk.CENTER)
 
+        # 헤더 클릭 정렬 (같은 컬럼 다시 클릭하면 방향 전환)
+        self.heading_texts = {col: self.tree.heading(col, "text") for col in columns}
+        for col in SORTABLE_COLUMNS:
+            self.tree.heading(col, command=lambda c=col: self._on_sort_column(c))
+
         self.tree.column("생일", width=40, minwidth=40, anchor=tk.CENTER)
         self.tree.column("유병", width=40, minwidth=40, anchor=tk.CENTER)
         self.tree.column("납부", width=40, minwidth=40, anchor=tk.CENTER)
@@ -502,9 +657,8 @@ class MainWindow:
         scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.detail_canvas.yview)
         self.detail_frame = tk.Frame(self.detail_canvas, bg=COLORS["bg_white"])
 
-        # scrollregion 안전하게 갱신
+        # scrollregion 갱신 (<Configure>는 geometry 계산 이후 발생하므로 강제 갱신 불필요)
         def _update_scroll_region():
-            self.detail_frame.update_idletasks()
             bbox = self.detail_canvas.bbox("all")
             if bbox:
                 self.detail_canvas.configure(scrollregion=bbox)
@@ -526,44 +680,66 @@ class MainWindow:
         self.detail_canvas.bind("<MouseWheel>", _on_mousewheel)
         self.detail_canvas.bind("<Enter>", lambda e: self.detail_canvas.focus_set())
 
+        # 상세 위젯은 한 번만 생성하고 선택 시 텍스트만 갱신 (위젯 재생성 없음)
+        self._build_detail_widgets()
+
         # 초기 안내 메시지
         self._show_detail_placeholder()
 
-    def _show_detail_placeholder(self):
-        """상세 패널에 안내 메시지 표시"""
-        for widget in self.detail_frame.winfo_children():
-            widget.destroy()
-
-        tk.Label(
+    def _build_detail_widgets(self):
+        """상세 패널 위젯 풀 생성 (안내 메시지 + 섹션/행 레이블)"""
+        self.detail_placeholder = tk.Label(
             self.detail_frame,
             text="고객을 선택하세요",
             font=FONTS["body"],
             bg=COLORS["bg_white"],
             fg=COLORS["text_hint"],
-        ).pack(padx=20, pady=50)
-
-        # ✨ 추가: scrollregion 리셋
-        self.detail_frame.update_idletasks()
-        self.detail_canvas.configure(scrollregion=(0, 0, 320, 100))
-
-    def _show_customer_detail(self, customer: Customer):
-        """상세 패널에 고객 정보 표시"""
-        for widget in self.detail_frame.winfo_children():
-            widget.destroy()
+        )
 
-        inner = tk.Frame(self.detail_frame, bg=COLORS["bg_white"])
-        inner.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
+        self.detail_inner = tk.Frame(self.detail_frame, bg=COLORS["bg_white"])
+        self.detail_values = {}  # 항목 키 → 값 Label
 
         # ===== 기본 정보 =====
-        self._add_section_header(inner, "기본 정보")
-        self._add_detail_row(inner, "이름", customer.name)
-        self._add_detail_row(inner, "전화", customer.phone)
-        self._add_detail_row(inner, "주민", customer.resident_id)
-        self._add_detail_row(inner, "주소", customer.address or "-")
-        self._add_detail_row(inner, "직업", customer.occupation or "-")
+        self._add_section_header(self.detail_inner, "기본 정보")
+        self._add_detail_row(self.detail_inner, "name", "이름")
+        self._add_detail_row(self.detail_inner, "phone", "전화")
+        self._add_detail_row(self.detail_inner, "resident_id", "주민")
+        self._add_detail_row(self.detail_inner, "address", "주소")
+        self._add_detail_row(self.detail_inner, "occupation", "직업")
 
         # ===== 보험 정보 =====
-        self._add_section_header(inner, "보험 정보")
+        self._add_section_header(self.detail_inner, "보험 정보")
+        self._add_detail_row(self.detail_inner, "driving", "운전")
+        self._add_detail_row(self.detail_inner, "payment_method", "입금")
+
+        # ===== 건강 정보 =====
+        self._add_section_header(self.detail_inner, "건강 정보")
+        self._add_detail_row(self.detail_inner, "med_medication", "약복용")
+        self._add_detail_row(self.detail_inner, "recent_exam", "최근진찰")
+        self._add_detail_row(self.detail_inner, "diagnosis", "5년진단")
+
+        # ===== 고지/메모 =====
+        self._add_section_header(self.detail_inner, "고지/메모")
+        self._add_detail_row(self.detail_inner, "notification_content", "고지", multiline=True)
+        self._add_detail_row(self.detail_inner, "memo", "메모", multiline=True)
+
+    def _show_detail_placeholder(self):
+        """상세 패널에 안내 메시지 표시"""
+        if self.detail_inner.winfo_manager():
+            self.detail_inner.pack_forget()
+        if not self.detail_placeholder.winfo_manager():
+            self.detail_placeholder.pack(padx=20, pady=50)
+
+        # ✨ 추가: scrollregion 리셋
+        self.detail_canvas.yview_moveto(0)
+        self.detail_canvas.configure(scrollregion=(0, 0, 320, 100))
+
+    def _show_customer_detail(self, customer: Customer):
+        """상세 패널에 고객 정보 표시 (기존 레이블 텍스트만 갱신)"""
+        if self.detail_placeholder.winfo_manager():
+            self.detail_placeholder.pack_forget()
+        if not self.detail_inner.winfo_manager():
+            self.detail_inner.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
 
         # 운전 여부
         driving_map = {"none": "미운전", "personal": "자가용", "commercial": "영업용"}
@@ -573,19 +749,11 @@ class MainWindow:
             detail_map = {"taxi": "택시", "construction": "건설용"}
             detail_text = ", ".join([detail_map.get(d.strip(), d.strip()) for d in details])
             driving_text += f" ({detail_text})"
-        self._add_detail_row(inner, "운전", driving_text)
-
-        self._add_detail_row(inner, "입금", customer.payment_method or "-")
-
-        # ===== 건강 정보 =====
-        self._add_section_header(inner, "건강 정보")
-        self._add_detail_row(inner, "약복용", customer.med_medication or "-")
 
         # 최근 3개월 진찰
         recent_exam = "있음" if customer.med_recent_exam else "없음"
         if customer.med_recent_exam_detail:
             recent_exam += f" - {customer.med_recent_exam_detail}"
-        self._add_detail_row(inner, "최근진찰", recent_exam)
 
         # 5년 이내 진단
         diagnosis_display = customer.med_5yr_diagnosis or "-"
@@ -594,18 +762,25 @@ class MainWindow:
                 diagnosis_display = customer.med_5yr_custom
             else:
                 diagnosis_display += f", {customer.med_5yr_custom}"
-        self._add_detail_row(inner, "5년진단", diagnosis_display)
 
-        # ===== 고지/메모 =====
-        self._add_section_header(inner, "고지/메모")
-        self._add_detail_row(inner, "고지", customer.notification_content or "-", multiline=True)
-        self._add_detail_row(inner, "메모", customer.memo or "-", multiline=True)
-
-        # ✨ 추가: scrollregion 강제 갱신
-        self.detail_frame.update_idletasks()
-        bbox = self.detail_canvas.bbox("all")
-        if bbox:
-            self.detail_canvas.configure(scrollregion=bbox)
+        values = {
+            "name": customer.name,
+            "phone": customer.phone,
+            "resident_id": customer.resident_id,
+            "address": customer.address or "-",
+            "occupation": customer.occupation or "-",
+            "driving": driving_text,
+            "payment_method": customer.payment_method or "-",
+            "med_medication": customer.med_medication or "-",
+            "recent_exam": recent_exam,
+            "diagnosis": diagnosis_display,
+            "notification_content": customer.notification_content or "-",
+            "memo": customer.memo or "-",
+        }
+        for key, value in values.items():
+            label = self.detail_values[key]
+            if label.cget("text") != value:
+                label.config(text=value)
 
     def _add_section_header(self, parent: tk.Frame, title: str):
         """섹션 헤더 추가"""
@@ -621,8 +796,8 @@ class MainWindow:
             anchor=tk.W,
         ).pack(fill=tk.X)
 
-    def _add_detail_row(self, parent: tk.Frame, label: str, value: str, multiline: bool = False):
-        """상세 정보 행 추가"""
+    def _add_detail_row(self, parent: tk.Frame, key: str, label: str, multiline: bool = False):
+        """상세 정보 행 추가 (값 Label은 self.detail_values[key]에 등록)"""
         frame = tk.Frame(parent, bg=COLORS["bg_white"])
         frame.pack(fill=tk.X, pady=3)
 
@@ -636,28 +811,19 @@ class MainWindow:
             width=8,
         ).pack(side=tk.LEFT)
 
-        if multiline and len(value) > 30:
-            # 여러 줄 텍스트
-            text_label = tk.Label(
-                frame,
-                text=value,
-                font=("Malgun Gothic", 9),
-                bg=COLORS["bg_white"],
-                fg=COLORS["text_primary"],
-                anchor=tk.W,
-                justify=tk.LEFT,
-                wraplength=220,
-            )
-            text_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
-        else:
-            tk.Label(
-                frame,
-                text=value,
-                font=("Malgun Gothic", 9),
-                bg=COLORS["bg_white"],
-                fg=COLORS["text_primary"],
-                anchor=tk.W,
-            ).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        value_label = tk.Label(
+            frame,
+            text="-",
+            font=("Malgun Gothic", 9),
+            bg=COLORS["bg_white"],
+            fg=COLORS["text_primary"],
+            anchor=tk.W,
+        )
+        if multiline:
+            # 여러 줄 텍스트 (짧은 값은 한 줄로 표시됨)
+            value_label.config(justify=tk.LEFT, wraplength=220)
+        value_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.detail_values[key] = value_label
 
     def _create_footer(self):
         """하단 버튼 영역"""
@@ -711,6 +877,8 @@ class MainWindow:
         )
         self.btn_sms_send.config(state="disabled")
 
+        self._create_button(right_group, "SMS Campaign", COLORS["info"], self._on_sms_campaign)
+
         self._create_button(right_group, "Exit", COLORS["btn_exit"], self._on_exit, side=tk.RIGHT)
 
     def _create_button(
@@ -757,183 +925,264 @@ class MainWindow:
             cursor="hand2",
             command=lambda: self._apply_filter(mode),
         )
+        # Ctrl+클릭: AND 조합 추가/해제, 우클릭: 제외(NOT) 조합 추가/해제
+        btn.bind("<Control-Button-1>", lambda e: self._toggle_filter_combination(mode, "and") or "break")
+        btn.bind("<Button-3>", lambda e: self._toggle_filter_combination(mode, "not"))
+        self.filter_labels[mode] = text
         btn.pack(side=tk.LEFT, padx=2)
         return btn
 
     def load_customers(self, customers=None):
-        """고객 목록을 테이블에 로드"""
-        # 기존 데이터 삭제
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # 고객 데이터 로드
-        if customers is None:
-            customers = self.db.get_all_customers()
-
-        # 오늘 날짜 (MM-DD)
-        today = datetime.now().strftime("%m-%d")
-
-        # 생일자 및 유병자 카운트
-        birthday_count = 0
-        medical_count = 0
-        credit_card_count = 0
-
-        # 납부 임박 및 연체 고객 조회 (성능 최적화)
-        upcoming_payments = self.db.get_upcoming_payments(days_ahead=7)
-        overdue_policies = self.db.get_overdue_policies()
-
-        # customer_id로 매핑 (빠른 조회)
-        upcoming_customer_ids = {p["customer"].id for p in upcoming_payments}
-        overdue_customer_ids = {p["customer"].id for p in overdue_policies}
-        overdue_days_by_customer = {}
-        for item in overdue_policies:
-            customer_id = item["customer"].id
-            overdue_days = item.get("overdue_days", 0)
-            if customer_id not in overdue_days_by_customer:
-                overdue_days_by_customer[customer_id] = overdue_days
-            else:
-                overdue_days_by_customer[customer_id] = max(
-                    overdue_days_by_customer[customer_id], overdue_days
-                )
+        """고객 목록을 테이블에 로드 (첫 페이지만 채우고 나머지는 스크롤 시 추가)
 
-        # 오늘 납부 예정 고객 (당일만)
-        today_str = datetime.now().strftime("%Y-%m-%d")
-        today_payment_customer_ids = {
-            p["customer"].id for p in upcoming_payments
-            if p["policy"].next_payment_date == today_str
-        }
-        upcoming_only_customer_ids = upcoming_customer_ids - today_payment_customer_ids
-
-        # 생일자 우선 정렬 + 필터 적용
-        def is_birthday_today(cust):
-            """생일인지 확인"""
-            if cust.resident_id:
-                try:
-                    resident_front = cust.resident_id.split("-")[0]
-                    if len(resident_front) == 6:
-                        birth_mmdd = resident_front[2:4] + "-" + resident_front[4:6]
-                        return birth_mmdd == today
-                except:
-                    pass
-            return False
+        Args:
+            customers: 검색 결과 고객 리스트 (None이면 전체)
+        """
+        # 기존 데이터 삭제 (채운 페이지 분량만)
+        self.tree.delete(*self.tree.get_children())
+
+        # 필터/정렬 (화면과 무관한 부분은 select_customer_ids에서 처리)
+        self._list_customers = customers
+        self._list_ids, scope_bits = select_customer_ids(
+            self.db, self.filter_mode, self.filter_combination, customers,
+            self.sort_key, self.sort_descending,
+        )
+        self._list_loaded = 0
+        self._append_list_page()
+        self._update_list_counters(scope_bits)
 
-        def is_patient(cust):
-            """유병자 여부 판단 (약 복용, 최근 진찰, 5년 진단, 사용자 정의 진단)"""
-            return any([
-                cust.med_medication,
-                cust.med_recent_exam,
-                cust.med_5yr_diagnosis,
-                cust.med_5yr_custom,
-            ])
-
-        def is_credit_card(cust):
-            payment_method = (cust.payment_method or "").strip()
-            return payment_method in {"신용카드", "card"}
-
-        # 필터 적용
-        filtered_customers = []
-        for customer in customers:
-            is_bday = is_birthday_today(customer)
-            is_med = is_patient(customer)
-            is_card = is_credit_card(customer)
-
-            if is_bday:
-                birthday_count += 1
-            if is_med:
-                medical_count += 1
-            if is_card:
-                credit_card_count += 1
-
-            # 필터 모드에 따라 선택
-            if self.filter_mode == "birthday" and not is_bday:
-                continue
-            elif self.filter_mode == "credit_card" and not is_card:
-                continue
-            elif self.filter_mode == "today_card" and customer.id not in today_payment_customer_ids:
-                continue
-            elif self.filter_mode == "medical" and not is_med:
-                continue
-            elif self.filter_mode == "upcoming_payment" and customer.id not in upcoming_only_customer_ids:
-                continue
-            elif self.filter_mode == "overdue" and customer.id not in overdue_customer_ids:
-                continue
+    def _update_list_counters(self, scope_bits: int):
+        """고객 수 + 필터 상태 표시 갱신
+
+        Args:
+            scope_bits: 검색 범위 비트 (select_customer_ids 결과)
+        """
+        segments = self.db.get_segment_index()
+        total_count = count_bits(scope_bits)
+
+        # 고객 수 업데이트
+        count = len(self._list_ids)
+        self.count_label.config(text=f"총 {count}명")
 
-            filtered_customers.append(customer)
+        # 필터 상태 표시 (세그먼트 비트 카운트)
+        birthday_count = count_bits(segments.bits("birthday_today") & scope_bits)
+        credit_card_count = count_bits(segments.bits("credit_card") & scope_bits)
+        medical_count = count_bits(segments.bits("patient") & scope_bits)
+        age_change_count = count_bits(segments.bits("age_change") & scope_bits)
+        combination_text = "".join(
+            f" {'+' if op == 'and' else '-'}{self.filter_labels.get(mode, mode)}"
+            for mode, op in self.filter_combination.items()
+        )
+        self.filter_status_label.config(
+            text=(
+                f"(전체 {total_count}명 | 생일자 {birthday_count}명 | "
+                f"신용카드 {credit_card_count}명 | 유병자 {medical_count}명 | "
+                f"상령일 임박 {age_change_count}명){combination_text}"
+            )
+        )
 
-        # 생일자 우선 정렬
-        def sort_key(cust):
-            is_bday = is_birthday_today(cust)
-            if self.filter_mode == "overdue":
-                # 연체 필터에서는 연체일수 큰 고객을 먼저 배치
-                return (0, -overdue_days_by_customer.get(cust.id, 0), cust.name)
-            return (0 if is_bday else 1, cust.name)
+    def _append_list_page(self):
+        """정렬된 ID 목록의 다음 페이지를 테이블 끝에 추가"""
+        self._list_page_pending = False
+        summaries = fetch_summary_page(self.db, self._list_ids, self._list_loaded)
+        if not summaries:
+            return
 
-        filtered_customers.sort(key=sort_key)
+        birthday_today = birthday_mmdds(datetime.now().date())
 
-        # 테이블에 추가
-        for i, customer in enumerate(filtered_customers):
+        # 테이블에 추가 (iid = 고객 ID: 변경 이벤트로 해당 행만 찾아 고침)
+        for i, summary in enumerate(summaries, start=self._list_loaded):
             tag = "odd" if i % 2 else "even"
+            self.tree.insert(
+                "",
+                tk.END,
+                iid=str(summary["customer_id"]),
+                values=self._summary_values(summary, birthday_today),
+                tags=(tag, str(summary["customer_id"])),  # customer.id를 tag에 포함
+            )
+        self._list_loaded += len(summaries)
 
-            # 생일 인디케이터 (촛불)
-            birthday_icon = ""
-            if is_birthday_today(customer):
-                birthday_icon = "🕯️"
+    @staticmethod
+    def _summary_values(summary: dict, birthday_today: Tuple[str, str]) -> tuple:
+        """요약 dict → 테이블 행 값
 
-            # 유병자 인디케이터 (십자가)
-            medical_icon = ""
-            if is_patient(customer):
-                medical_icon = "✚"
+        Args:
+            summary: get_customer_summaries() 항목
+            birthday_today: 오늘을 생일로 보는 MM-DD (birthday_mmdds - 평년 3월 1일은 2월 29일 포함)
+        """
+        # 운전 여부
+        driving_map = {"none": "미운전", "personal": "자가용", "commercial": "영업용"}
 
-            # 납부 임박 인디케이터 (당일 납부 예정)
-            payment_icon = ""
-            if customer.id in today_payment_customer_ids:
-                payment_icon = "💰"
+        # 생일 인디케이터 (촛불)
+        birthday_icon = "🕯️" if summary["birth_mmdd"] in birthday_today else ""
 
-            # 연체 인디케이터
-            overdue_icon = ""
-            if customer.id in overdue_customer_ids:
-                overdue_icon = "⚠️"
+        # 유병자 인디케이터 (십자가)
+        medical_icon = "✚" if summary["is_patient"] else ""
 
-            # 운전 여부
-            driving_map = {"none": "미운전", "personal": "자가용", "commercial": "영업용"}
-            driving_text = driving_map.get(customer.driving_type, "-")
+        # 납부 임박 인디케이터 (당일 납부 예정)
+        payment_icon = "💰" if summary["has_payment_today"] else ""
 
-            # 주민번호 전체 표시 (로컬 전용)
-            resident_display = customer.resident_id or "-"
+        # 연체 인디케이터
+        overdue_icon = "⚠️" if summary["oldest_overdue_date"] else ""
 
-            self.tree.insert(
-                "",
-                tk.END,
-                values=(
-                    birthday_icon,
-                    medical_icon,
-                    payment_icon,
-                    overdue_icon,
-                    customer.name,
-                    customer.phone,
-                    resident_display,
-                    driving_text,
-                    customer.payment_method or "-",
-                ),
-                tags=(tag, str(customer.id)),  # customer.id를 tag에 포함
-            )
+        driving_text = driving_map.get(summary["driving_type"], "-")
 
-        # 고객 수 업데이트
-        count = len(filtered_customers)
-        total_count = len(customers)
-        self.count_label.config(text=f"총 {count}명")
+        # 주민번호 전체 표시 (로컬 전용)
+        resident_display = summary["resident_id"] or "-"
 
-        # 필터 상태 표시
-        self.filter_status_label.config(
-            text=(
-                f"(전체 {total_count}명 | 생일자 {birthday_count}명 | "
-                f"신용카드 {credit_card_count}명 | 유병자 {medical_count}명)"
-            )
+        return (
+            birthday_icon,
+            medical_icon,
+            payment_icon,
+            overdue_icon,
+            summary["name"],
+            summary["phone"],
+            resident_display,
+            driving_text,
+            summary["payment_method"] or "-",
         )
 
+    def _on_db_changes(self, batch: ChangeBatch):
+        """DB 변경 반영 (IdleDispatcher 콜백, 쓰기 여러 건에 1회)
+
+        바뀐 고객 행/배지/카운터/상세 패널만 고친다. 바뀐 행을 모르는 REFRESH면 목록 전체를 다시 읽는다.
+        """
+        if batch.refresh:
+            self.load_customers(self._list_customers)
+        else:
+            self._patch_customers(batch.customer_ids, batch.deleted_customer_ids)
+
+        # 우측 상세 패널
+        if self.selected_customer_id is None:
+            return
+        if batch.refresh or self.selected_customer_id in batch.customer_ids | batch.deleted_customer_ids:
+            customer = self.db.get_customer(self.selected_customer_id)
+            if customer:
+                self._show_customer_detail(customer)
+            else:
+                self.selected_customer_id = None
+                self._show_detail_placeholder()
+                self.btn_copy_customer.config(state="disabled")
+                if hasattr(self, "btn_sms_send"):
+                    self.btn_sms_send.config(state="disabled")
+
+    def _patch_customers(self, changed_ids, deleted_ids):
+        """바뀐 고객 행만 테이블에 반영 (순서/필터 소속은 세그먼트 + SQL 정렬로 다시 계산)
+
+        채운 행 수는 유지하고(새로 들어온 행만큼 늘림), 요약은 새로 보이거나 바뀐 행만 조회한다.
+
+        Args:
+            changed_ids: 추가/수정된 고객 ID (계약 변경 포함)
+            deleted_ids: 삭제된 고객 ID
+        """
+        if deleted_ids and self._list_customers is not None:
+            self._list_customers = [c for c in self._list_customers if c.id not in deleted_ids]
+        new_ids, scope_bits = select_customer_ids(
+            self.db, self.filter_mode, self.filter_combination, self._list_customers,
+            self.sort_key, self.sort_descending,
+        )
+        target = min(len(new_ids), self._list_loaded + max(0, len(new_ids) - len(self._list_ids)))
+        visible = new_ids[:target]
+
+        # 범위에서 빠진 행 삭제
+        visible_iids = {str(customer_id) for customer_id in visible}
+        stale = [iid for iid in self.tree.get_children() if iid not in visible_iids]
+        if stale:
+            self.tree.delete(*stale)
+
+        # 새로 보이거나 바뀐 행만 요약 조회
+        fetch_ids = [
+            customer_id for customer_id in visible
+            if customer_id in changed_ids or not self.tree.exists(str(customer_id))
+        ]
+        summaries = {s["customer_id"]: s for s in self.db.get_customer_summaries(fetch_ids)} if fetch_ids else {}
+
+        birthday_today = birthday_mmdds(datetime.now().date())
+
+        # 순서 맞추기 (제자리면 move 생략) + 값 갱신, 교대 색상은 처음 달라진 위치부터
+        restripe_from = None
+        children = self.tree.get_children()
+        for index, customer_id in enumerate(visible):
+            iid = str(customer_id)
+            summary = summaries.get(customer_id)
+            if not self.tree.exists(iid):
+                if summary is None:
+                    continue
+                self.tree.insert("", index, iid=iid, tags=("even", iid),
+                                 values=self._summary_values(summary, birthday_today))
+            else:
+                if summary is not None:
+                    self.tree.item(iid, values=self._summary_values(summary, birthday_today))
+                if index >= len(children) or children[index] != iid:
+                    self.tree.move(iid, "", index)
+                else:
+                    continue
+            if restripe_from is None:
+                restripe_from = index
+            children = self.tree.get_children()
+        if stale and restripe_from is None:
+            restripe_from = 0
+        if restripe_from is not None:
+            for index, iid in enumerate(self.tree.get_children()[restripe_from:], start=restripe_from):
+                self.tree.item(iid, tags=("odd" if index % 2 else "even", iid))
+
+        self._list_ids = new_ids
+        self._list_loaded = len(self.tree.get_children())
+        self._update_list_counters(scope_bits)
+
+    def _on_tree_scroll(self, first, last):
+        """테이블 yscrollcommand - 스크롤바 갱신 + 채운 행의 끝 근처면 다음 페이지 예약"""
+        self.tree_scrollbar.set(first, last)
+        if (
+            float(last) >= 0.9
+            and self._list_loaded < len(self._list_ids)
+            and not self._list_page_pending
+        ):
+            self._list_page_pending = True
+            self.root.after_idle(self._append_list_page)
+
+    def _on_sort_column(self, column: str):
+        """헤더 클릭 - 정렬 키 변경 (같은 컬럼이면 방향 전환), SQL 정렬로 다시 로드"""
+        sort_key = SORTABLE_COLUMNS[column]
+        if self.sort_key == sort_key:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_key = sort_key
+            self.sort_descending = False
+        self._update_sort_headings()
+        self.load_customers(self._list_customers)
+
+    def _update_sort_headings(self):
+        """정렬 중인 컬럼 헤더에 방향 표시 (▲ 오름차순 / ▼ 내림차순)"""
+        for col, sort_key in SORTABLE_COLUMNS.items():
+            text = self.heading_texts[col]
+            if sort_key == self.sort_key:
+                text += " ▼" if self.sort_descending else " ▲"
+            self.tree.heading(col, text=text)
+
     def _apply_filter(self, mode: str):
-        """필터 적용"""
+        """필터 적용 (조합 필터 초기화)"""
         self.filter_mode = mode
+        self.filter_combination = {}
+        # 필터를 바꾸면 필터별 기본 정렬로 (연체: 연체일수 / 상령일: 남은 일수 / 그 외: 생일자 우선)
+        self.sort_key = None
+        self.sort_descending = False
+        self._update_sort_headings()
+        self.load_customers()
+
+    def _toggle_filter_combination(self, mode: str, op: str):
+        """조합 필터 추가/해제
+
+        Args:
+            mode: 필터 모드
+            op: "and" (함께 만족) / "not" (제외)
+        """
+        if mode == "all":
+            self.filter_combination = {}
+        elif self.filter_combination.get(mode) == op:
+            del self.filter_combination[mode]
+        else:
+            self.filter_combination[mode] = op
         self.load_customers()
 
     def _on_search(self, *args):
@@ -983,6 +1232,7 @@ class MainWindow:
         if customer:
             self.selected_customer_id = customer_id
             self._show_customer_detail(customer)
+            self._schedule_prefetch(selected[0])
             # ✨ 추가: 카톡 복사 버튼 활성화
             self.btn_copy_customer.config(state="normal")
             if hasattr(self, "btn_sms_send"):
@@ -994,8 +1244,43 @@ class MainWindow:
             if hasattr(self, "btn_sms_send"):
                 self.btn_sms_send.config(state="disabled")
 
+    def _schedule_prefetch(self, item: str, radius: int = 5):
+        """유휴 시간에 선택 행 ± radius 행의 고객/계약 프리페치 요청
+
+        Args:
+            item: 선택된 Treeview 항목
+            radius: 위/아래로 포함할 행 수
+        """
+        if self.prefetcher is None:
+            return
+        if self._prefetch_after_id is not None:
+            self.root.after_cancel(self._prefetch_after_id)
+
+        def _request():
+            self._prefetch_after_id = None
+            if not self.tree.exists(item):
+                return
+            items = [item]
+            before = after = item
+            for _ in range(radius):
+                before = self.tree.prev(before) if before else ""
+                after = self.tree.next(after) if after else ""
+                items.extend(i for i in (before, after) if i)
+
+            customer_ids = []
+            for tree_item in items:
+                for tag in self.tree.item(tree_item, "tags"):
+                    if str(tag).isdigit():
+                        customer_ids.append(int(tag))
+                        break
+            self.prefetcher.request(customer_ids)
+
+        self._prefetch_after_id = self.root.after_idle(_request)
+
     def _on_add_customer(self):
         """새 고객 추가 버튼 핸들러"""
+        from gui.customer_form import CustomerForm
+
         def save_customer(customer: Customer):
             """고객 저장 콜백"""
             try:
@@ -1005,13 +1290,11 @@ class MainWindow:
                     "추가 완료",
                     f"{customer.name}님이 추가되었습니다.\n저장된 고객 화면에서 보험 계약을 바로 추가할 수 있습니다.",
                 )
-                self.load_customers()
 
                 if created_customer:
                     # Open edit mode right away so policy section is visible.
-                    def save_updated_customer(updated_customer: Customer):
-                        self.db.update_customer(updated_customer)
-                        self.load_customers()
+                    def save_updated_customer(updated_customer: Customer, original: Customer):
+                        self.db.update_customer(updated_customer, original)
 
                     self.root.after(
                         50,
@@ -1029,6 +1312,8 @@ class MainWindow:
 
     def _on_edit_customer(self):
         """수정 버튼 핸들러"""
+        from gui.customer_form import CustomerForm
+
         selected = self.tree.selection()
         if not selected:
             messagebox.showwarning(
@@ -1058,18 +1343,17 @@ class MainWindow:
             messagebox.showerror("오류", "고객 정보를 찾을 수 없습니다.")
             return
 
-        def save_customer(updated_customer: Customer):
-            """고객 수정 콜백"""
+        def save_customer(updated_customer: Customer, original: Customer):
+            """고객 수정 콜백 (original: 폼을 연 시점 스냅샷 → 바뀐 컬럼만 저장, 버전 비교)"""
             try:
-                self.db.update_customer(updated_customer)
+                if not self.db.update_customer(updated_customer, original):
+                    return  # 바뀐 내용 없음 → 쓰기/목록 갱신 생략
                 messagebox.showinfo(
                     "수정 완료",
                     f"{updated_customer.name}님의 정보가 수정되었습니다.",
                 )
-                self.load_customers()
-                # 우측 패널 갱신
-                if self.selected_customer_id == customer_id:
-                    self._show_customer_detail(updated_customer)
+            except ConflictError:
+                raise  # 폼이 충돌 안내 후 열어 둠
             except Exception as e:
                 raise Exception(f"고객 수정 실패: {e}")
 
@@ -1108,8 +1392,6 @@ class MainWindow:
         try:
             if self.db.delete_customer(customer_id):
                 messagebox.showinfo("삭제 완료", f"{customer_name}님이 삭제되었습니다.")
-                self.load_customers()
-                self._show_detail_placeholder()
             else:
                 messagebox.showerror("오류", "고객 삭제에 실패했습니다.")
         except Exception as e:
@@ -1129,6 +1411,8 @@ class MainWindow:
 
     def _on_send_sms(self):
         """Send SMS via NCP (or simulate by config)."""
+        from utils.message_simulator import send_sms, build_sms_template_message
+
         if self.selected_customer_id is None:
             messagebox.showwarning("Select Customer", "Please select a customer first.")
             return
@@ -1160,6 +1444,29 @@ class MainWindow:
         ):
             return
 
+        # 실전송 설정이 있으면 발송 대기열에 등록 (백그라운드 발송, UI 멈춤 없음)
+        worker = self._get_sms_worker()
+        if worker is not None:
+            import hashlib
+
+            today_str = datetime.now().strftime("%Y-%m-%d")
+            digest = hashlib.sha1(msg.encode("utf-8")).hexdigest()[:12]
+            _, queued = self.db.enqueue_sms(
+                customer.phone,
+                msg,
+                customer_id=customer.id,
+                template=template_key,
+                # 같은 날 같은 본문만 중복 (본문을 고치면 새로 발송, 실패한 발송은 다시 대기)
+                idempotency_key=f"{template_key}:{customer.id}:{today_str}:{digest}",
+            )
+            if queued:
+                worker.wake()
+                show_toast(self.root, f"SMS 발송 대기열에 등록: {customer.name}")
+            else:
+                show_toast(self.root, f"오늘 같은 SMS가 이미 대기 중이거나 발송됨: {customer.name}",
+                           bg=COLORS["warning"])
+            return
+
         result = send_sms(customer, message_override=msg)
         if result.get("sent") == "true":
             messagebox.showinfo("SMS", "SMS sent successfully.")
@@ -1175,14 +1482,127 @@ class MainWindow:
             else:
                 messagebox.showinfo("SMS", "SMS not sent.")
 
-    def _on_backup(self):
-        """백업 버튼 핸들러"""
-        backup_path = filedialog.asksaveasfilename(
-            title="백업 파일 저장 위치 선택",
-            defaultextension=".db",
-            filetypes=[("Database files", "*.db"), ("All files", "*.*")],
-            initialfile=f"crm_backup_{Path('data/crm.db').stem}.db",
+    def _on_sms_campaign(self):
+        """세그먼트 대상 SMS 일괄 발송 (미리보기 → 확인 → 발송 대기열 등록)"""
+        from campaigns import CAMPAIGN_SEGMENTS, enqueue_campaign, plan_campaign
+
+        if not self._require_local_database("SMS 캠페인"):
+            return
+        segment = simpledialog.askstring(
+            "SMS Campaign",
+            "Segment: " + " / ".join(CAMPAIGN_SEGMENTS),
+            initialvalue="birthday_today",
+            parent=self.root,
         )
+        if segment is None:
+            return
+
+        segment = segment.strip().lower()
+        if segment not in CAMPAIGN_SEGMENTS:
+            messagebox.showwarning("SMS Campaign", "Invalid segment. Use " + " / ".join(CAMPAIGN_SEGMENTS) + ".")
+            return
+
+        plan = plan_campaign(self.db, segment)
+        if not plan.messages:
+            messagebox.showinfo("SMS Campaign", "No recipients for this segment.")
+            return
+
+        # 실전송 설정이 없으면 미리보기만 (dry-run)
+        worker = self._get_sms_worker()
+        if worker is None:
+            messagebox.showinfo("SMS Campaign (dry run)", plan.preview() + "\n\nSMS sending is not configured.")
+            return
+
+        if not messagebox.askyesno("SMS Campaign", plan.preview() + "\n\nSend now?", parent=self.root):
+            return
+
+        queued = enqueue_campaign(self.db, plan)
+        worker.wake()
+        skipped = len(plan.messages) - queued
+        note = f" (이미 등록된 {skipped}건 제외)" if skipped else ""
+        show_toast(self.root, f"캠페인 발송 대기열에 {queued}건 등록{note}")
+
+    def _get_sms_worker(self):
+        """SMS 백그라운드 발송기 (실전송 설정이 있을 때 최초 호출 시 시작, 없으면 None)"""
+        if self.server_url:
+            return None  # 발송기는 DB 파일이 있는 서비스 PC에서만
+        if self._sms_worker is None:
+            import queue
+            from utils.sms_outbox import HttpSmsTransport, SmsOutboxWorker
+
+            transport = HttpSmsTransport.from_env()
+            if transport is None:
+                return None
+            self._sms_status_queue = queue.Queue()
+            self._sms_worker = SmsOutboxWorker(
+                str(self.db.db_path),
+                transport,
+                rate_per_second=float(os.environ.get("NCP_SMS_RATE_PER_SECOND", "10")),  # 제공사 초당 한도
+                on_status=self._sms_status_queue.put,
+            )
+            self._sms_worker.start()
+            self.root.after(200, self._poll_sms_status)
+        return self._sms_worker
+
+    def _poll_sms_status(self):
+        """발송기 상태 변경을 Tk 스레드에서 반영 (폴링 주기마다 완료/실패를 모아 토스트 1개)"""
+        sent, failed = [], []
+        while not self._sms_status_queue.empty():
+            entry = self._sms_status_queue.get_nowait()
+            if entry["status"] == "sent":
+                sent.append(entry)
+            elif entry["status"] == "failed":
+                failed.append(entry)
+
+        if len(sent) == 1:
+            show_toast(self.root, f"SMS 발송 완료: {sent[0]['phone']}")
+        elif sent:
+            show_toast(self.root, f"SMS {len(sent)}건 발송 완료")
+        if failed:
+            detail = f"{failed[0]['phone']}\n{failed[0]['last_error']}"
+            if len(failed) > 1:
+                detail += f"\n외 {len(failed) - 1}건"
+            show_toast(self.root, f"SMS 발송 실패: {detail}", duration=5000, bg=COLORS["error"])
+
+        if self._sms_worker is not None:
+            self.root.after(200, self._poll_sms_status)
+
+    def _on_backup(self):
+        """백업 버튼 핸들러 (지난 백업이 있으면 증분 백업 선택 가능, 성공 후 변경 로그 압축)"""
+        from database import ChangeLogExpiredError
+        from utils.file_helpers import backup_changes, backup_database, get_backup_seq
+
+        if not self._require_local_database("백업"):
+            return
+
+        # 지난 백업 위치가 있으면 바뀐 행만 증분 백업할 수 있음 (복원: 전체 백업 → 증분 파일 순서대로)
+        since = self.db.get_change_log_mark("backup")
+        incremental = False
+        if since is not None:
+            answer = messagebox.askyesnocancel(
+                "백업",
+                "지난 백업 이후 바뀐 내용만 증분 백업하시겠습니까?\n\n"
+                "예: 증분 백업 (.jsonl, 지난 백업 복원 후 이어서 복원)\n아니오: 전체 백업 (.db)",
+            )
+            if answer is None:
+                return
+            incremental = answer
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if incremental:
+            backup_path = filedialog.asksaveasfilename(
+                title="증분 백업 파일 저장 위치 선택",
+                defaultextension=".jsonl",
+                filetypes=[("Incremental backup", "*.jsonl"), ("All files", "*.*")],
+                initialfile=f"crm_changes_{timestamp}.jsonl",
+            )
+        else:
+            backup_path = filedialog.asksaveasfilename(
+                title="백업 파일 저장 위치 선택",
+                defaultextension=".db",
+                filetypes=[("Database files", "*.db"), ("All files", "*.*")],
+                initialfile=f"crm_backup_{Path('data/crm.db').stem}.db",
+            )
 
         if not backup_path:
             return
@@ -1191,44 +1611,69 @@ class MainWindow:
             db_path = Path("data/crm.db")
             backup_dir = Path(backup_path).parent
 
-            success, result_path, error = backup_database(db_path, backup_dir)
+            if incremental:
+                success, result_path, error = backup_changes(self.db, backup_dir, since)
+            else:
+                success, result_path, error = backup_database(db_path, backup_dir)
 
             if success:
                 import shutil
 
+                backup_seq = get_backup_seq(Path(result_path))
                 shutil.move(result_path, backup_path)
+                # 다음 증분 기준 저장 + 모든 소비자가 처리한 톰스톤 정리
+                self.db.set_change_log_mark("backup", backup_seq)
+                self.db.compact_change_log_for_consumers()
                 messagebox.showinfo(
                     "백업 완료",
-                    f"백업이 완료되었습니다.\n\n저장 위치:\n{backup_path}",
+                    f"{'증분 ' if incremental else ''}백업이 완료되었습니다.\n\n저장 위치:\n{backup_path}",
                 )
             else:
                 messagebox.showerror("백업 실패", error)
+        except ChangeLogExpiredError:
+            messagebox.showerror("백업 실패", "변경 기록이 정리되어 증분 백업을 만들 수 없습니다.\n전체 백업을 실행해주세요.")
         except Exception as e:
             messagebox.showerror("오류", f"백업 중 오류 발생:\n{e}")
 
     def _on_restore(self):
-        """복원 버튼 핸들러"""
+        """복원 버튼 핸들러 (.db: 전체 교체 / .jsonl: 현재 DB에 증분 백업 적용)"""
+        from utils.file_helpers import restore_changes, restore_database
+
+        if not self._require_local_database("복원"):
+            return
         if not messagebox.askyesno(
             "복원 확인",
-            "백업 파일로 복원하면 현재 데이터가 모두 교체됩니다.\n\n계속하시겠습니까?",
+            "백업 파일로 복원하면 현재 데이터가 모두 교체됩니다.\n"
+            "(증분 백업은 직전 백업을 복원한 상태에 이어서 적용됩니다)\n\n계속하시겠습니까?",
         ):
             return
 
         backup_path = filedialog.askopenfilename(
             title="복원할 백업 파일 선택",
-            filetypes=[("Database files", "*.db"), ("All files", "*.*")],
+            filetypes=[
+                ("Database files", "*.db"),
+                ("Incremental backup", "*.jsonl"),
+                ("All files", "*.*"),
+            ],
         )
 
         if not backup_path:
             return
 
         try:
+            if self._sms_worker is not None:
+                self._sms_worker.stop()
+                self._sms_worker = None
+            self.prefetcher.close()
             self.db.close()
 
             db_path = Path("data/crm.db")
-            success, error = restore_database(Path(backup_path), db_path)
+            if Path(backup_path).suffix == ".jsonl":
+                success, error = restore_changes(Path(backup_path), db_path)
+            else:
+                success, error = restore_database(Path(backup_path), db_path)
 
-            self.db = DatabaseManager("data/crm.db")
+            self._open_database("data/crm.db")
 
             if success:
                 messagebox.showinfo("복원 완료", "백업 파일로 복원되었습니다.")
@@ -1239,33 +1684,55 @@ class MainWindow:
             messagebox.showerror("오류", f"복원 중 오류 발생:\n{e}")
 
     def _on_csv_download(self):
-        """CSV 다운로드 버튼 핸들러"""
+        """CSV 다운로드 버튼 핸들러 (지난 내보내기가 있으면 바뀐 고객만 내보내기 선택 가능)"""
+        from database import ChangeLogExpiredError
+        from utils.export_helpers import export_changes_to_csv, export_to_csv
+
+        # 증분 위치는 로컬 DB에만 저장 (서비스 모드는 항상 전체)
+        since = None if self.server_url else self.db.get_change_log_mark("csv_export")
+        incremental = False
+        if since is not None:
+            answer = messagebox.askyesnocancel(
+                "CSV 다운로드",
+                "지난 다운로드 이후 바뀐 고객만 내보내시겠습니까?\n\n예: 변경분 (추가/수정·삭제 표시)\n아니오: 전체 고객",
+            )
+            if answer is None:
+                return
+            incremental = answer
+
         # 저장 위치 선택
         today_str = datetime.now().strftime("%Y%m%d")
         csv_path = filedialog.asksaveasfilename(
             title="CSV 파일 저장 위치 선택",
             defaultextension=".csv",
             filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-            initialfile=f"고객목록_{today_str}.csv",
+            initialfile=f"{'고객변경' if incremental else '고객목록'}_{today_str}.csv",
         )
 
         if not csv_path:
             return
 
         try:
-            # 전체 고객 데이터 조회
-            customers = self.db.get_all_customers()
-
-            # CSV 내보내기
-            success, error = export_to_csv(customers, csv_path)
+            if incremental:
+                success, error, export_seq = export_changes_to_csv(self.db, since, csv_path)
+            else:
+                # 읽기 전 위치 기록 (내보내는 동안 바뀐 행은 다음 증분에 다시 나옴)
+                export_seq = None if self.server_url else self.db.get_change_seq()
+                # 전체 고객을 키셋 페이지로 읽으며 바로 기록 (고객 수와 무관하게 메모리 일정)
+                success, error = export_to_csv(self.db.iter_customers(), csv_path)
 
             if success:
+                if export_seq is not None:
+                    self.db.set_change_log_mark("csv_export", export_seq)
+                    self.db.compact_change_log_for_consumers()
                 messagebox.showinfo(
                     "다운로드 완료",
                     f"CSV 파일이 저장되었습니다.\n\n저장 위치:\n{csv_path}",
                 )
             else:
                 messagebox.showerror("다운로드 실패", error)
+        except ChangeLogExpiredError:
+            messagebox.showerror("다운로드 실패", "변경 기록이 정리되어 변경분을 만들 수 없습니다.\n전체 고객으로 다시 내보내주세요.")
         except Exception as e:
             messagebox.showerror("오류", f"CSV 다운로드 중 오류 발생:\n{e}")
 
@@ -1275,6 +1742,8 @@ class MainWindow:
 
     def _copy_customer_to_clipboard(self, customer: Customer):
         """Copy customer review text to clipboard (심사용 전체 정보 복사)."""
+        from utils.message_simulator import build_review_text
+
         try:
             import pyperclip
 
@@ -1294,10 +1763,78 @@ class MainWindow:
         except Exception as e:
             messagebox.showerror("오류", f"클립보드 복사 실패:\n{e}")
 
+    # =============================================================================
+    # 단일 인스턴스 명령 (utils.single_instance)
+    # =============================================================================
+
+    def _poll_instance_requests(self):
+        """수신 스레드가 넣은 명령을 Tk 스레드에서 처리 (50ms 주기, 쓰기 위임은 도착 순서대로)"""
+        from utils.single_instance import apply_write
+
+        requests = self.instance_server.requests
+        while not requests.empty():
+            request = requests.get_nowait()
+            if not request.claim():
+                continue  # 요청한 쪽이 시간 초과로 포기 (실패를 받은 쓰기는 실행하지 않음)
+            try:
+                if request.command == "focus":
+                    self._bring_to_front()
+                    request.reply()
+                elif request.command == "open_customer":
+                    self._bring_to_front()
+                    if self._open_customer(int(request.args["customer_id"])):
+                        request.reply()
+                    else:
+                        request.fail("고객을 찾을 수 없습니다")
+                elif request.command == "db_write":
+                    result = apply_write(self.db, request.args)  # 목록은 변경 이벤트로 갱신
+                    request.reply(result)
+            except Exception as e:
+                request.fail(f"{type(e).__name__}: {e}")
+
+        self.root.after(50, self._poll_instance_requests)
+
+    def _bring_to_front(self):
+        """창 복원 + 맨 앞으로 (잠깐 topmost로 올렸다 해제)"""
+        self.root.deiconify()
+        self.root.lift()
+        self.root.attributes("-topmost", True)
+        self.root.after_idle(self.root.attributes, "-topmost", False)
+        self.root.focus_force()
+
+    def _open_customer(self, customer_id: int) -> bool:
+        """고객 상세 표시 (채워진 페이지에 행이 있으면 선택)
+
+        Returns:
+            고객 존재 여부
+        """
+        customer = self.db.get_customer(customer_id)
+        if customer is None:
+            return False
+
+        items = self.tree.tag_has(str(customer_id))
+        if items:
+            self.tree.selection_set(items[0])  # <<TreeviewSelect>> → _on_row_select
+            self.tree.see(items[0])
+        else:
+            # 아직 채우지 않은 페이지의 고객: 목록 선택은 그대로 두고 상세만 표시
+            self.selected_customer_id = customer_id
+            self._show_customer_detail(customer)
+            self.btn_copy_customer.config(state="normal")
+            if hasattr(self, "btn_sms_send"):
+                self.btn_sms_send.config(state="normal")
+        return True
+
     def _on_exit(self):
         """종료 버튼 핸들러"""
         if messagebox.askokcancel("종료", "프로그램을 종료하시겠습니까?"):
-            self.db.close()
+            if self._sms_worker is not None:
+                self._sms_worker.stop()
+                self._sms_worker = None
+            if self.prefetcher is not None:
+                self.prefetcher.close()
+            if self.db is not None:
+                self.db.close()
             self.root.quit()
 
     def run(self):
@@ -3,11 +3,13 @@
 보험 계약 추가/편집 폼
 """
 
+import copy
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Optional, Callable
 from datetime import datetime
 
+from database import ConflictError, RecordDeletedError
 from models import Policy
 from gui.theme import COLORS, FONTS, SPACING
 from utils.validators import (
@@ -35,11 +37,13 @@ class PolicyForm:
             parent: 부모 윈도우
             customer_id: 고객 ID
             policy: 수정할 계약 (None이면 추가 모드)
-            on_save: 저장 후 호출될 콜백 함수
+            on_save: 저장 시 호출될 콜백 함수
+                     (추가: on_save(policy), 수정: on_save(policy, original) - original은 폼을 연 시점 스냅샷)
         """
         self.parent = parent
         self.customer_id = customer_id
         self.policy = policy
+        self.original = copy.copy(policy)  # 편집 시작 시점 스냅샷 (바뀐 컬럼 계산 + 버전 비교 기준)
         self.on_save = on_save
         self.is_edit_mode = policy is not None
 
@@ -540,10 +544,29 @@ class PolicyForm:
             policy.next_payment_date = self.policy.next_payment_date
             policy.last_payment_date = self.policy.last_payment_date
             policy.created_at = self.policy.created_at
+            policy.version = self.policy.version
 
         # ===== 콜백 호출 =====
         if self.on_save:
-            self.on_save(policy)
+            try:
+                if self.is_edit_mode:
+                    self.on_save(policy, self.original)
+                else:
+                    self.on_save(policy)
+            except RecordDeletedError:
+                messagebox.showwarning(
+                    "삭제된 계약",
+                    "이 계약은 그사이 다른 곳에서 삭제되어 수정 내용을 저장할 수 없습니다.\n"
+                    "필요한 내용을 옮겨 적은 뒤 창을 닫고 새 계약으로 다시 등록해주세요.",
+                )
+                return
+            except ConflictError:
+                messagebox.showwarning(
+                    "저장 충돌",
+                    "이 계약을 그사이 다른 곳에서 먼저 수정했습니다 (납부 처리 포함).\n"
+                    "입력한 내용을 확인한 뒤 창을 닫고 다시 열어 최신 정보에서 수정해주세요.",
+                )
+                return
 
         # 윈도우 닫기
         self.window.destroy()
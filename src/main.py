@@ -48,14 +48,82 @@ def setup_paths():
     data_dir.mkdir(parents=True, exist_ok=True)
 
 
-def main():
-    """애플리케이션 진입점"""
-    import tkinter as tk
-    from gui.main_window import MainWindow
-
-    root = tk.Tk()
-    app = MainWindow(root)
-    app.run()
+def forward_to_running_instance(db_path: str, customer_id: int = None, wait_seconds: float = 1.0) -> bool:
+    """이미 실행 중인 주 인스턴스에 창 앞으로 가져오기 / 고객 열기 전달
+
+    Args:
+        db_path: 데이터베이스 파일 경로
+        customer_id: 열 고객 ID (None이면 창만 앞으로)
+        wait_seconds: 주 인스턴스가 막 시작해 아직 수신 전이면 재시도할 시간 (초)
+
+    Returns:
+        전달 성공 여부
+    """
+    import time
+    from utils.single_instance import send_command
+
+    command, args = ("focus", {}) if customer_id is None else ("open_customer", {"customer_id": customer_id})
+    deadline = time.monotonic() + wait_seconds
+    while True:
+        response = send_command(db_path, command, args)
+        if response is not None:
+            if not response["ok"]:
+                print(f"[실행 중인 프로그램] {response['error']}", file=sys.stderr)
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.05)
+
+
+def main(argv=None):
+    """애플리케이션 진입점
+
+    같은 DB로 이미 실행 중이면 GUI를 띄우지 않고 명령만 전달한 뒤 종료한다 (tkinter import 전).
+    --server를 주면 로컬 DB 대신 서비스 모드(src/service.py)에 클라이언트로 접속한다.
+    """
+    import argparse
+    from utils.single_instance import InstanceLock, InstanceServer
+
+    parser = argparse.ArgumentParser(description="고객관리 시스템")
+    parser.add_argument("--open-customer", type=int, default=None, metavar="ID", help="시작 시 열 고객 ID")
+    parser.add_argument(
+        "--server", default=os.environ.get("CRM_SERVICE_URL"), metavar="URL",
+        help="서비스 모드 주소 (예: http://192.168.0.10:8765, 토큰은 CRM_SERVICE_TOKEN)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.server:
+        # 서비스 클라이언트: 로컬 DB 파일을 열지 않으므로 단일 인스턴스 잠금 없음
+        import tkinter as tk
+        from gui.main_window import MainWindow
+
+        root = tk.Tk()
+        app = MainWindow(root, open_customer_id=args.open_customer, server_url=args.server)
+        app.run()
+        return
+
+    db_path = os.environ.get("CRM_DB_PATH", "data/crm.db")
+    lock = InstanceLock(db_path)
+    if not lock.acquire():
+        if forward_to_running_instance(db_path, args.open_customer):
+            return
+        print("이미 실행 중인 프로그램(또는 서비스)이 같은 DB를 사용 중입니다. "
+              "서비스 모드면 --server로 접속하세요.", file=sys.stderr)
+        sys.exit(1)
+
+    # 주 인스턴스: 창을 만들기 전에 수신 시작 (그 사이 도착한 명령은 창이 뜬 뒤 처리)
+    server = InstanceServer(db_path)
+    server.start()
+    try:
+        import tkinter as tk
+        from gui.main_window import MainWindow
+
+        root = tk.Tk()
+        app = MainWindow(root, instance_server=server, open_customer_id=args.open_customer)
+        app.run()
+    finally:
+        server.stop()
+        lock.release()
 
 
 if __name__ == "__main__":
@@ -45,6 +45,7 @@ class Customer:
     id: Optional[int] = None
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
+    version: Optional[int] = None  # 행 버전 (수정마다 +1, 동시 수정 감지용 / 새 객체는 None)
 
     def to_dict(self) -> dict:
         """Customer 객체를 딕셔너리로 변환
@@ -75,6 +76,7 @@ class Customer:
             'notification_content': self.notification_content,
             'created_at': self.created_at,
             'updated_at': self.updated_at,
+            'version': self.version,
         }
 
     @staticmethod
@@ -85,7 +87,7 @@ class Customer:
             row: DB에서 조회한 튜플 (id, name, phone, resident_id, birth_date, address, email, memo,
                  occupation, driving_type, commercial_detail, payment_method,
                  med_medication, med_hospitalized, med_hospital_detail, med_recent_exam, med_recent_exam_detail,
-                 med_5yr_diagnosis, med_5yr_custom, notification_content, created_at, updated_at)
+                 med_5yr_diagnosis, med_5yr_custom, notification_content, created_at, updated_at[, version])
 
         Returns:
             Customer 객체
@@ -113,6 +115,7 @@ class Customer:
             notification_content=row[19],
             created_at=row[20],
             updated_at=row[21],
+            version=row[22] if len(row) > 22 else None,
         )
 
     @staticmethod
@@ -161,6 +164,7 @@ class Policy:
     id: Optional[int] = None
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
+    version: Optional[int] = None  # 행 버전 (Customer.version과 같음)
 
     def to_dict(self) -> dict:
         """Policy 객체를 딕셔너리로 변환
@@ -188,6 +192,7 @@ class Policy:
             'memo': self.memo,
             'created_at': self.created_at,
             'updated_at': self.updated_at,
+            'version': self.version,
         }
 
     @staticmethod
@@ -200,7 +205,7 @@ class Policy:
                  card_issuer, card_number, card_expiry,
                  contract_start_date, contract_end_date,
                  status, next_payment_date, last_payment_date,
-                 memo, created_at, updated_at)
+                 memo, created_at, updated_at[, version])
 
         Returns:
             Policy 객체
@@ -225,6 +230,7 @@ class Policy:
             memo=row[16],
             created_at=row[17],
             updated_at=row[18],
+            version=row[19] if len(row) > 19 else None,
         )
 
     @staticmethod
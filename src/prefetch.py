@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+선택 행 주변 고객/계약 프리페치 - 백그라운드 연결로 읽어 DatabaseManager 캐시에 채움
+"""
+
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from utils import query_profiler
+
+
+class Prefetcher:
+    """고객/계약 백그라운드 프리페처
+
+    작업 스레드 1개가 전용 sqlite3 연결로 IN 쿼리 두 번(고객, 계약)을 실행하고
+    DatabaseManager.prime_cache()로 캐시에 반영한다.
+    연속 요청은 마지막 요청만 처리한다 (방향키로 빠르게 이동하는 경우).
+    """
+
+    def __init__(self, db):
+        """Prefetcher 초기화
+
+        Args:
+            db: DatabaseManager 인스턴스 (db_path, 캐시 공유)
+        """
+        self.db = db
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._pending: Optional[tuple] = None  # (고객 ID 목록, 캐시 세대)
+        self._scheduled = False
+        self._connection = None  # 작업 스레드 전용 연결
+
+    def request(self, customer_ids: List[int]) -> None:
+        """고객 목록 프리페치 요청 (이미 캐시에 있는 고객은 제외)
+
+        Args:
+            customer_ids: 선택 고객 + 주변 행 고객 ID
+        """
+        missing = self.db.missing_from_cache(customer_ids)
+        if not missing:
+            return
+
+        with self._lock:
+            self._pending = (missing, self.db.cache_generation)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._executor.submit(self._run)
+
+    def _run(self) -> None:
+        """작업 스레드: 대기 중인 마지막 요청 처리"""
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._scheduled = False
+        if pending is None:
+            return
+
+        customer_ids, generation = pending
+        try:
+            if self._connection is None:
+                self._connection = query_profiler.connect(str(self.db.db_path), self.db.profiler, timeout=1.0)
+            customers = self.db.fetch_customers_by_ids(self._connection, customer_ids)
+            policies = self.db.fetch_policies_by_customers(self._connection, customer_ids)
+        except sqlite3.Error:
+            return  # 프리페치는 최적화일 뿐이므로 실패 시 무시 (다음 조회에서 직접 읽음)
+
+        self.db.prime_cache(customers, policies, generation)
+
+    def wait(self) -> None:
+        """제출된 작업 완료 대기 (테스트/종료용)"""
+        self._executor.submit(lambda: None).result()
+
+    def close(self) -> None:
+        """작업 스레드와 전용 연결 종료"""
+        def _close_connection():
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+        self._executor.submit(_close_connection)
+        self._executor.shutdown(wait=True)
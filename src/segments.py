@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+고객 세그먼트 비트맵 인덱스 - 필터 조합(AND/OR/NOT)을 비트 연산으로 처리
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Union
+
+from utils.date_helpers import birthday_mmdds
+
+
+# 세그먼트 정의: 이름 → 고객 ID를 반환하는 SQL
+# {customer_filter}는 전체 빌드 시 빈 문자열, 고객 1명 갱신 시 "AND c.id = :customer_id"로 치환된다.
+# 날짜 파라미터는 _segment_params()에서 기준일로 계산한다.
+SEGMENT_QUERIES = {
+    "birthday_today": """
+        SELECT c.id FROM customers c
+        WHERE c.birth_mmdd IN (:today_mmdd, :leap_day_mmdd) {customer_filter}
+    """,
+    "birthday_month": """
+        SELECT c.id FROM customers c
+        WHERE c.birth_mmdd BETWEEN :month_start AND :month_end {customer_filter}
+    """,
+    "patient": """
+        SELECT c.id FROM customers c
+        WHERE (COALESCE(c.med_medication, '') != ''
+               OR COALESCE(c.med_recent_exam, 0) != 0
+               OR COALESCE(c.med_5yr_diagnosis, '') != ''
+               OR COALESCE(c.med_5yr_custom, '') != '') {customer_filter}
+    """,
+    "credit_card": """
+        SELECT c.id FROM customers c
+        WHERE TRIM(COALESCE(c.payment_method, '')) IN ('신용카드', 'card') {customer_filter}
+    """,
+    "commercial": """
+        SELECT c.id FROM customers c
+        WHERE c.driving_type = 'commercial' {customer_filter}
+    """,
+    "age_change": """
+        SELECT c.id FROM customers c
+        WHERE c.insurance_age_change_date BETWEEN :today AND :age_change_end {customer_filter}
+    """,
+    "overdue": """
+        SELECT DISTINCT p.customer_id FROM policies p JOIN customers c ON c.id = p.customer_id
+        WHERE p.status = 'overdue' AND p.payment_method = 'card' {customer_filter}
+    """,
+    "upcoming_payment": """
+        SELECT DISTINCT p.customer_id FROM policies p JOIN customers c ON c.id = p.customer_id
+        WHERE p.next_payment_date BETWEEN :today AND :upcoming_end
+          AND p.status = 'active' AND p.payment_method = 'card' {customer_filter}
+    """,
+    "today_card": """
+        SELECT DISTINCT p.customer_id FROM policies p JOIN customers c ON c.id = p.customer_id
+        WHERE p.next_payment_date = :today
+          AND p.status = 'active' AND p.payment_method = 'card' {customer_filter}
+    """,
+}
+
+# 값별 세그먼트: 접두어 → (값, 고객 ID)를 반환하는 SQL ("condition:당뇨병", "vehicle:taxi")
+VALUE_SEGMENT_QUERIES = {
+    "condition": """
+        SELECT DISTINCT cc.name, cc.customer_id FROM customer_conditions cc
+        JOIN customers c ON c.id = cc.customer_id
+        WHERE 1 = 1 {customer_filter}
+    """,
+    "vehicle": """
+        SELECT vt.vehicle_type, vt.customer_id FROM customer_vehicle_types vt
+        JOIN customers c ON c.id = vt.customer_id
+        WHERE 1 = 1 {customer_filter}
+    """,
+}
+
+# 조합식: 세그먼트 이름(str) 또는 ("and"|"or", 식, ...) / ("not", 식)
+SegmentExpr = Union[str, tuple]
+
+
+def bitmap_from_ids(ids: Iterable[int]) -> int:
+    """고객 ID 목록 → 비트맵 (비트 위치 = 고객 ID)"""
+    ids = list(ids)
+    if not ids:
+        return 0
+    buffer = bytearray(max(ids) // 8 + 1)
+    for customer_id in ids:
+        buffer[customer_id >> 3] |= 1 << (customer_id & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def ids_from_bitmap(bits: int) -> List[int]:
+    """비트맵 → 고객 ID 오름차순 리스트"""
+    if bits <= 0:
+        return []
+    reversed_bits = bin(bits)[:1:-1]  # 인덱스 i = 비트 i
+    result = []
+    position = reversed_bits.find("1")
+    while position != -1:
+        result.append(position)
+        position = reversed_bits.find("1", position + 1)
+    return result
+
+
+def count_bits(bits: int) -> int:
+    """비트맵의 고객 수 (Python 3.10+는 int.bit_count 사용)"""
+    if bits <= 0:
+        return 0
+    if hasattr(bits, "bit_count"):
+        return bits.bit_count()
+    return bin(bits).count("1")
+
+
+class SegmentIndex:
+    """세그먼트별 고객 비트맵 관리 클래스
+
+    SQL로 한 번 빌드한 뒤, DatabaseManager 쓰기 경로에서 고객 단위로 갱신한다.
+    날짜가 바뀌면 (생일/납부 임박 등 날짜 기준 세그먼트) 다음 조회 시 전체 재빌드한다.
+    """
+
+    def __init__(self, connection, upcoming_days: int = 7, age_change_days: int = 30):
+        """SegmentIndex 초기화
+
+        Args:
+            connection: sqlite3 연결 (DatabaseManager.connection)
+            upcoming_days: 납부 임박 기준 일수 (기본: 7일)
+            age_change_days: 상령일 임박 기준 일수 (기본: 30일)
+        """
+        self.connection = connection
+        self.upcoming_days = upcoming_days
+        self.age_change_days = age_change_days
+        self.universe = 0
+        self.bitmaps: Dict[str, int] = {}
+        self.built_for: Optional[str] = None
+
+    # =========================================================================
+    # 빌드 / 갱신
+    # =========================================================================
+
+    def build(self) -> None:
+        """모든 세그먼트 비트맵을 SQL로 재구성"""
+        params = self._segment_params()
+        cursor = self.connection.cursor()
+
+        cursor.execute("SELECT id FROM customers")
+        self.universe = bitmap_from_ids(row[0] for row in cursor.fetchall())
+
+        bitmaps = {}
+        for name, sql in SEGMENT_QUERIES.items():
+            cursor.execute(sql.format(customer_filter=""), params)
+            bitmaps[name] = bitmap_from_ids(row[0] for row in cursor.fetchall())
+
+        for prefix, sql in VALUE_SEGMENT_QUERIES.items():
+            cursor.execute(sql.format(customer_filter=""))
+            grouped: Dict[str, List[int]] = {}
+            for value, customer_id in cursor.fetchall():
+                grouped.setdefault(value, []).append(customer_id)
+            for value, customer_ids in grouped.items():
+                bitmaps[f"{prefix}:{value}"] = bitmap_from_ids(customer_ids)
+
+        self.bitmaps = bitmaps
+        self.built_for = params["today"]
+
+    def invalidate(self) -> None:
+        """다음 조회 시 전체 재빌드 (대량 갱신 이후)"""
+        self.built_for = None
+
+    def refresh_customer(self, customer_id: int) -> None:
+        """고객 1명의 모든 세그먼트 비트 갱신 (추가/수정/삭제 공통)
+
+        Args:
+            customer_id: 고객 ID (삭제된 고객이면 모든 비트 해제)
+        """
+        if self.built_for is None:
+            return
+
+        params = self._segment_params()
+        if params["today"] != self.built_for:
+            self.invalidate()
+            return
+
+        params["customer_id"] = customer_id
+        customer_filter = "AND c.id = :customer_id"
+        bit = 1 << customer_id
+        cursor = self.connection.cursor()
+
+        cursor.execute("SELECT 1 FROM customers WHERE id = ?", (customer_id,))
+        exists = cursor.fetchone() is not None
+        self.universe = self.universe | bit if exists else self.universe & ~bit
+
+        for name, sql in SEGMENT_QUERIES.items():
+            cursor.execute(sql.format(customer_filter=customer_filter), params)
+            self._set_bit(name, bit, cursor.fetchone() is not None)
+
+        for prefix, sql in VALUE_SEGMENT_QUERIES.items():
+            cursor.execute(sql.format(customer_filter=customer_filter), params)
+            values = {row[0] for row in cursor.fetchall()}
+            for name in [n for n in self.bitmaps if n.startswith(prefix + ":")]:
+                if name[len(prefix) + 1:] not in values:
+                    self._set_bit(name, bit, False)
+            for value in values:
+                self._set_bit(f"{prefix}:{value}", bit, True)
+
+    def _set_bit(self, name: str, bit: int, on: bool) -> None:
+        """세그먼트 비트 설정/해제"""
+        current = self.bitmaps.get(name, 0)
+        self.bitmaps[name] = current | bit if on else current & ~bit
+
+    def _segment_params(self) -> dict:
+        """세그먼트 SQL 날짜 파라미터 (기준일: 오늘)"""
+        today = datetime.now().date()
+        today_mmdd, leap_day_mmdd = birthday_mmdds(today)  # 평년 3월 1일은 2월 29일생 포함
+        return {
+            "today": today.strftime("%Y-%m-%d"),
+            "today_mmdd": today_mmdd,
+            "leap_day_mmdd": leap_day_mmdd,
+            "month_start": today.strftime("%m-01"),
+            "month_end": today.strftime("%m-31"),
+            "upcoming_end": (today + timedelta(days=self.upcoming_days)).strftime("%Y-%m-%d"),
+            "age_change_end": (today + timedelta(days=self.age_change_days)).strftime("%Y-%m-%d"),
+        }
+
+    def _ensure_current(self) -> None:
+        """빌드 전이거나 날짜가 바뀌었으면 재빌드"""
+        if self.built_for != datetime.now().strftime("%Y-%m-%d"):
+            self.build()
+
+    # =========================================================================
+    # 조회
+    # =========================================================================
+
+    def names(self) -> List[str]:
+        """사용 가능한 세그먼트 이름 목록"""
+        self._ensure_current()
+        return sorted(self.bitmaps)
+
+    def bits(self, expr: SegmentExpr) -> int:
+        """조합식 → 비트맵
+
+        Args:
+            expr: 세그먼트 이름 또는 조합식
+                  예: ("and", "patient", "credit_card", ("not", "overdue"))
+
+        Returns:
+            결과 비트맵
+
+        Raises:
+            ValueError: 알 수 없는 연산자
+        """
+        self._ensure_current()
+        return self._evaluate(expr)
+
+    def count(self, expr: SegmentExpr) -> int:
+        """조합식에 해당하는 고객 수"""
+        return count_bits(self.bits(expr))
+
+    def ids(self, expr: SegmentExpr) -> List[int]:
+        """조합식에 해당하는 고객 ID 리스트 (오름차순)"""
+        return ids_from_bitmap(self.bits(expr))
+
+    def _evaluate(self, expr: SegmentExpr) -> int:
+        """조합식 재귀 평가 (미등록 세그먼트는 빈 집합)"""
+        if isinstance(expr, str):
+            if expr == "all":
+                return self.universe
+            return self.bitmaps.get(expr, 0)
+
+        op, operands = expr[0], expr[1:]
+        if op == "not":
+            return self.universe & ~self._evaluate(operands[0])
+        if op == "and":
+            result = self.universe
+            for operand in operands:
+                result &= self._evaluate(operand)
+            return result
+        if op == "or":
+            result = 0
+            for operand in operands:
+                result |= self._evaluate(operand)
+            return result
+        raise ValueError(f"알 수 없는 세그먼트 연산자: {op}")
@@ -0,0 +1,838 @@
+# -*- coding: utf-8 -*-
+"""
+서비스 모드 - 여러 설계사가 DB 하나를 함께 쓰는 로컬 HTTP/JSON 서버 + 클라이언트
+
+DB 파일을 복사해 돌려 쓰는 대신 한 PC에서 서비스를 실행하고, 각 PC의 앱은 클라이언트로 접속한다.
+
+    python src/service.py --db data/crm.db --host 0.0.0.0 --port 8765 --token <공유 비밀>
+    python src/main.py --server http://<서비스 PC>:8765      (토큰: CRM_SERVICE_TOKEN 환경 변수)
+
+- 쓰기: 큐 1개 → 쓰기 전용 스레드의 DatabaseManager 1개가 도착 순서대로 실행 (프로세스 간 잠금 경합 없음)
+- 읽기: 스레드 풀 (스레드마다 DatabaseManager → 읽기 캐시/세그먼트 인덱스 유지)
+  쓰기가 끝나면 바뀐 고객 ID를 쓰기 기록에 남기고, 읽기 스레드는 다음 요청 전에 그 고객만 갱신한다.
+- 실행 중에는 DB 단일 인스턴스 잠금(utils.single_instance)을 잡아 앱이 같은 파일을 직접 열지 않게 한다.
+
+엔드포인트 (본문/응답 모두 JSON, 응답은 {"ok", "result", "generation"} 또는 {"ok": false, "error", "type"}):
+    GET  /health                    상태 (쓰기 세대, 변경 로그 위치, 대기 중인 쓰기 수)
+    POST /list                      필터/정렬 목록 한 페이지
+                                    {filter_mode, filter_combination, sort, descending, keyword, start, size}
+    POST /search                    이름/전화번호 검색 한 페이지 {keyword, after_name, after_id, limit}
+    POST /payments/mark-paid        여러 계약 납부 완료 (한 트랜잭션) {policy_ids, payment_date}
+    GET  /changes?since=N&limit=M   변경 로그 (410: 압축으로 만료 → 전체 다시 받기)
+    GET  /segments                  세그먼트 비트맵 (클라이언트에서 필터 조합 계산)
+    POST /batch                     여러 호출을 한 번에 {calls: [{method, args, kwargs}, ...]} (읽기만 또는 쓰기만)
+    POST /rpc/<메서드>               DatabaseManager 메서드 1개 {args, kwargs} (READ_METHODS / WRITE_METHODS)
+"""
+
+import asyncio
+import base64
+import http.client
+import json
+import os
+import queue
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import events
+from database import ChangeLogExpiredError, ConflictError, DatabaseManager, RecordDeletedError
+from models import Customer, Policy
+from segments import SegmentIndex
+
+
+DEFAULT_PORT = 8765
+DEFAULT_READERS = 4
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+# 서비스로 호출할 수 있는 DatabaseManager 메서드 (읽기는 읽기 풀, 쓰기는 쓰기 큐)
+READ_METHODS = frozenset({
+    "get_customer", "get_all_customers", "get_customers_by_ids", "search_customers", "page_customers",
+    "get_customer_summaries", "page_customer_summaries", "get_sorted_customer_ids",
+    "get_customer_ids_by_conditions", "get_customer_ids_by_vehicle_types", "find_customers_by_conditions",
+    "get_birthday_customer_ids", "count_birthdays", "get_upcoming_birthdays", "get_upcoming_age_changes",
+    "get_policy", "get_policies_by_customer", "get_policies_by_customers", "page_policies",
+    "get_upcoming_payments", "get_overdue_policies", "get_payment_alert_counts", "calculate_next_payment_date",
+    "get_sms", "get_sms_outbox", "get_change_seq", "changes_since", "changed_rows_since",
+})
+WRITE_METHODS = frozenset({
+    "add_customer", "update_customer", "delete_customer",
+    "add_policy", "update_policy", "delete_policy",
+    "mark_payment_completed", "mark_payments_completed",
+    "auto_update_payment_status", "refresh_insurance_age_changes",
+    "enqueue_sms", "enqueue_sms_batch", "compact_change_log",
+})
+# 바뀐 고객을 고객 단위로 알리지 않는 대량 쓰기 → 읽기 스레드 캐시/세그먼트 전체 무효화
+FULL_REFRESH_METHODS = frozenset({"auto_update_payment_status", "refresh_insurance_age_changes"})
+
+# 읽기 스레드가 고객 단위로 갱신할 최대 고객 수 (넘으면 전체 무효화가 더 쌈)
+REFRESH_LIMIT = 200
+WRITE_LOG_SIZE = 256
+LIST_CACHE_SIZE = 16
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden", 404: "Not Found",
+               409: "Conflict", 410: "Gone", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class ServiceError(Exception):
+    """서비스 요청 실패 (status: HTTP 상태 코드, error_type: 서버 쪽 예외 이름)"""
+
+    def __init__(self, message: str, status: int = 500, error_type: str = "ServiceError"):
+        super().__init__(message)
+        self.status = status
+        self.error_type = error_type
+
+
+# 서버 예외 이름 → 클라이언트에서 다시 발생시킬 예외 (그 외는 ServiceError)
+REMOTE_ERRORS = {
+    "ValueError": ValueError,
+    "ChangeLogExpiredError": ChangeLogExpiredError,
+    "ConflictError": ConflictError,
+    "RecordDeletedError": RecordDeletedError,
+}
+
+
+# =============================================================================
+# JSON 인코딩 (Customer/Policy, 정수 키 dict, set)
+# =============================================================================
+
+MODELS = {"Customer": Customer, "Policy": Policy}
+
+
+def encode_value(value):
+    """메서드 인자/결과 → JSON 직렬화 가능한 값"""
+    if isinstance(value, (Customer, Policy)):
+        return {"__type__": type(value).__name__, "fields": value.to_dict()}
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value):
+            return {key: encode_value(item) for key, item in value.items()}
+        return {"__type__": "map", "items": [[key, encode_value(item)] for key, item in value.items()]}
+    if isinstance(value, (set, frozenset)):
+        return {"__type__": "set", "items": [encode_value(item) for item in value]}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    if isinstance(value, sqlite3.Row):
+        return {key: value[key] for key in value.keys()}
+    return value
+
+
+def decode_value(value):
+    """encode_value() 결과 → 원래 값 (tuple은 list로 돌아옴)"""
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    kind = value.get("__type__")
+    if kind in MODELS:
+        return MODELS[kind](**value["fields"])
+    if kind == "map":
+        return {key: decode_value(item) for key, item in value["items"]}
+    if kind == "set":
+        return {decode_value(item) for item in value["items"]}
+    return {key: decode_value(item) for key, item in value.items()}
+
+
+def pack_bitmap(bits: int) -> str:
+    """세그먼트 비트맵 → zlib + base64 문자열 (희소 비트맵이 대부분이라 압축이 잘 됨)"""
+    raw = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    return base64.b64encode(zlib.compress(raw)).decode("ascii")
+
+
+def unpack_bitmap(text: str) -> int:
+    """pack_bitmap() 역변환"""
+    return int.from_bytes(zlib.decompress(base64.b64decode(text)), "little")
+
+
+# =============================================================================
+# 서버
+# =============================================================================
+
+class _WriterDatabase(DatabaseManager):
+    """쓰기 전용 DatabaseManager - 쓰기마다 바뀐 고객 ID를 모아 둠 (읽기 스레드 갱신용)"""
+
+    def __init__(self, *args, **kwargs):
+        self.touched = set()
+        super().__init__(*args, **kwargs)
+
+    def _on_write(self, customer_ids, changes=None) -> None:
+        super()._on_write(customer_ids, changes)
+        self.touched.update(customer_id for customer_id in customer_ids if customer_id is not None)
+
+
+class CrmService:
+    """DatabaseManager를 감싼 asyncio HTTP/JSON 서버 (쓰기 큐 1개 + 읽기 스레드 풀)"""
+
+    def __init__(self, db_path: str, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                 readers: int = DEFAULT_READERS, token: Optional[str] = None):
+        """
+        Args:
+            db_path: 데이터베이스 파일 경로
+            host: 수신 주소 (기본: 이 PC에서만, 다른 PC 허용은 "0.0.0.0" + token)
+            port: 수신 포트 (0이면 임의 포트)
+            readers: 읽기 스레드 수
+            token: 공유 비밀 (지정하면 "Authorization: Bearer <token>" 없는 요청 거절)
+
+        Raises:
+            ValueError: 다른 PC 접속을 허용하면서 token이 없음
+        """
+        if host not in ("127.0.0.1", "localhost", "::1") and not token:
+            raise ValueError("다른 PC 접속을 허용하려면 token이 필요합니다")
+        self.db_path = str(db_path)
+        self.host = host
+        self.port = port
+        self.readers = readers
+        self.token = token
+        self.generation = 0  # 고객에 영향을 준 쓰기마다 증가
+        self._write_log = deque(maxlen=WRITE_LOG_SIZE)  # (generation, 고객 ID set 또는 None=전체)
+        self._log_lock = threading.Lock()
+        self._list_cache = OrderedDict()
+        self._list_cache_lock = threading.Lock()
+        self._write_jobs = queue.Queue()
+        self._read_jobs = queue.Queue()
+        self._reader_state = threading.local()  # 읽기 스레드별 맞춘 쓰기 세대
+        self._threads = []
+        self._connections = set()
+        self._lock = None
+        self._server = None
+        self._loop = None
+        self._loop_thread = None
+
+    # -------------------------------------------------------------------------
+    # 시작 / 종료
+    # -------------------------------------------------------------------------
+
+    async def start(self) -> int:
+        """DB 잠금 + 쓰기/읽기 스레드 + 수신 시작
+
+        Returns:
+            수신 포트
+
+        Raises:
+            RuntimeError: 같은 DB를 다른 프로세스(앱 또는 서비스)가 사용 중
+        """
+        from utils.single_instance import InstanceLock
+
+        self._lock = InstanceLock(self.db_path)
+        if not self._lock.acquire():
+            self._lock = None
+            raise RuntimeError(f"다른 프로세스가 사용 중인 DB입니다: {self.db_path}")
+
+        # 스키마 준비는 쓰기 스레드에서 먼저 끝낸 뒤 읽기 스레드를 연다
+        ready = Future()
+        self._start_worker("service-writer", self._write_jobs, writer=True, ready=ready)
+        await asyncio.wrap_future(ready)
+        for index in range(self.readers):
+            self._start_worker(f"service-reader-{index}", self._read_jobs, writer=False)
+
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self) -> None:
+        """수신 종료 → 대기 중인 작업 처리 후 스레드/DB 연결 종료 → 잠금 해제"""
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        for thread in self._threads:
+            (self._write_jobs if thread.name == "service-writer" else self._read_jobs).put(None)
+        for thread in self._threads:
+            await asyncio.to_thread(thread.join)
+        self._threads = []
+        if self._lock is not None:
+            self._lock.release()
+            self._lock = None
+
+    def start_in_thread(self) -> int:
+        """별도 스레드의 이벤트 루프에서 실행 (앱 내장/테스트/부하 테스트용)
+
+        Returns:
+            수신 포트
+        """
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name="service-loop", daemon=True)
+        self._loop_thread.start()
+        try:
+            return asyncio.run_coroutine_threadsafe(self.start(), self._loop).result()
+        except BaseException:
+            self.stop_thread()
+            raise
+
+    def stop_thread(self) -> None:
+        """start_in_thread()로 시작한 서비스 종료"""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+        self._loop.close()
+        self._loop = self._loop_thread = None
+
+    # -------------------------------------------------------------------------
+    # 쓰기 큐 / 읽기 풀
+    # -------------------------------------------------------------------------
+
+    def _start_worker(self, name: str, jobs: queue.Queue, writer: bool, ready: Future = None) -> None:
+        thread = threading.Thread(target=self._worker_main, args=(jobs, writer, ready), name=name, daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def _worker_main(self, jobs: queue.Queue, writer: bool, ready: Optional[Future]) -> None:
+        """작업 스레드 (DatabaseManager 연결은 만든 스레드 전용)"""
+        try:
+            db = (_WriterDatabase if writer else DatabaseManager)(self.db_path)
+        except BaseException as e:
+            if ready is not None:
+                ready.set_exception(e)
+            return
+        # 다른 연결의 커밋 감지(data_version)는 캐시 전체를 비우므로 끄고, 서비스 쓰기 기록으로 갱신
+        db.DATA_VERSION_CHECK_INTERVAL = float("inf")
+        synced = self.generation
+        if ready is not None:
+            ready.set_result(None)
+        try:
+            while True:
+                job = jobs.get()
+                if job is None:
+                    return
+                future, func, methods = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    if writer:
+                        result = func(db)
+                        self._record_write(db, methods)
+                    else:
+                        synced = self._reader_state.generation = self._sync_reader(db, synced)
+                        result = func(db)
+                except BaseException as e:
+                    if writer:
+                        self._record_write(db, methods)
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+        finally:
+            db.close()
+
+    def _record_write(self, db: _WriterDatabase, methods) -> None:
+        """쓰기 1건 이후: 바뀐 고객 ID(또는 전체)를 쓰기 기록에 추가"""
+        touched = None if FULL_REFRESH_METHODS.intersection(methods) else db.touched
+        db.touched = set()
+        if touched is not None and not touched:
+            return
+        with self._log_lock:
+            self.generation += 1
+            self._write_log.append((self.generation, touched))
+
+    def _sync_reader(self, db: DatabaseManager, synced: int) -> int:
+        """읽기 스레드 DB를 현재 쓰기 세대로 맞춤 (바뀐 고객만 갱신, 기록이 밀렸으면 전체 무효화)
+
+        Returns:
+            맞춘 쓰기 세대
+        """
+        with self._log_lock:
+            generation = self.generation
+            if synced == generation:
+                return synced
+            pending = [ids for gen, ids in self._write_log if gen > synced]
+            truncated = self._write_log[0][0] > synced + 1
+        if truncated or any(ids is None for ids in pending):
+            db.invalidate_caches()
+        else:
+            customer_ids = set().union(*pending)
+            if len(customer_ids) > REFRESH_LIMIT:
+                db.invalidate_caches()
+            else:
+                db.refresh_customers(customer_ids)
+        return generation
+
+    async def _submit(self, func, methods=(), write: bool = False):
+        """작업을 쓰기 큐 또는 읽기 풀에 넣고 결과 대기"""
+        future = Future()
+        (self._write_jobs if write else self._read_jobs).put((future, func, methods))
+        return await asyncio.wrap_future(future)
+
+    # -------------------------------------------------------------------------
+    # HTTP
+    # -------------------------------------------------------------------------
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """연결 1개 (HTTP/1.1 keep-alive, 요청은 순서대로 처리)"""
+        self._connections.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY_BYTES:
+                    status, payload = 413, {"ok": False, "error": "요청 본문이 너무 큽니다", "type": "ValueError"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self._dispatch(method, target, headers, body)
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                head = (
+                    f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                )
+                writer.write(head.encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            return  # 클라이언트가 끊었거나 요청 줄이 깨짐
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _dispatch(self, method: str, target: str, headers: dict, body: bytes):
+        """요청 1건 → (상태 코드, 응답 dict)"""
+        if self.token and headers.get("authorization") != f"Bearer {self.token}":
+            return 401, {"ok": False, "error": "인증 실패", "type": "PermissionError"}
+        url = urlsplit(target)
+        try:
+            params = decode_value(json.loads(body)) if body else {}
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            route = self._route(method, url.path)
+            if route is None:
+                return 404, {"ok": False, "error": f"알 수 없는 경로: {method} {url.path}", "type": "LookupError"}
+            result = await route(params, query)
+        except Exception as e:
+            return self._error_status(e), {"ok": False, "error": str(e), "type": type(e).__name__}
+        return 200, {"ok": True, "result": encode_value(result), "generation": self.generation}
+
+    def _route(self, method: str, path: str):
+        if path.startswith("/rpc/") and method == "POST":
+            name = path[len("/rpc/"):]
+            return lambda params, query: self._call(name, params.get("args") or [], params.get("kwargs") or {})
+        return {
+            ("GET", "/health"): self._health,
+            ("POST", "/list"): self._list,
+            ("POST", "/search"): self._search,
+            ("POST", "/payments/mark-paid"): self._mark_paid,
+            ("GET", "/changes"): self._changes,
+            ("GET", "/segments"): self._segments,
+            ("POST", "/batch"): self._batch,
+        }.get((method, path))
+
+    @staticmethod
+    def _error_status(error: Exception) -> int:
+        if isinstance(error, PermissionError):
+            return 403
+        if isinstance(error, ChangeLogExpiredError):
+            return 410
+        if isinstance(error, (sqlite3.IntegrityError, ConflictError)):
+            return 409
+        if isinstance(error, (ValueError, TypeError, KeyError)):
+            return 400
+        return 500
+
+    # -------------------------------------------------------------------------
+    # 엔드포인트
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _check_method(name: str) -> bool:
+        """허용된 메서드인지 확인
+
+        Returns:
+            쓰기 메서드 여부
+
+        Raises:
+            PermissionError: 허용 목록에 없는 메서드
+        """
+        if name in WRITE_METHODS:
+            return True
+        if name in READ_METHODS:
+            return False
+        raise PermissionError(f"서비스에서 허용되지 않은 메서드: {name}")
+
+    async def _call(self, name: str, args: list, kwargs: dict):
+        write = self._check_method(name)
+        return await self._submit(lambda db: getattr(db, name)(*args, **kwargs), (name,), write)
+
+    async def _batch(self, params: dict, query: dict) -> list:
+        calls = params.get("calls") or []
+        kinds = {self._check_method(call["method"]) for call in calls}
+        if len(kinds) > 1:
+            raise ValueError("한 batch에는 읽기 또는 쓰기만 넣을 수 있습니다")
+
+        def run(db):
+            return [
+                getattr(db, call["method"])(*(call.get("args") or []), **(call.get("kwargs") or {}))
+                for call in calls
+            ]
+
+        return await self._submit(run, [call["method"] for call in calls], write=kinds == {True})
+
+    async def _health(self, params: dict, query: dict) -> dict:
+        change_seq = await self._submit(lambda db: db.get_change_seq())
+        return {
+            "generation": self.generation,
+            "change_seq": change_seq,
+            "readers": self.readers,
+            "pending_writes": self._write_jobs.qsize(),
+        }
+
+    async def _list(self, params: dict, query: dict) -> dict:
+        from customer_list import LIST_PAGE_SIZE, fetch_summary_page, select_customer_ids
+
+        filter_mode = params.get("filter_mode", "all")
+        combination = params.get("filter_combination") or {}
+        sort = params.get("sort")
+        descending = bool(params.get("descending", False))
+        keyword = params.get("keyword") or None
+        start = int(params.get("start", 0))
+        size = min(int(params.get("size", LIST_PAGE_SIZE)), 1000)
+
+        def run(db):
+            # 같은 조건의 다음 페이지는 정렬된 ID를 다시 만들지 않음 (쓰기 세대/날짜가 바뀌면 새로)
+            key = (filter_mode, tuple(sorted(combination.items())), sort, descending, keyword,
+                   self._reader_state.generation, datetime.now().strftime("%Y-%m-%d"))
+            with self._list_cache_lock:
+                ordered_ids = self._list_cache.get(key)
+            if ordered_ids is None:
+                customers = db.search_customers(keyword) if keyword else None
+                ordered_ids, _ = select_customer_ids(db, filter_mode, combination, customers, sort, descending)
+                with self._list_cache_lock:
+                    self._list_cache[key] = ordered_ids
+                    while len(self._list_cache) > LIST_CACHE_SIZE:
+                        self._list_cache.popitem(last=False)
+            return {"total": len(ordered_ids), "start": start,
+                    "rows": fetch_summary_page(db, ordered_ids, start, size)}
+
+        return await self._submit(run)
+
+    async def _search(self, params: dict, query: dict) -> List[Customer]:
+        return await self._submit(lambda db: db.page_customers(
+            params.get("after_name"), params.get("after_id"), min(int(params.get("limit", 100)), 1000),
+            params.get("keyword"),
+        ))
+
+    async def _mark_paid(self, params: dict, query: dict) -> int:
+        policy_ids = [int(policy_id) for policy_id in params["policy_ids"]]
+        payment_date = params.get("payment_date") or datetime.now().strftime("%Y-%m-%d")
+        return await self._submit(
+            lambda db: db.mark_payments_completed(policy_ids, payment_date), ("mark_payments_completed",), True
+        )
+
+    async def _changes(self, params: dict, query: dict) -> dict:
+        since = int(query.get("since", 0))
+        limit = int(query["limit"]) if "limit" in query else None
+
+        def run(db):
+            return {"changes": db.changes_since(since, limit), "change_seq": db.get_change_seq()}
+
+        return await self._submit(run)
+
+    async def _segments(self, params: dict, query: dict) -> dict:
+        def run(db):
+            index = db.get_segment_index()
+            universe = index.bits("all")  # 날짜가 바뀌었으면 여기서 재빌드
+            return {
+                "built_for": index.built_for,
+                "universe": pack_bitmap(universe),
+                "bitmaps": {name: pack_bitmap(bits) for name, bits in index.bitmaps.items()},
+            }
+
+        return await self._submit(run)
+
+
+# =============================================================================
+# 클라이언트
+# =============================================================================
+
+class ServiceClient:
+    """서비스 HTTP 클라이언트 (keep-alive 연결 1개, 스레드 안전)"""
+
+    def __init__(self, base_url: str, token: Optional[str] = None, timeout: float = 30.0):
+        """
+        Args:
+            base_url: 서비스 주소 (예: "http://127.0.0.1:8765")
+            token: 공유 비밀 (기본: CRM_SERVICE_TOKEN 환경 변수)
+            timeout: 연결/응답 대기 한도 (초)
+        """
+        url = urlsplit(base_url)
+        self.host = url.hostname or "127.0.0.1"
+        self.port = url.port or DEFAULT_PORT
+        self.token = token if token is not None else os.environ.get("CRM_SERVICE_TOKEN")
+        self.timeout = timeout
+        self.generation = 0  # 마지막 응답의 서버 쓰기 세대
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def request(self, method: str, path: str, payload=None):
+        """요청 1건
+
+        Args:
+            method: "GET" / "POST"
+            path: 경로 (쿼리 포함 가능)
+            payload: JSON 본문 (Customer/Policy 포함 가능)
+
+        Returns:
+            응답 result (Customer/Policy 복원)
+
+        Raises:
+            ConnectionError: 서비스에 연결할 수 없음
+            ValueError / ChangeLogExpiredError / ConflictError(RecordDeletedError) / ServiceError: 서버에서 실행 실패
+        """
+        body = None if payload is None else json.dumps(encode_value(payload), ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        with self._lock:
+            # 재사용한 연결이 서버 쪽에서 닫혔으면 새 연결로 한 번만 다시 보냄
+            for attempt in range(2):
+                reused = self._connection is not None
+                if not reused:
+                    self._connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                try:
+                    self._connection.request(method, path, body=body, headers=headers)
+                    response = self._connection.getresponse()
+                    data = response.read()
+                    break
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                    self.close_connection()
+                    if not reused or attempt:
+                        raise ConnectionError(f"서비스 연결 실패: {e}") from e
+                except OSError as e:
+                    self.close_connection()
+                    raise ConnectionError(f"서비스 연결 실패: {e}") from e
+            if response.getheader("Connection", "").lower() == "close":
+                self.close_connection()
+
+        message = json.loads(data)
+        if not message["ok"]:
+            error = REMOTE_ERRORS.get(message.get("type"))
+            if error is not None:
+                raise error(message["error"])
+            raise ServiceError(message["error"], response.status, message.get("type", "ServiceError"))
+        self.generation = message.get("generation", self.generation)
+        return decode_value(message["result"])
+
+    def close_connection(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class RemoteSegmentIndex(SegmentIndex):
+    """서비스의 세그먼트 비트맵 사본 (조합 계산은 클라이언트에서, 서버 쓰기 세대가 바뀌면 다시 받음)"""
+
+    def __init__(self, client: ServiceClient):
+        super().__init__(connection=None)
+        self.client = client
+        self.generation = None
+
+    def build(self) -> None:
+        data = self.client.request("GET", "/segments")
+        self.universe = unpack_bitmap(data["universe"])
+        self.bitmaps = {name: unpack_bitmap(packed) for name, packed in data["bitmaps"].items()}
+        self.built_for = data["built_for"]
+        self.generation = self.client.generation
+
+    def refresh_customer(self, customer_id: int) -> None:
+        self.invalidate()
+
+    def _ensure_current(self) -> None:
+        if self.generation != self.client.generation:
+            self.invalidate()
+        super()._ensure_current()
+
+
+class RemoteDatabase:
+    """서비스 클라이언트 - DatabaseManager 대신 앱에 넘김 (READ_METHODS / WRITE_METHODS는 같은 이름으로 호출)
+
+    로컬 파일이 필요한 기능(백업/복원, 프리페치, SMS 발송기, 캠페인)은 서비스 PC에서 실행한다.
+    """
+
+    def __init__(self, base_url: str, token: Optional[str] = None):
+        """
+        Args:
+            base_url: 서비스 주소
+            token: 공유 비밀 (기본: CRM_SERVICE_TOKEN 환경 변수)
+        """
+        self.base_url = base_url
+        self.client = ServiceClient(base_url, token)
+        self._segment_index = None
+        self.events = events.EventBus()  # 이 클라이언트의 쓰기만 발행 (다른 PC의 변경은 새로고침으로 반영)
+
+    def __getattr__(self, name: str):
+        if name in READ_METHODS or name in WRITE_METHODS:
+            return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+        raise AttributeError(name)
+
+    def call(self, method: str, *args, **kwargs):
+        """DatabaseManager 메서드 원격 호출 (쓰기면 변경 이벤트 발행)"""
+        result = self.client.request("POST", f"/rpc/{method}", {"args": list(args), "kwargs": kwargs})
+        if method in WRITE_METHODS:
+            self._publish_write(method, args, result)
+        return result
+
+    def _publish_write(self, method: str, args: tuple, result) -> None:
+        """쓰기 결과 → DatabaseManager와 같은 이벤트 (행을 알 수 없는 쓰기는 전체 갱신)"""
+        if not result:
+            return  # 대상 없음 / 바뀐 값 없음
+        if method == "add_customer":
+            changes = [events.customer_event(events.INSERT, result)]
+        elif method in ("update_customer", "delete_customer"):
+            customer_id = args[0].id if method == "update_customer" else args[0]
+            changes = [events.customer_event(events.UPDATE if method == "update_customer" else events.DELETE,
+                                             customer_id)]
+        elif method == "add_policy":
+            changes = [events.policy_event(events.INSERT, result, args[0].customer_id)]
+        elif method == "update_policy":
+            policy, original = args[0], (args[1] if len(args) > 1 else None)
+            if original is not None and original.customer_id != policy.customer_id:
+                changes = [  # 다른 고객으로 옮김
+                    events.policy_event(events.DELETE, policy.id, original.customer_id),
+                    events.policy_event(events.INSERT, policy.id, policy.customer_id),
+                ]
+            else:
+                changes = [events.policy_event(events.UPDATE, policy.id, policy.customer_id)]
+        else:
+            changes = [events.REFRESH_EVENT]
+        self.events.publish(changes)
+
+    def batch(self, calls: List[tuple]) -> list:
+        """여러 호출을 한 번에 (왕복 1회)
+
+        Args:
+            calls: [(메서드, args 튜플, kwargs dict), ...] (읽기만 또는 쓰기만)
+
+        Returns:
+            호출별 결과 리스트
+        """
+        results = self.client.request("POST", "/batch", {"calls": [
+            {"method": method, "args": list(args), "kwargs": kwargs} for method, args, kwargs in calls
+        ]})
+        for (method, args, _), result in zip(calls, results):
+            if method in WRITE_METHODS:
+                self._publish_write(method, args, result)
+        return results
+
+    def update_customer(self, customer: Customer, original: Optional[Customer] = None) -> bool:
+        """고객 수정 (서버에서 버전 비교, 성공 시 로컬 객체 version도 DatabaseManager처럼 갱신)"""
+        return self._update_versioned("update_customer", customer, original)
+
+    def update_policy(self, policy: Policy, original: Optional[Policy] = None) -> bool:
+        """계약 수정 (update_customer와 같음)"""
+        return self._update_versioned("update_policy", policy, original)
+
+    def _update_versioned(self, method: str, record, original) -> bool:
+        expected = original.version if original is not None else record.version
+        updated = self.call(method, record, original)
+        if updated and expected is not None:
+            record.version = expected + 1
+        return updated
+
+    def list_page(self, filter_mode: str = "all", filter_combination: Optional[Dict[str, str]] = None,
+                  sort: Optional[str] = None, descending: bool = False, keyword: Optional[str] = None,
+                  start: int = 0, size: int = 200) -> dict:
+        """필터/정렬 목록 한 페이지 (정렬된 ID는 서버에 두고 페이지만 받음)
+
+        Returns:
+            {"total", "start", "rows": 요약 dict 리스트}
+        """
+        return self.client.request("POST", "/list", {
+            "filter_mode": filter_mode, "filter_combination": filter_combination or {}, "sort": sort,
+            "descending": descending, "keyword": keyword, "start": start, "size": size,
+        })
+
+    def search_page(self, keyword: str, after_name: Optional[str] = None, after_id: Optional[int] = None,
+                    limit: int = 100) -> List[Customer]:
+        """이름/전화번호 검색 한 페이지 (키셋)"""
+        return self.client.request("POST", "/search", {
+            "keyword": keyword, "after_name": after_name, "after_id": after_id, "limit": limit,
+        })
+
+    def mark_payments_completed(self, policy_ids: List[int], payment_date: Optional[str] = None) -> int:
+        """여러 계약 납부 완료 (서비스에서 한 트랜잭션)"""
+        count = self.client.request("POST", "/payments/mark-paid", {
+            "policy_ids": list(policy_ids), "payment_date": payment_date,
+        })
+        self._publish_write("mark_payments_completed", (policy_ids,), count)
+        return count
+
+    def changes(self, since: int = 0, limit: Optional[int] = None) -> dict:
+        """변경 로그 {"changes", "change_seq"}"""
+        query = f"?since={since}" + (f"&limit={limit}" if limit is not None else "")
+        return self.client.request("GET", f"/changes{query}")
+
+    def health(self) -> dict:
+        return self.client.request("GET", "/health")
+
+    def iter_customers(self, batch_size: int = 500, keyword: Optional[str] = None) -> Iterator[Customer]:
+        """이름순 전체 고객 스트리밍 (DatabaseManager.iter_customers와 같은 키셋 페이지)"""
+        after_name = after_id = None
+        while True:
+            page = self.search_page(keyword, after_name, after_id, batch_size)
+            yield from page
+            if len(page) < batch_size:
+                return
+            after_name, after_id = page[-1].name, page[-1].id
+
+    def get_segment_index(self) -> RemoteSegmentIndex:
+        if self._segment_index is None:
+            self._segment_index = RemoteSegmentIndex(self.client)
+        return self._segment_index
+
+    def invalidate_caches(self) -> None:
+        if self._segment_index is not None:
+            self._segment_index.invalidate()
+        self.events.publish([events.REFRESH_EVENT])
+
+    def close(self) -> None:
+        self.client.close_connection()
+
+
+def main(argv=None):
+    """서비스 실행 (Ctrl+C로 종료)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="고객관리 서비스 모드 (여러 PC 공유)")
+    parser.add_argument("--db", default=os.environ.get("CRM_DB_PATH", "data/crm.db"), help="DB 파일 경로")
+    parser.add_argument("--host", default="127.0.0.1", help="수신 주소 (다른 PC 허용: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--readers", type=int, default=DEFAULT_READERS, help="읽기 스레드 수")
+    parser.add_argument("--token", default=os.environ.get("CRM_SERVICE_TOKEN"), help="공유 비밀")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        service = CrmService(args.db, args.host, args.port, args.readers, args.token)
+        port = await service.start()
+        print(f"서비스 시작: http://{args.host}:{port} (DB: {args.db}, 읽기 스레드 {args.readers}개)", flush=True)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await service.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+백그라운드 작업 헬퍼 - 작업 스레드 실행 + Tk 스레드로 결과 전달 (root.after 폴링)
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """공용 작업 스레드 풀 (최초 사용 시 생성)"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="background")
+    return _executor
+
+
+def run_in_background(
+    root,
+    task: Callable[[], object],
+    on_done: Callable[[object], None],
+    on_error: Optional[Callable[[BaseException], None]] = None,
+    poll_ms: int = 50,
+) -> Future:
+    """작업 스레드에서 task 실행, 완료 시 Tk 스레드에서 콜백 호출
+
+    tkinter 위젯은 Tk 스레드에서만 다뤄야 하므로 작업 스레드는 결과만 만들고,
+    Tk 스레드가 root.after로 완료 여부를 확인해 콜백을 실행한다.
+    task 안에서는 sqlite3 연결을 새로 열어야 한다 (연결은 생성한 스레드 전용).
+
+    Args:
+        root: tkinter 루트 윈도우
+        task: 작업 스레드에서 실행할 함수 (인자 없음)
+        on_done: 성공 시 결과를 받는 콜백 (Tk 스레드)
+        on_error: 실패 시 예외를 받는 콜백 (Tk 스레드, 선택)
+        poll_ms: 완료 확인 주기 (밀리초, 기본: 50ms)
+
+    Returns:
+        작업 Future
+    """
+    future = _get_executor().submit(task)
+
+    def _poll():
+        if not future.done():
+            root.after(poll_ms, _poll)
+            return
+        error = future.exception()
+        if error is None:
+            on_done(future.result())
+        elif on_error is not None:
+            on_error(error)
+
+    root.after(poll_ms, _poll)
+    return future
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+날짜 파생 헬퍼 함수 (주민등록번호 → 생년월일)
+"""
+
+import calendar
+from datetime import date, datetime
+from typing import Optional, Tuple
+
+# dateutil은 시작 시간 단축을 위해 보험나이/상령일 계산 시점에 import 한다.
+
+
+# 주민등록번호 뒷자리 첫 숫자(성별 코드) → 출생 세기
+# 1,2: 1900년대 내국인 / 3,4: 2000년대 내국인
+# 5,6: 1900년대 외국인 / 7,8: 2000년대 외국인
+# 9,0: 1800년대
+CENTURY_BY_GENDER_DIGIT = {
+    "1": 1900, "2": 1900, "5": 1900, "6": 1900,
+    "3": 2000, "4": 2000, "7": 2000, "8": 2000,
+    "9": 1800, "0": 1800,
+}
+
+
+def parse_resident_birth_date(resident_id: Optional[str]) -> Optional[date]:
+    """주민등록번호에서 생년월일 추출 (성별 코드로 세기 판단)
+
+    Args:
+        resident_id: 주민등록번호 (NNNNNN-NNNNNNN 형식)
+
+    Returns:
+        생년월일 date 객체 또는 None (형식 오류/존재하지 않는 날짜)
+
+    Example:
+        >>> parse_resident_birth_date("900115-1234567")
+        datetime.date(1990, 1, 15)
+        >>> parse_resident_birth_date("050301-3234567")
+        datetime.date(2005, 3, 1)
+    """
+    if not resident_id:
+        return None
+
+    parts = resident_id.strip().split("-")
+    front = parts[0]
+    back = parts[1] if len(parts) > 1 else ""
+    if len(front) != 6 or not front.isdigit() or not back[:1].isdigit():
+        return None
+
+    century = CENTURY_BY_GENDER_DIGIT.get(back[0])
+    if century is None:
+        return None
+
+    try:
+        return date(century + int(front[0:2]), int(front[2:4]), int(front[4:6]))
+    except ValueError:
+        return None
+
+
+def derive_birth_fields(
+    resident_id: Optional[str], birth_date: Optional[str] = None
+) -> Tuple[Optional[str], Optional[str]]:
+    """저장용 생년월일/생일(MM-DD) 컬럼 값 계산
+
+    주민등록번호가 유효하면 주민번호 기준, 아니면 입력된 birth_date(YYYY-MM-DD) 기준.
+
+    Args:
+        resident_id: 주민등록번호
+        birth_date: 직접 입력된 생년월일 (YYYY-MM-DD, 선택)
+
+    Returns:
+        (birth_date "YYYY-MM-DD", birth_mmdd "MM-DD")
+        둘 다 계산할 수 없으면 (birth_date 원본, None)
+    """
+    parsed = parse_resident_birth_date(resident_id)
+    if parsed is None and birth_date:
+        try:
+            parsed = datetime.strptime(birth_date, "%Y-%m-%d").date()
+        except ValueError:
+            parsed = None
+
+    if parsed is None:
+        return (birth_date, None)
+    return (parsed.strftime("%Y-%m-%d"), parsed.strftime("%m-%d"))
+
+
+def next_birthday(birth_mmdd: str, base_date: date) -> date:
+    """기준일 이후(당일 포함) 가장 가까운 생일 계산
+
+    2월 29일 생일은 평년에 3월 1일로 계산한다 (MM-DD 문자열 정렬 순서와 일치).
+
+    Args:
+        birth_mmdd: 생일 (MM-DD)
+        base_date: 기준일
+
+    Returns:
+        다음 생일 date 객체
+    """
+    month, day = int(birth_mmdd[0:2]), int(birth_mmdd[3:5])
+
+    for year in (base_date.year, base_date.year + 1):
+        try:
+            candidate = date(year, month, day)
+        except ValueError:
+            candidate = date(year, 3, 1)
+        if candidate >= base_date:
+            return candidate
+
+    return candidate
+
+
+def birthday_mmdds(day: date) -> Tuple[str, str]:
+    """그날을 생일로 보는 MM-DD 2개 (SQL IN 파라미터용)
+
+    평년 3월 1일은 2월 29일 생일도 포함한다 (next_birthday와 같은 규칙). 그 외에는 같은 값 2개.
+
+    Args:
+        day: 날짜
+
+    Returns:
+        (당일 MM-DD, 2월 29일 생일 포함 시 "02-29" / 아니면 당일 MM-DD)
+    """
+    mmdd = day.strftime("%m-%d")
+    if mmdd == "03-01" and not calendar.isleap(day.year):
+        return (mmdd, "02-29")
+    return (mmdd, mmdd)
+
+
+def next_insurance_age_change(birth: date, base_date: date) -> date:
+    """기준일 이후(당일 포함) 가장 가까운 상령일 계산
+
+    상령일 = 생일 + 6개월 (보험나이가 1세 올라 보험료가 바뀌는 날).
+    월말 생일은 relativedelta 규칙으로 해당 월 마지막 날에 맞춘다 (예: 8/31 → 2/28).
+
+    Args:
+        birth: 생년월일
+        base_date: 기준일
+
+    Returns:
+        다음 상령일 date 객체
+    """
+    from dateutil.relativedelta import relativedelta
+
+    years = max(base_date.year - birth.year - 1, 0)
+    change = birth + relativedelta(years=years, months=6)
+    while change < base_date:
+        years += 1
+        change = birth + relativedelta(years=years, months=6)
+    return change
@@ -1,10 +1,10 @@
 # -*- coding: utf-8 -*-
 """
-CSV 내보내기 헬퍼 함수
+CSV 내보내기 헬퍼 함수 (전체 / change_log 기준 증분)
 """
 
 import csv
-from typing import List, Tuple, Optional
+from typing import Iterable, Tuple, Optional
 from pathlib import Path
 
 # models.py에서 Customer를 import할 수 없으므로 TYPE_CHECKING 사용
@@ -13,11 +13,64 @@ if TYPE_CHECKING:
     from models import Customer
 
 
-def export_to_csv(customers: List, file_path: str) -> Tuple[bool, Optional[str]]:
-    """고객 리스트를 CSV 파일로 내보내기
+# CSV 헤더 (전체/증분 공용)
+CSV_HEADERS = [
+    "이름", "전화번호", "주민등록번호", "생년월일", "주소", "이메일",
+    "운전여부", "영업상세", "입금방식",
+    "약복용", "입원여부", "입원상세", "5년진단",
+    "고지내용", "메모", "생성일시", "수정일시"
+]
+
+# 증분 CSV 변경 구분 (change_log op → 표시)
+CHANGE_LABELS = {"upserted": "추가/수정", "deleted": "삭제"}
+
+
+def _customer_csv_row(customer) -> list:
+    """Customer → CSV 행 (CSV_HEADERS 순서)"""
+    # 운전여부 변환
+    driving_map = {
+        "none": "미운전",
+        "personal": "자가용",
+        "commercial": "영업용"
+    }
+    driving_text = driving_map.get(customer.driving_type, customer.driving_type)
+
+    # 영업용 상세
+    commercial_detail = ""
+    if customer.commercial_detail:
+        details = customer.commercial_detail.split(",")
+        detail_map = {"taxi": "택시", "construction": "건설용"}
+        commercial_detail = ", ".join([detail_map.get(d.strip(), d.strip()) for d in details])
+
+    # 입원여부
+    hospitalized = "있음" if customer.med_hospitalized else "없음"
+
+    return [
+        customer.name,
+        customer.phone,
+        customer.resident_id,
+        customer.birth_date or "",
+        customer.address or "",
+        customer.email or "",
+        driving_text,
+        commercial_detail,
+        customer.payment_method or "",
+        customer.med_medication or "",
+        hospitalized,
+        customer.med_hospital_detail or "",
+        customer.med_5yr_diagnosis or "",
+        customer.notification_content or "",
+        customer.memo or "",
+        customer.created_at or "",
+        customer.updated_at or "",
+    ]
+
+
+def export_to_csv(customers: Iterable, file_path: str) -> Tuple[bool, Optional[str]]:
+    """고객 목록을 CSV 파일로 내보내기 (한 행씩 기록하므로 제너레이터를 넘기면 메모리 일정)
 
     Args:
-        customers: Customer 객체 리스트
+        customers: Customer 객체 리스트 또는 이터러블 (예: db.iter_customers())
         file_path: 저장할 CSV 파일 경로
 
     Returns:
@@ -26,8 +79,7 @@ def export_to_csv(customers: List, file_path: str) -> Tuple[bool, Optional[str]]
         실패 시: (False, "에러 메시지")
 
     Example:
-        >>> customers = db.get_all_customers()
-        >>> success, error = export_to_csv(customers, "customers.csv")
+        >>> success, error = export_to_csv(db.iter_customers(), "customers.csv")
         >>> if success:
         ...     print("CSV 내보내기 성공")
     """
@@ -35,56 +87,9 @@ def export_to_csv(customers: List, file_path: str) -> Tuple[bool, Optional[str]]
         # UTF-8 BOM 인코딩 (Excel 한글 호환)
         with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
             writer = csv.writer(f)
-
-            # CSV 헤더
-            headers = [
-                "이름", "전화번호", "주민등록번호", "생년월일", "주소", "이메일",
-                "운전여부", "영업상세", "입금방식",
-                "약복용", "입원여부", "입원상세", "5년진단",
-                "고지내용", "메모", "생성일시", "수정일시"
-            ]
-            writer.writerow(headers)
-
-            # 데이터 rows
+            writer.writerow(CSV_HEADERS)
             for customer in customers:
-                # 운전여부 변환
-                driving_map = {
-                    "none": "미운전",
-                    "personal": "자가용",
-                    "commercial": "영업용"
-                }
-                driving_text = driving_map.get(customer.driving_type, customer.driving_type)
-
-                # 영업용 상세
-                commercial_detail = ""
-                if customer.commercial_detail:
-                    details = customer.commercial_detail.split(",")
-                    detail_map = {"taxi": "택시", "construction": "건설용"}
-                    commercial_detail = ", ".join([detail_map.get(d.strip(), d.strip()) for d in details])
-
-                # 입원여부
-                hospitalized = "있음" if customer.med_hospitalized else "없음"
-
-                row = [
-                    customer.name,
-                    customer.phone,
-                    customer.resident_id,
-                    customer.birth_date or "",
-                    customer.address or "",
-                    customer.email or "",
-                    driving_text,
-                    commercial_detail,
-                    customer.payment_method or "",
-                    customer.med_medication or "",
-                    hospitalized,
-                    customer.med_hospital_detail or "",
-                    customer.med_5yr_diagnosis or "",
-                    customer.notification_content or "",
-                    customer.memo or "",
-                    customer.created_at or "",
-                    customer.updated_at or "",
-                ]
-                writer.writerow(row)
+                writer.writerow(_customer_csv_row(customer))
 
         return (True, None)
 
@@ -92,3 +97,41 @@ def export_to_csv(customers: List, file_path: str) -> Tuple[bool, Optional[str]]
         return (False, "파일이 다른 프로그램에서 사용 중입니다. 파일을 닫고 다시 시도해주세요.")
     except Exception as e:
         return (False, f"CSV 내보내기 실패: {str(e)}")
+
+
+def export_changes_to_csv(db, since_seq: int, file_path: str) -> Tuple[bool, Optional[str], int]:
+    """since_seq 이후 바뀐 고객만 CSV로 내보내기 (증분, change_log 기준)
+
+    바뀐 고객은 현재 값으로, 삭제된 고객은 고객ID만 있는 "삭제" 행(톰스톤)으로 기록한다.
+    이후 다시 바뀐 고객은 다음 증분에 또 나오므로 고객ID 기준으로 덮어쓰면 된다.
+
+    Args:
+        db: DatabaseManager 인스턴스
+        since_seq: 직전 내보내기 위치 (처음이면 전체 내보내기 직전의 db.get_change_seq())
+        file_path: 저장할 CSV 파일 경로
+
+    Returns:
+        (성공 여부, 에러 메시지, 이번 내보내기 위치 - 다음 호출의 since_seq)
+        since_seq 이후 로그가 압축된 경우 ChangeLogExpiredError (전체 내보내기 필요)
+    """
+    until_seq = db.get_change_seq()
+    changes = db.changed_rows_since("customers", since_seq, until_seq)
+    try:
+        with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(["변경", "고객ID", *CSV_HEADERS])
+
+            # 500건씩 조회 (그 사이 삭제된 고객은 다음 증분의 톰스톤으로 나옴)
+            upserted = changes["upserted"]
+            for start in range(0, len(upserted), 500):
+                for customer in db.get_customers_by_ids(upserted[start:start + 500]):
+                    writer.writerow([CHANGE_LABELS["upserted"], customer.id, *_customer_csv_row(customer)])
+            for customer_id in changes["deleted"]:
+                writer.writerow([CHANGE_LABELS["deleted"], customer_id] + [""] * len(CSV_HEADERS))
+
+        return (True, None, until_seq)
+
+    except PermissionError:
+        return (False, "파일이 다른 프로그램에서 사용 중입니다. 파일을 닫고 다시 시도해주세요.", since_seq)
+    except Exception as e:
+        return (False, f"CSV 내보내기 실패: {str(e)}", since_seq)
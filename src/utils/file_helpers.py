@@ -1,14 +1,25 @@
 # -*- coding: utf-8 -*-
 """
-파일 백업/복원 헬퍼 함수
+파일 백업/복원 헬퍼 함수 (전체 파일 복사 / change_log 기준 증분)
 """
 
+import json
 import shutil
+import sqlite3
 from pathlib import Path
 from datetime import datetime
 from typing import Tuple, Optional
 
 
+# 증분 백업 대상: change_log 테이블 → 함께 옮길 고객 부속 테이블 (customer_id 기준, 트리거 아닌 코드로 유지됨)
+# 부속 테이블 → 백업 컬럼 (SELECT * 대신 명시적 컬럼 목록)
+CHANGES_BACKUP_FORMAT = "crm-changes"
+CUSTOMER_ATTRIBUTE_TABLES = {
+    "customer_conditions": "customer_id, kind, name",
+    "customer_vehicle_types": "customer_id, vehicle_type",
+}
+
+
 def backup_database(db_path: Path, backup_dir: Path) -> Tuple[bool, Optional[str], Optional[str]]:
     """데이터베이스 파일 백업
 
@@ -102,3 +113,181 @@ def get_backup_info(backup_path: Path) -> dict:
         'created': datetime.fromtimestamp(stat.st_ctime).strftime("%Y-%m-%d %H:%M:%S"),
         'modified': datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
     }
+
+
+def backup_changes(db, backup_dir: Path, since_seq: int) -> Tuple[bool, Optional[str], Optional[str]]:
+    """since_seq 이후 바뀐 행만 증분 백업 (JSON Lines, change_log 기준)
+
+    첫 줄은 헤더 {"format", "since_seq", "until_seq", "created_at"}, 이후 한 줄에 한 행:
+    {"table", "op": "upsert", "row", "attributes"} 또는 {"table", "op": "delete", "id"}.
+    복원은 전체 백업을 복원한 뒤 그 이후 증분 파일을 순서대로 restore_changes()로 적용한다.
+
+    Args:
+        db: DatabaseManager 인스턴스
+        backup_dir: 백업 파일을 저장할 디렉토리
+        since_seq: 직전 백업 위치 (get_backup_seq(직전 백업 파일))
+
+    Returns:
+        (성공 여부, 백업 파일 경로, 에러 메시지)
+        since_seq 이후 로그가 압축된 경우 ChangeLogExpiredError (전체 백업 필요)
+    """
+    until_seq = db.get_change_seq()
+    # 모델 컬럼 + 고객 파생 컬럼 (복원 시 UPDATE가 파생 컬럼을 다시 계산하지 않으므로 함께 옮김)
+    columns = {
+        "customers": f"{db.CUSTOMER_COLUMNS}, birth_mmdd, insurance_age_change_date",
+        "policies": db.POLICY_COLUMNS,
+    }
+    changes = {table: db.changed_rows_since(table, since_seq, until_seq) for table in db.CHANGE_LOG_TABLES}
+    try:
+        backup_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        backup_path = backup_dir / f"crm_changes_{since_seq}_{until_seq}_{timestamp}.jsonl"
+
+        with open(backup_path, "w", encoding="utf-8") as f:
+            header = {
+                "format": CHANGES_BACKUP_FORMAT,
+                "since_seq": since_seq,
+                "until_seq": until_seq,
+                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            f.write(json.dumps(header, ensure_ascii=False) + "\n")
+
+            # 고객 → 계약 순 (복원 시 부모 행 먼저)
+            for table in db.CHANGE_LOG_TABLES:
+                upserted = changes[table]["upserted"]
+                for start in range(0, len(upserted), 500):
+                    chunk = upserted[start:start + 500]
+                    placeholders = ", ".join("?" for _ in chunk)
+                    rows = db.connection.execute(
+                        f"SELECT {columns[table]} FROM {table} WHERE id IN ({placeholders}) ORDER BY id", chunk
+                    ).fetchall()
+                    attributes = _customer_attributes(db.connection, chunk) if table == "customers" else {}
+                    for row in rows:
+                        entry = {"table": table, "op": "upsert", "row": dict(row)}
+                        if table == "customers":
+                            entry["attributes"] = {
+                                name: by_customer.get(row["id"], []) for name, by_customer in attributes.items()
+                            }
+                        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            for table in reversed(db.CHANGE_LOG_TABLES):
+                for row_id in changes[table]["deleted"]:
+                    f.write(json.dumps({"table": table, "op": "delete", "id": row_id}) + "\n")
+
+        return (True, str(backup_path), None)
+
+    except PermissionError:
+        return (False, None, "파일 접근 권한이 없습니다.")
+    except Exception as e:
+        return (False, None, f"증분 백업 실패: {str(e)}")
+
+
+def _customer_attributes(connection, customer_ids) -> dict:
+    """고객 부속 테이블 행 → {테이블: {customer_id: [행 dict, ...]}}"""
+    placeholders = ", ".join("?" for _ in customer_ids)
+    result = {}
+    for table, columns in CUSTOMER_ATTRIBUTE_TABLES.items():
+        by_customer = {}
+        for row in connection.execute(
+            f"SELECT {columns} FROM {table} WHERE customer_id IN ({placeholders})", list(customer_ids)
+        ).fetchall():
+            by_customer.setdefault(row["customer_id"], []).append(dict(row))
+        result[table] = by_customer
+    return result
+
+
+def restore_changes(changes_path: Path, db_path: Path) -> Tuple[bool, Optional[str]]:
+    """증분 백업 파일을 데이터베이스에 적용 (한 트랜잭션, 실패 시 변경 없음)
+
+    Args:
+        changes_path: backup_changes()로 만든 파일 경로
+        db_path: 적용할 데이터베이스 파일 경로 (직전 백업까지 복원된 상태)
+
+    Returns:
+        (성공 여부, 에러 메시지)
+    """
+    try:
+        if not changes_path.exists():
+            return (False, "백업 파일을 찾을 수 없습니다.")
+
+        with open(changes_path, encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("format") != CHANGES_BACKUP_FORMAT:
+                return (False, "증분 백업 파일 형식이 아닙니다.")
+
+            # 외래키 검사 끔 (고객 삭제 시 CASCADE 대신 계약 톰스톤을 그대로 적용)
+            connection = sqlite3.connect(str(db_path), isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                for line in f:
+                    _apply_change(connection, json.loads(line))
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+            finally:
+                connection.close()
+
+        return (True, None)
+
+    except PermissionError:
+        return (False, "파일 접근 권한이 없습니다.")
+    except Exception as e:
+        return (False, f"증분 복원 실패: {str(e)}")
+
+
+def _apply_change(connection, entry: dict) -> None:
+    """증분 백업 한 줄 적용 (upsert: 있으면 UPDATE, 없으면 INSERT / delete: 행 + 고객 부속 행 삭제)"""
+    table = entry["table"]
+    if entry["op"] == "delete":
+        connection.execute(f"DELETE FROM {table} WHERE id = ?", (entry["id"],))
+        if table == "customers":
+            for attribute_table in CUSTOMER_ATTRIBUTE_TABLES:
+                connection.execute(f"DELETE FROM {attribute_table} WHERE customer_id = ?", (entry["id"],))
+        return
+
+    # UPSERT(ON CONFLICT DO UPDATE) 대신 UPDATE → 없으면 INSERT:
+    # 바깥 문장의 충돌 처리가 요약 트리거의 INSERT OR REPLACE를 덮어써 요약 갱신이 실패하므로
+    row = entry["row"]
+    columns = list(row)
+    cursor = connection.execute(
+        f"UPDATE {table} SET {', '.join(f'{column} = ?' for column in columns if column != 'id')} WHERE id = ?",
+        [row[column] for column in columns if column != "id"] + [row["id"]],
+    )
+    if cursor.rowcount == 0:
+        connection.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            [row[column] for column in columns],
+        )
+    for attribute_table, rows in entry.get("attributes", {}).items():
+        connection.execute(f"DELETE FROM {attribute_table} WHERE customer_id = ?", (row["id"],))
+        for attribute in rows:
+            names = list(attribute)
+            connection.execute(
+                f"INSERT INTO {attribute_table} ({', '.join(names)}) VALUES ({', '.join('?' for _ in names)})",
+                [attribute[name] for name in names],
+            )
+
+
+def get_backup_seq(backup_path: Path) -> int:
+    """백업 파일의 변경 로그 위치 (다음 증분 백업의 since_seq)
+
+    Args:
+        backup_path: 전체 백업(.db) 또는 증분 백업(.jsonl) 파일 경로
+
+    Returns:
+        전체 백업: 백업 당시 change_log 위치 (로그 없으면 0) / 증분 백업: 헤더의 until_seq
+    """
+    backup_path = Path(backup_path)
+    if backup_path.suffix == ".jsonl":
+        with open(backup_path, encoding="utf-8") as f:
+            return int(json.loads(f.readline())["until_seq"])
+
+    connection = sqlite3.connect(f"file:{backup_path}?mode=ro", uri=True)
+    try:
+        row = connection.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+    except sqlite3.OperationalError:
+        row = None  # 변경 로그 도입 이전 백업
+    finally:
+        connection.close()
+    return row[0] if row else 0
@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+"""
+쿼리 계측 - SQL 형태/파라미터 수/소요 시간/반환 행 수/호출 메서드 기록, 느린 쿼리 로그
+
+기본은 꺼져 있다. CRM_QUERY_PROFILE=1이면 connect()가 계측 연결을 돌려주고,
+꺼져 있으면 일반 sqlite3 연결을 그대로 돌려주므로 추가 비용이 없다.
+
+환경 변수:
+    CRM_QUERY_PROFILE: "1"/"true"면 계측 사용
+    CRM_SLOW_QUERY_MS: 느린 쿼리 기준 (ms, 기본 50)
+    CRM_LOG_DIR: 로그 디렉토리 (기본 logs)
+
+출력 (CRM_LOG_DIR 아래):
+    slow_queries.log: 기준 초과 쿼리 1건당 JSON 한 줄 (1MB × 5개 순환)
+    query_stats.json: 호출 메서드별 집계 + 소요 시간 히스토그램 (flush() 시 기록)
+
+파라미터 값은 개인정보(주민번호, 전화번호)가 들어 있으므로 기록하지 않고 개수만 남긴다.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Dict, Optional
+
+
+# 히스토그램 구간 상한 (ms), 마지막 구간은 그 이상 전부
+HISTOGRAM_BOUNDS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+
+SLOW_LOG_MAX_BYTES = 1024 * 1024
+SLOW_LOG_BACKUPS = 5
+
+_SHAPE_CACHE_SIZE = 1024
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def sql_shape(sql: str) -> str:
+    """SQL 형태 (리터럴 → ?, IN 목록 → (?...), 공백 정리)
+
+    같은 쿼리가 값/IN 목록 길이만 달라도 한 형태로 집계되도록 한다.
+    """
+    shape = _STRING_LITERAL.sub("?", sql)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _WHITESPACE.sub(" ", shape).strip()
+    return _PLACEHOLDER_LIST.sub("(?...)", shape)
+
+
+def _calling_method() -> str:
+    """쿼리를 실행한 메서드 이름 ("DatabaseManager.add_customer")
+
+    이 모듈 밖 첫 프레임의 파일 안에서 가장 바깥 프레임을 고른다.
+    (add_customer → _sync_customer_attributes 처럼 내부 도우미를 거쳐도 공개 메서드로 집계)
+    """
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename == __file__:
+        frame = frame.f_back
+    if frame is None:
+        return "<unknown>"
+    filename = frame.f_code.co_filename
+    outer = frame
+    while frame is not None and frame.f_code.co_filename == filename:
+        outer = frame
+        frame = frame.f_back
+    code = outer.f_code
+    qualname = getattr(code, "co_qualname", None)  # Python 3.11+
+    if qualname is not None:
+        return qualname
+    owner = outer.f_locals.get("self")
+    return f"{type(owner).__name__}.{code.co_name}" if owner is not None else code.co_name
+
+
+class QueryProfiler:
+    """쿼리 기록 수집기 (여러 연결/스레드에서 공유, 스레드 안전)"""
+
+    def __init__(self, log_dir: Path, slow_ms: float = 50.0):
+        """QueryProfiler 초기화
+
+        Args:
+            log_dir: 로그 디렉토리
+            slow_ms: 느린 쿼리 기준 (ms)
+        """
+        self.log_dir = Path(log_dir)
+        self.slow_ms = slow_ms
+        self._lock = threading.Lock()
+        self._methods = {}  # 메서드 → {"count", "total_ms", "max_ms", "rows", "histogram", "shapes"}
+        self._shapes = {}  # SQL 문자열 → 형태 (정규식 비용 절감)
+        self._slow_logger = None
+
+    @classmethod
+    def from_env(cls) -> Optional["QueryProfiler"]:
+        """환경 변수로 설정 (CRM_QUERY_PROFILE이 꺼져 있으면 None)"""
+        if os.environ.get("CRM_QUERY_PROFILE", "").strip().lower() not in ("1", "true"):
+            return None
+        return cls(
+            log_dir=Path(os.environ.get("CRM_LOG_DIR", "logs")),
+            slow_ms=float(os.environ.get("CRM_SLOW_QUERY_MS", "50")),
+        )
+
+    def connect(self, database: str, **kwargs) -> sqlite3.Connection:
+        """계측 연결 생성 (sqlite3.connect와 같은 인자)"""
+        connection = sqlite3.connect(database, factory=ProfiledConnection, **kwargs)
+        connection.profiler = self
+        return connection
+
+    def _shape(self, sql: str) -> str:
+        shape = self._shapes.get(sql)
+        if shape is None:
+            if len(self._shapes) >= _SHAPE_CACHE_SIZE:
+                self._shapes.clear()
+            shape = self._shapes[sql] = sql_shape(sql)
+        return shape
+
+    def record(self, method: str, sql: str, param_count: int, elapsed_ms: float, rows: int) -> None:
+        """쿼리 1건 기록 (기준 초과면 느린 쿼리 로그에도 기록)"""
+        with self._lock:
+            shape = self._shape(sql)
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = {
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "rows": 0,
+                    "histogram": [0] * (len(HISTOGRAM_BOUNDS_MS) + 1),
+                    "shapes": {},
+                }
+            stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["rows"] += rows
+            stats["histogram"][_bucket(elapsed_ms)] += 1
+            stats["shapes"][shape] = stats["shapes"].get(shape, 0) + 1
+
+        if elapsed_ms >= self.slow_ms:
+            self._get_slow_logger().warning(json.dumps({
+                "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "method": method,
+                "ms": round(elapsed_ms, 3),
+                "rows": rows,
+                "params": param_count,
+                "sql": shape,
+            }, ensure_ascii=False))
+
+    def _get_slow_logger(self) -> logging.Logger:
+        """느린 쿼리 로거 (첫 느린 쿼리 때 파일 생성)"""
+        with self._lock:
+            if self._slow_logger is None:
+                self.log_dir.mkdir(parents=True, exist_ok=True)
+                handler = RotatingFileHandler(
+                    self.log_dir / "slow_queries.log",
+                    maxBytes=SLOW_LOG_MAX_BYTES,
+                    backupCount=SLOW_LOG_BACKUPS,
+                    encoding="utf-8",
+                )
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger = logging.getLogger(f"crm.slow_query.{id(self)}")
+                logger.propagate = False
+                logger.setLevel(logging.WARNING)
+                logger.addHandler(handler)
+                self._slow_logger = logger
+            return self._slow_logger
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """메서드별 집계 복사본
+
+        Returns:
+            {메서드: {"count", "total_ms", "mean_ms", "max_ms", "rows",
+                      "histogram": {"<=0.1ms": n, ..., ">1000ms": n}, "shapes": {형태: 횟수}}}
+        """
+        labels = [f"<={bound}ms" for bound in HISTOGRAM_BOUNDS_MS] + [f">{HISTOGRAM_BOUNDS_MS[-1]}ms"]
+        with self._lock:
+            return {
+                method: {
+                    "count": stats["count"],
+                    "total_ms": round(stats["total_ms"], 3),
+                    "mean_ms": round(stats["total_ms"] / stats["count"], 3),
+                    "max_ms": round(stats["max_ms"], 3),
+                    "rows": stats["rows"],
+                    "histogram": dict(zip(labels, stats["histogram"])),
+                    "shapes": dict(stats["shapes"]),
+                }
+                for method, stats in sorted(self._methods.items(), key=lambda item: -item[1]["total_ms"])
+            }
+
+    def flush(self) -> Optional[Path]:
+        """메서드별 집계를 query_stats.json으로 기록
+
+        Returns:
+            기록한 파일 경로 (기록할 내용이 없으면 None)
+        """
+        snapshot = self.snapshot()
+        if not snapshot:
+            return None
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        path = self.log_dir / "query_stats.json"
+        path.write_text(json.dumps(snapshot, ensure_ascii=False, indent=2), encoding="utf-8")
+        return path
+
+
+def _bucket(elapsed_ms: float) -> int:
+    for index, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+        if elapsed_ms <= bound:
+            return index
+    return len(HISTOGRAM_BOUNDS_MS)
+
+
+def _param_count(parameters) -> int:
+    try:
+        return len(parameters)
+    except TypeError:
+        return 0
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """계측 커서
+
+    execute 시점부터 결과를 다 읽을 때까지(또는 다음 execute/close까지)를 1건으로 기록한다.
+    SELECT는 실행 시간 대부분이 fetch에서 쓰이므로 fetch 시간과 행 수도 합산한다.
+    """
+
+    _pending = None  # [메서드, SQL, 파라미터 수, 누적 ms, 행 수]
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        pending = [_calling_method(), sql, _param_count(parameters), 0.0, 0]
+        start = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        finally:
+            pending[3] = (time.perf_counter() - start) * 1000
+            self._pending = pending
+        if self.description is None:  # 결과 행 없는 문장 (INSERT/UPDATE/DDL)
+            pending[4] = max(self.rowcount, 0)
+            self._finish()
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        method = _calling_method()
+        if not isinstance(seq_of_parameters, (list, tuple)):
+            seq_of_parameters = list(seq_of_parameters)
+        start = time.perf_counter()
+        try:
+            super().executemany(sql, seq_of_parameters)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.connection.profiler.record(
+                method, sql, len(seq_of_parameters), elapsed_ms, max(self.rowcount, 0)
+            )
+        return self
+
+    def executescript(self, sql_script):
+        self._finish()
+        method = _calling_method()
+        start = time.perf_counter()
+        try:
+            super().executescript(sql_script)
+        finally:
+            self.connection.profiler.record(method, sql_script, 0, (time.perf_counter() - start) * 1000, 0)
+        return self
+
+    def _timed_fetch(self, fetch, *args):
+        pending = self._pending
+        if pending is None:
+            return fetch(*args)
+        start = time.perf_counter()
+        try:
+            result = fetch(*args)
+        finally:
+            pending[3] += (time.perf_counter() - start) * 1000
+        return result
+
+    def fetchone(self):
+        row = self._timed_fetch(super().fetchone)
+        if self._pending is not None:
+            if row is None:
+                self._finish()
+            else:
+                self._pending[4] += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed_fetch(super().fetchmany, self.arraysize if size is None else size)
+        if self._pending is not None:
+            self._pending[4] += len(rows)
+            if not rows:
+                self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed_fetch(super().fetchall)
+        if self._pending is not None:
+            self._pending[4] += len(rows)
+            self._finish()
+        return rows
+
+    def __next__(self):
+        try:
+            row = self._timed_fetch(super().__next__)
+        except StopIteration:
+            self._finish()
+            raise
+        if self._pending is not None:
+            self._pending[4] += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        self._finish()
+
+    def _finish(self) -> None:
+        """진행 중인 기록 마무리"""
+        pending = self._pending
+        if pending is not None:
+            self._pending = None
+            method, sql, param_count, elapsed_ms, rows = pending
+            self.connection.profiler.record(method, sql, param_count, elapsed_ms, rows)
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """계측 연결 (execute 계열 단축 메서드도 계측 커서 사용)"""
+
+    profiler: QueryProfiler = None
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+_env_profiler = None
+_env_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> Optional[QueryProfiler]:
+    """프로세스 공용 계측기 (환경 변수로 켜진 경우만, 최초 호출 시 생성)"""
+    global _env_profiler
+    if os.environ.get("CRM_QUERY_PROFILE") is None:
+        return None
+    with _env_profiler_lock:
+        if _env_profiler is None:
+            _env_profiler = QueryProfiler.from_env()
+        return _env_profiler
+
+
+def connect(database: str, profiler: Optional[QueryProfiler] = None, **kwargs) -> sqlite3.Connection:
+    """sqlite3 연결 (계측기가 있으면 계측 연결, 없으면 일반 연결)
+
+    Args:
+        database: DB 파일 경로
+        profiler: 사용할 계측기 (기본: 환경 변수 설정 공용 계측기)
+        **kwargs: sqlite3.connect 인자
+    """
+    profiler = profiler or get_profiler()
+    if profiler is None:
+        return sqlite3.connect(database, **kwargs)
+    return profiler.connect(database, **kwargs)
@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+"""
+단일 인스턴스 - DB 파일당 실행 중인 앱(주 인스턴스) 하나 + 로컬 소켓 명령 전달
+
+같은 DB로 두 번째 실행하면 창을 새로 만들지 않고 주 인스턴스에 명령("focus", "open_customer")만
+보내고 바로 종료한다 (tkinter/GUI 모듈 import 전에 처리). 다른 프로세스의 쓰기도 "db_write" 명령으로
+주 인스턴스에 보내 주 인스턴스의 DB 연결에서 순서대로 실행한다 (프로세스 간 쓰기 경합/잠금 오류 방지).
+
+- 잠금: <DB 경로>.instance.lock 파일 배타 잠금 (프로세스 종료 시 OS가 자동 해제 → 비정상 종료 후에도 재실행 가능)
+- 연결 정보: <DB 경로>.instance.json {pid, port, token} (127.0.0.1 임의 포트, 토큰 없는 요청은 거절)
+- 프로토콜: 요청/응답 각각 JSON 한 줄 {"token", "command", "args"} → {"ok", "result" | "error"}
+"""
+
+import json
+import os
+import queue
+import secrets
+import socket
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+# 주 인스턴스 Tk 스레드에서 처리할 명령 (그 외 "ping"은 소켓 스레드에서 바로 응답)
+UI_COMMANDS = ("focus", "open_customer", "db_write")
+
+# "db_write"로 실행할 수 있는 DatabaseManager 쓰기 메서드 → dict 인자를 바꿀 모델 (없으면 그대로)
+WRITE_METHODS = {
+    "add_customer": "Customer",
+    "update_customer": "Customer",
+    "delete_customer": None,
+    "add_policy": "Policy",
+    "update_policy": "Policy",
+    "delete_policy": None,
+    "mark_payment_completed": None,
+    "enqueue_sms": None,
+}
+
+
+def _lock_path(db_path) -> Path:
+    return Path(f"{db_path}.instance.lock")
+
+
+def _info_path(db_path) -> Path:
+    return Path(f"{db_path}.instance.json")
+
+
+class InstanceLock:
+    """DB 파일당 주 인스턴스 잠금 (파일 배타 잠금, 비차단)"""
+
+    def __init__(self, db_path):
+        """
+        Args:
+            db_path: 데이터베이스 파일 경로 (잠금/연결 정보 파일은 같은 위치)
+        """
+        self.path = _lock_path(db_path)
+        self._file = None
+
+    def acquire(self) -> bool:
+        """잠금 시도
+
+        Returns:
+            True: 주 인스턴스가 됨 / False: 이미 다른 프로세스가 잠금 보유
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.path, "a+b")
+        try:
+            if os.name == "nt":
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._file = lock_file
+        return True
+
+    def release(self) -> None:
+        """잠금 해제 (파일은 남겨 둠: 지우면 다른 프로세스가 잡은 새 파일과 엇갈릴 수 있음)"""
+        if self._file is None:
+            return
+        try:
+            if os.name == "nt":
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+class InstanceRequest:
+    """주 인스턴스 Tk 스레드가 처리할 요청 1건 (소켓 스레드는 응답을 기다림)"""
+
+    def __init__(self, command: str, args: dict):
+        self.command = command
+        self.args = args
+        self.result = None
+        self.error = None
+        self.cancelled = False  # 응답 시간 초과로 요청한 쪽이 포기 → 처리하지 않음
+        self._started = False
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def claim(self) -> bool:
+        """(Tk 스레드) 처리 시작 표시
+
+        Returns:
+            True: 처리해야 함 / False: 이미 포기된 요청 (건너뜀)
+        """
+        with self._lock:
+            if self.cancelled:
+                return False
+            self._started = True
+            return True
+
+    def abandon(self) -> bool:
+        """(소켓 스레드) 응답 시간 초과 시 포기 표시
+
+        Returns:
+            True: 포기됨 (처리되지 않음) / False: 이미 처리 중 → 결과를 기다려야 함
+        """
+        with self._lock:
+            if self._started:
+                return False
+            self.cancelled = True
+            return True
+
+    def reply(self, result=None) -> None:
+        """처리 완료 (결과는 JSON 직렬화 가능해야 함)"""
+        self.result = result
+        self._done.set()
+
+    def fail(self, error: str) -> None:
+        """처리 실패"""
+        self.error = error
+        self._done.set()
+
+    def wait(self, timeout: float) -> bool:
+        return self._done.wait(timeout)
+
+
+class InstanceServer:
+    """주 인스턴스 명령 수신 (127.0.0.1 소켓 + 스레드 1개, 요청은 한 번에 하나씩 처리)
+
+    UI_COMMANDS는 requests 큐에 넣고 Tk 스레드가 reply()할 때까지 기다린다
+    (메인 윈도우가 root.after 폴링으로 꺼내 처리, 창이 뜨기 전 요청은 큐에서 대기).
+    """
+
+    def __init__(self, db_path, reply_timeout: float = 10.0):
+        """
+        Args:
+            db_path: 데이터베이스 파일 경로
+            reply_timeout: Tk 스레드 처리 대기 한도 (초)
+        """
+        self.info_path = _info_path(db_path)
+        self.reply_timeout = reply_timeout
+        self.requests: "queue.Queue[InstanceRequest]" = queue.Queue()
+        self.token = secrets.token_hex(16)
+        self._socket = None
+        self._thread = None
+
+    def start(self) -> int:
+        """소켓 열고 연결 정보 기록 + 수신 스레드 시작
+
+        Returns:
+            수신 포트
+        """
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.bind(("127.0.0.1", 0))
+        self._socket.listen(8)
+        port = self._socket.getsockname()[1]
+
+        # 원자적 교체 (읽는 쪽이 반쯤 쓰인 파일을 보지 않도록)
+        temp_path = self.info_path.with_suffix(".tmp")
+        temp_path.write_text(
+            json.dumps({"pid": os.getpid(), "port": port, "token": self.token}), encoding="utf-8"
+        )
+        os.replace(temp_path, self.info_path)
+
+        self._thread = threading.Thread(target=self._serve, name="instance-server", daemon=True)
+        self._thread.start()
+        return port
+
+    def stop(self) -> None:
+        """수신 종료 + 연결 정보 삭제"""
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+        try:
+            self.info_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _serve(self) -> None:
+        """수신 루프 (소켓이 닫히면 종료)"""
+        while True:
+            try:
+                connection, _ = self._socket.accept()
+            except OSError:
+                return
+            with connection:
+                connection.settimeout(2.0)
+                try:
+                    response = self._handle(_read_line(connection))
+                except Exception as e:  # 잘못된 요청 하나로 수신 스레드가 죽지 않도록
+                    response = {"ok": False, "error": f"잘못된 요청: {e}"}
+                try:
+                    connection.sendall(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                except OSError:
+                    pass  # 요청한 쪽이 먼저 끊음
+
+    def _handle(self, message: dict) -> dict:
+        """요청 1건 처리 → 응답 dict"""
+        if not isinstance(message, dict):
+            return {"ok": False, "error": "잘못된 요청: JSON 객체가 아님"}
+        if not secrets.compare_digest(str(message.get("token", "")), self.token):
+            return {"ok": False, "error": "인증 실패"}
+        command = message.get("command")
+        if command == "ping":
+            return {"ok": True, "result": {"pid": os.getpid()}}
+        if command not in UI_COMMANDS:
+            return {"ok": False, "error": f"알 수 없는 명령: {command}"}
+        args = message.get("args") or {}
+        if not isinstance(args, dict):
+            return {"ok": False, "error": "잘못된 요청: args가 JSON 객체가 아님"}
+
+        request = InstanceRequest(command, args)
+        self.requests.put(request)
+        if not request.wait(self.reply_timeout):
+            # 시간 초과로 실패를 알린 쓰기가 나중에 실행되지 않도록 포기 표시 (이미 처리 중이면 끝까지 기다림)
+            if request.abandon():
+                return {"ok": False, "error": "주 인스턴스 응답 시간 초과"}
+            request.wait(None)
+        if request.error is not None:
+            return {"ok": False, "error": request.error}
+        return {"ok": True, "result": request.result}
+
+
+def _read_line(connection) -> dict:
+    """JSON 한 줄 수신"""
+    buffer = b""
+    while not buffer.endswith(b"\n"):
+        chunk = connection.recv(65536)
+        if not chunk:
+            break
+        buffer += chunk
+    return json.loads(buffer.decode("utf-8"))
+
+
+def send_command(db_path, command: str, args: Optional[dict] = None, timeout: float = 2.0) -> Optional[dict]:
+    """실행 중인 주 인스턴스에 명령 전송
+
+    Args:
+        db_path: 데이터베이스 파일 경로
+        command: "ping" / "focus" / "open_customer" / "db_write"
+        args: 명령 인자 (JSON 직렬화 가능)
+        timeout: 연결/응답 대기 한도 (초)
+
+    Returns:
+        응답 {"ok": bool, "result" | "error"} (주 인스턴스가 없거나 연결 실패 시 None)
+    """
+    try:
+        info = json.loads(_info_path(db_path).read_text(encoding="utf-8"))
+        with socket.create_connection(("127.0.0.1", info["port"]), timeout=timeout) as connection:
+            message = {"token": info["token"], "command": command, "args": args or {}}
+            connection.sendall(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+            return _read_line(connection)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def request_write(db_path, method: str, *args, **kwargs):
+    """다른 프로세스에서 주 인스턴스로 DB 쓰기 위임 (주 인스턴스 연결에서 순서대로 실행)
+
+    Args:
+        db_path: 데이터베이스 파일 경로
+        method: WRITE_METHODS 중 하나 (Customer/Policy 인자는 to_dict() 결과로 전달)
+        *args, **kwargs: 메서드 인자
+
+    Returns:
+        메서드 반환값
+
+    Raises:
+        ConnectionError: 주 인스턴스 없음
+        RuntimeError: 주 인스턴스에서 실행 실패
+    """
+    response = send_command(
+        db_path, "db_write", {"method": method, "args": list(args), "kwargs": kwargs}, timeout=15.0
+    )
+    if response is None:
+        raise ConnectionError("실행 중인 주 인스턴스가 없습니다")
+    if not response["ok"]:
+        raise RuntimeError(response["error"])
+    return response["result"]
+
+
+def apply_write(db, args: dict):
+    """"db_write" 요청 실행 (주 인스턴스 Tk 스레드에서 호출)
+
+    Args:
+        db: DatabaseManager 인스턴스
+        args: {"method", "args", "kwargs"}
+
+    Returns:
+        메서드 반환값
+
+    Raises:
+        ValueError: 허용되지 않은 메서드
+    """
+    from models import Customer, Policy
+
+    method = args.get("method")
+    if method not in WRITE_METHODS:
+        raise ValueError(f"허용되지 않은 쓰기 메서드: {method}")
+    models: Dict[str, Callable] = {"Customer": Customer, "Policy": Policy}
+    call_args = list(args.get("args") or [])
+    call_kwargs = dict(args.get("kwargs") or {})
+    model = WRITE_METHODS[method]
+    if model is not None:
+        # 수정 대상 + 편집 시작 시점 스냅샷(original) 모두 모델로 복원
+        call_args = [models[model](**value) if isinstance(value, dict) else value for value in call_args]
+        call_kwargs = {
+            name: models[model](**value) if isinstance(value, dict) else value
+            for name, value in call_kwargs.items()
+        }
+    return getattr(db, method)(*call_args, **call_kwargs)
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+SMS 발송 대기열 처리기 - sms_outbox 테이블을 백그라운드에서 발송 (동시성 제한 + 속도 제한 + 재시도)
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import queue
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+
+class SmsSendError(Exception):
+    """SMS 발송 실패
+
+    Attributes:
+        retryable: 재시도 가능 여부 (네트워크 오류, 429, 5xx)
+        status_code: HTTP 상태 코드 (없으면 None)
+    """
+
+    def __init__(self, message: str, retryable: bool, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.status_code = status_code
+
+
+class TokenBucket:
+    """토큰 버킷 속도 제한 (스레드 안전)
+
+    초당 rate개 토큰이 채워지고 최대 capacity개까지 모인다.
+    acquire()는 토큰이 생길 때까지 기다린다.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[int] = None):
+        """TokenBucket 초기화
+
+        Args:
+            rate: 초당 허용 건수
+            capacity: 순간 최대 건수 (기본: rate 올림)
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate + 0.999))
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """토큰 1개 사용 (없으면 대기)"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class HttpSmsTransport:
+    """NCP SENS SMS API 전송기 (urllib, 추가 의존성 없음)
+
+    base_url을 바꾸면 로컬 테스트 서버로 보낼 수 있다.
+    """
+
+    def __init__(
+        self,
+        access_key: str,
+        secret_key: str,
+        service_id: str,
+        sender: str,
+        base_url: str = "https://sens.apigw.ntruss.com",
+        timeout: float = 10.0,
+    ):
+        """HttpSmsTransport 초기화
+
+        Args:
+            access_key: NCP Access Key
+            secret_key: NCP Secret Key
+            service_id: SENS 서비스 ID
+            sender: 발신 번호 (사전 등록 번호)
+            base_url: API 주소
+            timeout: 요청 제한 시간 (초)
+        """
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.service_id = service_id
+        self.sender = sender
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    @classmethod
+    def from_env(cls) -> Optional["HttpSmsTransport"]:
+        """환경변수로 전송기 생성 (SMS_SEND_ENABLED=true가 아니거나 설정 누락이면 None)"""
+        if os.environ.get("SMS_SEND_ENABLED", "").strip().lower() != "true":
+            return None
+        settings = {
+            "access_key": os.environ.get("NCP_ACCESS_KEY", ""),
+            "secret_key": os.environ.get("NCP_SECRET_KEY", ""),
+            "service_id": os.environ.get("NCP_SMS_SERVICE_ID", ""),
+            "sender": os.environ.get("NCP_SMS_SENDER", ""),
+        }
+        if not all(settings.values()):
+            return None
+        base_url = os.environ.get("NCP_SMS_BASE_URL", "https://sens.apigw.ntruss.com")
+        return cls(base_url=base_url, **settings)
+
+    def _signature(self, method: str, uri: str, timestamp: str) -> str:
+        """NCP API Gateway 서명 (HMAC-SHA256, Base64)"""
+        message = f"{method} {uri}\n{timestamp}\n{self.access_key}"
+        digest = hmac.new(self.secret_key.encode("utf-8"), message.encode("utf-8"), hashlib.sha256).digest()
+        return base64.b64encode(digest).decode("utf-8")
+
+    def send(self, phone: str, message: str, idempotency_key: str) -> None:
+        """SMS 1건 발송
+
+        Args:
+            phone: 수신 번호
+            message: 본문
+            idempotency_key: 중복 방지 키 (X-Idempotency-Key 헤더로 전달)
+
+        Raises:
+            SmsSendError: 발송 실패 (retryable로 재시도 여부 구분)
+        """
+        uri = f"/sms/v2/services/{self.service_id}/messages"
+        timestamp = str(int(time.time() * 1000))
+        body = json.dumps({
+            "type": "LMS" if len(message.encode("euc-kr", errors="replace")) > 90 else "SMS",
+            "from": self.sender.replace("-", ""),
+            "content": message,
+            "messages": [{"to": phone.replace("-", "")}],
+        }).encode("utf-8")
+
+        request = urllib.request.Request(
+            self.base_url + uri,
+            data=body,
+            method="POST",
+            headers={
+                "Content-Type": "application/json; charset=utf-8",
+                "x-ncp-apigw-timestamp": timestamp,
+                "x-ncp-iam-access-key": self.access_key,
+                "x-ncp-apigw-signature-v2": self._signature("POST", uri, timestamp),
+                "X-Idempotency-Key": idempotency_key,
+            },
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+        except urllib.error.HTTPError as e:
+            detail = e.read().decode("utf-8", errors="replace")[:200]
+            retryable = e.code == 429 or e.code >= 500
+            raise SmsSendError(f"HTTP {e.code}: {detail}", retryable=retryable, status_code=e.code)
+        except (urllib.error.URLError, OSError) as e:
+            raise SmsSendError(f"네트워크 오류: {e}", retryable=True)
+
+
+class SmsOutboxWorker:
+    """sms_outbox 백그라운드 발송기
+
+    - 디스패처 스레드 1개가 전용 DatabaseManager로 대기열을 읽고/갱신 (DB 쓰기는 이 스레드만)
+    - 발송은 ThreadPoolExecutor(max_concurrency)에서 실행, 토큰 버킷으로 초당 건수 제한
+    - 재시도 가능 오류는 지수 백오프(base_delay * 2^(시도-1), 최대 max_delay)로 재예약
+    - 상태 변경은 on_status(항목 dict) 콜백으로 알림 (디스패처 스레드에서 호출되므로
+      UI는 queue에 넣고 root.after로 꺼내야 한다)
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        transport,
+        max_concurrency: int = 4,
+        rate_per_second: float = 10.0,
+        max_attempts: int = 5,
+        base_delay: float = 2.0,
+        max_delay: float = 300.0,
+        poll_interval: float = 1.0,
+        on_status: Optional[Callable[[Dict], None]] = None,
+    ):
+        """SmsOutboxWorker 초기화
+
+        Args:
+            db_path: 데이터베이스 파일 경로
+            transport: send(phone, message, idempotency_key) 메서드를 가진 전송기
+            max_concurrency: 동시 발송 수
+            rate_per_second: 초당 최대 발송 건수 (제공사 한도)
+            max_attempts: 최대 시도 횟수
+            base_delay: 첫 재시도 대기 (초)
+            max_delay: 최대 재시도 대기 (초)
+            poll_interval: 대기열 확인 주기 (초)
+            on_status: 상태 변경 콜백 (항목 dict)
+        """
+        self.db_path = db_path
+        self.transport = transport
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(rate_per_second)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.on_status = on_status
+
+        self._results: "queue.Queue" = queue.Queue()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._in_flight = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """디스패처 스레드 시작"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="sms-outbox", daemon=True)
+        self._thread.start()
+
+    def wake(self) -> None:
+        """대기열에 새 항목이 들어왔음을 알림 (즉시 확인)"""
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """발송기 종료 (진행 중 발송은 완료까지 대기)"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_idle(self) -> bool:
+        """진행 중인 발송이 없는지 여부 (테스트용)"""
+        return self._in_flight == 0 and self._results.empty()
+
+    def _run(self) -> None:
+        """디스패처 루프: 결과 반영 → 발송 대상 가져오기 → 대기"""
+        from database import DatabaseManager
+
+        db = DatabaseManager(self.db_path)
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="sms-send")
+        try:
+            db.recover_sending_sms()
+            while not self._stop.is_set():
+                self._apply_results(db)
+
+                free = self.max_concurrency - self._in_flight
+                if free > 0:
+                    for entry in db.claim_due_sms(limit=free):
+                        self._in_flight += 1
+                        self._notify(entry)
+                        executor.submit(self._send, entry)
+
+                # 발송 결과 / wake() / poll_interval 중 먼저 오는 것까지 대기
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+        finally:
+            executor.shutdown(wait=True)
+            self._apply_results(db)
+            db.close()
+
+    def _send(self, entry: Dict) -> None:
+        """(발송 스레드) 속도 제한 후 1건 발송, 결과는 디스패처로 전달"""
+        self.bucket.acquire()
+        try:
+            self.transport.send(entry["phone"], entry["message"], entry["idempotency_key"])
+            self._results.put((entry, None))
+        except SmsSendError as e:
+            self._results.put((entry, e))
+        except Exception as e:  # 전송기 버그 등 예상 못한 오류도 재시도 대상으로 기록
+            self._results.put((entry, SmsSendError(str(e), retryable=True)))
+        self._wake.set()
+
+    def _apply_results(self, db) -> None:
+        """(디스패처 스레드) 발송 결과를 DB에 반영"""
+        while True:
+            try:
+                entry, error = self._results.get_nowait()
+            except queue.Empty:
+                return
+            self._in_flight -= 1
+
+            if error is None:
+                db.complete_sms(entry["id"])
+            elif error.retryable and entry["attempts"] < self.max_attempts:
+                delay = min(self.max_delay, self.base_delay * (2 ** (entry["attempts"] - 1)))
+                next_attempt = (datetime.now() + timedelta(seconds=delay)).strftime("%Y-%m-%d %H:%M:%S.%f")
+                db.retry_sms(entry["id"], str(error), next_attempt)
+            else:
+                db.fail_sms(entry["id"], str(error))
+            self._notify(db.get_sms(entry["id"]))
+
+    def _notify(self, entry: Optional[Dict]) -> None:
+        """상태 변경 콜백 호출 (콜백 오류는 발송에 영향 없음)"""
+        if self.on_status is None or entry is None:
+            return
+        try:
+            self.on_status(entry)
+        except Exception as e:
+            print(f"⚠️ SMS 상태 콜백 실패: {e}")
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+공용 테스트 픽스처 - 임시 데이터베이스, 계약 팩토리
+"""
+
+import sys
+from pathlib import Path
+
+# src 디렉토리를 sys.path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from database import DatabaseManager
+from models import Policy
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """테스트용 임시 데이터베이스 경로 (스키마 생성 후 닫힘 → 테스트가 직접 연결)"""
+    path = str(tmp_path / "test_crm.db")
+    DatabaseManager(path).close()
+    return path
+
+
+@pytest.fixture
+def db(tmp_path):
+    """테스트용 임시 데이터베이스"""
+    database = DatabaseManager(str(tmp_path / "test_crm.db"))
+    yield database
+    database.close()
+
+
+def make_policy(customer_id: int, **overrides) -> Policy:
+    """테스트용 카드 월납 계약 (지정한 필드만 덮어씀, 납부일을 안 주면 add_policy가 계산)"""
+    fields = dict(
+        customer_id=customer_id, insurer="삼성생명", product_name="종신보험", premium=50000,
+        payment_method="card", billing_cycle="monthly", billing_day=25, contract_start_date="2026-01-01",
+    )
+    fields.update(overrides)
+    return Policy(**fields)
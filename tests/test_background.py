@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+백그라운드 작업 테스트 - 작업 스레드 실행 + Tk 스레드 콜백 전달 + 시작 시 납부 체크
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+# src 디렉토리를 sys.path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models import Customer
+from utils.background import run_in_background
+from conftest import make_policy
+
+
+class _AfterLoop:
+    """root.after만 흉내 내는 테스트용 이벤트 루프 (호출 스레드 기록)"""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, ms, callback):
+        self.callbacks.append(callback)
+
+    def run_until(self, predicate, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not predicate() and time.monotonic() < deadline:
+            callbacks, self.callbacks = self.callbacks, []
+            for callback in callbacks:
+                callback()
+            time.sleep(0.01)
+
+
+def test_run_in_background_delivers_on_calling_thread():
+    """작업은 다른 스레드에서, 콜백은 root.after 루프(호출 스레드)에서 실행"""
+    root = _AfterLoop()
+    results = {}
+
+    def task():
+        results["task_thread"] = threading.get_ident()
+        return 42
+
+    def on_done(value):
+        results["value"] = value
+        results["callback_thread"] = threading.get_ident()
+
+    run_in_background(root, task, on_done)
+    root.run_until(lambda: "value" in results)
+
+    assert results["value"] == 42
+    assert results["task_thread"] != threading.get_ident()
+    assert results["callback_thread"] == threading.get_ident()
+
+
+def test_run_in_background_reports_errors():
+    """작업 예외는 on_error 콜백으로 전달"""
+    root = _AfterLoop()
+    errors = []
+
+    def task():
+        raise ValueError("실패")
+
+    run_in_background(root, task, on_done=lambda value: None, on_error=errors.append)
+    root.run_until(lambda: errors)
+
+    assert isinstance(errors[0], ValueError)
+
+
+def test_startup_payment_check_uses_own_connection(db):
+    """시작 시 납부 체크: 작업 스레드 전용 연결로 연체 갱신 + 건수 조회"""
+    from gui.main_window import _run_startup_payment_check
+
+    customer_id = db.add_customer(Customer(name="연체", phone="010-8100-0001"))
+    db.add_policy(make_policy(customer_id, contract_start_date="2025-01-01", next_payment_date="2025-12-25"))
+
+    root = _AfterLoop()
+    results = []
+    run_in_background(root, lambda: _run_startup_payment_check(str(db.db_path)), results.append)
+    root.run_until(lambda: results)
+
+    assert results[0]["updated"] == 1
+    assert results[0]["overdue_count"] == 1
+    assert results[0]["upcoming_count"] == 0
+
+    db.invalidate_caches()
+    assert db.get_segment_index().count("overdue") == 1
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+벤치마크 도구 테스트 - 합성 데이터 결정성, 결과 비교
+"""
+
+import sys
+import sqlite3
+from pathlib import Path
+
+# src, benchmarks 디렉토리를 sys.path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from create_dummy_data import BulkDistribution, create_bulk_data
+from datasets import build_dataset
+from cases import uncovered_methods
+from run import compare_reports, nearest_rank
+
+
+def _dump(path):
+    connection = sqlite3.connect(str(path))
+    try:
+        return {
+            table: connection.execute(f"SELECT * FROM {table} ORDER BY 1, 2").fetchall()
+            for table in ("customers", "policies", "customer_conditions", "customer_summary")
+        }
+    finally:
+        connection.close()
+
+
+def test_synthetic_dataset_is_deterministic(tmp_path):
+    """같은 규모/시드/기준일이면 같은 데이터, 요약 테이블도 채워짐"""
+    first, second = tmp_path / "a.db", tmp_path / "b.db"
+    build_dataset(first, 300, seed=7, base_date="2026-10-19")
+    build_dataset(second, 300, seed=7, base_date="2026-10-19")
+
+    dump = _dump(first)
+    assert dump == _dump(second)
+    assert len(dump["customers"]) == 300
+    assert len(dump["customer_summary"]) == 300
+    assert len(dump["policies"]) > 300
+
+
+def test_bulk_generation_is_independent_of_worker_count(tmp_path):
+    """청크별 시드 → 프로세스 수와 무관하게 같은 데이터, 분포 설정 반영"""
+    distribution = BulkDistribution().override(["policy_count_weights=0,0,1", "card_ratio=1.0"])
+    single, pooled = tmp_path / "single.db", tmp_path / "pooled.db"
+    create_bulk_data(single, 900, seed=3, base_date="2026-10-19", distribution=distribution,
+                     workers=1, verbose=False, chunk_size=250)
+    create_bulk_data(pooled, 900, seed=3, base_date="2026-10-19", distribution=distribution,
+                     workers=2, verbose=False, chunk_size=250)
+
+    dump = _dump(single)
+    assert dump == _dump(pooled)
+    assert len(dump["policies"]) == 1800
+    connection = sqlite3.connect(str(single))
+    try:
+        methods = {row[0] for row in connection.execute("SELECT DISTINCT payment_method FROM policies")}
+    finally:
+        connection.close()
+    assert methods == {"card"}
+
+
+def test_every_public_method_has_a_case():
+    """DatabaseManager 공개 메서드마다 벤치마크 케이스 존재"""
+    assert uncovered_methods() == []
+
+
+def test_compare_flags_regressions_over_threshold():
+    """임계값 이상 + 최소 차이 이상 느려진 케이스만 회귀로 판정"""
+    before = {"results": {"10k": {"a": {"median_ms": 10.0}, "b": {"median_ms": 0.01}, "c": {"median_ms": 5.0}}}}
+    after = {"results": {"10k": {"a": {"median_ms": 13.0}, "b": {"median_ms": 0.03}, "c": {"median_ms": 5.5}}}}
+
+    rows = {name: regressed for _, name, _, _, _, regressed in compare_reports(before, after, 0.2, 0.05)}
+    assert rows == {"a": True, "b": False, "c": False}
+
+
+def test_nearest_rank_percentile():
+    """p95는 nearest-rank (20개 → 19번째 값, 21개 → 20번째 값)"""
+    assert nearest_rank(list(range(1, 21)), 0.95) == 19
+    assert nearest_rank(list(range(1, 22)), 0.95) == 20
+    assert nearest_rank(list(range(1, 101)), 0.95) == 95
+    assert nearest_rank([7], 0.95) == 7
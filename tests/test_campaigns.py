@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+SMS 캠페인 테스트 - 세그먼트 수신자 조회, 템플릿 렌더링, dry-run, 대기열 등록
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# src 디렉토리를 sys.path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from campaigns import CompiledTemplate, enqueue_campaign, plan_campaign
+from models import Customer
+from conftest import make_policy
+
+
+BASE_DATE = "2026-10-19"
+
+
+def _add_card_policy(db, customer_id, product_name, premium, next_payment_date):
+    db.add_policy(make_policy(
+        customer_id, product_name=product_name, premium=premium, next_payment_date=next_payment_date,
+        card_issuer="신한카드", card_number="1234-5678-9012-3456", card_expiry="12/28",
+    ))
+
+
+def test_compiled_template_rejects_unknown_field():
+    """템플릿은 생성 시 한 번 파싱, 알 수 없는 필드는 즉시 오류"""
+    template = CompiledTemplate("{name}님 {payment_date} 납부 예정")
+    assert template.render({"name": "김고객", "payment_date": "2026-10-25"}) == "김고객님 2026-10-25 납부 예정"
+    assert template.render({"name": "김고객"}) == "김고객님  납부 예정"
+
+    with pytest.raises(ValueError):
+        CompiledTemplate("{nickname}님")
+
+
+def test_upcoming_campaign_groups_policies_per_customer(db):
+    """납부 임박 캠페인: 고객당 메시지 1건 (계약 합산), 다른 고객 제외"""
+    kim = db.add_customer(Customer(name="김임박", phone="010-1000-0001", resident_id="900101-1234567"))
+    lee = db.add_customer(Customer(name="이먼납부", phone="010-1000-0002", resident_id="850505-2234567"))
+    _add_card_policy(db, kim, "종신보험", 50000, "2026-10-22")
+    _add_card_policy(db, kim, "실손보험", 30000, "2026-10-24")
+    _add_card_policy(db, lee, "암보험", 40000, "2026-12-01")
+
+    plan = plan_campaign(db, "upcoming_payment", base_date=BASE_DATE)
+
+    assert [item.customer_id for item in plan.messages] == [kim]
+    message = plan.messages[0].message
+    assert "2026-10-22" in message and "80,000원" in message
+    assert "종신보험" in message and "실손보험" in message
+
+
+def test_age_change_campaign_uses_base_date(db):
+    """상령일 캠페인은 기준일 다음 상령일로 수신자/날짜 계산 (저장된 오늘 기준 상령일과 무관)"""
+    kim = db.add_customer(Customer(name="김상령", phone="010-3000-0001", resident_id="901020-1234567"))
+    db.add_customer(Customer(name="이먼상령", phone="010-3000-0002", resident_id="900101-1234567"))
+
+    plan = plan_campaign(db, "age_change", base_date="2028-04-15")
+    assert [item.customer_id for item in plan.messages] == [kim]
+    assert "2028-04-20부터" in plan.messages[0].message
+
+    # 다른 세그먼트 템플릿의 {age_change_date}도 기준일 기준
+    plan = plan_campaign(db, "birthday_today", template_text="{name} {age_change_date}", base_date="2028-10-20")
+    assert [item.message for item in plan.messages] == ["김상령 2029-04-20"]
+
+
+def test_birthday_campaign_includes_leap_day_on_march_first(db):
+    """평년 3월 1일 생일 캠페인은 2월 29일생 포함"""
+    db.add_customer(Customer(name="윤일생", phone="010-4000-0001", resident_id="000229-3234567"))
+    assert [item.name for item in plan_campaign(db, "birthday_today", base_date="2027-03-01").messages] == ["윤일생"]
+    assert plan_campaign(db, "birthday_today", base_date="2028-03-01").messages == []
+
+
+def test_dry_run_does_not_touch_outbox_and_enqueue_is_idempotent(db):
+    """dry-run은 DB 변경 없음, 같은 날 재등록은 중복 없음"""
+    db.add_customer(Customer(name="박생일", phone="010-2000-0001", resident_id="901019-1234567"))
+    db.add_customer(Customer(name="최다른날", phone="010-2000-0002", resident_id="900505-1234567"))
+
+    plan = plan_campaign(db, "birthday_today", base_date=BASE_DATE)
+    assert [item.name for item in plan.messages] == ["박생일"]
+    assert "수신자: 1명" in plan.preview()
+    assert db.get_sms_outbox() == []
+
+    assert enqueue_campaign(db, plan) == 1
+    assert enqueue_campaign(db, plan) == 0
+    outbox = db.get_sms_outbox()
+    assert len(outbox) == 1 and outbox[0]["template"] == "birthday"
+
+
+def test_campaign_renders_2000_recipients_under_one_second(db):
+    """2,000명 캠페인 조회 + 렌더링 1초 이내"""
+    timestamp = "2026-01-01 00:00:00"
+    db.connection.executemany(
+        """
+        INSERT INTO customers (name, phone, resident_id, birth_mmdd, created_at, updated_at)
+        VALUES (?, ?, '901019-1234567', '10-19', ?, ?)
+        """,
+        [(f"고객{i:04d}", f"010-3{i // 10000:03d}-{i % 10000:04d}", timestamp, timestamp) for i in range(2000)],
+    )
+    db.connection.commit()
+
+    start = time.perf_counter()
+    plan = plan_campaign(db, "birthday_today", base_date=BASE_DATE)
+    elapsed = time.perf_counter() - start
+
+    assert len(plan.messages) == 2000
+    assert elapsed < 1.0, f"렌더링 {elapsed:.3f}초"
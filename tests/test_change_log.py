@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+변경 로그(change_log) 테스트 - 트리거 기록, 톰스톤, 압축, 증분 CSV/백업
+"""
+
+import sys
+import csv
+import shutil
+from pathlib import Path
+
+# src 디렉토리를 sys.path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from database import ChangeLogExpiredError, DatabaseManager
+from models import Customer
+from utils.export_helpers import export_changes_to_csv
+from utils.file_helpers import backup_changes, backup_database, get_backup_seq, restore_changes
+from conftest import make_policy
+
+
+def test_triggers_log_changes_with_row_versions_and_tombstones(db):
+    """INSERT/UPDATE/DELETE 기록 (version = 행 version), 고객 삭제 CASCADE 계약도 톰스톤"""
+    customer_id = db.add_customer(Customer(name="김변경", phone="010-6000-0001", med_medication="고혈압"))
+    policy_id = db.add_policy(make_policy(customer_id))
+    start = db.get_change_seq()
+
+    customer = db.get_customer(customer_id)
+    customer.memo = "수정"
+    db.update_customer(customer)
+    db.delete_customer(customer_id)
+
+    changes = db.changes_since(start)
+    assert [(c["table_name"], c["row_id"], c["op"]) for c in changes] == [
+        ("customers", customer_id, "update"),
+        ("policies", policy_id, "delete"),
+        ("customers", customer_id, "delete"),
+    ]
+    assert [c["version"] for c in changes] == [2, 1, 2]  # 고객 v2 수정, 계약 v1 삭제, 고객 v2 삭제
+    assert [c["seq"] for c in changes] == sorted(c["seq"] for c in changes)
+    assert db.get_change_seq() == changes[-1]["seq"]
+    assert db.changed_rows_since("customers", 0) == {"upserted": [], "deleted": [customer_id]}
+
+
+def test_log_version_matches_row_version(db):
+    """상령일 갱신 같은 내부 쓰기도 행 version을 올림 → 로그 version과 행 version이 항상 같음"""
+    customer_id = db.add_customer(Customer(name="김버전", phone="010-6000-0009", resident_id="800101-1234567"))
+    db.connection.execute(
+        "UPDATE customers SET insurance_age_change_date = '2000-07-01', version = version + 1 WHERE id = ?",
+        (customer_id,),
+    )
+    db.connection.commit()
+    assert db.refresh_insurance_age_changes() == 1
+    customer = db.get_customer(customer_id)
+    customer.memo = "수정"
+    db.update_customer(customer)
+
+    assert customer.version == db.get_customer(customer_id).version == 4
+    assert [c["version"] for c in db.changes_since(0)] == [1, 2, 3, 4]
+
+
+def test_compaction_keeps_latest_per_row_and_expires_purged_positions(db):
+    """압축: 행별 마지막 항목만 유지 (seq 재사용 없음), 톰스톤 삭제 이전 위치는 증분 거절"""
+    kept = db.add_customer(Customer(name="유지", phone="010-6000-0002"))
+    removed = db.add_customer(Customer(name="삭제", phone="010-6000-0003"))
+    for index in range(3):
+        customer = db.get_customer(kept)
+        customer.memo = f"수정{index}"
+        db.update_customer(customer)
+    db.delete_customer(removed)
+    before = db.changed_rows_since("customers", 0)
+    last_seq = db.get_change_seq()
+
+    assert db.compact_change_log() == 4
+    assert db.changed_rows_since("customers", 0) == before
+    assert [(c["row_id"], c["version"]) for c in db.changes_since(0)] == [(kept, 4), (removed, 1)]
+
+    db.compact_change_log(purge_tombstones_through=last_seq)
+    assert db.changed_rows_since("customers", last_seq) == {"upserted": [], "deleted": []}
+    with pytest.raises(ChangeLogExpiredError):
+        db.changes_since(0)
+
+    new_id = db.add_customer(Customer(name="새고객", phone="010-6000-0004"))
+    assert db.changes_since(last_seq)[0]["seq"] == last_seq + 1
+    assert db.changed_rows_since("customers", last_seq)["upserted"] == [new_id]
+
+
+def test_incremental_csv_and_backup_restore(db, tmp_path):
+    """증분 CSV는 바뀐 고객만, 전체 백업 + 증분 백업 적용 = 현재 DB"""
+    ids = [db.add_customer(Customer(name=f"고객{i}", phone=f"010-6100-000{i}")) for i in range(4)]
+    db.add_policy(make_policy(ids[0]))
+    _, full_backup, _ = backup_database(db.db_path, tmp_path / "backups")
+    since = get_backup_seq(Path(full_backup))
+    assert since == db.get_change_seq()
+
+    customer = db.get_customer(ids[1])
+    customer.med_medication = "당뇨"
+    customer.resident_id = "900315-1234567"  # 파생 컬럼(birth_mmdd 등)도 복원되어야 함
+    db.update_customer(customer)
+    db.add_policy(make_policy(ids[1]))
+    db.delete_customer(ids[0])
+
+    success, error, until = export_changes_to_csv(db, since, str(tmp_path / "changes.csv"))
+    assert success, error
+    with open(tmp_path / "changes.csv", encoding="utf-8-sig") as f:
+        rows = list(csv.reader(f))[1:]
+    assert [(row[0], int(row[1]), row[2]) for row in rows] == [("추가/수정", ids[1], "고객1"), ("삭제", ids[0], "")]
+    assert until == db.get_change_seq()
+
+    success, changes_path, error = backup_changes(db, tmp_path / "backups", since)
+    assert success, error
+    assert get_backup_seq(Path(changes_path)) == until
+
+    restored = tmp_path / "restored.db"
+    shutil.copy2(full_backup, restored)
+    assert restore_changes(Path(changes_path), restored) == (True, None)
+
+    restored_db = DatabaseManager(str(restored))
+    try:
+        for table in ("customers", "policies", "customer_conditions", "customer_summary"):
+            query = f"SELECT * FROM {table} ORDER BY 1, 2"
+            actual = [tuple(row) for row in restored_db.connection.execute(query)]
+            assert actual == [tuple(row) for row in db.connection.execute(query)], table
+    finally:
+        restored_db.close()
+
+
+def test_consumer_marks_drive_compaction(db):
+    """소비자 위치 저장, 압축은 모든 소비자가 처리한 위치까지만 톰스톤 삭제"""
+    assert db.get_change_log_mark("backup") is None
+    with pytest.raises(ValueError):
+        db.get_change_log_mark("unknown")
+
+    first = db.add_customer(Customer(name="처리됨", phone="010-6000-0011"))
+    db.delete_customer(first)
+    csv_seq = db.get_change_seq()
+    db.set_change_log_mark("csv_export", csv_seq)
+    second = db.add_customer(Customer(name="백업만", phone="010-6000-0012"))
+    db.delete_customer(second)
+    db.set_change_log_mark("backup", db.get_change_seq())
+
+    db.compact_change_log_for_consumers()
+    assert db.get_change_log_mark("csv_export") == csv_seq
+    assert db.changed_rows_since("customers", csv_seq) == {"upserted": [], "deleted": [second]}
+    with pytest.raises(ChangeLogExpiredError):
+        db.changes_since(0)
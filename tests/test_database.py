@@ -10,8 +10,9 @@ from pathlib import Path
 # src 디렉토리를 path에 추가
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+import pytest
 from models import Customer
-from database import DatabaseManager
+from database import ConflictError, DatabaseManager, RecordDeletedError
 
 
 def test_database_creation():
@@ -124,6 +125,119 @@ def test_update_customer():
         db.close()
 
 
+def test_update_customer_version_conflict():
+    """먼저 저장한 쪽만 반영되고, 오래된 버전으로 저장하면 ConflictError (쓰기 잠금은 풀림)"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = DatabaseManager(str(Path(tmpdir) / "test.db"))
+        customer_id = db.add_customer(Customer(name="동시수정", phone="010-0000-0000"))
+
+        first = db.get_customer(customer_id)
+        second = db.get_customer(customer_id)
+        assert first.version == second.version == 1
+
+        first.memo = "첫 번째 창"
+        assert db.update_customer(first) is True
+        assert first.version == 2
+
+        second.memo = "두 번째 창"
+        with pytest.raises(ConflictError):
+            db.update_customer(second)
+        assert db.get_customer(customer_id).memo == "첫 번째 창"
+
+        # 같은 객체로 이어서 저장 (버전 갱신됨), 버전 없는 객체는 비교 없이 저장
+        first.memo = "다시 저장"
+        assert db.update_customer(first) is True
+        assert db.update_customer(Customer(name="버전없음", phone="010-0000-0000", id=customer_id)) is True
+        assert db.get_customer(customer_id).version == 4
+        with pytest.raises(RecordDeletedError):
+            db.update_customer(Customer(name="없음", phone="010-0000-0001", id=999))
+
+        # 충돌 후 쓰기 잠금이 남아 있지 않음 (다른 연결이 바로 쓸 수 있음)
+        other = sqlite3.connect(str(Path(tmpdir) / "test.db"), timeout=0)
+        other.execute("UPDATE customers SET memo = 'other' WHERE id = ?", (customer_id,))
+        other.commit()
+        other.close()
+        db.close()
+
+
+def test_update_customer_deleted_meanwhile():
+    """편집 중 다른 곳에서 삭제된 고객을 저장하면 False가 아니라 RecordDeletedError (쓰기 잠금은 풀림)"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = DatabaseManager(str(Path(tmpdir) / "test.db"))
+        customer_id = db.add_customer(Customer(name="삭제됨", phone="010-0000-0000"))
+        original = db.get_customer(customer_id)
+        edited = db.get_customer(customer_id)
+        edited.memo = "삭제 후 저장"
+        assert db.delete_customer(customer_id) is True
+
+        with pytest.raises(RecordDeletedError):
+            db.update_customer(edited, original)
+        with pytest.raises(RecordDeletedError):
+            db.update_customer(edited)
+
+        other = sqlite3.connect(str(Path(tmpdir) / "test.db"), timeout=0)
+        other.execute("UPDATE customers SET memo = 'other'")
+        other.commit()
+        other.close()
+        db.close()
+
+
+def test_update_customer_writes_only_changed_columns():
+    """스냅샷(original)을 주면 바뀐 컬럼만 UPDATE, 질환/차종 테이블은 관련 필드가 바뀔 때만 다시 씀"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = DatabaseManager(str(Path(tmpdir) / "test.db"))
+        customer_id = db.add_customer(Customer(
+            name="부분수정", phone="010-0000-0000", resident_id="900101-1234567",
+            email="a@example.com", med_medication="고혈압",
+        ))
+        original = db.get_customer(customer_id)
+
+        statements = []
+        db.connection.set_trace_callback(statements.append)
+        edited = db.get_customer(customer_id)
+        edited.memo = "메모만 수정"
+        assert db.update_customer(edited, original) is True
+        db.connection.set_trace_callback(None)
+
+        update = next(sql for sql in statements if sql.startswith("UPDATE customers"))
+        assert "memo = " in update and "name = " not in update and "birth_mmdd" not in update
+        assert not any("customer_conditions" in sql for sql in statements)
+
+        saved = db.get_customer(customer_id)
+        assert (saved.memo, saved.email, saved.birth_date, saved.version) == (
+            "메모만 수정", "a@example.com", "1990-01-01", 2
+        )
+        assert db.get_customer_ids_by_conditions(["고혈압"]) == {customer_id}
+
+        # 스냅샷 버전 기준 비교: 그사이 다른 수정이 있었으면 충돌
+        with pytest.raises(ConflictError):
+            db.update_customer(edited, original)
+        db.close()
+
+
+def test_update_customer_without_changes_skips_write():
+    """바뀐 값이 없으면 쓰기/커밋/변경 로그 없이 False (updated_at, version 그대로)"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = DatabaseManager(str(Path(tmpdir) / "test.db"))
+        customer_id = db.add_customer(Customer(
+            name="변경없음", phone="010-0000-0000", resident_id="900101-1234567", med_hospitalized=True,
+        ))
+        before = db.get_customer(customer_id)
+        change_seq = db.get_change_seq()
+        total_changes = db.connection.total_changes
+
+        # 폼 경로 (스냅샷 비교) / 스냅샷 없는 호출 (DB 현재 행 비교)
+        assert db.update_customer(db.get_customer(customer_id), before) is False
+        assert db.update_customer(db.get_customer(customer_id)) is False
+        assert db.connection.total_changes == total_changes
+        assert not db.connection.in_transaction
+        assert db.get_change_seq() == change_seq
+
+        after = db.get_customer(customer_id)
+        assert (after.updated_at, after.version) == (before.updated_at, before.version)
+        db.close()
+
+
 def test_delete_customer():
     """고객 삭제 테스트"""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -184,3 +298,252 @@ def test_korean_encoding():
         assert retrieved.memo == "중요 고객입니다."
 
         db.close()
+
+
+def test_birth_fields_derived_from_resident_id():
+    """주민번호 → 생년월일/생일 파생 컬럼 (성별 코드로 세기 판단)"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = DatabaseManager(str(Path(tmpdir) / "test.db"))
+
+        id_1900 = db.add_customer(Customer(name="구십년생", phone="010-0000-0001", resident_id="900115-1234567"))
+        id_2000 = db.add_customer(Customer(name="공오년생", phone="010-0000-0002", resident_id="050301-4234567"))
+
+        assert db.get_customer(id_1900).birth_date == "1990-01-15"
+        assert db.get_customer(id_2000).birth_date == "2005-03-01"
+
+        # 주민번호 수정 시 파생 컬럼도 갱신
+        customer = db.get_customer(id_1900)
+        customer.resident_id = "880301-2234567"
+        db.update_customer(customer)
+        assert db.get_customer(id_1900).birth_date == "1988-03-01"
+        assert db.get_birthday_customer_ids("2026-03-01") == {id_1900, id_2000}
+        assert db.count_birthdays("2026-03-01") == 2
+
+        db.close()
+
+
+def test_get_upcoming_birthdays_year_wrap():
+    """연말 구간 (12월 → 1월) 생일 조회"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = DatabaseManager(str(Path(tmpdir) / "test.db"))
+
+        db.add_customer(Customer(name="십이월", phone="010-0000-0001", resident_id="801230-1234567"))
+        db.add_customer(Customer(name="일월", phone="010-0000-0002", resident_id="810102-2234567"))
+        db.add_customer(Customer(name="유월", phone="010-0000-0003", resident_id="820615-1234567"))
+
+        results = db.get_upcoming_birthdays(days_ahead=7, base_date="2026-12-28")
+
+        assert [r["customer"].name for r in results] == ["십이월", "일월"]
+        assert results[0]["birthday"] == "2026-12-30"
+        assert results[0]["days_left"] == 2
+        assert results[1]["birthday"] == "2027-01-02"
+        assert results[1]["days_left"] == 5
+
+        db.close()
+
+
+def test_leap_day_birthday_on_march_first():
+    """2월 29일생은 평년 3월 1일이 생일 (단일 날짜 조회/건수/범위 조회가 같은 규칙)"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = DatabaseManager(str(Path(tmpdir) / "test.db"))
+        leap = db.add_customer(Customer(name="윤일생", phone="010-0000-0001", resident_id="000229-3234567"))
+        march = db.add_customer(Customer(name="삼월생", phone="010-0000-0002", resident_id="900301-1234567"))
+
+        assert db.get_birthday_customer_ids("2027-03-01") == {leap, march}
+        assert db.count_birthdays("2027-03-01") == 2
+        assert db.get_birthday_customer_ids("2028-03-01") == {march}
+        assert db.get_birthday_customer_ids("2028-02-29") == {leap}
+        upcoming = db.get_upcoming_birthdays(days_ahead=0, base_date="2027-03-01")
+        assert {(r["customer"].id, r["birthday"]) for r in upcoming} == {(leap, "2027-03-01"), (march, "2027-03-01")}
+
+        db.close()
+
+
+def test_birth_fields_backfilled_on_migration():
+    """기존 DB (birth_mmdd 컬럼 없음) 마이그레이션 시 생일 컬럼 채움"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = str(Path(tmpdir) / "test.db")
+        db = DatabaseManager(db_path)
+        customer_id = db.add_customer(Customer(name="기존고객", phone="010-0000-0001", resident_id="751225-1234567"))
+        db.connection.execute("UPDATE customers SET birth_mmdd = NULL, birth_date = NULL")
+        db.connection.commit()
+        db.close()
+
+        db = DatabaseManager(db_path)
+        assert db.get_customer(customer_id).birth_date == "1975-12-25"
+        assert db.get_birthday_customer_ids("2026-12-25") == {customer_id}
+        db.close()
+
+
+def _resident_id_for(birth):
+    """생년월일 → 테스트용 주민번호 (1900년대 1, 2000년대 3)"""
+    gender = "1" if birth.year < 2000 else "3"
+    return f"{birth.strftime('%y%m%d')}-{gender}234567"
+
+
+def test_get_upcoming_age_changes():
+    """상령일 임박 고객 조회 (생일 + 6개월, 기준일 고정)"""
+    from datetime import date
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = DatabaseManager(str(Path(tmpdir) / "test.db"))
+
+        # 기준일 2026-03-15: 1985-09-25생 → 2026-03-25 상령 (10일 후), 1990-12-13생 → 2026-06-13
+        soon_id = db.add_customer(Customer(name="상령임박", phone="010-0000-0001",
+                                           resident_id=_resident_id_for(date(1985, 9, 25))))
+        db.add_customer(Customer(name="상령여유", phone="010-0000-0002",
+                                 resident_id=_resident_id_for(date(1990, 12, 13))))
+
+        results = db.get_upcoming_age_changes(days_ahead=30, base_date="2026-03-15")
+
+        assert len(results) == 1
+        assert results[0]["customer"].id == soon_id
+        assert results[0]["change_date"] == "2026-03-25"
+        assert results[0]["days_left"] == 10
+        assert results[0]["insurance_age"] == 41
+
+        # 연말을 넘는 구간
+        results = db.get_upcoming_age_changes(days_ahead=30, base_date="2025-12-20")
+        assert [r["change_date"] for r in results] == []
+        results = db.get_upcoming_age_changes(days_ahead=100, base_date="2025-12-20")
+        assert [r["change_date"] for r in results] == ["2026-03-25"]
+
+        db.close()
+
+
+def test_age_change_query_with_other_base_date_does_not_write():
+    """다른 기준일 조회는 저장된 상령일을 바꾸지 않음 (이후 오늘 기준 조회 결과 유지)"""
+    from datetime import datetime, timedelta
+    from dateutil.relativedelta import relativedelta
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = DatabaseManager(str(Path(tmpdir) / "test.db"))
+
+        today = datetime.now().date()
+        birth = today + timedelta(days=10) - relativedelta(years=40, months=6)
+        customer_id = db.add_customer(Customer(name="상령임박", phone="010-0000-0001",
+                                               resident_id=_resident_id_for(birth)))
+
+        future = (today + timedelta(days=200)).strftime("%Y-%m-%d")
+        db.get_upcoming_age_changes(days_ahead=30, base_date=future)
+        db.refresh_insurance_age_changes(future)
+
+        assert [r["customer"].id for r in db.get_upcoming_age_changes(days_ahead=30)] == [customer_id]
+
+        db.close()
+
+
+def test_age_change_date_rolls_forward():
+    """지난 상령일은 조회 시 다음 해로 갱신"""
+    from datetime import datetime
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = DatabaseManager(str(Path(tmpdir) / "test.db"))
+
+        customer_id = db.add_customer(Customer(name="상령갱신", phone="010-0000-0001", resident_id="800101-1234567"))
+        db.connection.execute(
+            "UPDATE customers SET insurance_age_change_date = '2000-07-01' WHERE id = ?", (customer_id,)
+        )
+        db.connection.commit()
+
+        today = datetime.now().date()
+        assert db.refresh_insurance_age_changes() == 1
+
+        stored = db.connection.execute(
+            "SELECT insurance_age_change_date FROM customers WHERE id = ?", (customer_id,)
+        ).fetchone()[0]
+        assert stored >= today.strftime("%Y-%m-%d")
+        assert stored.endswith("-07-01")
+
+        db.close()
+
+
+def test_customer_cache_serves_repeated_reads_without_sql():
+    """반복 조회는 캐시에서 반환 (SQL 0회), 반환 객체 수정은 캐시에 영향 없음"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = DatabaseManager(str(Path(tmpdir) / "test.db"))
+        customer_id = db.add_customer(Customer(name="캐시고객", phone="010-0000-0001"))
+        db.get_customer(customer_id)
+
+        statements = []
+        db.connection.set_trace_callback(statements.append)
+        first = db.get_customer(customer_id)
+        first.name = "로컬수정"
+        second = db.get_customer(customer_id)
+        db.connection.set_trace_callback(None)
+
+        assert [s for s in statements if not s.startswith("PRAGMA data_version")] == []
+        assert second.name == "캐시고객"
+        assert db.get_cache_stats()["hits"] == 2
+        db.close()
+
+
+def test_customer_cache_invalidated_by_writes():
+    """update_customer / delete_customer 이후 캐시 무효화"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = DatabaseManager(str(Path(tmpdir) / "test.db"))
+        customer_id = db.add_customer(Customer(name="수정전", phone="010-0000-0001"))
+
+        customer = db.get_customer(customer_id)
+        customer.name = "수정후"
+        db.update_customer(customer)
+        assert db.get_customer(customer_id).name == "수정후"
+
+        db.delete_customer(customer_id)
+        assert db.get_customer(customer_id) is None
+        db.close()
+
+
+def test_customer_cache_invalidated_by_other_connection():
+    """다른 연결(프로세스)의 변경은 PRAGMA data_version으로 감지"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = str(Path(tmpdir) / "test.db")
+        db = DatabaseManager(db_path)
+        db.DATA_VERSION_CHECK_INTERVAL = 0
+        customer_id = db.add_customer(Customer(name="원래이름", phone="010-0000-0001"))
+        assert db.get_customer(customer_id).name == "원래이름"
+
+        other = sqlite3.connect(db_path)
+        other.execute("UPDATE customers SET name = '외부변경' WHERE id = ?", (customer_id,))
+        other.commit()
+        other.close()
+
+        assert db.get_customer(customer_id).name == "외부변경"
+        db.close()
+
+
+def test_customer_cache_is_bounded():
+    """CACHE_SIZE 초과 시 가장 오래된 항목부터 제거"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = DatabaseManager(str(Path(tmpdir) / "test.db"))
+        db.CACHE_SIZE = 3
+        ids = [db.add_customer(Customer(name=f"고객{i}", phone=f"010-0000-000{i}")) for i in range(5)]
+        for customer_id in ids:
+            db.get_customer(customer_id)
+
+        assert db.get_cache_stats()["size"] == 3
+        db.get_customer(ids[0])
+        assert db.get_cache_stats()["misses"] == 6
+        db.close()
+
+
+def test_page_customers_keyset_with_duplicate_names():
+    """키셋 페이지: 같은 이름도 ID로 이어서 빠짐/중복 없이, iter_customers는 전체 이름순"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = DatabaseManager(str(Path(tmpdir) / "test.db"))
+        for index, name in enumerate(["박민수", "김철수", "김철수", "이영희", "김철수"]):
+            db.add_customer(Customer(name=name, phone=f"010-4000-000{index}"))
+
+        first = db.page_customers(limit=2)
+        second = db.page_customers(first[-1].name, first[-1].id, limit=2)
+        third = db.page_customers(second[-1].name, second[-1].id, limit=2)
+        paged = [(c.name, c.id) for c in first + second + third]
+
+        assert len(third) == 1
+        assert paged == sorted(paged)
+        assert [(c.name, c.id) for c in db.iter_customers(batch_size=2)] == paged
+        assert [c.phone for c in db.iter_customers(batch_size=1, keyword="0003")] == ["010-4000-0003"]
+
+        with pytest.raises(ValueError):  # after_id 없이 after_name만 지정
+            db.page_customers(after_name="김철수")
+        db.close()
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+변경 이벤트 테스트 - DatabaseManager 발행, ChangeBatch 요약, EventBus/IdleDispatcher
+"""
+
+import sys
+from pathlib import Path
+
+# src 디렉토리를 sys.path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+import events
+from events import ChangeBatch, EventBus, IdleDispatcher, customer_event, policy_event
+from models import Customer
+from conftest import make_policy
+
+
+@pytest.fixture
+def published(db):
+    """db.events로 발행된 이벤트 리스트 (쓰기 1건 = 리스트 1개)"""
+    received = []
+    db.events.subscribe(received.append)
+    return received
+
+
+def test_customer_writes_publish_row_events(db, published):
+    """고객 추가/수정/삭제는 해당 행 이벤트, 바뀐 값이 없는 수정은 발행 안 함"""
+    customer_id = db.add_customer(Customer(name="홍길동", phone="010-1234-5678"))
+    customer = db.get_customer(customer_id)
+    customer.memo = "메모"
+    db.update_customer(customer)
+    assert db.update_customer(customer) is False
+    db.delete_customer(customer_id)
+
+    assert published == [
+        [customer_event(events.INSERT, customer_id)],
+        [customer_event(events.UPDATE, customer_id)],
+        [customer_event(events.DELETE, customer_id)],
+    ]
+
+
+def test_policy_writes_publish_owner(db, published):
+    """계약 이벤트는 소유 고객 포함, 다른 고객으로 옮기면 이전 고객 삭제 + 새 고객 추가"""
+    first = db.add_customer(Customer(name="고객1", phone="010-0000-0001"))
+    second = db.add_customer(Customer(name="고객2", phone="010-0000-0002"))
+    overdue = dict(next_payment_date="2026-01-25", status="overdue")
+    policy_id = db.add_policy(make_policy(first, **overdue))
+    second_policy_id = db.add_policy(make_policy(first, product_name="실손보험", **overdue))
+    published.clear()
+
+    assert db.mark_payments_completed([policy_id, second_policy_id], "2026-01-25") == 2
+    policy = db.get_policy(policy_id)
+    original = db.get_policy(policy_id)
+    policy.customer_id = second
+    db.update_policy(policy, original)
+    db.delete_policy(second_policy_id)
+
+    assert published == [
+        [policy_event(events.UPDATE, policy_id, first), policy_event(events.UPDATE, second_policy_id, first)],
+        [policy_event(events.DELETE, policy_id, first), policy_event(events.INSERT, policy_id, second)],
+        [policy_event(events.DELETE, second_policy_id, first)],
+    ]
+
+    db.invalidate_caches()
+    assert published[-1] == [events.REFRESH_EVENT]
+
+
+def test_change_batch_coalesces():
+    """같은 행은 마지막 작업 기준, 계약 변경은 소유 고객 행도 다시 그림"""
+    batch = ChangeBatch.from_events([
+        customer_event(events.INSERT, 1),
+        customer_event(events.UPDATE, 1),
+        customer_event(events.INSERT, 2),
+        customer_event(events.DELETE, 2),
+        policy_event(events.INSERT, 10, 3),
+        policy_event(events.UPDATE, 10, 3),
+        policy_event(events.DELETE, 11, 2),
+    ])
+    assert not batch.refresh
+    assert batch.customer_ids == {1, 3}
+    assert batch.deleted_customer_ids == {2}
+    assert batch.policies_of(3) == {10: events.UPDATE}
+    assert batch.policies_of(2) == {11: events.DELETE}
+    assert ChangeBatch.from_events([customer_event(events.UPDATE, 1), events.REFRESH_EVENT]).refresh
+
+
+def test_change_batch_keeps_moved_policy_per_customer():
+    """다른 고객으로 옮긴 계약: 이전 고객에는 삭제, 새 고객에는 추가로 남음"""
+    batch = ChangeBatch.from_events([
+        policy_event(events.UPDATE, 10, 1),
+        policy_event(events.DELETE, 10, 1),
+        policy_event(events.INSERT, 10, 2),
+    ])
+    assert batch.policies_of(1) == {10: events.DELETE}
+    assert batch.policies_of(2) == {10: events.INSERT}
+    assert batch.customer_ids == {1, 2}
+
+
+def test_event_bus_isolates_subscribers(capsys):
+    """구독자 예외는 다른 구독자/발행자에 영향 없음, 해제 후에는 받지 않음"""
+    bus = EventBus()
+    received = []
+
+    def broken(changes):
+        raise RuntimeError("boom")
+
+    bus.subscribe(broken)
+    unsubscribe = bus.subscribe(received.append)
+    bus.publish([events.REFRESH_EVENT])
+    unsubscribe()
+    bus.publish([events.REFRESH_EVENT])
+    bus.publish([])
+
+    assert received == [[events.REFRESH_EVENT]]
+    assert "변경 이벤트 처리 실패" in capsys.readouterr().out
+
+
+class FakeRoot:
+    """after_idle/after_cancel만 흉내 (예약된 콜백은 run_idle()로 실행)"""
+
+    def __init__(self):
+        self.idle = {}
+        self.next_id = 0
+
+    def after_idle(self, callback):
+        self.next_id += 1
+        self.idle[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.idle.pop(after_id, None)
+
+    def run_idle(self):
+        callbacks, self.idle = list(self.idle.values()), {}
+        for callback in callbacks:
+            callback()
+
+
+def test_idle_dispatcher_flushes_once():
+    """연속 쓰기 이벤트는 유휴 콜백 1회로 모이고, cancel하면 버림"""
+    root = FakeRoot()
+    batches = []
+    dispatcher = IdleDispatcher(root, batches.append)
+
+    for customer_id in (1, 2, 3):
+        dispatcher([customer_event(events.UPDATE, customer_id)])
+    assert len(root.idle) == 1
+    root.run_idle()
+    assert len(batches) == 1 and batches[0].customer_ids == {1, 2, 3}
+
+    dispatcher([customer_event(events.UPDATE, 4)])
+    dispatcher.cancel()
+    root.run_idle()
+    assert len(batches) == 1
@@ -2,12 +2,52 @@
 Tests for main.py
 """
 
+import re
+import sys
+import subprocess
+from pathlib import Path
+
 import pytest
 
+SRC_DIR = Path(__file__).parent.parent / "src"
+
 
 def test_placeholder():
     """임시 테스트 (Phase 1 완료 시 제거)"""
     assert True
 
 
+def test_main_window_import_defers_heavy_modules():
+    """gui.main_window import 시 폼/백업/CSV/SMS/dateutil/서비스 클라이언트는 로드하지 않음 (첫 사용 시 로드)"""
+    lazy_modules = (
+        "dateutil",
+        "gui.customer_form",
+        "utils.export_helpers",
+        "utils.file_helpers",
+        "utils.message_simulator",
+        "prefetch",
+        "service",
+    )
+    code = (
+        "import sys, gui.main_window; "
+        f"print(','.join(m for m in {lazy_modules!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=str(SRC_DIR), capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == ""
+
+
 # TODO: Phase 2 이후 GUI 테스트 추가
+
+
+def test_build_script_lists_every_module():
+    """build_exe.bat의 --hidden-import에 src 모듈이 모두 있음 (지연 import 모듈이 exe에서 빠지지 않게)"""
+    build_script = (SRC_DIR.parent / "scripts" / "build_exe.bat").read_text(encoding="utf-8")
+    hidden_imports = set(re.findall(r"--hidden-import=([\w.]+)", build_script))
+    modules = {
+        ".".join(path.relative_to(SRC_DIR).with_suffix("").parts).removesuffix(".__init__")
+        for path in SRC_DIR.rglob("*.py")
+    } - {"main"}
+    assert sorted(modules - hidden_imports) == []
@@ -13,7 +13,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 import pytest
-from database import DatabaseManager
+from database import ConflictError, DatabaseManager, RecordDeletedError
 from models import Customer, Policy
 
 
@@ -231,6 +231,84 @@ def test_update_policy(db, sample_policy):
     assert updated.billing_day == 10
 
 
+def test_update_policy_conflicts_with_payment(db, sample_policy):
+    """편집 중 납부 처리로 버전이 바뀌면 폼 저장은 충돌 (납부일/상태를 옛 값으로 되돌리지 않음)"""
+    original = db.get_policy(sample_policy.id)
+    edited = db.get_policy(sample_policy.id)
+    edited.memo = "편집 중"
+
+    assert db.mark_payment_completed(sample_policy.id, "2026-01-25")
+    with pytest.raises(ConflictError):
+        db.update_policy(edited, original)
+
+    current = db.get_policy(sample_policy.id)
+    assert current.version == 2 and current.last_payment_date == "2026-01-25"
+    current.memo = "최신 버전에서 수정"
+    assert db.update_policy(current, db.get_policy(sample_policy.id)) is True
+    assert db.get_policy(sample_policy.id).version == 3
+
+
+def test_update_policy_deleted_meanwhile(db, sample_policy):
+    """편집 중 삭제된 계약을 저장하면 RecordDeletedError (조용히 False로 버려지지 않음)"""
+    original = db.get_policy(sample_policy.id)
+    edited = db.get_policy(sample_policy.id)
+    edited.premium = 70000
+    assert db.delete_policy(sample_policy.id) is True
+
+    with pytest.raises(RecordDeletedError):
+        db.update_policy(edited, original)
+    with pytest.raises(RecordDeletedError):
+        db.update_policy(edited)
+    assert db.get_policy(sample_policy.id) is None
+
+
+def test_update_policy_without_changes_skips_write(db, sample_policy):
+    """바뀐 값이 없으면 False, 읽기 캐시도 무효화하지 않음"""
+    total_changes = db.connection.total_changes
+    edited = db.get_policy(sample_policy.id)
+    invalidations = db.get_cache_stats()["invalidations"]
+    assert db.update_policy(edited, sample_policy) is False
+    assert db.update_policy(db.get_policy(sample_policy.id)) is False
+    assert db.connection.total_changes == total_changes
+    assert db.get_cache_stats()["invalidations"] == invalidations
+    assert db.get_policy(sample_policy.id).version == 1
+
+
+def test_row_versions_added_for_existing_db():
+    """version 컬럼이 없던 기존 DB는 시작 시 컬럼 추가 (기존 행은 1) + 변경 로그 트리거 교체"""
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, "legacy.db")
+    try:
+        database = DatabaseManager(db_path)
+        customer_id = database.add_customer(Customer(name="기존", phone="010-7000-0001"))
+        # 예전 스키마: version 컬럼 없음, 트리거는 로그 안에서 번호를 셈
+        for table in ("customers", "policies"):
+            for op in ("insert", "update", "delete"):
+                database.connection.execute(f"DROP TRIGGER trg_change_{table}_{op}")
+            database.connection.execute(f"ALTER TABLE {table} DROP COLUMN version")
+        database.connection.execute(
+            """
+            CREATE TRIGGER trg_change_customers_update AFTER UPDATE ON customers BEGIN
+                INSERT INTO change_log (table_name, row_id, op, version, changed_at)
+                VALUES ('customers', NEW.id, 'update',
+                        (SELECT COUNT(*) FROM change_log WHERE row_id = NEW.id) + 100, 'legacy');
+            END
+            """
+        )
+        database.connection.commit()
+        database.close()
+
+        database = DatabaseManager(db_path)
+        customer = database.get_customer(customer_id)
+        assert customer.version == 1
+        customer.memo = "마이그레이션 후 수정"
+        assert database.update_customer(customer) is True and customer.version == 2
+        assert database.changes_since(0)[-1]["version"] == 2
+        database.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
 def test_delete_policy(db, sample_policy):
     """계약 삭제 테스트"""
     result = db.delete_policy(sample_policy.id)
@@ -335,6 +413,19 @@ def test_mark_payment_completed_not_found(db):
     assert result is False
 
 
+def test_mark_payments_completed_batch(db, sample_customer, sample_policy):
+    """여러 계약 한 번에 납부 완료 (계약별 다음 납부일, 없는/중복 ID 무시)"""
+    yearly_id = db.add_policy(Policy(
+        customer_id=sample_customer.id, insurer="KB손해보험", product_name="운전자보험", premium=300000,
+        payment_method="card", billing_cycle="yearly", billing_day=10, contract_start_date="2026-01-01",
+    ))
+
+    assert db.mark_payments_completed([sample_policy.id, yearly_id, sample_policy.id, 99999], "2026-02-25") == 2
+    assert db.get_policy(sample_policy.id).next_payment_date == db.calculate_next_payment_date("2026-02-25", "monthly", 25)
+    assert db.get_policy(yearly_id).next_payment_date == db.calculate_next_payment_date("2026-02-25", "yearly", 10)
+    assert db.mark_payments_completed([99999], "2026-02-25") == 0
+
+
 # =============================================================================
 # 필터 조회 테스트
 # =============================================================================
@@ -503,3 +594,334 @@ def test_korean_encoding_policy(db, sample_customer):
 
     assert saved.product_name == "(무)종신보험 프리미엄"
     assert saved.memo == "특약 포함: 암진단금 3천만원"
+
+
+# =============================================================================
+# 질환/차종 정규화 테이블 테스트
+# =============================================================================
+
+def _add_condition_customer(db, name, phone, medication=None, diagnosis=None, commercial_detail=None):
+    return db.add_customer(Customer(
+        name=name,
+        phone=phone,
+        med_medication=medication,
+        med_5yr_diagnosis=diagnosis,
+        driving_type="commercial" if commercial_detail else "none",
+        commercial_detail=commercial_detail,
+    ))
+
+
+def test_conditions_and_or_query(db):
+    """질환 조건 AND/OR 조회"""
+    both = _add_condition_customer(db, "둘다", "010-7000-0001", medication="고혈압, 당뇨병")
+    diabetes = _add_condition_customer(db, "당뇨만", "010-7000-0002", medication="당뇨병")
+    _add_condition_customer(db, "없음", "010-7000-0003")
+
+    assert db.get_customer_ids_by_conditions(["고혈압", "당뇨병"]) == {both}
+    assert db.get_customer_ids_by_conditions(["고혈압", "당뇨병"], match_all=False) == {both, diabetes}
+    assert db.get_customer_ids_by_conditions(["당뇨병"], kind="diagnosis") == set()
+
+    # Customer 모델의 문자열 필드는 그대로 유지
+    assert db.get_customer(both).med_medication == "고혈압, 당뇨병"
+
+
+def test_conditions_synced_on_update(db):
+    """고객 수정 시 정규화 테이블 동기화"""
+    customer_id = _add_condition_customer(db, "수정대상", "010-7000-0001", diagnosis="암", commercial_detail="taxi")
+
+    customer = db.get_customer(customer_id)
+    customer.med_5yr_diagnosis = "뇌졸중"
+    customer.commercial_detail = "taxi,construction"
+    db.update_customer(customer)
+
+    assert db.get_customer_ids_by_conditions(["암"]) == set()
+    assert db.get_customer_ids_by_conditions(["뇌졸중"], kind="diagnosis") == {customer_id}
+    assert db.get_customer_ids_by_vehicle_types(["taxi", "construction"], match_all=True) == {customer_id}
+
+    # 고객 삭제 시 CASCADE
+    db.delete_customer(customer_id)
+    assert db.get_customer_ids_by_vehicle_types(["taxi"]) == set()
+
+
+def test_find_customers_by_conditions_with_card_policy(db):
+    """당뇨병 + 카드결제 계약 보유 고객 조회"""
+    card_customer = _add_condition_customer(db, "카드고객", "010-7000-0001", medication="당뇨병")
+    transfer_customer = _add_condition_customer(db, "이체고객", "010-7000-0002", medication="당뇨병")
+
+    for customer_id, method in [(card_customer, "card"), (transfer_customer, "transfer")]:
+        db.add_policy(Policy(
+            customer_id=customer_id,
+            insurer="삼성생명",
+            product_name="종신보험",
+            premium=50000,
+            payment_method=method,
+            billing_cycle="monthly",
+            billing_day=25,
+            contract_start_date="2026-01-01",
+        ))
+
+    results = db.find_customers_by_conditions(["당뇨병"], card_policy_only=True)
+    assert [c.id for c in results] == [card_customer]
+
+    results = db.find_customers_by_conditions(["당뇨병"])
+    assert {c.id for c in results} == {card_customer, transfer_customer}
+
+
+def test_conditions_backfilled_for_existing_db():
+    """정규화 테이블이 없던 기존 DB는 시작 시 채워짐"""
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, "legacy.db")
+    try:
+        database = DatabaseManager(db_path)
+        customer_id = _add_condition_customer(database, "기존", "010-7000-0001", medication="고지혈증")
+        database.connection.execute("DROP TABLE customer_conditions")
+        database.connection.commit()
+        database.close()
+
+        database = DatabaseManager(db_path)
+        assert database.get_customer_ids_by_conditions(["고지혈증"]) == {customer_id}
+        database.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+# =============================================================================
+# customer_summary 읽기 모델 테스트
+# =============================================================================
+
+def _summary_rows(db, source):
+    """요약 테이블/재계산 뷰 → {customer_id: 행 튜플}"""
+    rows = db.connection.execute(f"SELECT {db.SUMMARY_COLUMNS} FROM {source}").fetchall()
+    return {row[0]: tuple(row) for row in rows}
+
+
+def test_customer_summary_matches_recomputation(db):
+    """추가/수정/삭제/납부/연체 이후 요약 테이블 == 재계산 결과 (트리거, 전체 재계산)"""
+    import random
+
+    rng = random.Random(42)
+    customer_ids = [
+        db.add_customer(Customer(name=f"요약{i:02d}", phone=f"010-7000-{i:04d}", med_medication="고혈압" if i % 3 == 0 else ""))
+        for i in range(12)
+    ]
+    policy_ids = []
+    for i in range(40):
+        policy_ids.append(db.add_policy(Policy(
+            customer_id=rng.choice(customer_ids),
+            insurer="삼성생명",
+            product_name=f"상품{i}",
+            premium=rng.choice([30000, 50000, 120000]),
+            payment_method=rng.choice(["card", "transfer"]),
+            billing_cycle=rng.choice(["monthly", "yearly"]),
+            billing_day=rng.randint(1, 28),
+            contract_start_date="2025-01-01",
+            next_payment_date=f"2025-{rng.randint(1, 12):02d}-15",
+        )))
+
+    db.auto_update_payment_status()
+    for policy_id in rng.sample(policy_ids, 10):
+        db.mark_payment_completed(policy_id, "2026-01-10")
+    for policy_id in rng.sample(policy_ids, 5):
+        policy = db.get_policy(policy_id)
+        policy.customer_id = rng.choice(customer_ids)
+        policy.status = "terminated"
+        db.update_policy(policy)
+    for policy_id in rng.sample(policy_ids, 5):
+        db.delete_policy(policy_id)
+    customer = db.get_customer(customer_ids[0])
+    customer.name = "이름변경"
+    db.update_customer(customer)
+    db.delete_customer(customer_ids[1])
+
+    assert _summary_rows(db, "customer_summary") == _summary_rows(db, "customer_summary_source")
+    assert customer_ids[1] not in _summary_rows(db, "customer_summary")
+
+    # 전체 재계산(GROUP BY)도 뷰와 같은 값 (계약 없는 고객 포함)
+    db.add_customer(Customer(name="계약없음", phone="010-7000-9999"))
+    db.rebuild_customer_summary()
+    assert _summary_rows(db, "customer_summary") == _summary_rows(db, "customer_summary_source")
+
+
+def test_customer_summary_values(db, sample_customer):
+    """요약 값: 월 환산 보험료, 가장 이른 납부일, 연체 일수"""
+    from datetime import datetime, timedelta
+
+    today = datetime.now().date()
+    overdue_date = (today - timedelta(days=5)).strftime("%Y-%m-%d")
+    for premium, cycle, next_date, status in [
+        (50000, "monthly", "2099-01-25", "active"),
+        (120000, "yearly", "2099-03-25", "active"),
+        (30000, "monthly", overdue_date, "overdue"),
+    ]:
+        db.add_policy(Policy(
+            customer_id=sample_customer.id, insurer="삼성생명", product_name="종신보험",
+            premium=premium, payment_method="card", billing_cycle=cycle, billing_day=25,
+            contract_start_date="2026-01-01", next_payment_date=next_date, status=status,
+        ))
+
+    summary = db.get_customer_summaries()[0]
+
+    assert summary["customer_id"] == sample_customer.id
+    assert summary["policy_count"] == 3
+    assert summary["monthly_premium_total"] == 50000 + 10000 + 30000
+    assert summary["next_payment_date"] == "2099-01-25"
+    assert summary["oldest_overdue_date"] == overdue_date
+    assert summary["overdue_days"] == 5
+    assert summary["has_card"] == 1
+    assert db.get_customer_summaries([sample_customer.id, 999]) == [summary]
+
+
+def test_customer_summary_payment_today_flag(db):
+    """오늘 납부 아이콘은 정상 카드 계약 중 오늘 납부가 있는지로 판단 (더 이른 지난 납부일이 있어도)"""
+    from datetime import datetime, timedelta
+    today = datetime.now().date()
+    today_str = today.isoformat()
+    dates = {
+        "today": [today_str],
+        "stale_and_today": [(today - timedelta(days=3)).isoformat(), today_str],
+        "stale_only": [(today - timedelta(days=3)).isoformat()],
+        "later": [(today + timedelta(days=1)).isoformat()],
+        "none": [],
+    }
+    ids = {}
+    for index, (key, next_dates) in enumerate(dates.items()):
+        ids[key] = db.add_customer(Customer(name=key, phone=f"010-0000-{index:04d}"))
+        for next_date in next_dates:
+            db.add_policy(Policy(
+                customer_id=ids[key], insurer="삼성생명", product_name="종신보험", premium=10000,
+                payment_method="card", billing_cycle="monthly", billing_day=25,
+                contract_start_date="2026-01-01", next_payment_date=next_date, status="active",
+            ))
+
+    flags = {s["name"]: s["has_payment_today"] for s in db.get_customer_summaries()}
+    assert flags == {"today": True, "stale_and_today": True, "stale_only": False, "later": False, "none": False}
+    page = db.page_customer_summaries(limit=10)
+    assert {s["name"]: s["has_payment_today"] for s in page} == flags
+
+
+def test_customer_summary_built_for_existing_db():
+    """customer_summary 없는 기존 DB는 최초 실행 시 전체 빌드"""
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, "test_crm.db")
+    try:
+        database = DatabaseManager(db_path)
+        customer_id = database.add_customer(Customer(name="기존", phone="010-7100-0001", payment_method="card"))
+        database.connection.execute("DROP TABLE customer_summary")
+        database.connection.commit()
+        database.close()
+
+        database = DatabaseManager(db_path)
+        assert [s["customer_id"] for s in database.get_customer_summaries()] == [customer_id]
+        database.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_superseded_indexes_migrated_for_existing_db():
+    """단일 컬럼 인덱스만 있는 기존 DB: 복합/부분 인덱스로 교체 + ANALYZE, 요약 뷰 재정의"""
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, "test_crm.db")
+    try:
+        database = DatabaseManager(db_path)
+        customer_id = database.add_customer(Customer(name="기존", phone="010-7200-0001"))
+        connection = database.connection
+        connection.execute("DROP INDEX idx_policy_customer_created")
+        connection.execute("DROP INDEX idx_policy_card_due")
+        connection.execute("DROP INDEX idx_summary_list")
+        connection.execute("CREATE INDEX idx_policy_customer ON policies(customer_id)")
+        connection.execute("CREATE INDEX idx_policy_status ON policies(status)")
+        connection.execute("CREATE INDEX idx_summary_name ON customer_summary(name, customer_id)")
+        connection.execute("DROP VIEW customer_summary_source")
+        connection.execute("CREATE VIEW customer_summary_source AS SELECT * FROM customer_summary")
+        connection.execute("DROP TABLE IF EXISTS sqlite_stat1")
+        connection.commit()
+        connection.close()
+        database.connection = None
+
+        database = DatabaseManager(db_path)
+        indexes = {
+            row[0] for row in database.connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+        assert {"idx_policy_customer_created", "idx_policy_card_due", "idx_summary_list"} <= indexes
+        assert not indexes & set(DatabaseManager.SUPERSEDED_INDEXES)
+        assert database.connection.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+
+        database.add_policy(Policy(customer_id=customer_id, insurer="삼성생명", product_name="종신보험",
+                                   premium=50000, payment_method="card", billing_cycle="monthly",
+                                   billing_day=25, next_payment_date="2026-11-25"))
+        assert database.get_customer_summaries()[0]["next_payment_date"] == "2026-11-25"
+        database.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_iter_policies_and_summary_pages(db, sample_customer):
+    """계약 ID순 스트리밍, 요약 목록 키셋 페이지 = 전체 요약과 같은 순서"""
+    for index in range(5):
+        db.add_policy(
+            Policy(customer_id=sample_customer.id, insurer="삼성생명", product_name=f"상품{index}", premium=10000,
+                   payment_method="card", billing_cycle="monthly", billing_day=25, next_payment_date="2026-11-25")
+        )
+        db.add_customer(Customer(name=f"요약{index % 2}", phone=f"010-7300-000{index}"))
+
+    assert [policy.product_name for policy in db.iter_policies(batch_size=2)] == [f"상품{i}" for i in range(5)]
+
+    pages, cursor = [], (None, None)
+    while True:
+        page = db.page_customer_summaries(*cursor, limit=2)
+        pages.extend(page)
+        if len(page) < 2:
+            break
+        cursor = (page[-1]["name"], page[-1]["customer_id"])
+    assert pages == db.get_customer_summaries()
+
+
+def test_sorted_customer_ids_and_filtered_sort(db):
+    """헤더 정렬: SQL 정렬 순서 (NULL은 방향과 무관하게 맨 뒤), 필터 범위 + 페이지 조회"""
+    from customer_list import fetch_summary_page, select_customer_ids
+
+    ids = {}
+    for name, phone, next_date in [
+        ("다고객", "010-7400-0003", "2099-03-01"),
+        ("가고객", "010-7400-0002", None),
+        ("나고객", "010-7400-0001", "2099-01-01"),
+        ("라고객", "010-7400-0004", "2000-01-01"),  # 연체
+    ]:
+        payment_method = "신용카드" if next_date else "계좌이체"
+        ids[name] = db.add_customer(Customer(name=name, phone=phone, payment_method=payment_method))
+        if next_date:
+            db.add_policy(
+                Policy(customer_id=ids[name], insurer="삼성생명", product_name="상품", premium=10000,
+                       payment_method="card", billing_cycle="monthly", billing_day=1, next_payment_date=next_date)
+            )
+    db.auto_update_payment_status()
+
+    assert db.get_sorted_customer_ids("phone") == [ids[n] for n in ("나고객", "가고객", "다고객", "라고객")]
+    assert db.get_sorted_customer_ids("next_payment") == [ids[n] for n in ("나고객", "다고객", "가고객", "라고객")]
+    assert db.get_sorted_customer_ids("next_payment", True) == [ids[n] for n in ("다고객", "나고객", "가고객", "라고객")]
+    assert db.get_sorted_customer_ids("overdue")[0] == ids["라고객"]
+    with pytest.raises(ValueError):
+        db.get_sorted_customer_ids("resident_id")
+
+    # 신용카드 고객만 + 전화번호 내림차순 → 페이지 조회도 같은 순서
+    ordered_ids, _ = select_customer_ids(db, "credit_card", sort="phone", descending=True)
+    assert ordered_ids == [ids[n] for n in ("라고객", "다고객", "나고객")]
+    page = fetch_summary_page(db, ordered_ids, 1, size=5)
+    assert [summary["name"] for summary in page] == ["다고객", "나고객"]
+
+    # 연체 필터 기본 정렬 = 연체일수 큰 순
+    assert select_customer_ids(db, "overdue")[0] == [ids["라고객"]]
+
+
+def test_policy_cache_invalidated_with_customer(db, sample_policy):
+    """계약 캐시: 납부 완료 / 고객 삭제(CASCADE) 시 무효화"""
+    assert db.get_policy(sample_policy.id).last_payment_date is None
+    assert len(db.get_policies_by_customer(sample_policy.customer_id)) == 1
+
+    db.mark_payment_completed(sample_policy.id, "2026-02-25")
+    assert db.get_policy(sample_policy.id).last_payment_date == "2026-02-25"
+    assert db.get_policies_by_customer(sample_policy.customer_id)[0].last_payment_date == "2026-02-25"
+
+    db.delete_customer(sample_policy.customer_id)
+    assert db.get_policy(sample_policy.id) is None
+    assert db.get_policies_by_customer(sample_policy.customer_id) == []
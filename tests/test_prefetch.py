@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+프리페치 테스트 - IN 조회 + 백그라운드 캐시 채우기 + 세대 검증
+"""
+
+import sys
+from pathlib import Path
+
+# src 디렉토리를 sys.path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from models import Customer
+from prefetch import Prefetcher
+from conftest import make_policy
+
+
+@pytest.fixture
+def db(db):
+    """공용 임시 데이터베이스 + 고객 5명, 고객당 계약 2건"""
+    for i in range(5):
+        customer_id = db.add_customer(Customer(name=f"프리페치{i}", phone=f"010-6000-000{i}"))
+        for j in range(2):
+            db.add_policy(make_policy(customer_id, product_name=f"상품{j}"))
+    return db
+
+
+def test_batch_reads_group_by_customer(db):
+    """IN 쿼리 조회: 고객 목록 + 고객별 계약"""
+    customer_ids = [1, 3, 999]
+
+    customers = db.get_customers_by_ids(customer_ids)
+    policies = db.get_policies_by_customers(customer_ids)
+
+    assert sorted(c.id for c in customers) == [1, 3]
+    assert [len(policies[cid]) for cid in customer_ids] == [2, 2, 0]
+    assert all(p.customer_id == 3 for p in policies[3])
+
+
+def test_prefetch_fills_cache(db):
+    """프리페치 이후 고객/계약 조회는 SQL 없이 캐시에서 반환"""
+    prefetcher = Prefetcher(db)
+    prefetcher.request([1, 2, 3])
+    prefetcher.wait()
+
+    statements = []
+    db.connection.set_trace_callback(statements.append)
+    customer = db.get_customer(2)
+    policies = db.get_policies_by_customer(2)
+    db.connection.set_trace_callback(None)
+    prefetcher.close()
+
+    assert customer.name == "프리페치1"
+    assert len(policies) == 2
+    assert [s for s in statements if not s.startswith("PRAGMA data_version")] == []
+    assert db.missing_from_cache([1, 2, 3, 4]) == [4]
+
+
+def test_stale_prefetch_discarded_after_write(db):
+    """읽는 동안 쓰기가 일어나면 프리페치 결과를 버림"""
+    generation = db.cache_generation
+    customers = db.get_customers_by_ids([1])
+    policies = db.get_policies_by_customers([1])
+
+    customer = db.get_customer(1)
+    customer.name = "수정됨"
+    db.update_customer(customer)
+
+    assert db.prime_cache(customers, policies, generation) is False
+    assert db.get_customer(1).name == "수정됨"
@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+"""
+쿼리 계획 회귀 테스트 - 자주 쓰는 조회의 EXPLAIN QUERY PLAN 검사
+
+HOT_QUERIES에 등록된 DatabaseManager 호출을 실사용 규모 합성 DB에서 실행하고,
+실제로 실행된 SQL마다 EXPLAIN QUERY PLAN을 확인한다.
+
+- expect_indexes의 인덱스를 모두 사용
+- 큰 테이블 전체 SCAN 없음 (allow_scan에 적은 테이블 제외)
+- 임시 B-tree 정렬 없음 (allow_sort=True 제외)
+
+실패 시 기대 계획(plan)과 실제 계획의 diff를 보여준다.
+아직 고치지 못한 계획은 known_bad에 이유를 적고 xfail(strict)로 둔다 → 고쳐지면 테스트가 알려준다.
+"""
+
+import re
+import sys
+import difflib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+# src, scripts 디렉토리를 sys.path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import pytest
+from create_dummy_data import create_bulk_data
+from database import DatabaseManager
+
+
+FIXTURE_CUSTOMERS = 20_000  # 계약 약 6만 건, ANALYZE 통계 포함
+BASE_DATE = "2026-10-19"
+
+# 전체 SCAN이 문제가 되는 테이블 (고객 수에 비례)
+LARGE_TABLES = {
+    "customers", "policies", "customer_summary", "customer_conditions", "customer_vehicle_types",
+    "change_log",  # 쓰기마다 증가 (압축 전까지)
+}
+
+
+@dataclass
+class HotQuery:
+    """등록된 자주 쓰는 조회
+
+    Attributes:
+        name: 테스트 ID
+        call: (db, sample) → DatabaseManager 호출 (sample: 계약 3건 이상 고객 ID 등)
+        expect_indexes: 계획에 나와야 하는 인덱스 이름
+        plan: 기대 계획 (실패 시 diff 기준, 문장마다 한 줄씩 이어 붙임)
+        allow_scan: 전체 SCAN을 허용하는 테이블 (설계상 전체 조회)
+        allow_sort: 임시 B-tree 정렬 허용 (결과가 작은 범위로 제한된 경우)
+        known_bad: 아직 고치지 못한 계획 (이유) → xfail
+    """
+
+    name: str
+    call: Callable
+    expect_indexes: Tuple[str, ...] = ()
+    plan: Tuple[str, ...] = ()
+    allow_scan: Tuple[str, ...] = ()
+    allow_sort: bool = False
+    known_bad: Optional[str] = None
+
+
+HOT_QUERIES = [
+    HotQuery(
+        "search_customers",
+        lambda db, sample: db.search_customers("김민"),
+        plan=("SEARCH customers USING INDEX ...",),
+        known_bad="앞뒤 와일드카드 LIKE는 B-tree 인덱스로 찾을 수 없음 (전문 검색 인덱스 필요)",
+    ),
+    HotQuery(
+        "get_upcoming_payments",
+        lambda db, sample: db.get_upcoming_payments(7),
+        expect_indexes=("idx_policy_card_due",),
+        plan=(
+            "SEARCH p USING INDEX idx_policy_card_due (status=? AND next_payment_date>? AND next_payment_date<?)",
+            "SEARCH c USING INTEGER PRIMARY KEY (rowid=?)",
+        ),
+    ),
+    HotQuery(
+        "get_overdue_policies",
+        lambda db, sample: db.get_overdue_policies(),
+        expect_indexes=("idx_policy_card_due",),
+        plan=(
+            "SEARCH p USING INDEX idx_policy_card_due (status=?)",
+            "SEARCH c USING INTEGER PRIMARY KEY (rowid=?)",
+        ),
+    ),
+    HotQuery(
+        "get_payment_alert_counts",
+        lambda db, sample: db.get_payment_alert_counts(7),
+        expect_indexes=("idx_policy_card_due",),
+        plan=(
+            "SCAN CONSTANT ROW",
+            "SCALAR SUBQUERY 1",
+            "SEARCH policies USING INDEX idx_policy_card_due (status=? AND next_payment_date>? AND next_payment_date<?)",
+            "SCALAR SUBQUERY 2",
+            "SEARCH policies USING INDEX idx_policy_card_due (status=?)",
+        ),
+    ),
+    HotQuery(
+        "auto_update_payment_status",
+        lambda db, sample: db.auto_update_payment_status(),
+        expect_indexes=("idx_policy_card_due",),
+        plan=("SEARCH policies USING INDEX idx_policy_card_due (status=? AND next_payment_date<?)",),
+    ),
+    HotQuery(
+        "get_policies_by_customer",
+        lambda db, sample: db.get_policies_by_customer(sample),
+        expect_indexes=("idx_policy_customer_created",),
+        plan=("SEARCH policies USING INDEX idx_policy_customer_created (customer_id=?)",),
+    ),
+    HotQuery(
+        "get_policies_by_customers",
+        lambda db, sample: db.get_policies_by_customers([sample, sample + 1, sample + 2]),
+        expect_indexes=("idx_policy_customer_created",),
+        plan=("SEARCH policies USING INDEX idx_policy_customer_created (customer_id=?)",),
+    ),
+    HotQuery(
+        "get_customer",
+        lambda db, sample: db.get_customer(sample),
+        plan=("SEARCH customers USING INTEGER PRIMARY KEY (rowid=?)",),
+    ),
+    HotQuery(
+        "get_customer_summaries[all]",
+        lambda db, sample: db.get_customer_summaries(),
+        expect_indexes=("idx_summary_list",),
+        plan=("SCAN customer_summary USING COVERING INDEX idx_summary_list",),
+        allow_scan=("customer_summary",),  # 목록 화면 전체 표시 (정렬은 인덱스 순서로 해결)
+    ),
+    HotQuery(
+        "page_customer_summaries",
+        lambda db, sample: db.page_customer_summaries("박", sample, limit=100),
+        expect_indexes=("idx_summary_list",),
+        plan=("SEARCH customer_summary USING COVERING INDEX idx_summary_list (name>?)",),
+    ),
+    HotQuery(
+        "get_sorted_customer_ids[phone]",
+        lambda db, sample: db.get_sorted_customer_ids("phone"),
+        expect_indexes=("idx_summary_sort_phone",),
+        plan=("SCAN customer_summary USING COVERING INDEX idx_summary_sort_phone",),
+        allow_scan=("customer_summary",),  # 헤더 정렬 전체 ID (정렬은 인덱스 순서로 해결)
+    ),
+    HotQuery(
+        "get_sorted_customer_ids[overdue,desc]",
+        lambda db, sample: db.get_sorted_customer_ids("overdue", descending=True),
+        expect_indexes=("idx_summary_sort_overdue",),
+        plan=(
+            "SEARCH customer_summary USING COVERING INDEX idx_summary_sort_overdue (oldest_overdue_date>?)",
+            "SEARCH customer_summary USING COVERING INDEX idx_summary_sort_overdue (oldest_overdue_date=?)",
+        ),
+    ),
+    HotQuery(
+        "page_customers",
+        lambda db, sample: db.page_customers("박", sample, limit=100),
+        expect_indexes=("idx_customer_name",),
+        plan=("SEARCH customers USING INDEX idx_customer_name (name>?)",),
+    ),
+    HotQuery(
+        "page_policies",
+        lambda db, sample: db.page_policies(sample, limit=100),
+        plan=("SEARCH policies USING INTEGER PRIMARY KEY (rowid>?)",),
+    ),
+    HotQuery(
+        "get_customer_summaries[ids]",
+        lambda db, sample: db.get_customer_summaries([sample, sample + 1]),
+        plan=("SEARCH customer_summary USING INTEGER PRIMARY KEY (rowid=?)",),
+        allow_sort=True,  # 지정한 ID 몇 건만 이름순 정렬
+    ),
+    HotQuery(
+        "get_birthday_customer_ids",
+        lambda db, sample: db.get_birthday_customer_ids(BASE_DATE),
+        expect_indexes=("idx_customer_birth_mmdd",),
+        plan=("SEARCH customers USING COVERING INDEX idx_customer_birth_mmdd (birth_mmdd=?)",),
+    ),
+    HotQuery(
+        "get_upcoming_birthdays",
+        lambda db, sample: db.get_upcoming_birthdays(7, BASE_DATE),
+        expect_indexes=("idx_customer_birth_mmdd",),
+        plan=(
+            "SEARCH customers USING INDEX idx_customer_birth_mmdd (birth_mmdd>? AND birth_mmdd<?)",
+            "USE TEMP B-TREE FOR RIGHT PART OF ORDER BY",
+        ),
+        allow_sort=True,  # 같은 날짜 안에서 이름 정렬 (7일치)
+    ),
+    HotQuery(
+        "get_upcoming_age_changes",
+        lambda db, sample: db.get_upcoming_age_changes(30),  # 오늘 기준 (저장된 상령일 인덱스 경로)
+        expect_indexes=("idx_customer_age_change",),
+        plan=(
+            "SEARCH customers USING INDEX idx_customer_age_change (insurance_age_change_date<?)",
+            "SEARCH customers USING INDEX idx_customer_age_change "
+            "(insurance_age_change_date>? AND insurance_age_change_date<?)",
+        ),
+    ),
+    HotQuery(
+        "get_customer_ids_by_vehicle_types",
+        lambda db, sample: db.get_customer_ids_by_vehicle_types(["SUV"]),
+        expect_indexes=("idx_vehicle_type",),
+        plan=("SEARCH customer_vehicle_types USING COVERING INDEX idx_vehicle_type (vehicle_type=?)",),
+    ),
+    HotQuery(
+        "find_customers_by_conditions",
+        lambda db, sample: db.find_customers_by_conditions(["당뇨병"], card_policy_only=True),
+        plan=(
+            "SEARCH customers USING INTEGER PRIMARY KEY (rowid=?)",
+            "LIST SUBQUERY 1",
+            "SCAN cc",
+            "CORRELATED SCALAR SUBQUERY 2",
+            "SEARCH p USING INDEX idx_policy_customer_created (customer_id=?)",
+            "USE TEMP B-TREE FOR ORDER BY",
+        ),
+        # 질환 종류가 적어(6종) 질환 하나가 고객의 약 1/6 → 고객 ID 순서인 PK 전체 스캔이 GROUP BY에 유리
+        allow_scan=("customer_conditions",),
+        allow_sort=True,  # 조건에 맞는 고객만 이름 정렬
+    ),
+    HotQuery(
+        "changes_since",
+        lambda db, sample: db.changes_since(sample),
+        plan=("SEARCH change_log USING INTEGER PRIMARY KEY (rowid>?)",),
+    ),
+    HotQuery(
+        "changed_rows_since",
+        lambda db, sample: db.changed_rows_since("customers", sample),
+        plan=(
+            "SEARCH change_log USING INTEGER PRIMARY KEY (rowid>? AND rowid<?)",
+            "USE TEMP B-TREE FOR GROUP BY",
+        ),
+        allow_sort=True,  # 증분 구간(seq 범위)의 행만 행별로 모음
+    ),
+    HotQuery(
+        "claim_due_sms",
+        lambda db, sample: db.claim_due_sms(),
+        expect_indexes=("idx_sms_outbox_due",),
+        plan=("SEARCH sms_outbox USING COVERING INDEX idx_sms_outbox_due (status=? AND next_attempt_at<?)",),
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def plan_db(tmp_path_factory):
+    """실사용 규모 합성 DB (모듈당 1회 생성)"""
+    db_path = tmp_path_factory.mktemp("plans") / "plans.db"
+    create_bulk_data(db_path, FIXTURE_CUSTOMERS, seed=11, base_date=BASE_DATE, verbose=False)
+    db = DatabaseManager(str(db_path))
+    sample = db.connection.execute(
+        "SELECT customer_id FROM policies GROUP BY customer_id HAVING COUNT(*) >= 3 LIMIT 1"
+    ).fetchone()[0]
+    yield db, sample
+    db.close()
+
+
+def capture_plans(db, call) -> list:
+    """호출 중 실행된 조회/갱신 SQL과 각 EXPLAIN QUERY PLAN
+
+    Returns:
+        [(SQL, [계획 줄, ...]), ...]
+    """
+    statements = []
+    db.connection.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        db.connection.set_trace_callback(None)
+
+    plans = []
+    for sql in statements:
+        if not sql.lstrip().upper().startswith(("SELECT", "WITH", "UPDATE", "DELETE")):
+            continue  # PRAGMA, 트리거 내부 문장, 트랜잭션 제어
+        rows = db.connection.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+        plans.append((sql, [row[3] for row in rows]))
+    return plans
+
+
+_TABLE_ALIAS = re.compile(r"\b(?:FROM|JOIN|UPDATE)\s+(\w+)(?:\s+(?:AS\s+)?(?!WHERE|JOIN|ON|SET|ORDER|GROUP|LIMIT|LEFT|INNER)(\w+))?", re.I)
+
+
+def _table_aliases(sql: str) -> dict:
+    """SQL의 별칭 → 테이블 이름 ("p" → "policies")"""
+    aliases = {}
+    for table, alias in _TABLE_ALIAS.findall(sql):
+        aliases[table] = table
+        if alias:
+            aliases[alias] = table
+    return aliases
+
+
+def plan_violations(hot_query: HotQuery, plans: list) -> list:
+    """규칙 위반 목록 (비어 있으면 통과)"""
+    lines = [line for _, plan in plans for line in plan]
+    violations = []
+    for index in hot_query.expect_indexes:
+        if not any(f" {index}" in line for line in lines):
+            violations.append(f"인덱스 미사용: {index}")
+    for sql, plan in plans:
+        aliases = _table_aliases(sql)
+        for line in plan:
+            words = line.split()
+            if words[:1] == ["SCAN"]:
+                table = aliases.get(words[1], words[1])
+                if table in LARGE_TABLES and table not in hot_query.allow_scan:
+                    violations.append(f"전체 SCAN ({table}): {line}")
+            if "TEMP B-TREE" in line and not hot_query.allow_sort:
+                violations.append(f"임시 B-tree 정렬: {line}")
+    return violations
+
+
+@pytest.mark.parametrize(
+    "hot_query",
+    [
+        pytest.param(
+            hot_query,
+            id=hot_query.name,
+            marks=[pytest.mark.xfail(reason=hot_query.known_bad, strict=True)] if hot_query.known_bad else [],
+        )
+        for hot_query in HOT_QUERIES
+    ],
+)
+def test_hot_query_plan(plan_db, hot_query):
+    """등록된 조회의 계획이 인덱스를 타고 큰 테이블 전체 스캔/임시 정렬이 없는지"""
+    db, sample = plan_db
+    plans = capture_plans(db, lambda: hot_query.call(db, sample))
+    assert plans, "실행된 SQL 없음"
+
+    violations = plan_violations(hot_query, plans)
+    actual = [line for _, plan in plans for line in plan]
+    diff = "\n".join(difflib.unified_diff(list(hot_query.plan), actual, "expected", "actual", lineterm=""))
+    sql = "\n\n".join(" ".join(statement.split()) for statement, _ in plans)
+    assert not violations, "\n".join(violations) + f"\n\n{diff}\n\nSQL:\n{sql}"
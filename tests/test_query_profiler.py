@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+쿼리 계측 테스트 - 기본 비활성, 호출 메서드별 집계, 느린 쿼리 로그
+"""
+
+import sys
+import json
+import sqlite3
+from pathlib import Path
+from types import SimpleNamespace
+
+# src 디렉토리를 sys.path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from database import DatabaseManager
+from models import Customer
+from utils import query_profiler
+from utils.query_profiler import QueryProfiler, sql_shape
+
+
+def test_disabled_by_default_uses_plain_connection(tmp_path, monkeypatch):
+    """환경 변수가 없으면 일반 sqlite3 연결 (계측 비용 없음)"""
+    monkeypatch.delenv("CRM_QUERY_PROFILE", raising=False)
+    db = DatabaseManager(str(tmp_path / "crm.db"))
+    try:
+        assert db.profiler is None
+        assert type(db.connection) is sqlite3.Connection
+    finally:
+        db.close()
+
+
+def test_sql_shape_collapses_literals_and_in_lists():
+    """값/IN 목록 길이가 달라도 같은 형태"""
+    first = sql_shape("SELECT * FROM customers\n  WHERE id IN (?, ?, ?) AND name = '김고객' LIMIT 10")
+    second = sql_shape("SELECT * FROM customers WHERE id IN (?,?) AND name = 'x' LIMIT 5")
+    assert first == second == "SELECT * FROM customers WHERE id IN (?...) AND name = ? LIMIT ?"
+
+
+def test_calling_method_without_qualname(monkeypatch):
+    """co_qualname이 없는 Python(3.10 이하)에서는 self의 클래스명 + co_name"""
+    def frame(filename, name, f_locals, back):
+        return SimpleNamespace(f_code=SimpleNamespace(co_filename=filename, co_name=name),
+                               f_locals=f_locals, f_back=back)
+
+    class Repository:
+        pass
+
+    caller = frame("gui.py", "_on_save", {}, None)
+    method = frame("database.py", "add_customer", {"self": Repository()}, caller)
+    helper = frame("database.py", "_sync_customer_attributes", {}, method)
+    inner = frame(query_profiler.__file__, "execute", {}, helper)
+    monkeypatch.setattr(query_profiler, "sys", SimpleNamespace(_getframe=lambda depth: inner))
+    assert query_profiler._calling_method() == "Repository.add_customer"
+
+    method.f_locals = {}
+    assert query_profiler._calling_method() == "add_customer"
+
+
+def test_records_per_method_stats_and_slow_log(tmp_path):
+    """호출한 공개 메서드별 집계, 기준 초과는 느린 쿼리 로그 (파라미터 값은 기록 안 함)"""
+    profiler = QueryProfiler(tmp_path / "logs", slow_ms=0.0)
+    db = DatabaseManager(str(tmp_path / "crm.db"), profiler=profiler)
+    try:
+        for index in range(3):
+            db.add_customer(Customer(name=f"고객{index}", phone=f"010-0000-000{index}", resident_id="900101-1234567"))
+        customers = db.get_all_customers()
+    finally:
+        db.close()
+
+    stats = profiler.snapshot()
+    assert stats["DatabaseManager.add_customer"]["count"] >= 3
+    assert stats["DatabaseManager.get_all_customers"]["rows"] == len(customers) == 3
+    assert sum(stats["DatabaseManager.get_all_customers"]["histogram"].values()) == 1
+    assert json.loads((tmp_path / "logs" / "query_stats.json").read_text(encoding="utf-8")) == stats
+
+    lines = (tmp_path / "logs" / "slow_queries.log").read_text(encoding="utf-8").splitlines()
+    entries = [json.loads(line) for line in lines]
+    inserts = [entry for entry in entries if entry["sql"].startswith("INSERT INTO customers")]
+    assert inserts and all(entry["params"] > 0 for entry in inserts)
+    assert "900101-1234567" not in "".join(lines)
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+세그먼트 비트맵 인덱스 테스트 - 빌드 + 조합 + 증분 갱신
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# src 디렉토리를 sys.path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from models import Customer
+from segments import bitmap_from_ids, ids_from_bitmap, count_bits
+from conftest import make_policy
+
+
+def test_bitmap_round_trip():
+    """ID 목록 ↔ 비트맵 변환"""
+    ids = [1, 5, 64, 1000]
+    bits = bitmap_from_ids(ids)
+
+    assert ids_from_bitmap(bits) == ids
+    assert count_bits(bits) == 4
+    assert ids_from_bitmap(0) == []
+
+
+def test_segments_built_from_sql(db):
+    """SQL 기반 세그먼트 빌드"""
+    today = datetime.now()
+    patient = db.add_customer(Customer(name="유병", phone="010-8000-0001", med_medication="고혈압"))
+    card = db.add_customer(Customer(name="카드", phone="010-8000-0002", payment_method="신용카드"))
+    birthday = db.add_customer(Customer(
+        name="생일", phone="010-8000-0003", resident_id=f"90{today.strftime('%m%d')}-1234567",
+    ))
+    db.add_policy(make_policy(card, next_payment_date=today.strftime("%Y-%m-%d")))
+
+    segments = db.get_segment_index()
+
+    assert segments.ids("patient") == [patient]
+    assert segments.ids("credit_card") == [card]
+    assert segments.ids("today_card") == [card]
+    assert segments.ids("birthday_today") == [birthday]
+    assert segments.ids("condition:고혈압") == [patient]
+    assert segments.count("all") == 3
+
+
+def test_segment_combinations(db):
+    """AND / OR / NOT 조합"""
+    both = db.add_customer(Customer(name="둘다", phone="010-8000-0001", med_medication="당뇨병", payment_method="card"))
+    patient = db.add_customer(Customer(name="유병", phone="010-8000-0002", med_recent_exam=True))
+    card = db.add_customer(Customer(name="카드", phone="010-8000-0003", payment_method="신용카드"))
+    plain = db.add_customer(Customer(name="일반", phone="010-8000-0004"))
+
+    segments = db.get_segment_index()
+
+    assert segments.ids(("and", "patient", "credit_card")) == [both]
+    assert segments.ids(("or", "patient", "credit_card")) == [both, patient, card]
+    assert segments.ids(("not", ("or", "patient", "credit_card"))) == [plain]
+    assert segments.count(("and", "patient", ("not", "credit_card"))) == 1
+    assert segments.ids("unknown_segment") == []
+
+    with pytest.raises(ValueError):
+        segments.bits(("xor", "patient", "credit_card"))
+
+
+def test_segments_updated_incrementally(db):
+    """쓰기 메서드 호출 시 해당 고객 비트만 갱신"""
+    segments = db.get_segment_index()
+    assert segments.count("all") == 0
+
+    customer_id = db.add_customer(Customer(name="증분", phone="010-8000-0001"))
+    assert segments.ids("all") == [customer_id]
+    assert segments.ids("patient") == []
+
+    customer = db.get_customer(customer_id)
+    customer.med_5yr_diagnosis = "암"
+    customer.driving_type = "commercial"
+    customer.commercial_detail = "taxi"
+    db.update_customer(customer)
+    assert segments.ids("patient") == [customer_id]
+    assert segments.ids("condition:암") == [customer_id]
+    assert segments.ids("vehicle:taxi") == [customer_id]
+    assert segments.ids("commercial") == [customer_id]
+
+    # 계약 추가 → 납부 임박, 삭제 → 해제
+    soon = (datetime.now() + timedelta(days=3)).strftime("%Y-%m-%d")
+    policy_id = db.add_policy(make_policy(customer_id, next_payment_date=soon))
+    assert segments.ids("upcoming_payment") == [customer_id]
+    db.delete_policy(policy_id)
+    assert segments.ids("upcoming_payment") == []
+
+    # 고객 삭제 → 모든 비트 해제
+    db.delete_customer(customer_id)
+    assert segments.count("all") == 0
+    assert segments.ids("condition:암") == []
+
+
+def test_segments_rebuilt_after_bulk_status_update(db):
+    """auto_update_payment_status 이후 연체 세그먼트 반영"""
+    customer_id = db.add_customer(Customer(name="연체", phone="010-8000-0001"))
+    db.add_policy(make_policy(customer_id, next_payment_date="2025-12-01"))
+
+    segments = db.get_segment_index()
+    assert segments.ids("overdue") == []
+
+    db.auto_update_payment_status()
+    assert segments.ids("overdue") == [customer_id]
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+서비스 모드 테스트 - HTTP/JSON 왕복, 쓰기 큐/읽기 풀 일관성, 일괄 엔드포인트, 오류 매핑
+"""
+
+import sys
+import json
+import http.client
+from pathlib import Path
+
+# src 디렉토리를 sys.path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from customer_list import select_customer_ids
+from database import ChangeLogExpiredError, ConflictError, DatabaseManager, RecordDeletedError
+from events import UPDATE, customer_event
+from models import Customer, Policy
+from service import CrmService, RemoteDatabase, ServiceError
+from utils.single_instance import InstanceLock
+
+
+@pytest.fixture
+def service(tmp_path):
+    """임시 DB(고객 6명, 카드 계약 1건씩) + 임의 포트 서비스"""
+    db_path = tmp_path / "crm.db"
+    db = DatabaseManager(str(db_path))
+    for index in range(6):
+        customer_id = db.add_customer(Customer(
+            name=f"고객{index}", phone=f"010-7000-000{index}",
+            payment_method="신용카드" if index % 2 else "계좌이체",
+        ))
+        db.add_policy(Policy(
+            customer_id=customer_id, insurer="삼성생명", product_name="종신보험", premium=50000,
+            payment_method="card", billing_cycle="monthly", billing_day=25,
+            contract_start_date="2026-01-01", next_payment_date="2026-01-25", status="overdue",
+        ))
+    db.close()
+
+    crm_service = CrmService(str(db_path), port=0, readers=2)
+    port = crm_service.start_in_thread()
+    yield crm_service, f"http://127.0.0.1:{port}"
+    crm_service.stop_thread()
+
+
+@pytest.fixture
+def remote(service):
+    client = RemoteDatabase(service[1])
+    yield client
+    client.close()
+
+
+def test_remote_calls_round_trip_models(remote):
+    """Customer/Policy, 정수 키 dict, set이 원래 타입으로 돌아옴"""
+    customer = remote.get_customer(1)
+    assert isinstance(customer, Customer) and customer.name == "고객0"
+
+    policies = remote.get_policies_by_customers([1, 2])
+    assert set(policies) == {1, 2} and isinstance(policies[1][0], Policy)
+    assert remote.get_birthday_customer_ids() == set()
+
+    published = []
+    remote.events.subscribe(published.append)
+    stale = remote.get_customer(1)
+    customer.memo = "서비스 수정"
+    assert remote.update_customer(customer) is True and customer.version == 2
+    assert published == [[customer_event(UPDATE, 1)]]  # 자기 쓰기는 DatabaseManager와 같은 이벤트
+    assert remote.get_customer(1).memo == "서비스 수정"
+    stale.memo = "다른 설계사"
+    with pytest.raises(ConflictError):
+        remote.update_customer(stale)
+    with pytest.raises(RecordDeletedError):
+        remote.update_customer(Customer(name="없음", phone="010-0000-0000", id=999))
+    assert [c.id for c in remote.iter_customers(batch_size=4)] == [1, 2, 3, 4, 5, 6]
+
+
+def test_readers_see_writes_and_segments_follow(service, remote):
+    """쓰기 큐로 바꾼 내용이 바로 다음 읽기(다른 읽기 스레드 포함)와 목록/세그먼트에 반영"""
+    before = remote.list_page("credit_card", sort="name")
+    assert before["total"] == 3
+
+    new_id = remote.add_customer(Customer(name="가신규", phone="010-7000-0100", payment_method="신용카드"))
+    for _ in range(4):  # 읽기 스레드 2개 모두 거치도록
+        page = remote.list_page("credit_card", sort="name", size=2)
+        assert page["total"] == 4 and page["rows"][0]["customer_id"] == new_id
+
+    # 클라이언트 쪽 세그먼트 사본 (앱의 필터 조합 경로)
+    assert remote.get_segment_index().count("overdue") == 6
+    assert remote.mark_payments_completed([1, 2, 999], "2026-02-25") == 2
+    assert remote.get_segment_index().count("overdue") == 4
+    ordered_ids, _ = select_customer_ids(remote, "overdue")
+    assert ordered_ids == [3, 4, 5, 6]
+
+    result = remote.changes(since=0)
+    assert result["changes"][-1]["seq"] == result["change_seq"]
+    assert remote.health()["generation"] == service[0].generation == 2
+
+
+def test_batch_and_errors(service, remote):
+    """batch 왕복 1회, 허용 목록/검증/제약 오류는 상태 코드 + 예외로 전달"""
+    customer, policies = remote.batch([("get_customer", (2,), {}), ("get_policies_by_customer", (2,), {})])
+    assert customer.id == 2 and policies[0].customer_id == 2
+
+    with pytest.raises(ServiceError) as error:
+        remote.call("rebuild_customer_summary")
+    assert error.value.status == 403
+    with pytest.raises(ValueError):
+        remote.batch([("get_customer", (1,), {}), ("delete_customer", (1,), {})])
+    with pytest.raises(ValueError):
+        remote.get_sorted_customer_ids("unknown")
+    with pytest.raises(ServiceError) as error:
+        remote.add_customer(Customer(name="중복", phone="010-7000-0001"))
+    assert error.value.status == 409
+
+    remote.compact_change_log(purge_tombstones_through=remote.get_change_seq())
+    with pytest.raises(ChangeLogExpiredError):
+        remote.changes(since=0)
+
+
+def test_token_and_database_lock(tmp_path):
+    """토큰 없는 요청은 401, 서비스 실행 중에는 같은 DB를 다른 프로세스가 열 수 없음"""
+    with pytest.raises(ValueError):
+        CrmService(str(tmp_path / "crm.db"), host="0.0.0.0")
+
+    crm_service = CrmService(str(tmp_path / "crm.db"), port=0, token="secret")
+    port = crm_service.start_in_thread()
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        connection.request("GET", "/health")
+        response = connection.getresponse()
+        assert response.status == 401 and not json.loads(response.read())["ok"]
+        connection.close()
+
+        client = RemoteDatabase(f"http://127.0.0.1:{port}", token="secret")
+        assert client.health()["pending_writes"] == 0
+        client.close()
+
+        assert not InstanceLock(tmp_path / "crm.db").acquire()
+        with pytest.raises(RuntimeError):
+            CrmService(str(tmp_path / "crm.db"), port=0).start_in_thread()
+    finally:
+        crm_service.stop_thread()
+    assert InstanceLock(tmp_path / "crm.db").acquire()
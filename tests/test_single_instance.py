@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+단일 인스턴스 테스트 - 잠금, 두 번째 실행 명령 전달, 쓰기 위임
+"""
+
+import sys
+import os
+import json
+import queue
+import socket
+import subprocess
+import threading
+from pathlib import Path
+
+# src 디렉토리를 sys.path에 추가
+SRC_DIR = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+import pytest
+from database import DatabaseManager
+from models import Customer
+from utils.single_instance import InstanceLock, InstanceServer, apply_write, request_write, send_command
+
+
+@pytest.fixture
+def primary(tmp_path):
+    """주 인스턴스 흉내: 잠금 + 수신기 + Tk 스레드 대신 요청 처리 스레드 (DB 연결 소유)"""
+    db_path = tmp_path / "crm.db"
+    lock = InstanceLock(db_path)
+    assert lock.acquire()
+    server = InstanceServer(db_path)
+    server.start()
+    handled = queue.Queue()
+    stop = threading.Event()
+
+    def dispatch():
+        db = DatabaseManager(str(db_path))
+        try:
+            while not stop.is_set():
+                try:
+                    request = server.requests.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+                if not request.claim():
+                    continue
+                handled.put((request.command, request.args))
+                try:
+                    request.reply(apply_write(db, request.args) if request.command == "db_write" else None)
+                except Exception as e:
+                    request.fail(f"{type(e).__name__}: {e}")
+        finally:
+            db.close()
+
+    thread = threading.Thread(target=dispatch, daemon=True)
+    thread.start()
+    yield db_path, handled
+    stop.set()
+    thread.join(2.0)
+    server.stop()
+    lock.release()
+
+
+def test_lock_is_exclusive_per_database(tmp_path):
+    """같은 DB는 한 프로세스만 주 인스턴스, 해제 후 다시 획득 가능"""
+    first, second = InstanceLock(tmp_path / "crm.db"), InstanceLock(tmp_path / "crm.db")
+    assert first.acquire()
+    assert not second.acquire()
+    assert InstanceLock(tmp_path / "other.db").acquire()
+    first.release()
+    assert second.acquire()
+    second.release()
+
+
+def test_no_running_instance(tmp_path):
+    """주 인스턴스가 없으면 전달 실패 (None / ConnectionError)"""
+    assert send_command(tmp_path / "crm.db", "focus", timeout=0.2) is None
+    with pytest.raises(ConnectionError):
+        request_write(tmp_path / "crm.db", "delete_customer", 1)
+
+
+def test_writes_are_forwarded_to_primary(primary):
+    """다른 프로세스의 쓰기는 주 인스턴스 연결에서 실행, 허용 목록 밖 메서드는 거절"""
+    db_path, handled = primary
+    assert send_command(db_path, "ping")["ok"]
+
+    customer_id = request_write(db_path, "add_customer", Customer(name="위임", phone="010-5000-0001").to_dict())
+    assert request_write(db_path, "delete_customer", customer_id) is True
+    with pytest.raises(RuntimeError, match="허용되지 않은"):
+        request_write(db_path, "rebuild_customer_summary")
+    assert [handled.get_nowait()[0] for _ in range(3)] == ["db_write"] * 3
+
+    # 토큰이 다르면 거절
+    info_path = Path(f"{db_path}.instance.json")
+    info = info_path.read_text(encoding="utf-8")
+    info_path.write_text(info.replace('"token": "', '"token": "x'), encoding="utf-8")
+    assert send_command(db_path, "focus") == {"ok": False, "error": "인증 실패"}
+
+
+def test_second_launch_forwards_open_customer(primary):
+    """두 번째 실행은 창 없이 명령만 전달하고 종료"""
+    db_path, handled = primary
+    env = dict(os.environ, CRM_DB_PATH=str(db_path))
+    result = subprocess.run(
+        [sys.executable, str(SRC_DIR / "main.py"), "--open-customer", "7"],
+        env=env, capture_output=True, text=True, timeout=30,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert handled.get(timeout=1.0) == ("open_customer", {"customer_id": 7})
+
+
+def test_timed_out_and_malformed_requests(tmp_path):
+    """시간 초과로 포기된 요청은 처리하지 않음, JSON 객체가 아닌 요청에도 수신 스레드는 계속 동작"""
+    db_path = tmp_path / "crm.db"
+    server = InstanceServer(db_path, reply_timeout=0.1)
+    port = server.start()
+    try:
+        response = send_command(db_path, "db_write", {"method": "delete_customer", "args": [1]})
+        assert response == {"ok": False, "error": "주 인스턴스 응답 시간 초과"}
+        request = server.requests.get_nowait()
+        assert request.cancelled and not request.claim()
+
+        for line in (b"[]\n", b'"focus"\n'):
+            with socket.create_connection(("127.0.0.1", port), timeout=2) as connection:
+                connection.sendall(line)
+                assert json.loads(connection.makefile().readline())["ok"] is False
+        assert send_command(db_path, "ping")["ok"]
+    finally:
+        server.stop()
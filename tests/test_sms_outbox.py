@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+SMS 발송 대기열 테스트 - 로컬 HTTP 서버(지연/오류 시뮬레이션) 대상
+"""
+
+import sys
+import json
+import sqlite3
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# src 디렉토리를 sys.path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from database import DatabaseManager
+from utils.sms_outbox import HttpSmsTransport, SmsOutboxWorker, TokenBucket
+
+
+class _StandInSmsServer:
+    """NCP SENS 대역 서버: 수신 번호별 응답 코드 시나리오 + 지연 + 동시 요청 수 기록"""
+
+    def __init__(self, latency=0.02, scenarios=None):
+        self.latency = latency
+        self.scenarios = {phone: list(codes) for phone, codes in (scenarios or {}).items()}
+        self.requests = []
+        self.active = 0
+        self.peak_active = 0
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                phone = body["messages"][0]["to"]
+                with server.lock:
+                    server.active += 1
+                    server.peak_active = max(server.peak_active, server.active)
+                    server.requests.append((time.monotonic(), phone, self.headers["X-Idempotency-Key"]))
+                    codes = server.scenarios.get(phone)
+                    code = codes.pop(0) if codes else 202
+                time.sleep(server.latency)
+                with server.lock:
+                    server.active -= 1
+                self.send_response(code)
+                self.end_headers()
+                self.wfile.write(b'{"statusCode": "%d"}' % code)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _transport(server):
+    return HttpSmsTransport("access", "secret", "service", "010-1234-5678", base_url=server.base_url, timeout=5)
+
+
+def _wait_until_done(db, ids, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        statuses = {db.get_sms(i)["status"] for i in ids}
+        if statuses <= {"sent", "failed"}:
+            return
+        time.sleep(0.02)
+    raise AssertionError(f"발송 미완료: {statuses}")
+
+
+def test_enqueue_is_idempotent(db_path):
+    """같은 idempotency_key는 한 번만 등록"""
+    db = DatabaseManager(db_path)
+    first = db.enqueue_sms("010-1111-2222", "안녕하세요", idempotency_key="birthday:1:2026-10-19")
+    second = db.enqueue_sms("010-1111-2222", "안녕하세요", idempotency_key="birthday:1:2026-10-19")
+
+    assert first == (first[0], True) and second == (first[0], False)
+    assert len(db.get_sms_outbox()) == 1
+
+    # 최종 실패한 키는 다시 대기 (재발송)
+    db.fail_sms(first[0], "HTTP 400")
+    assert db.enqueue_sms("010-1111-2222", "안녕하세요", idempotency_key="birthday:1:2026-10-19") == (first[0], True)
+    entry = db.get_sms(first[0])
+    assert entry["status"] == "pending" and entry["attempts"] == 0 and entry["last_error"] is None
+    db.close()
+
+
+def test_enqueue_surfaces_constraint_errors(db_path):
+    """중복 키만 무시하고, 전화번호 누락 같은 제약 위반은 오류 (일괄 등록은 전체 롤백)"""
+    db = DatabaseManager(db_path)
+    with pytest.raises(sqlite3.IntegrityError):
+        db.enqueue_sms(None, "안녕하세요", idempotency_key="birthday:1:2026-10-19")
+
+    entries = [
+        {"idempotency_key": "campaign:a:1", "phone": "010-1111-2222", "message": "안녕하세요"},
+        {"idempotency_key": "campaign:a:2", "phone": None, "message": "안녕하세요"},
+    ]
+    with pytest.raises(sqlite3.IntegrityError):
+        db.enqueue_sms_batch(entries)
+    assert db.get_sms_outbox() == []
+    assert db.enqueue_sms_batch(entries[:1] * 2) == 1
+    db.close()
+
+
+def test_worker_retries_and_reports_status(db_path):
+    """5xx/429는 백오프 재시도, 4xx는 즉시 실패, 상태는 콜백으로 보고"""
+    server = _StandInSmsServer(scenarios={"01000000001": [500, 429], "01000000002": [400]})
+    statuses = []
+    worker = SmsOutboxWorker(
+        db_path, _transport(server), base_delay=0.01, poll_interval=0.05,
+        on_status=lambda entry: statuses.append((entry["id"], entry["status"])),
+    )
+    db = DatabaseManager(db_path)
+    retry_id, _ = db.enqueue_sms("010-0000-0001", "재시도 메시지")
+    fail_id, _ = db.enqueue_sms("010-0000-0002", "실패 메시지")
+    ok_id, _ = db.enqueue_sms("010-0000-0003", "정상 메시지")
+    try:
+        worker.start()
+        _wait_until_done(db, [retry_id, fail_id, ok_id])
+    finally:
+        worker.stop()
+        server.close()
+
+    retried = db.get_sms(retry_id)
+    assert retried["status"] == "sent" and retried["attempts"] == 3
+    failed = db.get_sms(fail_id)
+    assert failed["status"] == "failed" and failed["attempts"] == 1 and "HTTP 400" in failed["last_error"]
+    assert db.get_sms(ok_id)["status"] == "sent"
+
+    # 재시도에도 같은 idempotency_key 사용
+    keys = {key for _, phone, key in server.requests if phone == "01000000001"}
+    assert keys == {retried["idempotency_key"]}
+    assert (retry_id, "sent") in statuses and (fail_id, "failed") in statuses
+    db.close()
+
+
+def test_worker_respects_concurrency_and_rate(db_path):
+    """동시 발송 수 ≤ max_concurrency, 발송 속도 ≤ 토큰 버킷"""
+    server = _StandInSmsServer(latency=0.05)
+    worker = SmsOutboxWorker(db_path, _transport(server), max_concurrency=3, rate_per_second=20, poll_interval=0.05)
+    db = DatabaseManager(db_path)
+    ids = [db.enqueue_sms(f"010-2000-{i:04d}", f"메시지 {i}")[0] for i in range(30)]
+    try:
+        worker.start()
+        _wait_until_done(db, ids)
+    finally:
+        worker.stop()
+        server.close()
+
+    times = sorted(t for t, _, _ in server.requests)
+    assert len(times) == 30
+    assert server.peak_active <= 3
+    # 버킷 용량(20) 이후 10건은 초당 20건 속도 → 최소 약 0.5초
+    assert times[-1] - times[0] >= 0.4
+    db.close()
+
+
+def test_token_bucket_limits_burst():
+    """토큰 버킷: 용량 소진 후에는 rate 속도로만 통과"""
+    bucket = TokenBucket(rate=50, capacity=5)
+    start = time.monotonic()
+    for _ in range(10):
+        bucket.acquire()
+
+    assert time.monotonic() - start >= 5 / 50 * 0.9